@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import copy
 import enum
+import threading
 import uuid
 from datetime import datetime
 from enum import Enum
@@ -12,14 +13,14 @@ from pydantic import SerializeAsAny, Field, ConfigDict, ValidationError
 
 from nfvcl.blueprints_ng.lcm.performance_manager import get_performance_manager
 from nfvcl.blueprints_ng.pdu_configurators.pdu_configurator import PDUConfigurator
-from nfvcl.blueprints_ng.providers.blueprint.blueprint_provider import BlueprintProvider
+from nfvcl.blueprints_ng.providers.blueprint.blueprint_provider import BlueprintProvider, BlueprintOperationHandle
 from nfvcl.blueprints_ng.providers.blueprint_ng_provider_interface import BlueprintNGProviderData
 from nfvcl.blueprints_ng.providers.kubernetes import K8SProviderNative
 from nfvcl.blueprints_ng.providers.kubernetes.k8s_provider_interface import K8SProviderInterface
 from nfvcl.blueprints_ng.providers.pdu.pdu_provider import PDUProvider
 from nfvcl.blueprints_ng.providers.virtualization import VirtualizationProviderOpenstack, VirtualizationProviderProxmox
 from nfvcl.blueprints_ng.providers.virtualization.virtualization_provider_interface import \
-    VirtualizationProviderInterface
+    VirtualizationProviderInterface, VM_CREATION_MAX_WORKERS
 from nfvcl.blueprints_ng.resources import Resource, ResourceConfiguration, ResourceDeployable, VmResource, \
     HelmChartResource, VmResourceConfiguration, NetResource
 from nfvcl.blueprints_ng.utils import get_class_from_path, get_class_path_str_from_obj
@@ -173,10 +174,20 @@ def register_performance(params_to_info=None):
                         info[pi[1]] = pi[2](args[pi[0]])
                     else:
                         info[pi[1]] = args[pi[0]]
-            provider_call_id = performance_manager.start_provider_call(performance_manager.get_pending_operation_id(provider_aggregator_instance.blueprint.id), method.__name__, info)
-            res = method(*args, **kwargs)
-            performance_manager.end_provider_call(provider_call_id)
-            return res
+            # The call is ended (recording the exception) also when the method raises
+            with performance_manager.provider_call(performance_manager.get_pending_operation_id(provider_aggregator_instance.blueprint.id), method.__name__, info):
+                try:
+                    result = method(*args, **kwargs)
+                except BaseException:
+                    # The changes made before the failure are saved too, but a failed save must not hide the error
+                    try:
+                        provider_aggregator_instance.blueprint.flush_db()
+                    except Exception as flush_error:
+                        provider_aggregator_instance.blueprint.logger.error(f"Unable to save the blueprint after the failure of {method.__name__}: {str(flush_error)}")
+                    raise
+                # The end of a provider call is a flush point for the changes made by the provider
+                provider_aggregator_instance.blueprint.flush_db()
+                return result
         return wrapper
     return decorator
 
@@ -193,67 +204,90 @@ class ProvidersAggregator(VirtualizationProviderInterface, K8SProviderInterface,
         self.k8s_providers_impl: Dict[int, K8SProviderInterface] = {}
         self.pdu_provider_impl: Optional[PDUProvider] = None
         self.blueprint_provider_impl: Optional[BlueprintProvider] = None
+        # The providers are created when first used, operations running concurrently (e.g. the deployment of different
+        # areas) must get the same provider instance, otherwise the data of one of them would be lost
+        self._providers_lock = threading.RLock()
 
     def get_virt_provider(self, area: int):
-        vim = self.topology.get_vim_from_area_id_model(area)
-        if area not in self.virt_providers_impl:
-            if vim.vim_type is VimTypeEnum.OPENSTACK:
-                self.virt_providers_impl[area] = VirtualizationProviderOpenstack(area, self.blueprint.id, self.blueprint.to_db)
-            elif vim.vim_type is VimTypeEnum.PROXMOX:
-                self.virt_providers_impl[area] = VirtualizationProviderProxmox(area, self.blueprint.id, self.blueprint.to_db)
-
-            if str(area) not in self.blueprint.base_model.virt_providers:
-                self.blueprint.base_model.virt_providers[str(area)] = BlueprintNGProviderModel(
-                    provider_type=get_class_path_str_from_obj(self.virt_providers_impl[area]),
-                    provider_data_type=get_class_path_str_from_obj(self.virt_providers_impl[area].data),
-                    provider_data=self.virt_providers_impl[area].data
-                )
+        with self._providers_lock:
+            vim = self.topology.get_vim_from_area_id_model(area)
+            if area not in self.virt_providers_impl:
+                if vim.vim_type is VimTypeEnum.OPENSTACK:
+                    self.virt_providers_impl[area] = VirtualizationProviderOpenstack(area, self.blueprint.id, self.blueprint.mark_dirty, self.blueprint.to_db)
+                elif vim.vim_type is VimTypeEnum.PROXMOX:
+                    self.virt_providers_impl[area] = VirtualizationProviderProxmox(area, self.blueprint.id, self.blueprint.mark_dirty, self.blueprint.to_db)
+
+                if str(area) not in self.blueprint.base_model.virt_providers:
+                    self.blueprint.base_model.virt_providers[str(area)] = BlueprintNGProviderModel(
+                        provider_type=get_class_path_str_from_obj(self.virt_providers_impl[area]),
+                        provider_data_type=get_class_path_str_from_obj(self.virt_providers_impl[area].data),
+                        provider_data=self.virt_providers_impl[area].data
+                    )
 
         return self.virt_providers_impl[area]
 
     def get_k8s_provider(self, area: int):
-        if area not in self.k8s_providers_impl:
-            self.k8s_providers_impl[area] = K8SProviderNative(area, self.blueprint.id, self.blueprint.to_db)
+        with self._providers_lock:
+            if area not in self.k8s_providers_impl:
+                self.k8s_providers_impl[area] = K8SProviderNative(area, self.blueprint.id, self.blueprint.mark_dirty, self.blueprint.to_db)
 
-            if str(area) not in self.blueprint.base_model.k8s_providers:
-                self.blueprint.base_model.k8s_providers[str(area)] = BlueprintNGProviderModel(
-                    provider_type=get_class_path_str_from_obj(self.k8s_providers_impl[area]),
-                    provider_data_type=get_class_path_str_from_obj(self.k8s_providers_impl[area].data),
-                    provider_data=self.k8s_providers_impl[area].data
-                )
+                if str(area) not in self.blueprint.base_model.k8s_providers:
+                    self.blueprint.base_model.k8s_providers[str(area)] = BlueprintNGProviderModel(
+                        provider_type=get_class_path_str_from_obj(self.k8s_providers_impl[area]),
+                        provider_data_type=get_class_path_str_from_obj(self.k8s_providers_impl[area].data),
+                        provider_data=self.k8s_providers_impl[area].data
+                    )
 
         return self.k8s_providers_impl[area]
 
     def get_pdu_provider(self):
         # The area is -1 because there is only one PDUProvider
-        if not self.pdu_provider_impl:
-            self.pdu_provider_impl = PDUProvider(area=-1, blueprint_id=self.blueprint.id, persistence_function=self.blueprint.to_db)
-
-            if not self.blueprint.base_model.pdu_provider:
-                self.blueprint.base_model.pdu_provider = BlueprintNGProviderModel(
-                    provider_type=get_class_path_str_from_obj(self.pdu_provider_impl),
-                    provider_data_type=get_class_path_str_from_obj(self.pdu_provider_impl.data),
-                    provider_data=self.pdu_provider_impl.data
-                )
+        with self._providers_lock:
+            if not self.pdu_provider_impl:
+                self.pdu_provider_impl = PDUProvider(area=-1, blueprint_id=self.blueprint.id, persistence_function=self.blueprint.mark_dirty, persistence_flush_function=self.blueprint.to_db)
+
+                if not self.blueprint.base_model.pdu_provider:
+                    self.blueprint.base_model.pdu_provider = BlueprintNGProviderModel(
+                        provider_type=get_class_path_str_from_obj(self.pdu_provider_impl),
+                        provider_data_type=get_class_path_str_from_obj(self.pdu_provider_impl.data),
+                        provider_data=self.pdu_provider_impl.data
+                    )
         return self.pdu_provider_impl
 
     def get_blueprint_provider(self):
         # The area is -1 because there is only one BlueprintProvider
-        if not self.blueprint_provider_impl:
-            self.blueprint_provider_impl = BlueprintProvider(area=-1, blueprint_id=self.blueprint.id, persistence_function=self.blueprint.to_db)
-
-            if not self.blueprint.base_model.blueprint_provider:
-                self.blueprint.base_model.blueprint_provider = BlueprintNGProviderModel(
-                    provider_type=get_class_path_str_from_obj(self.blueprint_provider_impl),
-                    provider_data_type=get_class_path_str_from_obj(self.blueprint_provider_impl.data),
-                    provider_data=self.blueprint_provider_impl.data
-                )
+        with self._providers_lock:
+            if not self.blueprint_provider_impl:
+                self.blueprint_provider_impl = BlueprintProvider(area=-1, blueprint_id=self.blueprint.id, persistence_function=self.blueprint.mark_dirty, persistence_flush_function=self.blueprint.to_db)
+
+                if not self.blueprint.base_model.blueprint_provider:
+                    self.blueprint.base_model.blueprint_provider = BlueprintNGProviderModel(
+                        provider_type=get_class_path_str_from_obj(self.blueprint_provider_impl),
+                        provider_data_type=get_class_path_str_from_obj(self.blueprint_provider_impl.data),
+                        provider_data=self.blueprint_provider_impl.data
+                    )
         return self.blueprint_provider_impl
 
     @register_performance(params_to_info=[(1, "vm_name", lambda x: x.name)])
     def create_vm(self, vm_resource: VmResource):
         return self.get_virt_provider(vm_resource.area).create_vm(vm_resource)
 
+    @register_performance(params_to_info=[(1, "vm_names", lambda x: ",".join([vm.name for vm in x]))])
+    def create_vms(self, vm_resources: List[VmResource], max_workers: int = VM_CREATION_MAX_WORKERS):
+        """
+        Create multiple VMs, the VMs are grouped by area and every group is created by the provider of the area.
+        Providers that support it create the VMs of the group concurrently.
+
+        Args:
+            vm_resources: List of VMs to be created, they need to be already registered in the blueprint
+            max_workers: The maximum number of VMs created at the same time by a provider
+        """
+        vms_by_area: Dict[int, List[VmResource]] = {}
+        for vm_resource in vm_resources:
+            vms_by_area.setdefault(vm_resource.area, []).append(vm_resource)
+        for area, area_vm_resources in vms_by_area.items():
+            self.get_virt_provider(area).create_vms(area_vm_resources, max_workers)
+
     @register_performance(params_to_info=[(1, "vm_name", lambda x: x.name)])
     def attach_nets(self, vm_resource: VmResource, nets_name: List[str]):
         """
@@ -276,6 +310,28 @@ class ProvidersAggregator(VirtualizationProviderInterface, K8SProviderInterface,
     def configure_vm(self, vm_resource_configuration: VmResourceConfiguration) -> dict:
         return self.get_virt_provider(vm_resource_configuration.vm_resource.area).configure_vm(vm_resource_configuration)
 
+    @register_performance(params_to_info=[(1, "vm_names", lambda x: ",".join([conf.vm_resource.name for conf in x]))])
+    def configure_vms(self, vm_resource_configurations: List[VmResourceConfiguration]) -> List[dict]:
+        """
+        Configure multiple VMs, the configurations are grouped by area and every group is applied by the provider of the area.
+        Providers that support it configure the VMs of the group in parallel.
+
+        Args:
+            vm_resource_configurations: List of configurations to be applied
+
+        Returns:
+            The result of every configuration, in the same order of vm_resource_configurations
+        """
+        indexes_by_area: Dict[int, List[int]] = {}
+        for index, vm_resource_configuration in enumerate(vm_resource_configurations):
+            indexes_by_area.setdefault(vm_resource_configuration.vm_resource.area, []).append(index)
+        results: List[dict] = [{}] * len(vm_resource_configurations)
+        for area, indexes in indexes_by_area.items():
+            area_results = self.get_virt_provider(area).configure_vms([vm_resource_configurations[index] for index in indexes])
+            for index, result in zip(indexes, area_results):
+                results[index] = result
+        return results
+
     @register_performance(params_to_info=[(1, "vm_name", lambda x: x.name)])
     def destroy_vm(self, vm_resource: VmResource):
         return self.get_virt_provider(vm_resource.area).destroy_vm(vm_resource)
@@ -327,6 +383,18 @@ class ProvidersAggregator(VirtualizationProviderInterface, K8SProviderInterface,
     def create_blueprint(self, msg: Any, path: str):
         return self.get_blueprint_provider().create_blueprint(msg, path)
 
+    @register_performance(params_to_info=[(2, "blueprint_type", None)])
+    def create_blueprint_async(self, msg: Any, path: str) -> BlueprintOperationHandle:
+        return self.get_blueprint_provider().create_blueprint_async(msg, path)
+
+    @register_performance(params_to_info=[(1, "blueprint_id", None), (2, "function_name", None)])
+    def call_blueprint_function_async(self, blue_id: str, function_name: str, *args, **kwargs) -> BlueprintOperationHandle:
+        return self.get_blueprint_provider().call_blueprint_function_async(blue_id, function_name, *args, **kwargs)
+
+    @register_performance(params_to_info=[(1, "operations", lambda x: str(len(x)))])
+    def wait_all(self, handles: List[BlueprintOperationHandle], timeout: Optional[float] = None) -> List[BlueprintOperationCallbackModel]:
+        return self.get_blueprint_provider().wait_all(handles, timeout)
+
     @register_performance(params_to_info=[(1, "blueprint_id", None)])
     def delete_blueprint(self, blueprint_id: str):
         return self.get_blueprint_provider().delete_blueprint(blueprint_id)
@@ -351,6 +419,11 @@ class BlueprintNG(Generic[StateTypeVar, CreateConfigTypeVar]):
         """
         super().__init__()
         self.logger = create_logger(self.__class__.__name__, blueprintid=blueprint_id)
+        # Providers may save the blueprint from multiple threads (e.g. concurrent VM creation)
+        self.db_lock = threading.RLock()
+        # Write-behind persistence, changes are only marked and then written to the database at flush points
+        self.db_dirty = False
+        self.db_deleted = False
 
         self.state_type = state_type
         state = state_type()
@@ -462,7 +535,11 @@ class BlueprintNG(Generic[StateTypeVar, CreateConfigTypeVar]):
             elif isinstance(value.value, HelmChartResource):
                 self.provider.uninstall_helm_chart(value.value)
         self.provider.final_cleanup()
-        destroy_ng_blue(blueprint_id=self.base_model.id)
+        with self.db_lock:
+            # Pending changes must not recreate the document after the deletion
+            self.db_dirty = False
+            self.db_deleted = True
+            destroy_ng_blue(blueprint_id=self.base_model.id)
 
     @property
     def state(self) -> StateTypeVar:
@@ -555,13 +632,44 @@ class BlueprintNG(Generic[StateTypeVar, CreateConfigTypeVar]):
 
         return serialized_dict
 
+    def mark_dirty(self) -> None:
+        """
+        Mark the blueprint as changed, the changes will be saved in the database at the next flush (see flush_db).
+        This is the persistence function given to providers, that signal changes many times during a single call.
+        """
+        self.db_dirty = True
+
+    def flush_db(self) -> bool:
+        """
+        Save the blueprint in the database only if it has been marked as changed since the last save.
+
+        Returns:
+            True if the blueprint has been written to the database
+        """
+        with self.db_lock:
+            if not self.db_dirty:
+                return False
+            self.to_db()
+            return True
+
     def to_db(self) -> None:
         """
-        Generates the blueprint serialized representation and save it in the database.
+        Generates the blueprint serialized representation and save it in the database immediately.
+        Used for crash-safety points, where the changes cannot wait for the next flush.
         """
         self.logger.debug("to_db")
-        serialized_dict = self.__serialize_content()
-        save_ng_blue(self.base_model.id, serialized_dict)
+        with self.db_lock:
+            if self.db_deleted:
+                self.logger.debug("The blueprint has been deleted, skipping to_db")
+                return
+            # Cleared before serializing, changes marked by other threads during the save will be written by the next flush
+            self.db_dirty = False
+            try:
+                serialized_dict = self.__serialize_content()
+                save_ng_blue(self.base_model.id, serialized_dict)
+            except Exception:
+                self.db_dirty = True
+                raise
 
     @classmethod
     def from_db(cls, deserialized_dict: dict):
@@ -667,8 +775,37 @@ class BlueprintNG(Generic[StateTypeVar, CreateConfigTypeVar]):
         if detailed:
             return self.__serialize_content()
         else:
-            dict_to_ret = {"id": self.base_model.id, "type": self.base_model.type, "status": self.base_model.status, "created": self.base_model.created, "protected": self.base_model.protected}
-            if self.base_model.corrupted:
-                dict_to_ret["corrupted"] = "True"
-            return dict_to_ret
+            return BlueprintNG.summary_dict(self.base_model.id, self.base_model.type, self.base_model.status, self.base_model.created, self.base_model.protected, self.base_model.corrupted)
+
+    @staticmethod
+    def summary_dict(blue_id: str, blue_type: str, status: BlueprintNGStatus | dict, created: datetime | None, protected: bool, corrupted: bool) -> dict:
+        """
+        Build the summary representation of a blueprint, it is shared by to_dict and summary_from_db such that both
+        produce the same output.
+        """
+        dict_to_ret = {"id": blue_id, "type": blue_type, "status": status, "created": created, "protected": protected}
+        if corrupted:
+            dict_to_ret["corrupted"] = "True"
+        return dict_to_ret
+
+    @staticmethod
+    def summary_from_db(summary_db_dict: dict) -> dict:
+        """
+        Build the summary of a blueprint from the projection of the database document (see BLUE_SUMMARY_PROJECTION),
+        without loading the blueprint.
+
+        Args:
+            summary_db_dict: The projection of the blueprint document
+
+        Returns:
+            The same summary returned by to_dict(detailed=False)
+        """
+        return BlueprintNG.summary_dict(
+            summary_db_dict["id"],
+            summary_db_dict["type"],
+            summary_db_dict.get("status", BlueprintNGStatus().model_dump()),
+            summary_db_dict.get("created"),
+            summary_db_dict.get("protected", False),
+            summary_db_dict.get("corrupted", False)
+        )
 
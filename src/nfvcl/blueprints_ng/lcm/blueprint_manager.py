@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import importlib
-from typing import Any, List, Callable, Optional
+import threading
+import time
+from typing import Any, List, Callable, Optional, Iterator
 
 from verboselogs import VerboseLogger
 
@@ -9,14 +11,22 @@ from nfvcl.blueprints_ng.blueprint_ng import BlueprintNG
 from nfvcl.blueprints_ng.lcm.blueprint_type_manager import blueprint_type
 from nfvcl.blueprints_ng.lcm.blueprint_worker import BlueprintWorker
 from nfvcl.blueprints_ng.lcm.performance_manager import get_performance_manager
+from nfvcl.blueprints_ng.lcm.worker_scheduler import get_worker_scheduler
 from nfvcl.blueprints_ng.resources import VmResource
+from nfvcl.models.blueprint_ng.blueprint_list import BlueprintNGListFilter, BlueprintNGListPage
 from nfvcl.models.blueprint_ng.worker_message import WorkerMessageType
 from nfvcl.models.http_models import BlueprintNotFoundException, BlueprintAlreadyExisting, BlueprintProtectedException
-from nfvcl.utils.database import get_ng_blue_by_id_filter, get_ng_blue_list
+from nfvcl.utils.database import get_ng_blue_by_id_filter, get_ng_blue_list, get_ng_blue_summary_list, get_ng_blue_cursor, \
+    forget_ng_blue_snapshot
 from nfvcl.utils.log import create_logger
+from nfvcl.utils.metrics.metrics_registry import get_metrics_registry
 from nfvcl.utils.util import generate_blueprint_id
 
 BLUEPRINTS_MODULE_FOLDER: str = "nfvcl.blueprints_ng.modules"
+# Seconds without messages after which a worker is removed from the memory, the blueprint is reloaded from the DB when needed
+WORKER_IDLE_EVICTION_TIME: float = 600
+# Minimum seconds between two checks for idle workers
+WORKER_EVICTION_CHECK_INTERVAL: float = 60
 logger: VerboseLogger = create_logger("BlueprintNGManager")
 
 __blueprint_manager: BlueprintManager | None = None
@@ -48,9 +58,55 @@ class BlueprintManager:
     worker_collection: dict[str, BlueprintWorker] = {}
 
     def __init__(self):
+        self._last_eviction_check = time.monotonic()
+        # Guards the lookup, insertion and eviction of the workers: a blueprint must never have two workers in memory
+        self._workers_lock = threading.RLock()
+        metrics_registry = get_metrics_registry()
+        metrics_registry.gauge("nfvcl_blueprint_workers", "Blueprint workers in memory", lambda: len(self.worker_collection))
+        metrics_registry.gauge("nfvcl_blueprint_worker_queue_depth", "Messages waiting to be processed by the blueprint workers", self.get_worker_queue_depth)
+        metrics_registry.gauge("nfvcl_blueprint_worker_threads", "Threads processing the blueprint worker messages", lambda: get_worker_scheduler().thread_count)
         # Load the modules into the memory
         self._load_modules()
 
+    def evict_idle_workers(self, idle_time: float = WORKER_IDLE_EVICTION_TIME) -> List[str]:
+        """
+        Remove from the memory the workers that have not received messages for idle_time seconds.
+        Workers that are scheduled, running or have queued messages are never removed. Pending changes of the
+        blueprints are saved before the removal.
+
+        Args:
+            idle_time: Seconds without messages after which a worker is removed
+
+        Returns:
+            The IDs of the removed workers
+        """
+        self._last_eviction_check = time.monotonic()
+        evicted = []
+        with self._workers_lock:
+            for blueprint_id, worker in list(self.worker_collection.items()):
+                # Holding the lock the worker cannot be returned by get_worker while it is removed, the blueprint is
+                # saved before any other thread can reload it from the DB
+                if worker.is_idle(idle_time):
+                    worker.blueprint.flush_db()
+                    self.worker_collection.pop(blueprint_id, None)
+                    # The snapshot would otherwise be kept in memory until the blueprint is saved again
+                    forget_ng_blue_snapshot(blueprint_id)
+                    evicted.append(blueprint_id)
+        if len(evicted) > 0:
+            logger.debug(f"Evicted idle workers: {evicted}")
+        return evicted
+
+    def get_worker_queue_depth(self) -> int:
+        """
+        Returns:
+            The number of messages waiting to be processed by the workers
+        """
+        return sum(worker.message_queue.qsize() for worker in list(self.worker_collection.values()))
+
+    def _evict_idle_workers_if_needed(self):
+        if time.monotonic() - self._last_eviction_check > WORKER_EVICTION_CHECK_INTERVAL:
+            self.evict_idle_workers()
+
     def get_worker(self, blueprint_id: str) -> BlueprintWorker:
         """
         Return the blueprint dedicated worker, given the blueprint ID
@@ -63,19 +119,20 @@ class BlueprintManager:
         Raises:
             BlueprintNotFoundException if blue does nor exist.
         """
-        if blueprint_id in self.worker_collection:
-            # The worker for the blueprint has already been instantiated/re-instantiated
-            return self.worker_collection[blueprint_id]
-        else:
-            blueprint = self._load_blue_from_db(blueprint_id)
-            if blueprint is not None:
+        self._evict_idle_workers_if_needed()
+        with self._workers_lock:
+            worker = self.worker_collection.get(blueprint_id)
+            if worker is None:
+                blueprint = self._load_blue_from_db(blueprint_id)
+                if blueprint is None:
+                    logger.error(f"Blueprint {blueprint_id} not found")
+                    raise BlueprintNotFoundException(blueprint_id)
                 worker = BlueprintWorker(blueprint)
                 worker.start_listening()
                 self.worker_collection[blueprint_id] = worker
-                return worker
-            else:
-                logger.error(f"Blueprint {blueprint_id} not found")
-                raise BlueprintNotFoundException(blueprint_id)
+            # The caller is going to send a message, the worker must not be evicted in the meantime
+            worker.touch()
+            return worker
 
     def _load_blue_from_db(self, blueprint_id: str) -> BlueprintNG | None:
         """
@@ -139,6 +196,7 @@ class BlueprintManager:
         Returns:
             The ID of the created blueprint.
         """
+        self._evict_idle_workers_if_needed()
         blue_id = generate_blueprint_id()
         # Check that a blueprint with that ID is not existing in the DB
         if self._load_blue_from_db(blue_id) is not None:
@@ -153,11 +211,12 @@ class BlueprintManager:
             created_blue.to_db()
             # Creating and starting the worker
             worker = BlueprintWorker(created_blue)
-            worker.start_listening()  # Start another THREAD
+            worker.start_listening()  # Messages are processed by the worker scheduler threads
 
             get_performance_manager().add_blueprint(blue_id, path)
 
-            self.worker_collection[blue_id] = worker
+            with self._workers_lock:
+                self.worker_collection[blue_id] = worker
             # Putting the creation message into the worker (the spawn happens asynch)
             if wait:
                 worker.put_message_sync(WorkerMessageType.DAY0, f'{path}', msg)
@@ -184,7 +243,8 @@ class BlueprintManager:
             worker.destroy_blueprint_sync()
         else:
             worker.destroy_blueprint()
-        self.worker_collection.pop(blueprint_id)
+        with self._workers_lock:
+            self.worker_collection.pop(blueprint_id, None)
         return blueprint_id
 
     def delete_all_blueprints(self) -> None:
@@ -222,8 +282,9 @@ class BlueprintManager:
             The summary/details of a blueprint
         """
         # If the blueprint is active and loaded in memory, then use the one in memory
-        if blueprint_id in self.worker_collection:
-            blueprint: BlueprintNG = self.worker_collection[blueprint_id].blueprint
+        worker = self.worker_collection.get(blueprint_id)
+        if worker is not None:
+            blueprint: BlueprintNG = worker.blueprint
         else:
             # Otherwise load it from the database
             blueprint: BlueprintNG = self._load_blue_from_db(blueprint_id)
@@ -241,17 +302,80 @@ class BlueprintManager:
         Returns:
             The summary/details of all blueprints that satisfy the given filter.
         """
+        if not detailed:
+            # The summary is built from a projection of the documents, blueprints are not loaded
+            summary_list = []
+            for summary in get_ng_blue_summary_list(blue_type):
+                worker = self.worker_collection.get(summary["id"])
+                if worker is not None:
+                    summary_list.append(worker.blueprint.to_dict(detailed=False))
+                else:
+                    summary_list.append(BlueprintNG.summary_from_db(summary))
+            return summary_list
+
         blue_list = self._load_all_blue_from_db(blue_type, provider_initialization=False)
-        blue_mem_id_list = self.worker_collection.keys()
         # Replace blueprints from DB with the ones that are present in the memory.
         for i in range(len(blue_list)):
-            if blue_list[i].id in blue_mem_id_list:
-                blue_list[i] = self.worker_collection[blue_list[i].id].blueprint
+            worker = self.worker_collection.get(blue_list[i].id)
+            if worker is not None:
+                blue_list[i] = worker.blueprint
+
+        return [blueprint.to_dict(detailed=True) for blueprint in blue_list]
 
+    def _blueprint_dict_from_db_item(self, item: dict, detailed: bool) -> dict:
+        """
+        Convert a document returned by get_ng_blue_cursor to the blueprint representation returned by to_dict.
+        If the blueprint is present in memory, it is used instead of the document.
+        """
+        item.pop("_id", None)
+        worker = self.worker_collection.get(item["id"])
+        if worker is not None:
+            return worker.blueprint.to_dict(detailed=detailed)
         if detailed:
-            return [blueprint.to_dict(detailed=True) for blueprint in blue_list]
-        else:
-            return [blueprint.to_dict(detailed=False) for blueprint in blue_list]
+            # The document is the serialized blueprint (see BlueprintNG.to_dict)
+            return item
+        return BlueprintNG.summary_from_db(item)
+
+    def get_blueprint_summary_page(self, list_filter: BlueprintNGListFilter, detailed: bool = False, cursor: Optional[str] = None, limit: int = 100) -> BlueprintNGListPage:
+        """
+        Retrieves a page of the blueprint summary list, the filters are applied by the database.
+        Args:
+            list_filter: The filters to be applied.
+            detailed: If true, return all the info saved in the database about the blueprints.
+            cursor: The cursor returned with the previous page, None for the first page.
+            limit: The maximum number of blueprints in the page.
+
+        Returns:
+            The page of blueprints and the cursor to retrieve the next one (None if this is the last page).
+
+        Raises:
+            ValueError if the cursor is not valid
+        """
+        page = BlueprintNGListPage()
+        last_id = None
+        # One more item is requested to know if there is a next page
+        for item in get_ng_blue_cursor(list_filter.to_mongo_filter(), detailed=detailed, after=cursor, limit=limit + 1):
+            if len(page.items) == limit:
+                page.next_cursor = str(last_id)
+                break
+            last_id = item["_id"]
+            page.items.append(self._blueprint_dict_from_db_item(item, detailed))
+        return page
+
+    def iter_blueprint_summaries(self, list_filter: BlueprintNGListFilter, detailed: bool = False) -> Iterator[dict]:
+        """
+        Iterates over the blueprint summary list, blueprints are fetched from the database in batches while iterating,
+        the filters are applied by the database.
+        Args:
+            list_filter: The filters to be applied.
+            detailed: If true, return all the info saved in the database about the blueprints.
+
+        Returns:
+            An iterator on the summary/details of the blueprints that satisfy the filters.
+        """
+        with get_ng_blue_cursor(list_filter.to_mongo_filter(), detailed=detailed) as blue_cursor:
+            for item in blue_cursor:
+                yield self._blueprint_dict_from_db_item(item, detailed)
 
     def get_vm_target_by_ip(self, ipv4: str) -> VmResource | None:
         """
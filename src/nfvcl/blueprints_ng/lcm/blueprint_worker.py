@@ -1,12 +1,13 @@
 import queue
 import threading
+import time
 from functools import partial
-from threading import Thread
 from typing import Any
 
 from nfvcl.blueprints_ng.blueprint_ng import BlueprintNG, BlueprintNGStatus, CurrentOperation
 from nfvcl.blueprints_ng.lcm.blueprint_type_manager import blueprint_type
 from nfvcl.blueprints_ng.lcm.performance_manager import get_performance_manager
+from nfvcl.blueprints_ng.lcm.worker_scheduler import get_worker_scheduler
 from nfvcl.models.blueprint_ng.worker_message import WorkerMessageType, WorkerMessage, BlueprintOperationCallbackModel
 from nfvcl.models.performance import BlueprintPerformanceType
 from nfvcl.utils.log import create_logger
@@ -21,21 +22,50 @@ def callback_function(event, namespace, msg: BlueprintOperationCallbackModel):
 
 
 class BlueprintWorker:
+    """
+    Process the messages of a blueprint in FIFO order. The worker does not own a thread, messages are processed by the
+    threads of the BlueprintWorkerScheduler, one at a time for every worker.
+    """
     blueprint: BlueprintNG
     message_queue: queue.Queue
-    thread: Thread = None
 
     def __init__(self, blueprint: BlueprintNG):
         self.blueprint = blueprint
         self.logger = create_logger('BLUEV2_WORKER', blueprintid=blueprint.id)
         self.message_queue = queue.Queue()
+        # Managed by the scheduler, True while the worker is in the ready queue or a thread is processing its message
+        self.scheduled = False
+        self.listening = False
+        self.stopped = False
+        self.last_activity = time.monotonic()
 
     def start_listening(self):
-        self.thread = Thread(target=self._listen, args=())
-        self.thread.start()
+        self.logger.debug(f"Worker listening")
+        self.listening = True
+        if not self.message_queue.empty():
+            get_worker_scheduler().schedule(self)
 
     def stop_listening(self):
         self.logger.info("Blueprint worker stopping listening.")
+        self.listening = False
+        self.stopped = True
+
+    def touch(self):
+        """
+        Record an activity of the worker, delaying its eviction
+        """
+        self.last_activity = time.monotonic()
+
+    def is_idle(self, idle_time: float) -> bool:
+        """
+        Check if the worker has nothing to do since at least idle_time seconds
+        Args:
+            idle_time: Seconds since the last message was received or processed
+
+        Returns:
+            True if the worker is idle
+        """
+        return not self.scheduled and self.message_queue.empty() and time.monotonic() - self.last_activity > idle_time
 
     def call_function_sync(self, function_name, *args, **kwargs) -> BlueprintOperationCallbackModel:
         """
@@ -53,7 +83,8 @@ class BlueprintWorker:
         namespace = {}
 
         self.put_message(WorkerMessageType.DAY2_BY_NAME, function_name, (args, kwargs), callback=partial(callback_function, event, namespace))
-        event.wait()
+        with get_worker_scheduler().blocking():
+            event.wait()
 
         return namespace["msg"]
 
@@ -64,7 +95,8 @@ class BlueprintWorker:
         namespace = {}
 
         self.put_message(msg_type, path, message, callback=partial(callback_function, event, namespace))
-        event.wait()
+        with get_worker_scheduler().blocking():
+            event.wait()
 
         return namespace["msg"]
 
@@ -80,7 +112,7 @@ class BlueprintWorker:
             callback: Function to be called after the message is processed
         """
         worker_message = WorkerMessage(message_type=msg_type, message=message, path=path, callback=callback)
-        self.message_queue.put(worker_message)  # Thread safe
+        self._enqueue(worker_message)
 
     def destroy_blueprint_sync(self):
         """
@@ -93,7 +125,16 @@ class BlueprintWorker:
         Sent a termination message to the worker. This function should be called by an external process to the worker.
         """
         worker_message = WorkerMessage(message_type=WorkerMessageType.STOP, message="", path="")
+        self._enqueue(worker_message)
+
+    def _enqueue(self, worker_message: WorkerMessage):
+        if worker_message.trace_parent is None:
+            # Messages sent by another blueprint during a provider call are linked to the call
+            worker_message.trace_parent = get_performance_manager().get_current_trace_parent()
+        self.last_activity = time.monotonic()
         self.message_queue.put(worker_message)  # Thread safe
+        if self.listening:
+            get_worker_scheduler().schedule(self)
 
     def protect_blueprint(self, protect: bool) -> bool:
         """
@@ -108,91 +149,98 @@ class BlueprintWorker:
         self.blueprint.to_db()
         return self.blueprint.base_model.protected
 
-    def _listen(self):
-        self.logger.debug(f"Worker listening")
-        while True:
-            received_message: WorkerMessage = self.message_queue.get()  # Thread safe
-            self.logger.debug(f"Received message: {received_message.message}")
-            match received_message.message_type:
-                # ------------------------ This is the case of blueprint creation (create and start VMs, Dockers, ...)
-                case WorkerMessageType.DAY0:
-                    self.logger.info(f"Creating blueprint")
-                    self.blueprint.base_model.status = BlueprintNGStatus.deploying(self.blueprint.id)
-                    trigger_redis_event(BLUEPRINT_TOPIC, BlueEventType.BLUE_STARTED_DAY0, self.blueprint.base_model.model_dump())
-                    self.blueprint.to_db()
-                    try:
-                        performance_operation_id = get_performance_manager().start_operation(self.blueprint.id, BlueprintPerformanceType.DAY0, "create")
+    def process_next_message(self):
+        """
+        Process the first message in the queue, called by the scheduler threads.
+        """
+        try:
+            received_message: WorkerMessage = self.message_queue.get_nowait()  # Thread safe
+        except queue.Empty:
+            return
+        if self.stopped:
+            self.logger.warning(f"The worker has been stopped, ignoring message {received_message.message_type}")
+            return
+        try:
+            self._process_message(received_message)
+        finally:
+            self.last_activity = time.monotonic()
+
+    def _process_message(self, received_message: WorkerMessage):
+        self.logger.debug(f"Received message: {received_message.message}")
+        match received_message.message_type:
+            # ------------------------ This is the case of blueprint creation (create and start VMs, Dockers, ...)
+            case WorkerMessageType.DAY0:
+                self.logger.info(f"Creating blueprint")
+                self.blueprint.base_model.status = BlueprintNGStatus.deploying(self.blueprint.id)
+                trigger_redis_event(BLUEPRINT_TOPIC, BlueEventType.BLUE_STARTED_DAY0, self.blueprint.base_model.model_dump())
+                self.blueprint.to_db()
+                try:
+                    with get_performance_manager().operation(self.blueprint.id, BlueprintPerformanceType.DAY0, "create", received_message.trace_parent):
                         self.blueprint.create(received_message.message)
-                        get_performance_manager().end_operation(performance_operation_id)
-                        if received_message.callback:
-                            received_message.callback(BlueprintOperationCallbackModel(id=self.blueprint.id, operation=str(CurrentOperation.IDLE), status="OK"))
-                        self.blueprint.base_model.status = BlueprintNGStatus(current_operation=CurrentOperation.IDLE)
-                        trigger_redis_event(BLUEPRINT_TOPIC, BlueEventType.BLUE_CREATED, self.blueprint.base_model.model_dump())
-                        self.logger.success(f"Blueprint created")
-                    except Exception as e:
-                        self.blueprint.base_model.status.error = True
-                        self.blueprint.base_model.status.detail = str(e)
-                        if received_message.callback:
-                            received_message.callback(BlueprintOperationCallbackModel(id=self.blueprint.id, operation=str(CurrentOperation.IDLE), status="ERROR", detailed_status=str(e)))
-                        self.logger.error(f"Error creating blueprint", exc_info=e)
-                        trigger_redis_event(BLUEPRINT_TOPIC, BlueEventType.BLUE_ERROR, self.blueprint.base_model.model_dump())
-
-                    self.blueprint.to_db()
-                # ------------------------- This is the case of blueprint day 2
-                case WorkerMessageType.DAY2 | WorkerMessageType.DAY2_BY_NAME:
-                    self.logger.info(f"Calling DAY2 function on blueprint")
-                    self.blueprint.base_model.status = BlueprintNGStatus(current_operation=CurrentOperation.RUNNING_DAY2_OP, detail=f"Calling DAY2 function {received_message.path} on blueprint {self.blueprint.id}")
-                    trigger_redis_event(BLUEPRINT_TOPIC, BlueEventType.BLUE_STARTED_DAY2, self.blueprint.base_model.model_dump())
-                    self.blueprint.to_db()
-                    try:
-                        # This is the DAY2 message, getting the function to be called
-                        if received_message.message_type == WorkerMessageType.DAY2:
-                            if received_message.message:
-                                self.blueprint.base_model.day_2_call_history.append(received_message.message.model_dump_json())
-                            function = blueprint_type.get_function_to_be_called(received_message.path)
-                            performance_operation_id = get_performance_manager().start_operation(self.blueprint.id, BlueprintPerformanceType.DAY2, received_message.path.split("/")[-1])
+                    if received_message.callback:
+                        received_message.callback(BlueprintOperationCallbackModel(id=self.blueprint.id, operation=str(CurrentOperation.IDLE), status="OK"))
+                    self.blueprint.base_model.status = BlueprintNGStatus(current_operation=CurrentOperation.IDLE)
+                    trigger_redis_event(BLUEPRINT_TOPIC, BlueEventType.BLUE_CREATED, self.blueprint.base_model.model_dump())
+                    self.logger.success(f"Blueprint created")
+                except Exception as e:
+                    self.blueprint.base_model.status.error = True
+                    self.blueprint.base_model.status.detail = str(e)
+                    if received_message.callback:
+                        received_message.callback(BlueprintOperationCallbackModel(id=self.blueprint.id, operation=str(CurrentOperation.IDLE), status="ERROR", detailed_status=str(e)))
+                    self.logger.error(f"Error creating blueprint", exc_info=e)
+                    trigger_redis_event(BLUEPRINT_TOPIC, BlueEventType.BLUE_ERROR, self.blueprint.base_model.model_dump())
+
+                self.blueprint.to_db()
+            # ------------------------- This is the case of blueprint day 2
+            case WorkerMessageType.DAY2 | WorkerMessageType.DAY2_BY_NAME:
+                self.logger.info(f"Calling DAY2 function on blueprint")
+                self.blueprint.base_model.status = BlueprintNGStatus(current_operation=CurrentOperation.RUNNING_DAY2_OP, detail=f"Calling DAY2 function {received_message.path} on blueprint {self.blueprint.id}")
+                trigger_redis_event(BLUEPRINT_TOPIC, BlueEventType.BLUE_STARTED_DAY2, self.blueprint.base_model.model_dump())
+                self.blueprint.to_db()
+                try:
+                    # This is the DAY2 message, getting the function to be called
+                    if received_message.message_type == WorkerMessageType.DAY2:
+                        if received_message.message:
+                            self.blueprint.base_model.day_2_call_history.append(received_message.message.model_dump_json())
+                        function = blueprint_type.get_function_to_be_called(received_message.path)
+                        with get_performance_manager().operation(self.blueprint.id, BlueprintPerformanceType.DAY2, received_message.path.split("/")[-1], received_message.trace_parent):
                             if received_message.message:
                                 result = getattr(self.blueprint, function.__name__)(received_message.message)
                             else:
                                 result = getattr(self.blueprint, function.__name__)()
-                            get_performance_manager().end_operation(performance_operation_id)
-                        else:
-                            performance_operation_id = get_performance_manager().start_operation(self.blueprint.id, BlueprintPerformanceType.DAY2, received_message.path.split("/")[-1])
+                    else:
+                        with get_performance_manager().operation(self.blueprint.id, BlueprintPerformanceType.DAY2, received_message.path.split("/")[-1], received_message.trace_parent):
                             result = getattr(self.blueprint, received_message.path)(*received_message.message[0], **received_message.message[1])
-                            get_performance_manager().end_operation(performance_operation_id)
-
-                        # Starting processing the request.
-                        if received_message.callback:
-                            received_message.callback(BlueprintOperationCallbackModel(id=self.blueprint.id, operation=str(CurrentOperation.IDLE), result=result, status="OK"))
-
-                        self.blueprint.base_model.status = BlueprintNGStatus(current_operation=CurrentOperation.IDLE)
-                        trigger_redis_event(BLUEPRINT_TOPIC, BlueEventType.BLUE_END_DAY2, self.blueprint.base_model.model_dump())
-                        self.logger.success(f"Function DAY2 {received_message.path} on blueprint {self.blueprint.id} called.")
-                    except Exception as e:
-                        self.blueprint.base_model.status.error = True
-                        self.blueprint.base_model.status.detail = str(e)
-                        if received_message.callback:
-                            received_message.callback(BlueprintOperationCallbackModel(id=self.blueprint.id, operation=str(CurrentOperation.IDLE), status="ERROR", detailed_status=str(e)))
-                        self.logger.error(f"Error calling function on blueprint", exc_info=e)
-                        trigger_redis_event(BLUEPRINT_TOPIC, BlueEventType.BLUE_ERROR, self.blueprint.base_model.model_dump())
-                    self.blueprint.to_db()
-                # ------------------------- This is the case of blueprint destroy
-                case WorkerMessageType.STOP:
-                    self.logger.info(f"Destroying blueprint")
-                    self.blueprint.base_model.status = BlueprintNGStatus.destroying(blue_id=self.blueprint.id)
-                    trigger_redis_event(BLUEPRINT_TOPIC, BlueEventType.BLUE_START_DAYN, self.blueprint.base_model.model_dump())
-                    performance_operation_id = get_performance_manager().start_operation(self.blueprint.id, BlueprintPerformanceType.DELETION, "delete")
-                    self.blueprint.destroy()
-                    get_performance_manager().end_operation(performance_operation_id)
+
+                    # Starting processing the request.
                     if received_message.callback:
-                        received_message.callback(self.blueprint.id)
-                    self.logger.success(f"Blueprint destroyed")
-                    trigger_redis_event(BLUEPRINT_TOPIC, BlueEventType.BLUE_DELETED, self.blueprint.base_model.model_dump())
-                    break
-                case _:
-                    raise ValueError("Worker message type not recognized")
-
-        self.stop_listening()
+                        received_message.callback(BlueprintOperationCallbackModel(id=self.blueprint.id, operation=str(CurrentOperation.IDLE), result=result, status="OK"))
+
+                    self.blueprint.base_model.status = BlueprintNGStatus(current_operation=CurrentOperation.IDLE)
+                    trigger_redis_event(BLUEPRINT_TOPIC, BlueEventType.BLUE_END_DAY2, self.blueprint.base_model.model_dump())
+                    self.logger.success(f"Function DAY2 {received_message.path} on blueprint {self.blueprint.id} called.")
+                except Exception as e:
+                    self.blueprint.base_model.status.error = True
+                    self.blueprint.base_model.status.detail = str(e)
+                    if received_message.callback:
+                        received_message.callback(BlueprintOperationCallbackModel(id=self.blueprint.id, operation=str(CurrentOperation.IDLE), status="ERROR", detailed_status=str(e)))
+                    self.logger.error(f"Error calling function on blueprint", exc_info=e)
+                    trigger_redis_event(BLUEPRINT_TOPIC, BlueEventType.BLUE_ERROR, self.blueprint.base_model.model_dump())
+                self.blueprint.to_db()
+            # ------------------------- This is the case of blueprint destroy
+            case WorkerMessageType.STOP:
+                self.logger.info(f"Destroying blueprint")
+                self.blueprint.base_model.status = BlueprintNGStatus.destroying(blue_id=self.blueprint.id)
+                trigger_redis_event(BLUEPRINT_TOPIC, BlueEventType.BLUE_START_DAYN, self.blueprint.base_model.model_dump())
+                with get_performance_manager().operation(self.blueprint.id, BlueprintPerformanceType.DELETION, "delete", received_message.trace_parent):
+                    self.blueprint.destroy()
+                if received_message.callback:
+                    received_message.callback(self.blueprint.id)
+                self.logger.success(f"Blueprint destroyed")
+                trigger_redis_event(BLUEPRINT_TOPIC, BlueEventType.BLUE_DELETED, self.blueprint.base_model.model_dump())
+                self.stop_listening()
+            case _:
+                raise ValueError("Worker message type not recognized")
 
     def __eq__(self, __value):
         """
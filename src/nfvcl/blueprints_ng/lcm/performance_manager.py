@@ -1,17 +1,24 @@
 from __future__ import annotations
 
 import datetime
+import json
+import threading
 import uuid
-from typing import Dict, Optional
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, Optional, List, Tuple, Callable
 
-from pymongo import MongoClient
+from pymongo import MongoClient, ASCENDING
 from verboselogs import VerboseLogger
 
 from nfvcl.models.config_model import NFVCLConfigModel
 from nfvcl.models.performance import BlueprintPerformanceType, BlueprintPerformance, BlueprintPerformanceOperation, \
-    BlueprintPerformanceProviderCall
+    BlueprintPerformanceProviderCall, PerformanceOutcome, PerformanceDurationStats, PerformanceSlowProviderCall, PerformanceDay0Breakdown, \
+    PerformanceTraceParent, PerformanceTrace
+from nfvcl.blueprints_ng.lcm.performance_trace import build_trace, trace_to_otel
 from nfvcl.utils.database import get_nfvcl_database
 from nfvcl.utils.log import create_logger
+from nfvcl.utils.metrics.metrics_registry import get_metrics_registry
 from nfvcl.utils.util import get_nfvcl_config
 
 logger: VerboseLogger = create_logger("PerformanceManager")
@@ -20,6 +27,82 @@ __performance_manager: PerformanceManager | None = None
 
 nfvcl_config: NFVCLConfigModel = get_nfvcl_config()
 
+# Number of blueprints for which the performances are loaded with a single query at startup
+PERFORMANCE_LOAD_BATCH_SIZE = 500
+# Maximum number of operations kept in the database for every blueprint, the oldest are removed
+PERFORMANCE_OPERATIONS_RETENTION = 1000
+
+# Categories of the provider methods used to break down the DAY0 duration, methods not listed are in 'other'
+PROVIDER_METHOD_CATEGORIES: Dict[str, str] = {
+    "create_vm": "vm",
+    "create_vms": "vm",
+    "destroy_vm": "vm",
+    "create_net": "vm",
+    "attach_nets": "vm",
+    "configure_vm": "ansible",
+    "configure_vms": "ansible",
+    "install_helm_chart": "helm",
+    "update_values_helm_chart": "helm",
+    "uninstall_helm_chart": "helm",
+    "create_blueprint": "child_blueprints",
+    "create_blueprint_async": "child_blueprints",
+    "call_blueprint_function": "child_blueprints",
+    "call_blueprint_function_async": "child_blueprints",
+    "delete_blueprint": "child_blueprints",
+    "wait_all": "child_blueprints",
+}
+
+
+def _percentile_expression(percentile: float) -> dict:
+    """
+    Build the aggregation expression selecting a percentile from the sorted 'durations' array (nearest rank).
+    """
+    return {"$arrayElemAt": ["$durations", {"$toInt": {"$floor": {"$multiply": [percentile, {"$subtract": ["$count", 1]}]}}}]}
+
+
+def _duration_stats_stages(group: Dict[str, str], duration_field: str) -> List[dict]:
+    """
+    Build the aggregation stages computing the duration statistics for every group.
+    Args:
+        group: The name of the group fields and the document fields (e.g. {"method_name": "$operations.provider_calls.method_name"})
+        duration_field: The document field containing the duration
+
+    Returns:
+        The aggregation stages producing documents compatible with PerformanceDurationStats
+    """
+    return [
+        # The order is kept by $push, in this way the durations of every group are sorted
+        {"$sort": {duration_field: 1}},
+        {"$group": {
+            "_id": group,
+            "durations": {"$push": f"${duration_field}"},
+            "count": {"$sum": 1},
+            "mean": {"$avg": f"${duration_field}"},
+            "max": {"$max": f"${duration_field}"}
+        }},
+        {"$project": {
+            "_id": False,
+            "group": "$_id",
+            "count": True,
+            "mean": True,
+            "max": True,
+            "p50": _percentile_expression(0.5),
+            "p95": _percentile_expression(0.95),
+            "p99": _percentile_expression(0.99),
+        }},
+        {"$sort": {"p95": -1}}
+    ]
+
+
+def _time_window_match(field: str, since: Optional[datetime.datetime], until: Optional[datetime.datetime]) -> dict:
+    time_window = {}
+    if since:
+        time_window["$gte"] = since
+    if until:
+        time_window["$lt"] = until
+    return {field: time_window} if time_window else {}
+
+
 def get_performance_manager() -> PerformanceManager:
     """
     Allow to retrieve the PerformanceManager (that can have only one instance)
@@ -36,19 +119,48 @@ def get_performance_manager() -> PerformanceManager:
 
 class PerformanceManager:
     """
-    This class is used to manage the performance metrics collection
+    This class is used to manage the performance metrics collection.
+    Only the pending operations are kept in memory, every completed operation is appended to the blueprint document in
+    the database and removed from memory.
     """
     performance_dict: Dict[str, BlueprintPerformance]
     pending_operations: Dict[str, str] # blueprint_id: operation_id
     operations: Dict[str, BlueprintPerformanceOperation]
+    operations_blueprint: Dict[str, str] # operation_id: blueprint_id
     provider_calls: Dict[str, BlueprintPerformanceProviderCall]
+    provider_calls_operation: Dict[str, str] # provider_call_id: operation_id
 
     def __init__(self):
         super().__init__()
         self.performance_dict = {}
         self.pending_operations = {}
         self.operations = {}
+        self.operations_blueprint = {}
         self.provider_calls = {}
+        self.provider_calls_operation = {}
+        # The provider calls in progress in every thread, used to link the operations triggered by a call to it
+        self._local = threading.local()
+        # Provider calls may be started by multiple threads of the same operation
+        self.lock = threading.RLock()
+
+        metrics_registry = get_metrics_registry()
+        self.operation_duration_histogram = metrics_registry.histogram(
+            "nfvcl_blueprint_operation_duration_seconds",
+            "Duration of the blueprint operations",
+            ("blueprint_type", "operation_type", "outcome")
+        )
+        self.provider_call_duration_histogram = metrics_registry.histogram(
+            "nfvcl_provider_call_duration_seconds",
+            "Duration of the calls to the blueprint providers",
+            ("method_name", "outcome")
+        )
+        self.provider_call_errors_counter = metrics_registry.counter(
+            "nfvcl_provider_call_errors_total",
+            "Provider calls ended with an exception",
+            ("method_name", "error")
+        )
+        metrics_registry.gauge("nfvcl_blueprint_operations_in_progress", "Blueprint operations in progress", lambda: len(self.operations))
+        metrics_registry.gauge("nfvcl_provider_calls_in_progress", "Provider calls in progress", lambda: sum(1 for call in list(self.provider_calls.values()) if call.end is None))
 
         mongo_client: MongoClient = get_nfvcl_database().mongo_client
         db = mongo_client.get_database(nfvcl_config.mongodb.db)
@@ -57,29 +169,48 @@ class PerformanceManager:
             db.create_collection('performance')
 
         self.performance_collection = db.get_collection('performance')
+        self.performance_collection.create_index([("blueprint_id", ASCENDING)])
+        self.performance_collection.create_index([("operations.start", ASCENDING)])
+        self.performance_collection.create_index([("operations.id", ASCENDING)])
+        self.performance_collection.create_index([("operations.trace_id", ASCENDING)])
         self.blue_inst_collection = db.get_collection('blue-inst-v2')
 
         self._load_from_db()
 
     def _load_from_db(self):
         """
-        Load the metrics already collected for the blueprints currently instantiated
+        Load the metrics already collected for the blueprints currently instantiated.
+        Past operations are not loaded, they are only in the database.
         """
-        blueprints_to_load = self.blue_inst_collection.find()
-        for blueprint_to_load in blueprints_to_load:
-            element = self.performance_collection.find_one({"blueprint_id": blueprint_to_load["id"]})
-            if element:
+        blueprint_ids = [blueprint["id"] for blueprint in self.blue_inst_collection.find({}, {"_id": False, "id": True})]
+        for index in range(0, len(blueprint_ids), PERFORMANCE_LOAD_BATCH_SIZE):
+            batch_ids = blueprint_ids[index:index + PERFORMANCE_LOAD_BATCH_SIZE]
+            found_ids = set()
+            for element in self.performance_collection.find({"blueprint_id": {"$in": batch_ids}}, {"_id": False, "operations": False}):
                 self.performance_dict[element['blueprint_id']] = BlueprintPerformance.model_validate(element)
-                logger.debug(f"Loaded performances for blueprint {element['blueprint_id']}")
-            else:
-                logger.warning(f"Unable to load performances for blueprint {blueprint_to_load['id']}")
+                found_ids.add(element['blueprint_id'])
+            for blueprint_id in batch_ids:
+                if blueprint_id not in found_ids:
+                    logger.warning(f"Unable to load performances for blueprint {blueprint_id}")
+        logger.debug(f"Loaded performances for {len(self.performance_dict)} blueprints")
 
-    def _persist_to_db(self):
+    def _persist_operation(self, blueprint_id: str, operation: BlueprintPerformanceOperation):
         """
-        Persist the collected metrics to the mongo db
+        Append a completed operation to the performance document of the blueprint, the document is created if missing.
+        Only the last PERFORMANCE_OPERATIONS_RETENTION operations are kept.
+        Args:
+            blueprint_id: The blueprint id
+            operation: The completed operation
         """
-        for blueid in self.performance_dict.keys():
-            self.performance_collection.update_one({ "blueprint_id": blueid }, { "$set": self.performance_dict[blueid].model_dump()}, upsert=True)
+        blueprint_performance = self.performance_dict[blueprint_id]
+        self.performance_collection.update_one(
+            {"blueprint_id": blueprint_id},
+            {
+                "$setOnInsert": blueprint_performance.model_dump(exclude={"operations"}),
+                "$push": {"operations": {"$each": [operation.model_dump()], "$slice": -PERFORMANCE_OPERATIONS_RETENTION}}
+            },
+            upsert=True
+        )
 
     def get_blue_performance(self, blueprint_id: str) -> BlueprintPerformance:
         """
@@ -94,6 +225,147 @@ class PerformanceManager:
             return BlueprintPerformance.model_validate(element)
         raise ValueError(f"No performance metrics found for blueprint '{blueprint_id}'")
 
+    def _operations_pipeline(self, since: Optional[datetime.datetime], until: Optional[datetime.datetime], blueprint_type: Optional[str] = None) -> List[dict]:
+        """
+        Build the first stages of the aggregations, producing a document for every completed operation in the time window.
+        """
+        blueprint_match = {"blueprint_type": blueprint_type} if blueprint_type else {}
+        return [
+            # Uses the index on operations.start to skip the blueprints without operations in the window
+            {"$match": {**blueprint_match, **_time_window_match("operations.start", since, until)}},
+            {"$unwind": "$operations"},
+            {"$match": {"operations.duration": {"$ne": None}, **_time_window_match("operations.start", since, until)}}
+        ]
+
+    def get_operation_stats(self, since: Optional[datetime.datetime] = None, until: Optional[datetime.datetime] = None, blueprint_type: Optional[str] = None) -> List[PerformanceDurationStats]:
+        """
+        Get the duration percentiles of the completed operations grouped by blueprint type, operation type, operation name and outcome.
+        Args:
+            since: Consider only operations started after this time
+            until: Consider only operations started before this time
+            blueprint_type: Consider only the blueprints of this type
+
+        Returns:
+            The statistics of every group, ordered by p95 (descending)
+        """
+        pipeline = self._operations_pipeline(since, until, blueprint_type)
+        pipeline.extend(_duration_stats_stages({
+            "blueprint_type": "$blueprint_type",
+            "type": "$operations.type",
+            "op_name": "$operations.op_name",
+            "outcome": {"$ifNull": ["$operations.outcome", PerformanceOutcome.OK.value]}
+        }, "operations.duration"))
+        return [PerformanceDurationStats.model_validate(element) for element in self.performance_collection.aggregate(pipeline, allowDiskUse=True)]
+
+    def _provider_calls_pipeline(self, since: Optional[datetime.datetime], until: Optional[datetime.datetime], blueprint_type: Optional[str], method_name: Optional[str]) -> List[dict]:
+        pipeline = self._operations_pipeline(since, until, blueprint_type)
+        pipeline.extend([
+            {"$unwind": "$operations.provider_calls"},
+            {"$match": {"operations.provider_calls.duration": {"$ne": None}}}
+        ])
+        if method_name:
+            pipeline.append({"$match": {"operations.provider_calls.method_name": method_name}})
+        return pipeline
+
+    def get_provider_call_stats(self, since: Optional[datetime.datetime] = None, until: Optional[datetime.datetime] = None, blueprint_type: Optional[str] = None) -> List[PerformanceDurationStats]:
+        """
+        Get the duration percentiles of the provider calls grouped by blueprint type, method name and outcome.
+        Args:
+            since: Consider only calls of operations started after this time
+            until: Consider only calls of operations started before this time
+            blueprint_type: Consider only the blueprints of this type
+
+        Returns:
+            The statistics of every group, ordered by p95 (descending)
+        """
+        pipeline = self._provider_calls_pipeline(since, until, blueprint_type, None)
+        pipeline.extend(_duration_stats_stages({
+            "blueprint_type": "$blueprint_type",
+            "method_name": "$operations.provider_calls.method_name",
+            # Failures are kept separated, a call failing slowly must not hide in the successful ones
+            "outcome": {"$ifNull": ["$operations.provider_calls.outcome", PerformanceOutcome.OK.value]}
+        }, "operations.provider_calls.duration"))
+        return [PerformanceDurationStats.model_validate(element) for element in self.performance_collection.aggregate(pipeline, allowDiskUse=True)]
+
+    def get_slowest_provider_calls(self, since: Optional[datetime.datetime] = None, until: Optional[datetime.datetime] = None, blueprint_type: Optional[str] = None, method_name: Optional[str] = None, limit: int = 10) -> List[PerformanceSlowProviderCall]:
+        """
+        Get the slowest provider calls.
+        Args:
+            since: Consider only calls of operations started after this time
+            until: Consider only calls of operations started before this time
+            blueprint_type: Consider only the blueprints of this type
+            method_name: Consider only the calls to this provider method
+            limit: The maximum number of calls returned
+
+        Returns:
+            The provider calls ordered by duration (descending)
+        """
+        pipeline = self._provider_calls_pipeline(since, until, blueprint_type, method_name)
+        pipeline.extend([
+            {"$sort": {"operations.provider_calls.duration": -1}},
+            {"$limit": limit},
+            {"$project": {
+                "_id": False,
+                "blueprint_id": True,
+                "blueprint_type": True,
+                "operation_id": "$operations.id",
+                "op_name": "$operations.op_name",
+                "method_name": "$operations.provider_calls.method_name",
+                "info": "$operations.provider_calls.info",
+                "start": "$operations.provider_calls.start",
+                "duration": "$operations.provider_calls.duration",
+                "outcome": "$operations.provider_calls.outcome",
+                "error": "$operations.provider_calls.error",
+                "retries": {"$ifNull": ["$operations.provider_calls.retries", 0]}
+            }}
+        ])
+        return [PerformanceSlowProviderCall.model_validate(element) for element in self.performance_collection.aggregate(pipeline, allowDiskUse=True)]
+
+    def get_day0_breakdown(self, since: Optional[datetime.datetime] = None, until: Optional[datetime.datetime] = None, blueprint_type: Optional[str] = None) -> List[PerformanceDay0Breakdown]:
+        """
+        Get where the time of the DAY0 operations is spent (VM creation, Ansible, Helm, child blueprints...) for every blueprint type.
+        Args:
+            since: Consider only operations started after this time
+            until: Consider only operations started before this time
+            blueprint_type: Consider only the blueprints of this type
+
+        Returns:
+            The breakdown of every blueprint type, ordered by total duration (descending)
+        """
+        day0_pipeline = self._operations_pipeline(since, until, blueprint_type)
+        day0_pipeline.append({"$match": {"operations.type": BlueprintPerformanceType.DAY0.value}})
+
+        breakdowns: Dict[str, PerformanceDay0Breakdown] = {}
+        operations_pipeline = day0_pipeline + [
+            {"$group": {
+                "_id": "$blueprint_type",
+                "operations": {"$sum": 1},
+                "total_duration": {"$sum": "$operations.duration"}
+            }}
+        ]
+        for element in self.performance_collection.aggregate(operations_pipeline, allowDiskUse=True):
+            breakdowns[element["_id"]] = PerformanceDay0Breakdown(blueprint_type=element["_id"], operations=element["operations"], total_duration=element["total_duration"], not_in_provider_calls=0)
+
+        # The provider calls are unwound and grouped directly, without collecting them in a single document per blueprint type
+        calls_pipeline = day0_pipeline + [
+            {"$unwind": "$operations.provider_calls"},
+            {"$group": {
+                "_id": {"blueprint_type": "$blueprint_type", "method_name": "$operations.provider_calls.method_name"},
+                "duration": {"$sum": {"$ifNull": ["$operations.provider_calls.duration", 0]}}
+            }}
+        ]
+        for element in self.performance_collection.aggregate(calls_pipeline, allowDiskUse=True):
+            breakdown = breakdowns.get(element["_id"]["blueprint_type"])
+            if breakdown is None:
+                # Operations completed between the two aggregations
+                continue
+            category = PROVIDER_METHOD_CATEGORIES.get(element["_id"]["method_name"], "other")
+            breakdown.categories[category] = breakdown.categories.get(category, 0) + element["duration"]
+
+        for breakdown in breakdowns.values():
+            breakdown.not_in_provider_calls = max(0, breakdown.total_duration - sum(breakdown.categories.values()))
+        return sorted(breakdowns.values(), key=lambda item: item.total_duration, reverse=True)
+
     def get_pending_operation_id(self, blueprint_id: str) -> Optional[str]:
         """
         Get the current pending operation id for a blueprint
@@ -114,15 +386,17 @@ class PerformanceManager:
             blueprint_type: The type of the blueprint
         """
         blueprint_performance = BlueprintPerformance(blueprint_id=blueprint_id, start=datetime.datetime.utcnow(), blueprint_type=blueprint_type)
-        self.performance_dict[blueprint_id] = blueprint_performance
+        with self.lock:
+            self.performance_dict[blueprint_id] = blueprint_performance
 
-    def start_operation(self, blueprint_id: str, operation_type: BlueprintPerformanceType, op_name: str) -> Optional[str]:
+    def start_operation(self, blueprint_id: str, operation_type: BlueprintPerformanceType, op_name: str, trace_parent: Optional[PerformanceTraceParent] = None) -> Optional[str]:
         """
         Log the start of a new operation on a blueprint
         Args:
             blueprint_id: The blueprint id
             operation_type: The operation type (day0, day2)
             op_name: The name of the operation
+            trace_parent: The provider call that triggered the operation, None if the operation was requested by a user
 
         Returns: The operation id
         """
@@ -130,36 +404,90 @@ class PerformanceManager:
             logger.warning("Skipping operation performance for unknown blueprint")
             return None
         op_id = str(uuid.uuid4())
-        blueprint_operation = BlueprintPerformanceOperation(id=op_id, op_name=op_name, type=operation_type, start=datetime.datetime.utcnow())
-        self.performance_dict[blueprint_id].operations.append(blueprint_operation)
-        self.operations[op_id] = blueprint_operation
-        if blueprint_id in self.pending_operations:
-            #raise Exception("Multiple operation pending")
-            logger.error("Multiple operation pending, replacing with newer one")
-        self.pending_operations[blueprint_id] = op_id
+        blueprint_operation = BlueprintPerformanceOperation(
+            id=op_id,
+            op_name=op_name,
+            type=operation_type,
+            start=datetime.datetime.utcnow(),
+            trace_id=trace_parent.trace_id if trace_parent else op_id,
+            parent=trace_parent
+        )
+        with self.lock:
+            self.performance_dict[blueprint_id].operations.append(blueprint_operation)
+            self.operations[op_id] = blueprint_operation
+            self.operations_blueprint[op_id] = blueprint_id
+            if blueprint_id in self.pending_operations:
+                #raise Exception("Multiple operation pending")
+                logger.error("Multiple operation pending, replacing with newer one")
+            self.pending_operations[blueprint_id] = op_id
         return op_id
 
     def _find_operation(self, operation_id: str) -> (BlueprintPerformanceOperation, str):
-        for blueprint_performance in self.performance_dict.values():
-            for blueprint_operation in blueprint_performance.operations:
-                if blueprint_operation.id == operation_id:
-                    return blueprint_operation, blueprint_performance.blueprint_id
+        if operation_id in self.operations:
+            return self.operations[operation_id], self.operations_blueprint[operation_id]
         return None, None
 
-    def end_operation(self, operation_id: str):
+    def end_operation(self, operation_id: str, exception: Optional[BaseException] = None):
         """
-        Log the end of an operation on a blueprint
+        Log the end of an operation on a blueprint, the operation is saved in the database and removed from memory.
         Args:
             operation_id: The operation id
+            exception: The exception raised by the operation, None if it was successful
         """
-        operation, blueprint_id = self._find_operation(operation_id)
-        if operation is None:
-            logger.warning("Skipping operation performance for unknown operation or blueprint")
-            return
-        operation.end = datetime.datetime.utcnow()
-        operation.duration = round((operation.end - operation.start).total_seconds() * 1000)
-        del self.pending_operations[blueprint_id]
-        self._persist_to_db()
+        with self.lock:
+            operation, blueprint_id = self._find_operation(operation_id)
+            if operation is None:
+                logger.warning("Skipping operation performance for unknown operation or blueprint")
+                return
+            operation.end = datetime.datetime.utcnow()
+            operation.duration = round((operation.end - operation.start).total_seconds() * 1000)
+            operation.outcome = PerformanceOutcome.OK if exception is None else PerformanceOutcome.ERROR
+            operation.error = type(exception).__name__ if exception is not None else None
+            if self.pending_operations.get(blueprint_id) == operation_id:
+                del self.pending_operations[blueprint_id]
+
+            # Evicting the completed operation from memory
+            del self.operations[operation_id]
+            del self.operations_blueprint[operation_id]
+            for provider_call in operation.provider_calls:
+                if provider_call.end is None:
+                    # A call not ended (e.g. from a thread still running) is closed with the operation, recording the
+                    # exception of the operation since the outcome of the call is unknown
+                    self._close_provider_call(provider_call, exception, aborted=True)
+                self.provider_calls.pop(provider_call.id, None)
+                self.provider_calls_operation.pop(provider_call.id, None)
+            blueprint_performance = self.performance_dict[blueprint_id]
+            self.operation_duration_histogram.observe((operation.end - operation.start).total_seconds(), blueprint_type=blueprint_performance.blueprint_type, operation_type=operation.type.value, outcome=operation.outcome.value)
+            blueprint_performance.operations = [op for op in blueprint_performance.operations if op.id != operation_id]
+
+        self._persist_operation(blueprint_id, operation)
+
+        # After the deletion no other operation can be executed on the blueprint
+        if operation.type == BlueprintPerformanceType.DELETION and exception is None:
+            with self.lock:
+                self.performance_dict.pop(blueprint_id, None)
+
+    @contextmanager
+    def operation(self, blueprint_id: str, operation_type: BlueprintPerformanceType, op_name: str, trace_parent: Optional[PerformanceTraceParent] = None):
+        """
+        Context manager logging an operation on a blueprint, the operation is always ended, also when an exception is raised.
+        Args:
+            blueprint_id: The blueprint id
+            operation_type: The operation type (day0, day2)
+            op_name: The name of the operation
+            trace_parent: The provider call that triggered the operation, None if the operation was requested by a user
+
+        Returns: The operation id
+        """
+        operation_id = self.start_operation(blueprint_id, operation_type, op_name, trace_parent)
+        try:
+            yield operation_id
+        except BaseException as e:
+            if operation_id is not None:
+                self.end_operation(operation_id, e)
+            raise
+        if operation_id is not None:
+            self.end_operation(operation_id)
 
     def start_provider_call(self, operation_id: Optional[str], method_name: str, info: Dict[str, str]) -> Optional[str]:
         """
@@ -175,21 +503,215 @@ class PerformanceManager:
             logger.warning("Skipping provider call performance for unknown operation")
             return None
         provider_call_id = str(uuid.uuid4())
-        operation = self.operations[operation_id]
         blueprint_performance_provider_call = BlueprintPerformanceProviderCall(id=provider_call_id, method_name=method_name, info=info, start=datetime.datetime.utcnow())
-        self.provider_calls[provider_call_id] = blueprint_performance_provider_call
-        operation.provider_calls.append(blueprint_performance_provider_call)
+        with self.lock:
+            operation = self.operations.get(operation_id)
+            if operation is None:
+                return None
+            self.provider_calls[provider_call_id] = blueprint_performance_provider_call
+            self.provider_calls_operation[provider_call_id] = operation_id
+            operation.provider_calls.append(blueprint_performance_provider_call)
+        self._provider_call_stack().append(provider_call_id)
         return provider_call_id
 
-    def end_provider_call(self, provider_call_id: str):
+    def end_provider_call(self, provider_call_id: str, exception: Optional[BaseException] = None):
         """
         Log the end of a provider call
         Args:
             provider_call_id: The id of the provider call
+            exception: The exception raised by the call, None if it was successful
         """
-        if provider_call_id not in self.provider_calls:
-            logger.warning("Skipping provider call performance for unknown operation")
-            return
-        provider_call = self.provider_calls[provider_call_id]
+        provider_call_stack = self._provider_call_stack()
+        if provider_call_id in provider_call_stack:
+            provider_call_stack.remove(provider_call_id)
+        with self.lock:
+            provider_call = self.provider_calls.get(provider_call_id)
+            if provider_call is None:
+                logger.warning("Skipping provider call performance for unknown operation")
+                return
+            self._close_provider_call(provider_call, exception)
+
+    def _close_provider_call(self, provider_call: BlueprintPerformanceProviderCall, exception: Optional[BaseException], aborted: bool = False):
         provider_call.end = datetime.datetime.utcnow()
         provider_call.duration = round((provider_call.end - provider_call.start).total_seconds() * 1000)
+        if aborted:
+            provider_call.outcome = PerformanceOutcome.ABORTED
+        else:
+            provider_call.outcome = PerformanceOutcome.OK if exception is None else PerformanceOutcome.ERROR
+        provider_call.error = type(exception).__name__ if exception is not None else None
+        self.provider_call_duration_histogram.observe((provider_call.end - provider_call.start).total_seconds(), method_name=provider_call.method_name, outcome=provider_call.outcome.value)
+        if exception is not None:
+            self.provider_call_errors_counter.inc(method_name=provider_call.method_name, error=provider_call.error)
+
+    @contextmanager
+    def provider_call(self, operation_id: Optional[str], method_name: str, info: Dict[str, str]):
+        """
+        Context manager logging a provider call, the call is always ended, also when an exception is raised.
+        Args:
+            operation_id: The operation in which this provider call occur
+            method_name: The name of the method called on the provider
+            info: Additional information about the call
+
+        Returns: Provider call id
+        """
+        provider_call_id = self.start_provider_call(operation_id, method_name, info)
+        try:
+            yield provider_call_id
+        except BaseException as e:
+            if provider_call_id is not None:
+                self.end_provider_call(provider_call_id, e)
+            raise
+        if provider_call_id is not None:
+            self.end_provider_call(provider_call_id)
+
+    def record_retry(self):
+        """
+        Count a retry (e.g. a new connection attempt) in the provider call in progress in the current thread.
+        """
+        provider_call_stack = self._provider_call_stack()
+        if len(provider_call_stack) == 0:
+            return
+        with self.lock:
+            provider_call = self.provider_calls.get(provider_call_stack[-1])
+            if provider_call is not None:
+                provider_call.retries += 1
+
+    def in_current_provider_call(self, function: Callable) -> Callable:
+        """
+        Wrap a function to be executed by other threads (e.g. by a ThreadPoolExecutor) such that the retries it records
+        are counted in the provider call in progress in the current thread.
+
+        Args:
+            function: The function to be wrapped
+
+        Returns:
+            The wrapped function
+        """
+        provider_call_stack = list(self._provider_call_stack())
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            self._local.provider_call_stack = list(provider_call_stack)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self._local.provider_call_stack = []
+
+        return wrapper
+
+    def _provider_call_stack(self) -> List[str]:
+        if not hasattr(self._local, "provider_call_stack"):
+            self._local.provider_call_stack = []
+        return self._local.provider_call_stack
+
+    def get_current_trace_parent(self) -> Optional[PerformanceTraceParent]:
+        """
+        Get the provider call in progress in the current thread, the operations requested to other blueprints during the
+        call (e.g. the creation of a child blueprint) are linked to it.
+
+        Returns:
+            The trace parent for the operations triggered now, None if no provider call is in progress
+        """
+        provider_call_stack = self._provider_call_stack()
+        if len(provider_call_stack) == 0:
+            return None
+        provider_call_id = provider_call_stack[-1]
+        with self.lock:
+            operation_id = self.provider_calls_operation.get(provider_call_id)
+            operation = self.operations.get(operation_id) if operation_id else None
+            if operation is None:
+                return None
+            return PerformanceTraceParent(
+                trace_id=operation.trace_id,
+                blueprint_id=self.operations_blueprint[operation_id],
+                operation_id=operation_id,
+                provider_call_id=provider_call_id
+            )
+
+    def _get_trace_operations(self, trace_id: str) -> List[Tuple[str, str, BlueprintPerformanceOperation]]:
+        """
+        Get the operations of a trace, both the completed (from the database) and the ones in progress.
+
+        Returns:
+            The operations as (blueprint_id, blueprint_type, operation)
+        """
+        trace_match = {"$or": [{"operations.trace_id": trace_id}, {"operations.id": trace_id}]}
+        pipeline = [
+            {"$match": trace_match},
+            {"$unwind": "$operations"},
+            {"$match": trace_match},
+            {"$project": {"_id": False, "blueprint_id": True, "blueprint_type": True, "operation": "$operations"}}
+        ]
+        operations = {}
+        for element in self.performance_collection.aggregate(pipeline):
+            operation = BlueprintPerformanceOperation.model_validate(element["operation"])
+            operations[operation.id] = (element["blueprint_id"], element["blueprint_type"], operation)
+
+        with self.lock:
+            for operation_id, operation in self.operations.items():
+                if operation.trace_id == trace_id:
+                    blueprint_id = self.operations_blueprint[operation_id]
+                    operations[operation_id] = (blueprint_id, self.performance_dict[blueprint_id].blueprint_type, operation.model_copy(deep=True))
+        return list(operations.values())
+
+    def get_trace(self, operation_id: str) -> PerformanceTrace:
+        """
+        Get the span tree of the trace containing an operation, e.g. the creation of a 5G core with the creation of the
+        child blueprints (router, UPF...) and all the provider calls, with the critical path.
+        Args:
+            operation_id: The id of any operation in the trace
+
+        Returns:
+            The trace
+        """
+        with self.lock:
+            operation = self.operations.get(operation_id)
+            trace_id = operation.trace_id if operation else None
+        if trace_id is None:
+            element = self.performance_collection.find_one({"operations.id": operation_id}, {"_id": False, "operations.$": True})
+            if element is None:
+                raise ValueError(f"No performance metrics found for operation '{operation_id}'")
+            # Operations saved before the introduction of traces have no trace id
+            trace_id = element["operations"][0].get("trace_id") or operation_id
+        return build_trace(trace_id, self._get_trace_operations(trace_id))
+
+    def get_day0_operation_id(self, blueprint_id: str) -> str:
+        """
+        Get the id of the (last) DAY0 operation of a blueprint, the root of the trace of its deployment.
+        Args:
+            blueprint_id: The blueprint id
+
+        Returns:
+            The operation id
+        """
+        with self.lock:
+            operation_id = self.pending_operations.get(blueprint_id)
+            if operation_id and self.operations[operation_id].type == BlueprintPerformanceType.DAY0:
+                return operation_id
+        pipeline = [
+            {"$match": {"blueprint_id": blueprint_id}},
+            {"$unwind": "$operations"},
+            {"$match": {"operations.type": BlueprintPerformanceType.DAY0.value}},
+            {"$sort": {"operations.start": -1}},
+            {"$limit": 1},
+            {"$project": {"_id": False, "id": "$operations.id"}}
+        ]
+        for element in self.performance_collection.aggregate(pipeline):
+            return element["id"]
+        raise ValueError(f"No DAY0 operation found for blueprint '{blueprint_id}'")
+
+    def export_trace_otel(self, operation_id: str, file_path: Optional[str] = None) -> dict:
+        """
+        Export the trace containing an operation in the OpenTelemetry (OTLP/JSON) format.
+        Args:
+            operation_id: The id of any operation in the trace
+            file_path: If present, the path of the file where the trace is written
+
+        Returns:
+            The OTLP/JSON document
+        """
+        otel_trace = trace_to_otel(self.get_trace(operation_id))
+        if file_path:
+            with open(file_path, "w") as trace_file:
+                json.dump(otel_trace, trace_file)
+        return otel_trace
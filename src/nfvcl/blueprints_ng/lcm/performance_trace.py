@@ -0,0 +1,158 @@
+import datetime
+import uuid
+from typing import List, Tuple, Dict, Optional
+
+from nfvcl.models.performance import BlueprintPerformanceOperation, PerformanceSpan, PerformanceSpanKind, PerformanceTrace, \
+    PerformanceOutcome
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def _span_end(span: PerformanceSpan, now: datetime.datetime) -> datetime.datetime:
+    # Spans still running are considered ending now
+    return span.end if span.end is not None else now
+
+
+def build_trace(trace_id: str, operations: List[Tuple[str, str, BlueprintPerformanceOperation]], now: Optional[datetime.datetime] = None) -> PerformanceTrace:
+    """
+    Build the span tree of a trace and mark its critical path.
+    The critical path starts from the root and, at every level, follows the child ending last (the one the parent
+    had to wait for).
+
+    Args:
+        trace_id: The id of the trace (the id of its first operation)
+        operations: The operations of the trace as (blueprint_id, blueprint_type, operation)
+        now: The time used as end of the spans still running, utcnow if None
+
+    Returns:
+        The trace
+    """
+    now = now if now is not None else datetime.datetime.utcnow()
+    spans: Dict[str, PerformanceSpan] = {}
+    operation_spans: List[PerformanceSpan] = []
+
+    for blueprint_id, blueprint_type, operation in operations:
+        operation_span = PerformanceSpan(
+            id=operation.id,
+            parent_id=operation.parent.provider_call_id if operation.parent else None,
+            kind=PerformanceSpanKind.OPERATION,
+            name=f"{blueprint_type}.{operation.op_name}",
+            blueprint_id=blueprint_id,
+            blueprint_type=blueprint_type,
+            start=operation.start,
+            end=operation.end,
+            duration=operation.duration,
+            info={"type": operation.type.value},
+            outcome=operation.outcome,
+            error=operation.error
+        )
+        spans[operation_span.id] = operation_span
+        operation_spans.append(operation_span)
+        for provider_call in operation.provider_calls:
+            provider_call_span = PerformanceSpan(
+                id=provider_call.id,
+                parent_id=operation.id,
+                kind=PerformanceSpanKind.PROVIDER_CALL,
+                name=provider_call.method_name,
+                blueprint_id=blueprint_id,
+                blueprint_type=blueprint_type,
+                start=provider_call.start,
+                end=provider_call.end,
+                duration=provider_call.duration,
+                info={**provider_call.info, "retries": str(provider_call.retries)},
+                outcome=provider_call.outcome,
+                error=provider_call.error
+            )
+            spans[provider_call_span.id] = provider_call_span
+            operation_span.children.append(provider_call_span)
+
+    roots: List[PerformanceSpan] = []
+    for operation_span in operation_spans:
+        if operation_span.parent_id in spans:
+            spans[operation_span.parent_id].children.append(operation_span)
+        else:
+            # The first operation of the trace, or an operation whose parent is no longer available
+            roots.append(operation_span)
+
+    for span in spans.values():
+        span.children.sort(key=lambda child: child.start)
+    roots.sort(key=lambda root: (root.id != trace_id, root.start))
+
+    critical_path: List[str] = []
+    span = roots[0] if len(roots) > 0 else None
+    while span is not None:
+        span.critical = True
+        critical_path.append(span.id)
+        span = max(span.children, key=lambda child: _span_end(child, now), default=None)
+
+    return PerformanceTrace(trace_id=trace_id, spans=roots, critical_path=critical_path)
+
+
+def _unix_nano(date: datetime.datetime) -> str:
+    # The performance dates are naive UTC dates
+    delta = date.replace(tzinfo=None) - _EPOCH
+    return str((delta.days * 86400 + delta.seconds) * 10 ** 9 + delta.microseconds * 1000)
+
+
+def _otel_id(span_id: str, length: int) -> str:
+    try:
+        return uuid.UUID(span_id).hex[:length]
+    except ValueError:
+        return uuid.uuid5(uuid.NAMESPACE_OID, span_id).hex[:length]
+
+
+def _otel_attributes(attributes: Dict[str, str]) -> List[dict]:
+    return [{"key": key, "value": {"stringValue": str(value)}} for key, value in attributes.items()]
+
+
+def trace_to_otel(trace: PerformanceTrace) -> dict:
+    """
+    Convert a trace to the OpenTelemetry (OTLP/JSON) format, it can be imported in tools like Jaeger.
+
+    Args:
+        trace: The trace to be converted
+
+    Returns:
+        The OTLP/JSON document
+    """
+    trace_id = _otel_id(trace.trace_id, 32)
+    otel_spans = []
+    to_visit = list(trace.spans)
+    while len(to_visit) > 0:
+        span = to_visit.pop()
+        to_visit.extend(span.children)
+        attributes = {
+            "nfvcl.kind": span.kind.value,
+            "nfvcl.blueprint_id": span.blueprint_id,
+            "nfvcl.blueprint_type": span.blueprint_type,
+            "nfvcl.critical": str(span.critical).lower(),
+            **span.info
+        }
+        otel_span = {
+            "traceId": trace_id,
+            "spanId": _otel_id(span.id, 16),
+            "name": span.name,
+            # INTERNAL for operations, CLIENT for the calls to the providers
+            "kind": 1 if span.kind == PerformanceSpanKind.OPERATION else 3,
+            "startTimeUnixNano": _unix_nano(span.start),
+            "endTimeUnixNano": _unix_nano(span.end if span.end is not None else span.start),
+            "attributes": _otel_attributes(attributes)
+        }
+        if span.error is not None:
+            otel_span["attributes"].extend(_otel_attributes({"exception.type": span.error}))
+        if span.outcome is not None:
+            # STATUS_CODE_OK = 1, STATUS_CODE_ERROR = 2
+            otel_span["status"] = {"code": 1 if span.outcome == PerformanceOutcome.OK else 2}
+        if span.parent_id is not None:
+            otel_span["parentSpanId"] = _otel_id(span.parent_id, 16)
+        otel_spans.append(otel_span)
+
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": _otel_attributes({"service.name": "nfvcl"})},
+            "scopeSpans": [{
+                "scope": {"name": "nfvcl.performance"},
+                "spans": otel_spans
+            }]
+        }]
+    }
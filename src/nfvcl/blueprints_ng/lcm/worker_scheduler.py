@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, TYPE_CHECKING
+
+from nfvcl.utils.log import create_logger
+
+if TYPE_CHECKING:
+    from nfvcl.blueprints_ng.lcm.blueprint_worker import BlueprintWorker
+
+# Maximum number of threads processing worker messages at the same time (threads waiting for another blueprint are not counted)
+WORKER_SCHEDULER_MAX_THREADS = 16
+# Seconds after which a thread with nothing to process is terminated
+WORKER_SCHEDULER_THREAD_IDLE_TIMEOUT = 60
+
+logger = create_logger("BlueprintWorkerScheduler")
+
+__worker_scheduler: BlueprintWorkerScheduler | None = None
+
+
+def get_worker_scheduler() -> BlueprintWorkerScheduler:
+    """
+    Allow to retrieve the BlueprintWorkerScheduler (that can have only one instance)
+    Returns:
+        The worker scheduler
+    """
+    global __worker_scheduler
+    if __worker_scheduler is not None:
+        return __worker_scheduler
+    else:
+        __worker_scheduler = BlueprintWorkerScheduler()
+        return __worker_scheduler
+
+
+class BlueprintWorkerScheduler:
+    """
+    Run the messages of every blueprint worker on a bounded set of threads.
+    A worker with pending messages is in the ready queue at most once and is taken by one thread at a time, this keeps
+    the messages of a blueprint in FIFO order while different blueprints are processed in parallel.
+
+    A thread waiting for the operation of another blueprint (e.g. a parent waiting for a child creation) is not
+    counted in the bound, otherwise parents waiting for their children could use all the threads.
+    """
+
+    def __init__(self, max_threads: int = WORKER_SCHEDULER_MAX_THREADS, thread_idle_timeout: float = WORKER_SCHEDULER_THREAD_IDLE_TIMEOUT):
+        self.max_threads = max_threads
+        self.thread_idle_timeout = thread_idle_timeout
+        self._condition = threading.Condition()
+        self._ready: Deque[BlueprintWorker] = deque()
+        self._threads = 0
+        self._idle_threads = 0
+        self._blocked_threads = 0
+        self._thread_counter = 0
+        self._local = threading.local()
+
+    @property
+    def thread_count(self) -> int:
+        """
+        The number of threads currently alive
+        """
+        return self._threads
+
+    def schedule(self, worker: BlueprintWorker) -> None:
+        """
+        Insert the worker in the ready queue if it is not already scheduled or running. Called after a message is put in the worker queue.
+        THREAD SAFE.
+
+        Args:
+            worker: The worker having pending messages
+        """
+        with self._condition:
+            if worker.scheduled:
+                # The thread processing the worker will find the new message
+                return
+            worker.scheduled = True
+            self._ready.append(worker)
+            self._start_thread_if_needed()
+            self._condition.notify()
+
+    def release(self, worker: BlueprintWorker) -> None:
+        """
+        Called after a worker message has been processed, the worker is scheduled again if other messages are pending.
+
+        Args:
+            worker: The worker that processed a message
+        """
+        with self._condition:
+            if worker.stopped or worker.message_queue.empty():
+                worker.scheduled = False
+            else:
+                # Back to the end of the queue, such that other blueprints are not starved
+                self._ready.append(worker)
+                self._start_thread_if_needed()
+                self._condition.notify()
+
+    @contextmanager
+    def blocking(self):
+        """
+        Context manager to be used while a scheduler thread waits for the operation of another worker, the bound on
+        the number of threads does not consider the waiting thread.
+        """
+        if not getattr(self._local, "scheduler_thread", False):
+            yield
+            return
+        with self._condition:
+            self._blocked_threads += 1
+            if len(self._ready) > 0:
+                self._start_thread_if_needed()
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._blocked_threads -= 1
+
+    def _start_thread_if_needed(self) -> None:
+        # Must be called holding the lock. Every idle thread (including the ones just started) takes one ready worker,
+        # new threads are started until every ready worker has a thread or the bound is reached.
+        while len(self._ready) > self._idle_threads and (self._threads - self._blocked_threads) < self.max_threads:
+            self._threads += 1
+            # The new thread is idle from now, otherwise the next iteration would start another thread for the same worker
+            self._idle_threads += 1
+            self._thread_counter += 1
+            threading.Thread(target=self._run, name=f"blue_worker_{self._thread_counter}", daemon=True).start()
+
+    def _run(self) -> None:
+        self._local.scheduler_thread = True
+        # The thread has been counted as idle when started
+        idle = True
+        while True:
+            with self._condition:
+                if not idle:
+                    self._idle_threads += 1
+                while len(self._ready) == 0:
+                    if not self._condition.wait(timeout=self.thread_idle_timeout) and len(self._ready) == 0:
+                        self._idle_threads -= 1
+                        self._threads -= 1
+                        return
+                self._idle_threads -= 1
+                idle = False
+                worker = self._ready.popleft()
+
+            try:
+                worker.process_next_message()
+            except Exception as e:
+                logger.error(f"Unhandled error processing a message of blueprint {worker.blueprint.id}", exc_info=e)
+            finally:
+                self.release(worker)
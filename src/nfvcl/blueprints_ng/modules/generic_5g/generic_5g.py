@@ -1,18 +1,21 @@
 import copy
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Generic, TypeVar, Optional, List, final, Dict, Set
 
 from pydantic import Field
 
 from nfvcl.blueprints_ng.blueprint_ng import BlueprintNG, BlueprintNGState, BlueprintNGException
 from nfvcl.blueprints_ng.lcm.blueprint_type_manager import day2_function
+from nfvcl.blueprints_ng.lcm.worker_scheduler import get_worker_scheduler
 from nfvcl.blueprints_ng.modules.generic_5g.generic_5g_upf import DeployedUPFInfo
+from nfvcl.blueprints_ng.providers.blueprint.blueprint_provider import BlueprintOperationHandle
 from nfvcl.blueprints_ng.modules.router_5g.router_5g import Router5GCreateModel, Router5GCreateModelNetworks, \
     Router5GAddRouteModel
 from nfvcl.blueprints_ng.pdu_configurators.types.gnb_pdu_configurator import GNBPDUConfigurator
 from nfvcl.models.base_model import NFVCLBaseModel
 from nfvcl.models.blueprint_ng.core5g.common import Create5gModel, SubSubscribers, SubSliceProfiles, SubSlices, \
-    SstConvertion, Router5GNetworkInfo, SubDataNets
+    SstConvertion, Router5GNetworkInfo, SubDataNets, SubArea
 from nfvcl.models.blueprint_ng.g5.core import Core5GAddSubscriberModel, Core5GDelSubscriberModel, Core5GAddSliceModel, \
     Core5GDelSliceModel, Core5GAddTacModel, Core5GDelTacModel, Core5GAddDnnModel, Core5GDelDnnModel
 from nfvcl.models.blueprint_ng.g5.upf import UPFBlueCreateModel, BlueCreateModelNetworks, SliceModel
@@ -60,6 +63,8 @@ CreateConfigTypeVar5G = TypeVar("CreateConfigTypeVar5G")
 ROUTER_BLUEPRINT_TYPE = "router_5g"
 ROUTER_GET_INFO_FUNCTION = "get_router_info"
 ROUTER_ADD_ROUTES = "add_routes"
+# Maximum number of edge areas deployed at the same time
+EDGE_AREAS_ROLLOUT_MAX_WORKERS = 8
 
 
 class Generic5GBlueprintNG(BlueprintNG[Generic5GBlueprintNGState, Create5gModel], Generic[StateTypeVar5G, CreateConfigTypeVar5G]):
@@ -136,46 +141,54 @@ class Generic5GBlueprintNG(BlueprintNG[Generic5GBlueprintNGState, Create5gModel]
     ####                  START EDGE SECTION                    ####
     ################################################################
 
-    def update_edge_areas(self):
+    def update_edge_areas(self, max_workers: int = EDGE_AREAS_ROLLOUT_MAX_WORKERS):
         """
         Deploy new edge areas
         Delete edge areas not needed anymore
         If necessary send update to changed edge areas
-        """
 
+        The areas are deployed (or updated) concurrently, inside every area the router is deployed before the UPF.
+        When every area is ready the routes for the DNNs are added, with a single call for every router.
+
+        Args:
+            max_workers: The maximum number of areas deployed at the same time
+        """
+        new_area_ids: Set[int] = set()
         for area in self.state.current_config.areas:
             if str(area.id) not in self.state.edge_areas:
-                # Deploy everything that this edge area need
-
+                # Created here such that the threads deploying the areas only edit the info of their own area
                 self.state.edge_areas[str(area.id)] = EdgeAreaInfo(area=area.id)
-
-                # Router deployment for this area
-                router_info: Router5GInfo
-                if not area.networks.external_router:
-                    router_info = self.deploy_router_blueprint(area.id)
-                else:
-                    router_info = Router5GInfo(external=True, network=area.networks.external_router)
-                self.state.edge_areas[str(area.id)].router = router_info
-
-                # UPF deployment for this area
-                upf_info = self.deploy_upf_blueprint(area.id, area.upf.type)
-                self.state.edge_areas[str(area.id)].upf = upf_info
-            else:
-                # The edge area is already deployed but MAY need to be updated with a new configuration
-                edge_info = self.state.edge_areas[str(area.id)]
-
-                # Updating UPF configuration (move to a new method in the future?)
-                updated_config = self._create_upf_config(area.id)
-                if edge_info.upf.current_config != updated_config:
-                    self.logger.info(f"Updating UPF for area {area.id}")
-                    self.provider.call_blueprint_function(edge_info.upf.blue_id, "update", updated_config)
-                    self.state.edge_areas[str(area.id)].upf = self.get_upfs_info(area.id, edge_info.upf.blue_id, updated_config)
-
-            # The router need to route the traffic for the DNN ip pool through the UPF N6 interface
+                new_area_ids.add(area.id)
+
+        errors: Dict[int, Exception] = {}
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{self.id}_area") as executor:
+            futures = {executor.submit(self._update_edge_area, area, area.id in new_area_ids): area for area in self.state.current_config.areas}
+            # The thread waiting for the children blueprints must not be counted by the worker scheduler
+            with get_worker_scheduler().blocking():
+                for future in as_completed(futures):
+                    area = futures[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        self.logger.error(f"Error deploying edge area {area.id}: {str(e)}")
+                        errors[area.id] = e
+
+        if len(errors) > 0:
+            raise BlueprintNGException(f"Unable to deploy edge areas {sorted(errors.keys())}") from next(iter(errors.values()))
+
+        # The router need to route the traffic for the DNN ip pool through the UPF N6 interface
+        route_handles: List[BlueprintOperationHandle] = []
+        for area in self.state.current_config.areas:
+            routes: List[Route] = []
             for deployed_upf in self.state.edge_areas[str(area.id)].upf.upf_list:
                 for slice in deployed_upf.served_slices:
                     for dnn in slice.dnn_list:
-                        self.add_route_to_router(area.id, dnn.cidr, deployed_upf.network_info.n6_ip.exploded)
+                        routes.append(Route(network_cidr=dnn.cidr, next_hop=deployed_upf.network_info.n6_ip.exploded))
+            handle = self.add_routes_to_router(area.id, routes, wait=False)
+            if handle is not None:
+                route_handles.append(handle)
+        # The routers are configured at the same time
+        self.provider.wait_all(route_handles)
 
         # Deleting edge areas that are not in the current configuration (deleted by del_tac day2)
         currently_existing_areas: Set[str] = set(map(lambda x: str(x.id), self.state.current_config.areas))
@@ -195,6 +208,37 @@ class Generic5GBlueprintNG(BlueprintNG[Generic5GBlueprintNGState, Create5gModel]
             # Delete edge area from state
             del self.state.edge_areas[edge_area_id]
 
+    def _update_edge_area(self, area: SubArea, new_area: bool):
+        """
+        Deploy (router and UPF) or update a single edge area, called concurrently for different areas
+        Args:
+            area: The area configuration
+            new_area: If the area has to be deployed
+        """
+        edge_info = self.state.edge_areas[str(area.id)]
+        if new_area:
+            # Deploy everything that this edge area need
+
+            # Router deployment for this area
+            router_info: Router5GInfo
+            if not area.networks.external_router:
+                router_info = self.deploy_router_blueprint(area.id)
+            else:
+                router_info = Router5GInfo(external=True, network=area.networks.external_router)
+            edge_info.router = router_info
+
+            # UPF deployment for this area, the router must be deployed first
+            edge_info.upf = self.deploy_upf_blueprint(area.id, area.upf.type)
+        else:
+            # The edge area is already deployed but MAY need to be updated with a new configuration
+
+            # Updating UPF configuration (move to a new method in the future?)
+            updated_config = self._create_upf_config(area.id)
+            if edge_info.upf.current_config != updated_config:
+                self.logger.info(f"Updating UPF for area {area.id}")
+                self.provider.call_blueprint_function(edge_info.upf.blue_id, "update", updated_config)
+                edge_info.upf = self.get_upfs_info(area.id, edge_info.upf.blue_id, updated_config)
+
     def deploy_router_blueprint(self, area_id: int) -> Router5GInfo:
         """
         Deploy a router in the given area
@@ -246,16 +290,34 @@ class Generic5GBlueprintNG(BlueprintNG[Generic5GBlueprintNGState, Create5gModel]
             cidr: The network cidr of the network to route
             nexthop: The nexthop of the route
         """
+        self.add_routes_to_router(area_id, [Route(network_cidr=cidr, next_hop=nexthop)])
+
+    def add_routes_to_router(self, area_id: int, routes: List[Route], wait: bool = True) -> Optional[BlueprintOperationHandle]:
+        """
+        Add multiple routes to the router in the specified area, with a single call to the router blueprint
+        Args:
+            area_id: The area of the router where the routes will be added
+            routes: The routes to be added
+            wait: Wait for the router to be configured
+
+        Returns:
+            If wait is False, the handle of the call to the router blueprint (None if no call is needed)
+        """
+        if len(routes) == 0:
+            return None
         router_info = self.state.edge_areas[str(area_id)].router
         if router_info.external:
             # TODO in the future the external router may be configured by NFVCL calling metalcl/netcl
-            self.logger.warning(f"The router for area {area_id} is external, manually add the following route:")
-            self.logger.warning(f"ip r add {cidr} via {nexthop}")
+            self.logger.warning(f"The router for area {area_id} is external, manually add the following routes:")
+            for route in routes:
+                self.logger.warning(f"ip r add {route.network_cidr} via {route.next_hop}")
         else:
-            self.logger.info(f"Adding route '{cidr}' via '{nexthop}' to router {router_info.blue_id}")
-            self.provider.call_blueprint_function(router_info.blue_id, ROUTER_ADD_ROUTES, Router5GAddRouteModel(additional_routes=[
-                Route(network_cidr=cidr, next_hop=nexthop)
-            ]))
+            self.logger.info(f"Adding routes {[f'{route.network_cidr} via {route.next_hop}' for route in routes]} to router {router_info.blue_id}")
+            route_model = Router5GAddRouteModel(additional_routes=routes)
+            if not wait:
+                return self.provider.call_blueprint_function_async(router_info.blue_id, ROUTER_ADD_ROUTES, route_model)
+            self.provider.call_blueprint_function(router_info.blue_id, ROUTER_ADD_ROUTES, route_model)
+        return None
 
     def _create_upf_config(self, area_id: int) -> UPFBlueCreateModel:
         """
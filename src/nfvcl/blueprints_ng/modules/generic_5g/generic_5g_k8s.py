@@ -76,7 +76,8 @@ class Generic5GK8sBlueprintNG(Generic5GBlueprintNG[Generic5GK8sBlueprintNGState,
         """
         self.logger.info(f"Scaling {nf_scaling.nf} to {nf_scaling.replica_count} replicas")
 
-        k8s_config = get_k8s_config_from_file_content(self.provider.get_k8s_provider(list(filter(lambda x: x.core == True, self.state.current_config.areas))[0].id).k8s_cluster.credentials)
+        k8s_cluster = self.provider.get_k8s_provider(list(filter(lambda x: x.core == True, self.state.current_config.areas))[0].id).k8s_cluster
+        k8s_config = get_k8s_config_from_file_content(k8s_cluster.credentials, k8s_cluster.name)
         k8s_scale_k8s_deployment(
             k8s_config,
             namespace=self.state.core_helm_chart.namespace.lower(),
@@ -155,15 +155,18 @@ class K8sBlueprint(BlueprintNG[K8sBlueprintNGState, K8sCreateModel]):
         self.state.password = create_model.password
         self.state.cadvisor_node_port = create_model.cadvisor_node_port
 
+        vms_to_create: List[VmResource] = []
         area: K8sAreaDeployment
         for area in create_model.areas:  # In each area we deploy workers and in the core area also the master (there is always a core area containing the master)
             if area.is_master_area:
                 self.state.master_area = area
                 self.state.require_port_security_disabled = create_model.require_port_security_disabled
-                self.deploy_master_node(area, create_model.master_flavors)
+                vms_to_create.append(self.define_master_node(area, create_model.master_flavors))
             if len(area.load_balancer_pools_ips) > 0:
                 self.state.load_balancer_ips_area[str(area.area_id)] = area.load_balancer_pools_ips
-            self.deploy_area(area)
+            vms_to_create.extend(self.define_area(area))
+        # Master and workers are registered, creating all the VMs of the cluster at the same time
+        self.provider.create_vms(vms_to_create)
 
         # Start initial configuration, first it get network list ready. Set self.state.reserved_pools
         self.setup_load_balancer_pool()
@@ -190,6 +193,18 @@ class K8sBlueprint(BlueprintNG[K8sBlueprintNGState, K8sCreateModel]):
             self.state.topology_onboarded = create_model.topology_onboard
 
     def deploy_master_node(self, area: K8sAreaDeployment, master_flavors: VmResourceFlavor):
+        """
+        Define, register and create the master node.
+        """
+        self.provider.create_vm(self.define_master_node(area, master_flavors))
+
+    def define_master_node(self, area: K8sAreaDeployment, master_flavors: VmResourceFlavor) -> VmResource:
+        """
+        Define and register the master node and its configurators, the VM is NOT created.
+
+        Returns:
+            The master VM to be created
+        """
         # Defining Master node. Should be executed only once.
         self.state.vm_master = VmResource(
             area=area.area_id,
@@ -204,15 +219,27 @@ class K8sBlueprint(BlueprintNG[K8sBlueprintNGState, K8sCreateModel]):
         )
         # Registering master node
         self.register_resource(self.state.vm_master)
-        # Creating the VM
-        self.provider.create_vm(self.state.vm_master)
         # Creating the configurator for the master
         self.state.day_0_master_configurator = VmK8sDay0Configurator(vm_resource=self.state.vm_master, vm_number=0)
         self.state.day_2_master_configurator = VmK8sDay2Configurator(vm_resource=self.state.vm_master)
         self.register_resource(self.state.day_0_master_configurator)
         self.register_resource(self.state.day_2_master_configurator)
+        return self.state.vm_master
 
     def deploy_area(self, area: K8sAreaDeployment):
+        """
+        Define, register and create (concurrently) the workers of the area.
+        """
+        self.provider.create_vms(self.define_area(area))
+
+    def define_area(self, area: K8sAreaDeployment) -> List[VmResource]:
+        """
+        Define and register the workers of the area and their configurators, the VMs are NOT created.
+
+        Returns:
+            The worker VMs to be created
+        """
+        area_vms: List[VmResource] = []
         for worker_replica_num in range(0, area.worker_replicas):
             # Workers of area X
             worker_number = self.state.reserve_worker_number()
@@ -228,10 +255,9 @@ class K8sBlueprint(BlueprintNG[K8sBlueprintNGState, K8sCreateModel]):
                 require_port_security_disabled=self.state.require_port_security_disabled
             )
             self.state.vm_workers.append(vm)
-            # Registering master node
+            # Registering worker node
             self.register_resource(vm)
-            # Creating the VM
-            self.provider.create_vm(vm)
+            area_vms.append(vm)
 
             configurator = VmK8sDay0Configurator(vm_resource=vm, vm_number=worker_number)
             self.state.day_0_workers_configurators.append(configurator)
@@ -247,6 +273,8 @@ class K8sBlueprint(BlueprintNG[K8sBlueprintNGState, K8sCreateModel]):
         if area not in self.state.area_list:
             self.state.area_list.append(area)
 
+        return area_vms
+
     def setup_load_balancer_pool(self):
         """
         Creates the load balancer pool to be used by MetalLB.
@@ -292,7 +320,9 @@ class K8sBlueprint(BlueprintNG[K8sBlueprintNGState, K8sCreateModel]):
         # Configuring ONLY worker nodes that have not yet been configured and then removing from the list
         for configurator in self.state.day_0_workers_configurators_tobe_exec:
             configurator.configure_worker(self.state.master_key_add_worker, self.state.master_credentials)
-            self.provider.configure_vm(configurator)
+        # Workers are configured together, in parallel
+        if len(self.state.day_0_workers_configurators_tobe_exec) > 0:
+            self.provider.configure_vms(self.state.day_0_workers_configurators_tobe_exec)
 
         self.state.day_0_workers_configurators_tobe_exec = []
 
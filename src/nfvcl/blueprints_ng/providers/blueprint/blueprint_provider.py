@@ -1,9 +1,11 @@
-from typing import Any, List
+import threading
+import time
+from typing import Any, List, Optional
 
 from pydantic import Field
 
 from nfvcl.blueprints_ng.providers.blueprint_ng_provider_interface import BlueprintNGProviderData, BlueprintNGProviderInterface
-from nfvcl.models.blueprint_ng.worker_message import BlueprintOperationCallbackModel
+from nfvcl.models.blueprint_ng.worker_message import BlueprintOperationCallbackModel, WorkerMessageType
 
 
 class BlueprintProviderData(BlueprintNGProviderData):
@@ -13,6 +15,46 @@ class BlueprintProviderData(BlueprintNGProviderData):
 class BlueprintProviderException(Exception):
     pass
 
+
+class BlueprintOperationHandle:
+    """
+    Handle of an operation requested to another blueprint without waiting for it, completed by the callback of the
+    worker processing the operation.
+    """
+
+    def __init__(self, blue_id: Optional[str], description: str):
+        self.blue_id = blue_id
+        self.description = description
+        self._event = threading.Event()
+        self._result: Optional[BlueprintOperationCallbackModel] = None
+
+    def _complete(self, result: BlueprintOperationCallbackModel):
+        self._result = result
+        self._event.set()
+
+    def done(self) -> bool:
+        """
+        Returns:
+            True if the operation is completed (successfully or not)
+        """
+        return self._event.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> BlueprintOperationCallbackModel:
+        """
+        Wait for the operation to be completed.
+        Args:
+            timeout: Maximum seconds to wait, None to wait forever
+
+        Returns:
+            The result of the operation, status is "ERROR" if the operation failed
+
+        Raises:
+            TimeoutError if the operation is not completed before the timeout
+        """
+        if not self._event.wait(timeout):
+            raise TimeoutError(f"Timeout waiting for {self.description}")
+        return self._result
+
 class BlueprintProvider(BlueprintNGProviderInterface):
     data: BlueprintProviderData
 
@@ -24,7 +66,8 @@ class BlueprintProvider(BlueprintNGProviderInterface):
     def create_blueprint(self, msg: Any, path: str):
         blue_id = self.blueprint_manager.create_blueprint(msg, path, wait=True, parent_id=self.blueprint_id)
         self.data.deployed_blueprints.append(blue_id)
-        self.save_to_db()
+        # The child blueprint exists now, it needs to be saved to be deleted in case of crash
+        self.flush_to_db()
         return blue_id
 
     def delete_blueprint(self, blueprint_id: str):
@@ -33,6 +76,80 @@ class BlueprintProvider(BlueprintNGProviderInterface):
         self.save_to_db()
         return blueprint_id
 
+    def create_blueprint_async(self, msg: Any, path: str) -> BlueprintOperationHandle:
+        """
+        Create a child blueprint without waiting for the creation to be completed
+        Args:
+            msg: The creation message
+            path: The blueprint type
+
+        Returns:
+            The handle of the creation, the id of the new blueprint is in the handle
+        """
+        handle = BlueprintOperationHandle(None, f"creation of {path} blueprint")
+        handle.blue_id = self.blueprint_manager.create_blueprint(msg, path, wait=False, parent_id=self.blueprint_id, callback=handle._complete)
+        handle.description = f"creation of {path} blueprint {handle.blue_id}"
+        self.data.deployed_blueprints.append(handle.blue_id)
+        # The child blueprint exists now, it needs to be saved to be deleted in case of crash
+        self.flush_to_db()
+        return handle
+
+    def call_blueprint_function_async(self, blue_id: str, function_name: str, *args, **kwargs) -> BlueprintOperationHandle:
+        """
+        Call a function on another blueprint without waiting for the result
+        Args:
+            blue_id: Id of the blueprint to call on the function on
+            function_name: Name of the function to call
+            *args: args
+            **kwargs: kwargs
+
+        Returns:
+            The handle of the call, the result of the function is the result of the handle
+        """
+        self.logger.debug(f"Calling (async) external function '{function_name}' on blueprint '{blue_id}', args={args}, kwargs={kwargs}")
+        handle = BlueprintOperationHandle(blue_id, f"function '{function_name}' on blueprint {blue_id}")
+        self.blueprint_manager.get_worker(blue_id).put_message(WorkerMessageType.DAY2_BY_NAME, function_name, (args, kwargs), callback=handle._complete)
+        return handle
+
+    def wait_all(self, handles: List[BlueprintOperationHandle], timeout: Optional[float] = None) -> List[BlueprintOperationCallbackModel]:
+        """
+        Wait for the completion of multiple operations on other blueprints
+        Args:
+            handles: The handles of the operations
+            timeout: Maximum seconds to wait for all the operations, None to wait forever
+
+        Returns:
+            The results of the operations, in the same order of the handles
+
+        Raises:
+            BlueprintProviderException if at least one operation failed or has not been completed before the timeout,
+            the exception is raised after every operation has been completed (or the timeout expired)
+        """
+        # Imported here to avoid a circular import (worker_scheduler -> blueprint_worker -> blueprint_ng -> providers)
+        from nfvcl.blueprints_ng.lcm.worker_scheduler import get_worker_scheduler
+
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        results: List[Optional[BlueprintOperationCallbackModel]] = []
+        errors: List[str] = []
+        # The thread waiting for other blueprints must not be counted by the worker scheduler
+        with get_worker_scheduler().blocking():
+            for handle in handles:
+                try:
+                    result = handle.wait(max(0.0, deadline - time.monotonic()) if deadline is not None else None)
+                except TimeoutError as e:
+                    errors.append(str(e))
+                    results.append(None)
+                    continue
+                if result.status != "OK":
+                    errors.append(f"Error in {handle.description}: {result.detailed_status}")
+                results.append(result)
+
+        if len(errors) > 0:
+            for error in errors:
+                self.logger.error(error)
+            raise BlueprintProviderException(f"{len(errors)} of {len(handles)} blueprint operations failed: {errors}")
+        return results
+
     def call_blueprint_function(self, blue_id: str, function_name: str, *args, **kwargs) -> BlueprintOperationCallbackModel:
         """
         Call a function on another blueprint
@@ -20,11 +20,19 @@ class BlueprintNGProviderInterface(abc.ABC):
     area: int
     data: BlueprintNGProviderData
 
-    def __init__(self, area: int, blueprint_id: str, persistence_function: Optional[Callable] = None):
+    def __init__(self, area: int, blueprint_id: str, persistence_function: Optional[Callable] = None, persistence_flush_function: Optional[Callable] = None):
+        """
+        Args:
+            area: The area of the provider
+            blueprint_id: The ID of the blueprint using the provider
+            persistence_function: Function called to signal that the blueprint needs to be saved, the write may be deferred
+            persistence_flush_function: Function called to immediately save the blueprint, defaults to persistence_function
+        """
         super().__init__()
         self.area = area
         self.blueprint_id = blueprint_id
         self.save_to_db = persistence_function
+        self.flush_to_db = persistence_flush_function if persistence_flush_function else persistence_function
         self.logger = create_logger(self.__class__.__name__, blueprintid=self.blueprint_id)
         self.topology = build_topology()
         self.logger.debug(f"Creating {self.__class__.__name__} for area {self.area}")
@@ -1,20 +1,57 @@
 import tempfile
-from typing import Optional
+from typing import Optional, List, Dict
 
 import ansible_runner
 from ansible_runner import Runner
+from pydantic import Field
 
 from nfvcl.blueprints_ng.providers.utils import create_ansible_inventory
+from nfvcl.models.base_model import NFVCLBaseModel
 from nfvcl.utils.log import create_logger
 
+# Default number of hosts configured in parallel by a single ansible run
+ANSIBLE_DEFAULT_FORKS = 10
+
+
+class AnsibleTargetHost(NFVCLBaseModel):
+    """
+    A host to be inserted in the inventory of a multi-host ansible run
+    """
+    host: str = Field()
+    username: str = Field()
+    password: str = Field()
+    become_password: Optional[str] = Field(default=None)
+
 
 def run_ansible_playbook(host: str, username: str, password: str, playbook: str, logger=create_logger("Ansible Configurator"), become_password: Optional[str] = None) -> (Runner, dict):
+    ansible_runner_result, fact_caches = run_ansible_playbook_multi_host(
+        [AnsibleTargetHost(host=host, username=username, password=password, become_password=become_password)],
+        playbook,
+        logger=logger
+    )
+    return ansible_runner_result, fact_caches[host]
+
+
+def run_ansible_playbook_multi_host(hosts: List[AnsibleTargetHost], playbook: str, logger=create_logger("Ansible Configurator"), forks: int = ANSIBLE_DEFAULT_FORKS) -> (Runner, Dict[str, dict]):
+    """
+    Run the playbook on every host with a single ansible run, the inventory contains all the hosts and up to 'forks'
+    hosts are configured at the same time.
+
+    Args:
+        hosts: The hosts on which the playbook is executed
+        playbook: The playbook to be executed (the play should target 'all' the hosts)
+        logger: The logger used to output ansible logs
+        forks: The maximum number of hosts configured in parallel
+
+    Returns:
+        The ansible runner result and the fact cache of every host, indexed by host
+    """
     tmp_playbook = tempfile.NamedTemporaryFile(mode="w")
     tmp_inventory = tempfile.NamedTemporaryFile(mode="w")
     tmp_private_data_dir = tempfile.TemporaryDirectory()
 
     # Write the inventory and playbook to files
-    tmp_inventory.write(create_ansible_inventory(host, username, password, become_password=become_password))
+    tmp_inventory.write("\n".join([create_ansible_inventory(target.host, target.username, target.password, become_password=target.become_password) for target in hosts]))
     tmp_playbook.write(playbook)
     tmp_playbook.flush()
     tmp_inventory.flush()
@@ -37,15 +74,16 @@ def run_ansible_playbook(host: str, username: str, password: str, playbook: str,
         private_data_dir=tmp_private_data_dir.name,
         status_handler=my_status_handler,
         event_handler=my_event_handler,
+        forks=min(forks, len(hosts)),
         quiet=True
     )
 
-    # Save the fact cache to a variable before deleting tmp_private_data_dir
-    fact_cache = ansible_runner_result.get_fact_cache(host)
+    # Save the fact caches to a variable before deleting tmp_private_data_dir
+    fact_caches = {target.host: ansible_runner_result.get_fact_cache(target.host) for target in hosts}
 
     # Close the tmp files, this will delete them
     tmp_playbook.close()
     tmp_inventory.close()
     tmp_private_data_dir.cleanup()
 
-    return ansible_runner_result, fact_cache
+    return ansible_runner_result, fact_caches
@@ -1,4 +1,3 @@
-import asyncio
 import tempfile
 from pathlib import Path
 from typing import Dict, Any, List, Optional
@@ -8,7 +7,7 @@ import yaml
 from kubernetes.client import V1PodList
 from nfvcl.utils.file_utils import create_tmp_file, create_tmp_folder
 from pydantic import Field
-from pyhelm3 import Client, ReleaseRevisionStatus
+from pyhelm3 import Client, ReleaseRevisionStatus, ReleaseRevision
 
 from nfvcl.blueprints_ng.providers.blueprint_ng_provider_interface import BlueprintNGProviderData
 from nfvcl.blueprints_ng.providers.kubernetes.k8s_provider_interface import K8SProviderInterface, K8SProviderException
@@ -18,6 +17,8 @@ from nfvcl.rest_endpoints.k8s import get_k8s_cluster_by_area
 from nfvcl.topology.topology import build_topology
 from nfvcl.utils.k8s import get_k8s_config_from_file_content, get_services, get_deployments, k8s_delete_namespace, \
     get_pods_for_k8s_namespace, get_logs_for_pod
+from nfvcl.utils.k8s.helm_chart_cache import get_helm_chart_cache
+from nfvcl.utils.k8s.helm_event_loop import run_helm
 from nfvcl.utils.k8s.helm_plugin_manager import build_helm_client_from_credential_file_content
 
 HELM_TMP_FOLDER_PATH = create_tmp_folder('helm')
@@ -64,34 +65,35 @@ class K8SProviderNative(K8SProviderInterface):
     def install_helm_chart(self, helm_chart_resource: HelmChartResource, values: Dict[str, Any]):
         self.logger.info(f"Installing Helm chart {helm_chart_resource.name}")
 
-        chart = asyncio.run(self.helm_client.get_chart(
+        # The chart is kept in the cache until the installation is completed
+        with get_helm_chart_cache().use_chart(
+            self.helm_client,
             helm_chart_resource.get_chart_converted(),
             repo=helm_chart_resource.repo,
             version=helm_chart_resource.version
-        ))
-
-        self.logger.debug(f"Helm chart internal name: {chart.metadata.name}, version: {chart.metadata.version}")
+        ) as chart:
+            self.logger.debug(f"Helm chart internal name: {chart.metadata.name}, version: {chart.metadata.version}")
 
-        # Install or upgrade a release, if fails print debug cmd to reproduce locally the error with debug option. Pyhelm3 does not support debug option.
-        try:
-            revision = asyncio.run(self.helm_client.install_or_upgrade_release(
-                helm_chart_resource.name.lower(),
-                chart,
-                values,
-                namespace=helm_chart_resource.namespace.lower(),
-                atomic=True,
-                wait=True
-            ))
-        except pyhelm3.errors.Error as helmError:
-            self.logger.error(f"Helm chart deployment failed. You can debug installation in this way from nfvcl folder:\n{self._generate_debug_cmd_cli(helm_chart_resource, values, chart.metadata.version)}")
-            raise helmError
+            # Install or upgrade a release, if fails print debug cmd to reproduce locally the error with debug option. Pyhelm3 does not support debug option.
+            try:
+                revision = run_helm(self.helm_client.install_or_upgrade_release(
+                    helm_chart_resource.name.lower(),
+                    chart,
+                    values,
+                    namespace=helm_chart_resource.namespace.lower(),
+                    atomic=True,
+                    wait=True
+                ))
+            except pyhelm3.errors.Error as helmError:
+                self.logger.error(f"Helm chart deployment failed. You can debug installation in this way from nfvcl folder:\n{self._generate_debug_cmd_cli(helm_chart_resource, values, chart.metadata.version)}")
+                raise helmError
 
         if helm_chart_resource.namespace.lower() not in self.data.namespaces:
             self.data.namespaces.append(helm_chart_resource.namespace.lower())
 
         self.logger.debug(f"Helm chart installed name: {revision.release.name}, namespace: {revision.release.namespace}, revision: {revision.revision}, status: {str(revision.status)}")
 
-        self.save_to_db()
+        self.flush_to_db()
 
         if not self._check_helm_chart_status(revision.release.name, revision.release.namespace, ReleaseRevisionStatus.DEPLOYED):
             self.logger.error(f"The helm chart '{helm_chart_resource.name}' is not in the DEPLOYED state")
@@ -99,11 +101,12 @@ class K8SProviderNative(K8SProviderInterface):
 
         # Adding this blueprint to the deployed list on the cluster
         topo = build_topology()
-        cluster = topo.get_k8s_cluster_by_area(self.area)
+        # The topology model is shared, the cluster is edited on a copy
+        cluster = topo.get_k8s_cluster_by_area(self.area).model_copy(deep=True)
         cluster.deployed_blueprints.append(self.blueprint_id)
         topo.update_k8scluster(cluster)
 
-        k8s_config = get_k8s_config_from_file_content(self.k8s_cluster.credentials)
+        k8s_config = get_k8s_config_from_file_content(self.k8s_cluster.credentials, self.k8s_cluster.name)
         services = get_services(kube_client_config=k8s_config, namespace=helm_chart_resource.namespace.lower())
         deployments = get_deployments(kube_client_config=k8s_config, namespace=helm_chart_resource.namespace.lower())
 
@@ -136,40 +139,51 @@ class K8SProviderNative(K8SProviderInterface):
         k8s_credential_path = HELM_TMP_FOLDER_PATH / f"k8s_credential_{self.k8s_cluster.name}"
         return f"helm upgrade {helm_chart_resource.name} {helm_chart_resource.get_chart_converted()} --history-max 10 --install --output json --timeout 5m --values '{values_path.absolute()}' --debug --atomic --create-namespace --namespace {helm_chart_resource.namespace.lower()} --version {version} --wait --wait-for-jobs --kubeconfig {k8s_credential_path.absolute()}"
 
+    def _get_release_revision(self, release_name: str, release_namespace: str) -> Optional[ReleaseRevision]:
+        """
+        Get the current revision of a single release, without listing all the releases of the cluster
+        Args:
+            release_name: The name of the release
+            release_namespace: The namespace of the release
+
+        Returns:
+            The current revision of the release, None if the release does not exist
+        """
+        try:
+            return run_helm(self.helm_client.get_current_revision(release_name, namespace=release_namespace))
+        except pyhelm3.errors.ReleaseNotFoundError:
+            return None
+
     def _check_if_helm_chart_installed(self, release_name: str, release_namespace: str):
-        releases = asyncio.run(self.helm_client.list_releases(all=True, all_namespaces=True))
-        for release in releases:
-            if release.name == release_name and release.namespace == release_namespace:
-                return True
-        return False
+        return self._get_release_revision(release_name, release_namespace) is not None
 
     def _check_helm_chart_status(self, release_name: str, release_namespace: str, desired_status: ReleaseRevisionStatus):
-        releases = asyncio.run(self.helm_client.list_releases(all=True, all_namespaces=True))
-        for release in releases:
-            revision = asyncio.run(release.current_revision())
-            if release.name == release_name and release.namespace == release_namespace:
-                return revision.status == desired_status
-        raise K8SProviderNativeException(f"Unable to check Helm chart status for '{release_name}', namespace '{release_namespace}', not found")
+        revision = self._get_release_revision(release_name, release_namespace)
+        if revision is None:
+            raise K8SProviderNativeException(f"Unable to check Helm chart status for '{release_name}', namespace '{release_namespace}', not found")
+        return revision.status == desired_status
 
     def update_values_helm_chart(self, helm_chart_resource: HelmChartResource, values: Dict[str, Any]):
         self.logger.info(f"Updating Helm chart {helm_chart_resource.name}")
 
-        chart = asyncio.run(self.helm_client.get_chart(
+        # The chart is kept in the cache until the upgrade is completed
+        with get_helm_chart_cache().use_chart(
+            self.helm_client,
             helm_chart_resource.get_chart_converted(),
             repo=helm_chart_resource.repo,
             version=helm_chart_resource.version
-        ))
-        self.logger.debug(f"Helm chart {helm_chart_resource.name} metadata version: {chart.metadata.version}")
+        ) as chart:
+            self.logger.debug(f"Helm chart {helm_chart_resource.name} metadata version: {chart.metadata.version}")
 
-        # Install or upgrade a release
-        revision = asyncio.run(self.helm_client.install_or_upgrade_release(
-            helm_chart_resource.name.lower(),
-            chart,
-            values,
-            namespace=helm_chart_resource.namespace.lower(),
-            atomic=True,
-            wait=True
-        ))
+            # Install or upgrade a release
+            revision = run_helm(self.helm_client.install_or_upgrade_release(
+                helm_chart_resource.name.lower(),
+                chart,
+                values,
+                namespace=helm_chart_resource.namespace.lower(),
+                atomic=True,
+                wait=True
+            ))
 
         if not self._check_helm_chart_status(revision.release.name, revision.release.namespace, ReleaseRevisionStatus.DEPLOYED):
             self.logger.error(f"The helm chart '{helm_chart_resource.name}' is not in the DEPLOYED state")
@@ -182,7 +196,7 @@ class K8SProviderNative(K8SProviderInterface):
     def uninstall_helm_chart(self, helm_chart_resource: HelmChartResource):
         self.logger.info(f"Uninstalling Helm chart {helm_chart_resource.name}")
 
-        asyncio.run(self.helm_client.uninstall_release(
+        run_helm(self.helm_client.uninstall_release(
             helm_chart_resource.name.lower(),
             namespace=helm_chart_resource.namespace.lower(),
             wait=True
@@ -196,7 +210,7 @@ class K8SProviderNative(K8SProviderInterface):
         # Removing this blueprint to the deployed list on the cluster
         try:
             topo = build_topology()
-            cluster = topo.get_k8s_cluster_by_area(self.area)
+            cluster = topo.get_k8s_cluster_by_area(self.area).model_copy(deep=True)
             cluster.deployed_blueprints.remove(self.blueprint_id)
             topo.update_k8scluster(cluster)
         except ValueError as e:
@@ -206,7 +220,7 @@ class K8SProviderNative(K8SProviderInterface):
 
     def final_cleanup(self):
         self.logger.info(f"Performing k8s final cleanup")
-        k8s_config = get_k8s_config_from_file_content(self.k8s_cluster.credentials)
+        k8s_config = get_k8s_config_from_file_content(self.k8s_cluster.credentials, self.k8s_cluster.name)
         for ns in self.data.namespaces:
             self.logger.debug(f"Deleting k8s namespace '{ns}'")
             try:
@@ -215,5 +229,5 @@ class K8SProviderNative(K8SProviderInterface):
                 self.logger.error(f"Error deleting k8s namespace '{ns}': {str(e)}")
 
     def get_pod_log(self, helm_chart_resource: HelmChartResource, pod_name: str, tail_lines: Optional[int]=None) -> str:
-        k8s_config = get_k8s_config_from_file_content(self.k8s_cluster.credentials)
+        k8s_config = get_k8s_config_from_file_content(self.k8s_cluster.credentials, self.k8s_cluster.name)
         return get_logs_for_pod(k8s_config, helm_chart_resource.namespace.lower(), pod_name, tail_lines=tail_lines)
@@ -36,15 +36,10 @@ class PDUProvider(BlueprintNGProviderInterface):
 
         Returns: The PDU if exactly one is found
         """
-        all_pdus = build_topology().get_pdus()
-
-        filtered_by_area = list(filter(lambda x: x.area == area, all_pdus))
-        filtered_by_type = list(filter(lambda x: x.type == pdu_type, filtered_by_area))
+        found = build_topology().get_model().find_pdus(area, pdu_type)
 
         if instance_type:
-            found = list(filter(lambda x: x.instance_type == instance_type, filtered_by_type))
-        else:
-            found = filtered_by_type
+            found = list(filter(lambda x: x.instance_type == instance_type, found))
 
         if name:
             found = list(filter(lambda x: x.name == name, found))
@@ -53,15 +48,14 @@ class PDUProvider(BlueprintNGProviderInterface):
             raise PDUProviderException(f"No PDU found with area {area} of type {pdu_type} and with name '{name}' (None mean that the name was not used to find the PDU)")
         if len(found) > 1:
             raise PDUProviderException(f"Found multiple PDUs with area {area} of type {pdu_type}, the name need to be used in this case to choose one")
-        return found[0]
+        # The topology model is shared, the PDU is edited when it is locked
+        return found[0].model_copy(deep=True)
 
     def find_by_name(self, name: str) -> PduModel:
-        all_pdus = build_topology().get_pdus()
-
-        results = list(filter(lambda x: x.name == name, all_pdus))
-        if len(results) == 0:
+        try:
+            return build_topology().get_pdu(name).model_copy(deep=True)
+        except ValueError:
             raise PDUProviderException(f"No PDU found with name '{name}'")
-        return results[0]
 
     def is_pdu_locked(self, pdu_model: PduModel) -> bool:
         """
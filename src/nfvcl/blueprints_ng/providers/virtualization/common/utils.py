@@ -1,11 +1,14 @@
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Optional, List, Dict
 
 import paramiko
 import verboselogs
 
-from nfvcl.blueprints_ng.providers.configurators.ansible_utils import run_ansible_playbook
+from nfvcl.blueprints_ng.lcm.performance_manager import get_performance_manager
+from nfvcl.blueprints_ng.providers.configurators.ansible_utils import run_ansible_playbook, \
+    run_ansible_playbook_multi_host, AnsibleTargetHost, ANSIBLE_DEFAULT_FORKS
 from nfvcl.blueprints_ng.providers.virtualization.virtualization_provider_interface import \
     VirtualizationProviderException
 from nfvcl.blueprints_ng.resources import VmResourceAnsibleConfiguration
@@ -38,11 +41,13 @@ def wait_for_ssh_to_be_ready(host: str, port: int, user: str, passwd: str, timeo
         except paramiko.ssh_exception.SSHException as e:
             # socket is open, but not SSH service responded
             logger.debug(f"Socket is open, but not SSH service responded: {e}")
+            get_performance_manager().record_retry()
             time.sleep(retry_interval)
             continue
 
         except paramiko.ssh_exception.NoValidConnectionsError as e:
             logger.debug('SSH transport is not ready...')
+            get_performance_manager().record_retry()
             time.sleep(retry_interval)
             continue
     return False
@@ -101,3 +106,64 @@ def configure_vm_ansible(vm_resource_configuration: VmResourceAnsibleConfigurati
     )
 
     return fact_cache
+
+
+def configure_vms_ansible(vm_resource_configurations: List[VmResourceAnsibleConfiguration], blueprint_id: str, forks: int = ANSIBLE_DEFAULT_FORKS, logger_override: Optional[verboselogs.VerboseLogger] = None) -> List[dict]:
+    """
+    Configure multiple VMs with ansible. Configurations producing the same playbook are executed with a single ansible
+    run, with an inventory containing every VM, such that up to 'forks' VMs are configured at the same time.
+
+    Args:
+        vm_resource_configurations: The configurations to be executed, at most one for every VM
+        blueprint_id: The ID of the blueprint owning the VMs
+        forks: The maximum number of VMs configured in parallel
+        logger_override: The logger to be used
+
+    Returns:
+        The fact cache of every configuration, in the same order of vm_resource_configurations
+    """
+    if logger_override:
+        logger = logger_override
+    else:
+        logger = logger_pu
+
+    nfvcl_tmp_dir = create_tmp_folder("nfvcl/playbook")  # Path("/tmp/nfvcl/playbook")
+
+    # Grouping the configurations by playbook, every group is executed in a single ansible run
+    playbook_groups: Dict[str, List[VmResourceAnsibleConfiguration]] = {}
+    for vm_resource_configuration in vm_resource_configurations:
+        playbook_str = vm_resource_configuration.dump_playbook()
+        with open(Path(nfvcl_tmp_dir, f"{blueprint_id}_{vm_resource_configuration.vm_resource.name}.yml"), "w+") as f:
+            f.write(playbook_str)
+        playbook_groups.setdefault(playbook_str, []).append(vm_resource_configuration)
+
+    # Wait for SSH to be ready, this is needed because sometimes cloudinit is still not finished and the server doesn't allow password connections
+    # The VMs are waited at the same time, the total wait is the one of the slowest VM
+    @get_performance_manager().in_current_provider_call
+    def wait_for_vm_ssh(vm_resource_configuration: VmResourceAnsibleConfiguration) -> bool:
+        return wait_for_ssh_to_be_ready(
+            vm_resource_configuration.vm_resource.access_ip,
+            22,
+            vm_resource_configuration.vm_resource.username,
+            vm_resource_configuration.vm_resource.password,
+            300,
+            5,
+            logger_override=logger_override
+        )
+
+    if len(vm_resource_configurations) > 0:
+        with ThreadPoolExecutor(max_workers=min(forks, len(vm_resource_configurations)), thread_name_prefix=f"{blueprint_id}_ssh") as executor:
+            list(executor.map(wait_for_vm_ssh, vm_resource_configurations))
+
+    fact_caches: Dict[str, dict] = {}
+    for playbook_str, group in playbook_groups.items():
+        logger.debug(f"Configuring VMs {[conf.vm_resource.name for conf in group]} with a single ansible run")
+        hosts = [AnsibleTargetHost(host=conf.vm_resource.access_ip, username=conf.vm_resource.username, password=conf.vm_resource.password) for conf in group]
+        ansible_runner_result, group_fact_caches = run_ansible_playbook_multi_host(hosts, playbook_str, logger, forks=forks)
+
+        if ansible_runner_result.status == "failed":
+            raise VirtualizationConfiguratorException(f"Error running ansible configurator on VMs {[conf.vm_resource.name for conf in group]}")
+
+        fact_caches.update(group_fact_caches)
+
+    return [fact_caches[conf.vm_resource.access_ip] for conf in vm_resource_configurations]
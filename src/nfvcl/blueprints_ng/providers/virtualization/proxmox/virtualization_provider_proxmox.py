@@ -2,6 +2,7 @@ import ipaddress
 import json
 import math
 import re
+import uuid
 from enum import Enum
 from typing import Dict, List
 
@@ -20,8 +21,9 @@ from nfvcl.blueprints_ng.providers.virtualization.virtualization_provider_interf
     VirtualizationProviderException, \
     VirtualizationProviderInterface, VirtualizationProviderData
 from nfvcl.blueprints_ng.resources import VmResource, VmResourceConfiguration, VmResourceNetworkInterfaceAddress, \
-    VmResourceNetworkInterface, VmResourceAnsibleConfiguration, NetResource
+    VmResourceNetworkInterface, VmResourceAnsibleConfiguration, NetResource, VmResourceImage
 from nfvcl.blueprints_ng.utils import rel_path
+from nfvcl.utils.image_cache import get_image_cache, ImageCacheException
 
 cloud_init_packages = ['qemu-guest-agent']
 cloud_init_runcmd = ["systemctl enable qemu-guest-agent.service", "systemctl start qemu-guest-agent.service"]
@@ -82,7 +84,7 @@ class VirtualizationProviderProxmox(VirtualizationProviderInterface):
             self.data.proxmox_node_name = nodes.data[0].node
 
         self.logger.info(f"Creating VM {vm_resource.name}")
-        self.__download_cloud_image(f'{vm_resource.image.url}', f'{vm_resource.image.name}')
+        self.__download_cloud_image(vm_resource.image)
         c_init = CloudInit(packages=cloud_init_packages,
                                     ssh_authorized_keys=self.vim.ssh_keys,
                                     runcmd=cloud_init_runcmd)
@@ -115,7 +117,7 @@ class VirtualizationProviderProxmox(VirtualizationProviderInterface):
         self.__load_cloud_init(cloud_init=netwotk_cloud_init.build_cloud_config(), cloud_init_path=network_cloud_init_path)
 
         self.data.proxmox_dict[vm_resource.id] = str(vmid)
-        self.save_to_db()
+        self.flush_to_db()
         self.__execute_ssh_command(f'qm importdisk {vmid} {self.path}/template/qcow/{vm_resource.image.name}.qcow2 {self.vim.vim_proxmox_storage_volume}')
         self.__execute_ssh_command(f'qm set {vmid} --scsi0 {self.vim.vim_proxmox_storage_volume}:vm-{vmid}-disk-0,discard=on,iothread=on,cache=writethrough')
         self.resize_disk(vmid, int(vm_resource.flavor.storage_gb))
@@ -245,8 +247,44 @@ class VirtualizationProviderProxmox(VirtualizationProviderInterface):
     def __load_cloud_init(self, cloud_init: str, cloud_init_path: str) -> None:
         self.__execute_ssh_command(f"echo -e '{cloud_init}' > {cloud_init_path}")
 
-    def __download_cloud_image(self, image_url, image_name):
-        self.__execute_ssh_command(f'/root/scripts/image_script.sh {image_url} {self.path}/template/qcow/{image_name}.qcow2')
+    def __download_cloud_image(self, vm_image: VmResourceImage):
+        """
+        Make the image available on the Proxmox node, the image is downloaded by the node. If the image needs to be
+        checked (check_sha512sum) the hash of the remote file is compared with the one of the image, computed by the
+        NFVCL image cache, and the file is downloaded again when it differs. Otherwise the image is downloaded only if
+        not already present.
+        Args:
+            vm_image: The image to be prepared
+        """
+        image_path = f"{self.path}/template/qcow/{vm_image.name}.qcow2"
+        if not vm_image.check_sha512sum:
+            self.__execute_ssh_command(f'/root/scripts/image_script.sh {vm_image.url} {image_path}')
+            return
+
+        try:
+            image_hash512 = get_image_cache().get_sha512(vm_image.url)
+        except ImageCacheException as e:
+            raise VirtualizationProviderProxmoxException(f"Unable to compute the hash 512 of {vm_image.url}: {str(e)}") from e
+
+        if self.__remote_sha512sum(image_path) == image_hash512:
+            self.logger.info(f"Image {vm_image.name} on Proxmox sha512 coincides with the one of the remote image")
+            return
+
+        self.logger.info(f"Downloading image {vm_image.name} on Proxmox from {vm_image.url}")
+        # Unique for every download, VMs being created from the old image keep using it until the new one is moved in place
+        tmp_image_path = f"{image_path}.{uuid.uuid4().hex}.tmp"
+        try:
+            self.__execute_ssh_command(f'/root/scripts/image_script.sh {vm_image.url} {tmp_image_path}')
+            downloaded_hash512 = self.__remote_sha512sum(tmp_image_path)
+            if downloaded_hash512 != image_hash512:
+                raise VirtualizationProviderProxmoxException(f"The image downloaded from {vm_image.url} has sha512 {downloaded_hash512}, expected {image_hash512}")
+            self.__execute_ssh_command(f"mv {tmp_image_path} {image_path}")
+        finally:
+            self.__execute_ssh_command(f"rm -f {tmp_image_path}")
+
+    def __remote_sha512sum(self, path: str) -> str:
+        stdout = self.__execute_ssh_command(f"sha512sum {path} 2>/dev/null || true")
+        return stdout.read().decode().split(" ")[0].strip()
 
     def __get_macs(self, vmid: int):
         pattern = re.compile("^net[0-9]+$")
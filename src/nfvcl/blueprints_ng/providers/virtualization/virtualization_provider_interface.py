@@ -5,7 +5,10 @@ from typing import List
 
 from nfvcl.blueprints_ng.providers.blueprint_ng_provider_interface import BlueprintNGProviderInterface, \
     BlueprintNGProviderData
-from nfvcl.blueprints_ng.resources import VmResource, VmResourceConfiguration, NetResource
+from nfvcl.blueprints_ng.resources import VmResource, VmResourceConfiguration, NetResource, VmResourceAnsibleConfiguration
+
+# Maximum number of VMs that a provider creates at the same time when using create_vms
+VM_CREATION_MAX_WORKERS = 8
 
 
 class VirtualizationProviderData(BlueprintNGProviderData):
@@ -23,12 +26,59 @@ class VirtualizationProviderInterface(BlueprintNGProviderInterface):
     def create_vm(self, vm_resource: VmResource):
         pass
 
+    def create_vms(self, vm_resources: List[VmResource], max_workers: int = VM_CREATION_MAX_WORKERS):
+        """
+        Create multiple VMs. The default implementation creates them one after another, providers that are able to
+        create VMs concurrently should override this method.
+        Every VM resource MUST be already registered in the blueprint, in this way a failed batch can be destroyed.
+
+        Args:
+            vm_resources: List of VMs to be created
+            max_workers: The maximum number of VMs created at the same time
+        """
+        for vm_resource in vm_resources:
+            self.create_vm(vm_resource)
+
     @abc.abstractmethod
     def configure_vm(self, vm_resource_configuration: VmResourceConfiguration) -> dict:
         if not vm_resource_configuration.vm_resource.created:
             raise VirtualizationProviderException("VM Resource not created")
         return {}
 
+    def configure_vms(self, vm_resource_configurations: List[VmResourceConfiguration]) -> List[dict]:
+        """
+        Configure multiple VMs, ansible configurations are executed together such that the VMs are configured in parallel.
+        Other types of configuration are not executed, like in configure_vm.
+
+        Args:
+            vm_resource_configurations: The configurations to be applied, at most one for every VM
+
+        Returns:
+            The facts of every configuration, in the same order of vm_resource_configurations (None for configurations
+            that are not ansible ones)
+        """
+        # The utils of the providers import this module
+        from nfvcl.blueprints_ng.providers.virtualization.common.utils import configure_vms_ansible
+
+        vm_names = [vm_resource_configuration.vm_resource.name for vm_resource_configuration in vm_resource_configurations]
+        self.logger.info(f"Configuring VMs {vm_names}")
+
+        ansible_configurations: List[VmResourceAnsibleConfiguration] = []
+        for vm_resource_configuration in vm_resource_configurations:
+            if not vm_resource_configuration.vm_resource.created:
+                raise VirtualizationProviderException("VM Resource not created")
+            if isinstance(vm_resource_configuration, VmResourceAnsibleConfiguration):
+                ansible_configurations.append(vm_resource_configuration)
+
+        ansible_facts = configure_vms_ansible(ansible_configurations, self.blueprint_id, logger_override=self.logger)
+        # Configurations are not hashable, using the object identity to correlate them with the facts
+        facts_by_configuration = {id(configuration): facts for configuration, facts in zip(ansible_configurations, ansible_facts)}
+
+        self.logger.success(f"Configuring VMs {vm_names} finished")
+        self.save_to_db()
+
+        return [facts_by_configuration.get(id(vm_resource_configuration)) for vm_resource_configuration in vm_resource_configurations]
+
     @abc.abstractmethod
     def attach_nets(self, vm_resource: VmResource, nets_name: List[str]) -> List[str]:
         """
@@ -1,7 +1,7 @@
-import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict
 
-import requests
 from openstack.compute.v2.flavor import Flavor
 from openstack.compute.v2.server import Server
 from openstack.compute.v2.server_interface import ServerInterface
@@ -18,10 +18,11 @@ from nfvcl.blueprints_ng.providers.virtualization.common.models.netplan import V
 from nfvcl.blueprints_ng.providers.virtualization.common.utils import configure_vm_ansible
 from nfvcl.blueprints_ng.providers.virtualization.virtualization_provider_interface import \
     VirtualizationProviderException, \
-    VirtualizationProviderInterface, VirtualizationProviderData
+    VirtualizationProviderInterface, VirtualizationProviderData, VM_CREATION_MAX_WORKERS
 from nfvcl.blueprints_ng.resources import VmResourceAnsibleConfiguration, VmResourceNetworkInterface, \
     VmResourceNetworkInterfaceAddress, VmResource, VmResourceConfiguration, NetResource, VmResourceFlavor, VmResourceImage
 from nfvcl.models.vim import VimModel
+from nfvcl.utils.image_cache import get_image_cache, ImageCacheException
 from nfvcl.utils.openstack.openstack_client import OpenStackClient
 
 
@@ -78,6 +79,11 @@ class VirtualizationProviderOpenstack(VirtualizationProviderInterface):
         self.os_client = get_os_client_from_vim(self.vim, self.area)
         self.conn = self.os_client.client
         self.vim_need_floating_ip = self.vim.config.use_floating_ip
+        # Used to avoid multiple uploads of the same image when VMs are created concurrently
+        self.image_lock = threading.Lock()
+        # Used to avoid creating the same flavor multiple times when VMs are created concurrently
+        self._flavor_locks: Dict[str, threading.Lock] = {}
+        self._flavor_locks_lock = threading.Lock()
 
     def __create_image_from_url(self, vm_image: VmResourceImage):
         image_attrs = {
@@ -110,16 +116,12 @@ class VirtualizationProviderOpenstack(VirtualizationProviderInterface):
                 raise VirtualizationProviderOpenstackException(f"Network >{net}< not found on vim")
 
     def __get_checksum(self, vm_image: VmResourceImage) -> str:
-        self.logger.debug(f"Downloading {vm_image.url} image on NFVCL machine to compute its hash 512...")
-        response = requests.get(vm_image.url, stream=True)
-
-        if response.status_code == 200:
-            file_hash = hashlib.sha512(response.content).hexdigest()
-            self.logger.debug(f"Downloading of {vm_image.url} finished")
-            return file_hash
-        else:
-            self.logger.error(f"Failed to download file. Status code: {response.status_code}")
-            raise ValueError("The URL is not valid")
+        self.logger.debug(f"Computing the hash 512 of {vm_image.url} using the NFVCL image cache...")
+        try:
+            return get_image_cache().get_sha512(vm_image.url)
+        except ImageCacheException as e:
+            self.logger.error(str(e))
+            raise VirtualizationProviderOpenstackException(f"Unable to compute the hash 512 of {vm_image.url}") from e
 
     def __prepare_image(self, vm_image: VmResourceImage):
         """
@@ -166,7 +168,8 @@ class VirtualizationProviderOpenstack(VirtualizationProviderInterface):
 
         self._pre_creation_checks(vm_resource)
 
-        image = self.__prepare_image(vm_resource.image)
+        with self.image_lock:
+            image = self.__prepare_image(vm_resource.image)
 
         flavor: Flavor = self.create_get_flavor(vm_resource.flavor, vm_resource.name)
 
@@ -206,7 +209,7 @@ class VirtualizationProviderOpenstack(VirtualizationProviderInterface):
 
         # Register the VM in the provider data, this is needed to be able to delete it using only the vm_resource
         self.data.os_dict[vm_resource.id] = server_obj.id
-        self.save_to_db()
+        self.flush_to_db()
 
         self.__update_net_info_vm(vm_resource, server_obj)
         self.__disable_port_security_all_ports(vm_resource, server_obj)
@@ -217,12 +220,39 @@ class VirtualizationProviderOpenstack(VirtualizationProviderInterface):
         self.logger.success(f"Creating VM {vm_resource.name} finished")
         self.save_to_db()
 
+    def create_vms(self, vm_resources: List[VmResource], max_workers: int = VM_CREATION_MAX_WORKERS):
+        """
+        Create multiple VMs concurrently. Every VM is created by create_vm, that save the server id in the provider data
+        as soon as the server exists, if a creation fails the other ones are completed anyway.
+
+        Args:
+            vm_resources: List of VMs to be created
+            max_workers: The maximum number of VMs created at the same time
+
+        Raises:
+            VirtualizationProviderOpenstackException if at least one VM has not been created
+        """
+        self.logger.info(f"Creating {len(vm_resources)} VMs, max {max_workers} at the same time")
+        errors: Dict[str, Exception] = {}
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{self.blueprint_id}_vm") as executor:
+            futures = {executor.submit(self.create_vm, vm_resource): vm_resource for vm_resource in vm_resources}
+            for future in as_completed(futures):
+                vm_resource = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    self.logger.error(f"Error creating VM {vm_resource.name}: {str(e)}")
+                    errors[vm_resource.name] = e
+
+        if len(errors) > 0:
+            raise VirtualizationProviderOpenstackException(f"Unable to create VMs {list(errors.keys())}") from next(iter(errors.values()))
+
     def __update_net_info_vm(self, vm_resource: VmResource, server_obj: Server):
-        vm_resource.network_interfaces.clear()
         # Getting detailed info about the networks attached to the machine
         subnet_detailed = self.__get_network_details(vm_resource.get_all_connected_network_names())
-        # Parse the OS output and create a structured network_interfaces dictionary
-        self.__parse_os_addresses(vm_resource, server_obj.addresses, subnet_detailed)
+        # Parse the OS output and create a structured network_interfaces dictionary, the dictionary is replaced and not
+        # edited in place because the blueprint may be serialized by another thread in the meantime
+        vm_resource.network_interfaces = self.__parse_os_addresses(server_obj.addresses, subnet_detailed)
 
         # Find the IP to use for configuring the VM, floating if present or the fixed one from the management interface if not
         mgt_interface = vm_resource.network_interfaces[vm_resource.management_network][0]
@@ -305,6 +335,7 @@ class VirtualizationProviderOpenstack(VirtualizationProviderInterface):
 
         self.data.subnets.append(subnet.id)
         self.data.networks.append(network.id)
+        self.os_client.invalidate_network_cache()
 
         self.logger.success(f"Creating NET {net_resource.name} finished")
 
@@ -312,12 +343,20 @@ class VirtualizationProviderOpenstack(VirtualizationProviderInterface):
         """
         Get a flavor if flavor name is present, create it if a flavor with that name does not exist.
         Otherwise, it creates a flavor, from specification, if not already present.
+        Concurrent calls for the same flavor are serialized, such that the flavor is created only once.
         Args:
             requested_flavor: Flavor to be get/created.
             vm_name: The VM name used to name the flavor if the flavor name is not present.
         Returns:
             The flavor on the VIM
         """
+        flavor_name = requested_flavor.name if requested_flavor.name is not None else f"Flavor_{vm_name}"
+        with self._flavor_locks_lock:
+            flavor_lock = self._flavor_locks.setdefault(flavor_name, threading.Lock())
+        with flavor_lock:
+            return self.__create_get_flavor(requested_flavor, flavor_name)
+
+    def __create_get_flavor(self, requested_flavor: VmResourceFlavor, flavor_name: str) -> Flavor:
         # If a flavor name is specified, try to use that one.
         if requested_flavor.name is not None:
             found_flavor_on_vim = self.conn.get_flavor(requested_flavor.name)
@@ -334,7 +373,6 @@ class VirtualizationProviderOpenstack(VirtualizationProviderInterface):
             return found_flavor_on_vim
         # If no name was given, create it by specifications
         else:
-            flavor_name = f"Flavor_{vm_name}"
             # If present in local flavor list -> Already created
             if flavor_name in self.data.flavors:
                 flavor: Flavor = self.conn.get_flavor(flavor_name)
@@ -414,8 +452,11 @@ class VirtualizationProviderOpenstack(VirtualizationProviderInterface):
         # Delete networks
         for network_id in self.data.networks:
             self.conn.delete_network(network_id)
+        if len(self.data.networks) > 0:
+            self.os_client.invalidate_network_cache()
 
-    def __parse_os_addresses(self, vm_resource: VmResource, addresses, subnet_details: Dict[str, Subnet]):
+    def __parse_os_addresses(self, addresses, subnet_details: Dict[str, Subnet]) -> Dict[str, List[VmResourceNetworkInterface]]:
+        network_interfaces: Dict[str, List[VmResourceNetworkInterface]] = {}
         for network_name, network_info in addresses.items():
             fixed = None
             floating = None
@@ -424,9 +465,10 @@ class VirtualizationProviderOpenstack(VirtualizationProviderInterface):
                     fixed = VmResourceNetworkInterfaceAddress(ip=address["addr"], mac=address["OS-EXT-IPS-MAC:mac_addr"], cidr=subnet_details[network_name].cidr)
                 if address["OS-EXT-IPS:type"] == "floating":
                     floating = VmResourceNetworkInterfaceAddress(ip=address["addr"], mac=address["OS-EXT-IPS-MAC:mac_addr"], cidr=subnet_details[network_name].cidr)
-                if network_name not in vm_resource.network_interfaces:
-                    vm_resource.network_interfaces[network_name] = []
-            vm_resource.network_interfaces[network_name].append(VmResourceNetworkInterface(fixed=fixed, floating=floating))
+                if network_name not in network_interfaces:
+                    network_interfaces[network_name] = []
+            network_interfaces[network_name].append(VmResourceNetworkInterface(fixed=fixed, floating=floating))
+        return network_interfaces
 
     def __disable_port_security(self, conn: Connection, port_id):
         try:
@@ -446,5 +488,5 @@ class VirtualizationProviderOpenstack(VirtualizationProviderInterface):
         subnet_detail_list = {}
         for network_name in network_names:
             network_detail: Network = self.os_client.get_network(network_name)
-            subnet_detail_list[network_name] = self.conn.get_subnet(network_detail.subnet_ids[0])
+            subnet_detail_list[network_name] = self.os_client.get_subnet(network_detail.subnet_ids[0])
         return subnet_detail_list
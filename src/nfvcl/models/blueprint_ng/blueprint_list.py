@@ -0,0 +1,57 @@
+from datetime import datetime
+from typing import Optional, List
+
+from pydantic import Field
+
+from nfvcl.models.base_model import NFVCLBaseModel
+
+
+class BlueprintNGListFilter(NFVCLBaseModel):
+    """
+    Filters applied, on the database side, when listing blueprints. Filters that are None are not applied.
+    """
+    blue_type: Optional[str] = Field(default=None, description="The type of the blueprint")
+    status: Optional[str] = Field(default=None, description="The current operation of the blueprint (e.g. idle, deploying)")
+    error: Optional[bool] = Field(default=None, description="If the blueprint is (or is not) in error")
+    parent_blue_id: Optional[str] = Field(default=None, description="The ID of the parent blueprint")
+    created_after: Optional[datetime] = Field(default=None, description="Minimum creation date (included)")
+    created_before: Optional[datetime] = Field(default=None, description="Maximum creation date (excluded)")
+    area: Optional[int] = Field(default=None, description="An area where the blueprint has resources")
+
+    def to_mongo_filter(self) -> dict:
+        """
+        Build the MongoDB query for the blueprint collection.
+
+        Returns:
+            The query matching the blueprints that satisfy every filter
+        """
+        blue_filter = {}
+        if self.blue_type:
+            blue_filter["type"] = self.blue_type
+        if self.status:
+            blue_filter["status.current_operation"] = self.status
+        if self.error is not None:
+            blue_filter["status.error"] = self.error
+        if self.parent_blue_id:
+            blue_filter["parent_blue_id"] = self.parent_blue_id
+        if self.created_after or self.created_before:
+            blue_filter["created"] = {}
+            if self.created_after:
+                blue_filter["created"]["$gte"] = self.created_after
+            if self.created_before:
+                blue_filter["created"]["$lt"] = self.created_before
+        if self.area is not None:
+            # Providers are saved with the area (as string) as key
+            blue_filter["$or"] = [
+                {f"virt_providers.{self.area}": {"$exists": True}},
+                {f"k8s_providers.{self.area}": {"$exists": True}}
+            ]
+        return blue_filter
+
+
+class BlueprintNGListPage(NFVCLBaseModel):
+    """
+    A page of the blueprint list, next_cursor is used to request the following page and is None on the last one.
+    """
+    items: List[dict] = Field(default_factory=list)
+    next_cursor: Optional[str] = Field(default=None)
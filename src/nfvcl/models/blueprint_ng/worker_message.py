@@ -4,6 +4,7 @@ from typing import Any, Optional, Callable
 from pydantic import Field
 
 from nfvcl.models.base_model import NFVCLBaseModel
+from nfvcl.models.performance import PerformanceTraceParent
 
 class BlueprintOperationCallbackModel(NFVCLBaseModel):
     id: str = Field()
@@ -32,3 +33,4 @@ class WorkerMessage(NFVCLBaseModel):
     path: str # The request path
     message: Any # The message content
     callback: Optional[Callable[[Any], Any]] = Field(default=None)
+    trace_parent: Optional[PerformanceTraceParent] = Field(default=None, description="The provider call of another blueprint that sent the message")
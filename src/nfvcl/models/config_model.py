@@ -1,4 +1,5 @@
 import socket
+from enum import Enum
 from typing import Optional
 
 from nfvcl.models.base_model import NFVCLBaseModel
@@ -86,9 +87,18 @@ class MongoParameters(NFVCLBaseModel):
         return db
 
 
+class RedisDropPolicy(str, Enum):
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+
+
 class RedisParameters(NFVCLBaseModel):
     host: str
     port: int
+    publish_queue_size: int = Field(default=10000, description="Maximum number of events and logs waiting to be published on redis")
+    publish_batch_size: int = Field(default=200, description="Maximum number of messages published with a single pipeline")
+    publish_drop_policy: RedisDropPolicy = Field(default=RedisDropPolicy.DROP_OLDEST, description="Which message is dropped when the publish queue is full")
+    compact_events: bool = Field(default=False, description="If true, events contain only the id, the status and the difference from the previous event of the same object")
 
     class Config:
         validate_assignment = True
@@ -113,11 +123,39 @@ class RedisParameters(NFVCLBaseModel):
         raise ValueError(f"Config decode error for Redis DB host: >{host}< is not a valid string.")
 
 
+class HelmParameters(NFVCLBaseModel):
+    chart_cache_folder: Optional[str] = Field(default=None, description="The folder of the helm chart cache, if None 'helm_chart_cache' in the tmp folder")
+    chart_cache_max_size_mb: int = Field(default=2048, description="Maximum size of the helm chart cache, the least recently used charts are removed")
+    offline: bool = Field(default=False, description="If true, charts are never downloaded, only cached charts can be installed")
+
+    class Config:
+        validate_assignment = True
+
+
+class ImageCacheParameters(NFVCLBaseModel):
+    cache_folder: Optional[str] = Field(default=None, description="The folder of the VM image hash cache, if None 'image_cache' in the tmp folder")
+
+    class Config:
+        validate_assignment = True
+
+
+class RestParameters(NFVCLBaseModel):
+    blocking_max_workers: int = Field(default=32, description="Threads executing the blocking operations (k8s and database calls) of the REST endpoints")
+    max_concurrent_per_cluster: int = Field(default=4, description="Maximum number of REST operations executed at the same time on the same k8s cluster")
+    request_timeout: float = Field(default=60, description="Seconds after which a blocking REST operation is answered with 504 (Gateway Timeout)")
+
+    class Config:
+        validate_assignment = True
+
+
 class NFVCLConfigModel(NFVCLBaseModel):
     log_level: int = Field(default=20, description="10 = DEBUG, CRITICAL = 50,FATAL = CRITICAL, ERROR = 40, WARNING = 30, WARN = WARNING, INFO = 20, DEBUG = 10, NOTSET = 0")
     nfvcl: NFVCLParameters
     mongodb: MongoParameters
     redis: RedisParameters
+    helm: HelmParameters = Field(default_factory=HelmParameters)
+    rest: RestParameters = Field(default_factory=RestParameters)
+    images: ImageCacheParameters = Field(default_factory=ImageCacheParameters)
 
     class Config:
         validate_assignment = True
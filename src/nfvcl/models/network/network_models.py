@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, field_validator, field_serializer, IPvAnyNetwork, IPvAnyAddress
+from pydantic import BaseModel, Field, field_validator, field_serializer, IPvAnyNetwork, IPvAnyAddress, PrivateAttr
 from typing import List, Optional, Union, Any
 from enum import Enum
 from ipaddress import IPv4Network, IPv4Address
@@ -69,7 +69,7 @@ class IPv4ReservedRange(IPv4Pool):
         TWO RESERVED RANGE ARE CONSIDERED EQUAL IF SOME OF THE IPs ARE OVERLAPPED.
         """
         if isinstance(other, IPv4ReservedRange):
-            if other.start <= self.start <= other.end or other.start <= self.end <= other.end:
+            if self.start <= other.end and other.start <= self.end:
                 return True
         return False
 
@@ -86,6 +86,8 @@ class NetworkModel(BaseModel):
     allocation_pool: List[IPv4Pool] = Field(default=[], description='The list of ranges that are used by the VIM to assign IP addresses to VMs (Reserved to VIM)')
     reserved_ranges: List[IPv4ReservedRange] = Field(default=[], description='The list of ranges that have been reserved by deployed blueprints')
     dns_nameservers: List[IPv4Address] = Field(default=[], description='List of DNS IPs avaiable in this network')
+    # Free addresses of the network, built at the first reservation and then kept updated
+    _ipam: Optional[Any] = PrivateAttr(default=None)
 
     @classmethod
     def build_network_model(cls, name: str, type: NetworkTypeEnum, cidr: IPv4Network):
@@ -144,6 +146,55 @@ class NetworkModel(BaseModel):
                        "range. See IPv4ReservedRange for more info.").format(reserved_range.model_dump())
             raise ValueError(msg_err)
         self.reserved_ranges.append(reserved_range)
+        if self._ipam is not None:
+            self._ipam.discard(int(reserved_range.start), int(reserved_range.end))
+
+    def get_ipam(self):
+        """
+        Returns the free addresses of the network (IPv4IntervalSet), the ranges used by the VIM and the reserved ones
+        are excluded.
+        """
+        if self._ipam is None:
+            from nfvcl.utils.ipam import build_network_ipam
+            self._ipam = build_network_ipam(self.cidr, self.allocation_pool + self.reserved_ranges)
+        return self._ipam
+
+    def find_free_range(self, range_length: int, alignment: int = 1, best_fit: bool = True) -> IPv4Pool:
+        """
+        Look for a free range in the network, the range is NOT reserved.
+        Args:
+            range_length: The length of the range (the range goes from start to start + range_length)
+            alignment: The start address must be a multiple of it
+            best_fit: Use the smallest free interval that can contain the range, otherwise the first one
+
+        Returns:
+            The free range
+
+        Raises:
+            ValueError if there is no free range
+        """
+        from nfvcl.utils.ipam import find_range_in_ipam
+        return find_range_in_ipam(self.get_ipam(), range_length, alignment, best_fit)
+
+    def _release_in_ipam(self, released_range: IPv4ReservedRange):
+        if self._ipam is None:
+            return
+        # The addresses used by the VIM must remain unavailable
+        pieces = [(int(released_range.start), int(released_range.end))]
+        for pool in self.allocation_pool:
+            pool_start, pool_end = int(pool.start), int(pool.end)
+            remaining = []
+            for start, end in pieces:
+                if end < pool_start or pool_end < start:
+                    remaining.append((start, end))
+                    continue
+                if start < pool_start:
+                    remaining.append((start, pool_start - 1))
+                if pool_end < end:
+                    remaining.append((pool_end + 1, end))
+            pieces = remaining
+        for start, end in pieces:
+            self._ipam.release(start, end)
 
     def release_range(self, owner: str, ip_range: IPv4ReservedRange) \
         -> Union[IPv4ReservedRange, None]:
@@ -164,6 +215,7 @@ class NetworkModel(BaseModel):
                 # Checking reserved range has the required owner
                 if reserved_range.owner == owner:
                     self.reserved_ranges.remove(reserved_range)
+                    self._release_in_ipam(reserved_range)
                     return reserved_range
             else:
                 # Ensure that the owner inside the reservation is the required one
@@ -171,6 +223,7 @@ class NetworkModel(BaseModel):
                 # Checking reserved range is equal to the required one (owner, start ip, end ip)
                 if reserved_range == ip_range:
                     self.reserved_ranges.remove(reserved_range)
+                    self._release_in_ipam(reserved_range)
                     return reserved_range
 
         return None
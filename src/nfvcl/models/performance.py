@@ -11,6 +11,12 @@ class BlueprintPerformanceType(str, Enum):
     DAY2 = 'day2'
     DELETION = 'deletion'
 
+class PerformanceOutcome(str, Enum):
+    OK = 'ok'
+    ERROR = 'error'
+    # The provider call was still in progress when its operation ended
+    ABORTED = 'aborted'
+
 class BlueprintPerformanceProviderCall(NFVCLBaseModel):
     id: str = Field()
     method_name: str = Field()
@@ -18,6 +24,18 @@ class BlueprintPerformanceProviderCall(NFVCLBaseModel):
     start: datetime = Field()
     end: Optional[datetime] = Field(default=None)
     duration: Optional[int] = Field(default=None)
+    outcome: Optional[PerformanceOutcome] = Field(default=None, description="The outcome of the call, None while in progress")
+    error: Optional[str] = Field(default=None, description="The class of the exception raised by the call")
+    retries: int = Field(default=0, description="The attempts repeated during the call (e.g. waiting for SSH)")
+
+class PerformanceTraceParent(NFVCLBaseModel):
+    """
+    The provider call (of another blueprint operation) that triggered an operation, e.g. the creation of a child blueprint
+    """
+    trace_id: str = Field(description="The id of the first operation of the trace")
+    blueprint_id: str = Field()
+    operation_id: str = Field()
+    provider_call_id: str = Field()
 
 class BlueprintPerformanceOperation(NFVCLBaseModel):
     id: str = Field()
@@ -27,9 +45,78 @@ class BlueprintPerformanceOperation(NFVCLBaseModel):
     end: Optional[datetime] = Field(default=None)
     duration: Optional[int] = Field(default=None)
     provider_calls: List[BlueprintPerformanceProviderCall] = Field(default_factory=list)
+    outcome: Optional[PerformanceOutcome] = Field(default=None, description="The outcome of the operation, None while in progress")
+    error: Optional[str] = Field(default=None, description="The class of the exception raised by the operation")
+    trace_id: Optional[str] = Field(default=None, description="The id of the first operation of the trace, the operation id if it has no parent")
+    parent: Optional[PerformanceTraceParent] = Field(default=None)
 
 class BlueprintPerformance(NFVCLBaseModel):
     blueprint_id: str = Field()
     blueprint_type: str = Field()
     start: datetime = Field()
     operations: List[BlueprintPerformanceOperation] = Field(default_factory=list)
+
+class PerformanceDurationStats(NFVCLBaseModel):
+    """
+    Statistics (in milliseconds) of the durations of a group of operations or provider calls
+    """
+    group: Dict[str, str] = Field(default_factory=dict, description="The values identifying the group (e.g. blueprint_type, method_name)")
+    count: int = Field()
+    mean: float = Field()
+    p50: int = Field()
+    p95: int = Field()
+    p99: int = Field()
+    max: int = Field()
+
+class PerformanceSlowProviderCall(NFVCLBaseModel):
+    blueprint_id: str = Field()
+    blueprint_type: str = Field()
+    operation_id: str = Field()
+    op_name: str = Field()
+    method_name: str = Field()
+    info: Dict[str, str] = Field(default_factory=dict)
+    start: datetime = Field()
+    duration: int = Field()
+    outcome: Optional[PerformanceOutcome] = Field(default=None)
+    error: Optional[str] = Field(default=None)
+    retries: int = Field(default=0)
+
+class PerformanceDay0Breakdown(NFVCLBaseModel):
+    """
+    Where the time (in milliseconds) of the DAY0 operations of a blueprint type is spent.
+    Provider calls executed in parallel are all counted, for this reason the sum of the categories can exceed the total duration.
+    """
+    blueprint_type: str = Field()
+    operations: int = Field(description="The number of DAY0 operations")
+    total_duration: int = Field(description="The sum of the durations of the DAY0 operations")
+    categories: Dict[str, int] = Field(default_factory=dict, description="The sum of the durations of the provider calls of every category")
+    not_in_provider_calls: int = Field(description="The time of the operations not spent in provider calls, 0 when the provider calls overlap")
+
+class PerformanceSpanKind(str, Enum):
+    OPERATION = 'operation'
+    PROVIDER_CALL = 'provider_call'
+
+class PerformanceSpan(NFVCLBaseModel):
+    """
+    An operation or a provider call in a trace, the children of an operation are its provider calls and the children
+    of a provider call are the operations of other blueprints triggered by the call.
+    """
+    id: str = Field()
+    parent_id: Optional[str] = Field(default=None)
+    kind: PerformanceSpanKind = Field()
+    name: str = Field()
+    blueprint_id: str = Field()
+    blueprint_type: str = Field()
+    start: datetime = Field()
+    end: Optional[datetime] = Field(default=None)
+    duration: Optional[int] = Field(default=None)
+    info: Dict[str, str] = Field(default_factory=dict)
+    outcome: Optional[PerformanceOutcome] = Field(default=None)
+    error: Optional[str] = Field(default=None)
+    critical: bool = Field(default=False, description="If the span is in the critical path of the trace")
+    children: List['PerformanceSpan'] = Field(default_factory=list)
+
+class PerformanceTrace(NFVCLBaseModel):
+    trace_id: str = Field()
+    spans: List[PerformanceSpan] = Field(default_factory=list, description="The spans without a parent, the first is the root of the trace")
+    critical_path: List[str] = Field(default_factory=list, description="The ids of the spans in the critical path, from the root")
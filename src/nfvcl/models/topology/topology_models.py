@@ -3,8 +3,8 @@ from nfvcl.models.network import NetworkModel, RouterModel, PduModel
 from nfvcl.models.prometheus.prometheus_model import PrometheusServerModel
 from nfvcl.models.vim import VimModel
 from nfvcl.models.k8s.topology_k8s_model import TopologyK8sModel
-from pydantic import BaseModel, HttpUrl, Field
-from typing import List, Optional
+from pydantic import BaseModel, HttpUrl, Field, PrivateAttr
+from typing import List, Optional, Dict, Tuple, Any, Callable
 from nfvcl.utils.log import create_logger
 
 logger: Logger = create_logger('Topology model')
@@ -18,6 +18,51 @@ class TopoK8SNotFoundException(Exception):
     pass
 
 
+class TopologyIndexes:
+    """
+    Secondary indexes of the topology lists, they contain the positions of the items in the lists of TopologyModel.
+    Items with the same key are kept in list order such that the first match is the same one of a linear scan.
+    """
+
+    def __init__(self, topology: 'TopologyModel'):
+        self.sizes = TopologyIndexes.list_sizes(topology)
+        self.vims_by_name: Dict[str, int] = {}
+        self.vims_by_area: Dict[int, List[int]] = {}
+        self.k8s_by_name: Dict[str, int] = {}
+        self.k8s_by_area: Dict[int, List[int]] = {}
+        self.networks_by_name: Dict[str, int] = {}
+        self.routers_by_name: Dict[str, int] = {}
+        self.routers_by_net: Dict[str, List[int]] = {}
+        self.pdus_by_name: Dict[str, int] = {}
+        self.pdus_by_area_type: Dict[Tuple[int, str], List[int]] = {}
+
+        for index, vim in enumerate(topology.vims):
+            self.vims_by_name.setdefault(vim.name, index)
+            for area in vim.areas:
+                self.vims_by_area.setdefault(area, []).append(index)
+        for index, k8s_cluster in enumerate(topology.kubernetes):
+            self.k8s_by_name.setdefault(k8s_cluster.name, index)
+            for area in k8s_cluster.areas:
+                self.k8s_by_area.setdefault(area, []).append(index)
+        for index, network in enumerate(topology.networks):
+            self.networks_by_name.setdefault(network.name, index)
+        for index, router in enumerate(topology.routers):
+            self.routers_by_name.setdefault(router.name, index)
+            # A router is listed once for every network, even if it has multiple ports on it
+            for net_name in dict.fromkeys(port.net for port in router.ports):
+                self.routers_by_net.setdefault(net_name, []).append(index)
+        for index, pdu in enumerate(topology.pdus):
+            self.pdus_by_name.setdefault(pdu.name, index)
+            self.pdus_by_area_type.setdefault((pdu.area, pdu.type), []).append(index)
+
+    @staticmethod
+    def list_sizes(topology: 'TopologyModel') -> Tuple[int, ...]:
+        """
+        The sizes of the indexed lists, if they change the indexes are stale
+        """
+        return len(topology.vims), len(topology.kubernetes), len(topology.networks), len(topology.routers), len(topology.pdus)
+
+
 class TopologyModel(BaseModel):
     id: Optional[str] = Field(default='topology')
     callback: Optional[HttpUrl] = Field(default=None)
@@ -30,6 +75,54 @@ class TopologyModel(BaseModel):
     # " installed deployed services. When needed the NFVCL will add a new job to the server in order to pull data."
     prometheus_srv: List[PrometheusServerModel] = Field(default=[])
 
+    _indexes: Optional[TopologyIndexes] = PrivateAttr(default=None)
+
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        # Replacing a whole list (e.g. topology.vims = []) makes the indexes stale
+        if name in type(self).model_fields:
+            self.invalidate_indexes()
+
+    @property
+    def indexes(self) -> TopologyIndexes:
+        """
+        Secondary indexes of the topology, built when needed and dropped every time the topology lists are changed.
+        """
+        if self._indexes is None or self._indexes.sizes != TopologyIndexes.list_sizes(self):
+            self._indexes = TopologyIndexes(self)
+        return self._indexes
+
+    def _lookup(self, get_positions: Callable[[TopologyIndexes], List[int]], items: List[Any], matches: Callable[[Any], bool]) -> List[int]:
+        """
+        Find the positions of the items using the indexes. The items at the positions are checked, if they do not match
+        the indexes are stale (e.g. an item has been replaced in place) and they are rebuilt. A miss is trusted, changes
+        that add a key in place (e.g. renaming an item) must call invalidate_indexes.
+        Args:
+            get_positions: Return the positions of the items from the indexes
+            items: The list of the topology containing the items
+            matches: Check if an item is one of the searched ones
+
+        Returns:
+            The positions of the items in the list, empty if there are none
+        """
+        positions = get_positions(self.indexes)
+        if not all(position < len(items) and matches(items[position]) for position in positions):
+            self.invalidate_indexes()
+            positions = get_positions(self.indexes)
+        return positions
+
+    def _lookup_by_name(self, index: Callable[[TopologyIndexes], Dict[str, int]], items: List[Any], name: str) -> int:
+        positions = self._lookup(lambda indexes: [index(indexes)[name]] if name in index(indexes) else [], items, lambda item: item.name == name)
+        return positions[0] if len(positions) > 0 else -1
+
+    def invalidate_indexes(self):
+        """
+        Drop the secondary indexes, they will be rebuilt at the next lookup.
+        Lookups detect the stale hits by themselves but not the missing keys: this must be called after the changes to
+        the items that are not made through the methods of this class (e.g. renaming an item or adding an area to a VIM).
+        """
+        self._indexes = None
+
     def add_prometheus_srv(self, prom_srv: PrometheusServerModel):
         """
         Add a prometheus server instance to the topology
@@ -81,6 +174,7 @@ class TopologyModel(BaseModel):
             raise ValueError(msg_err)
 
         self.kubernetes.append(k8s_cluster)
+        self.invalidate_indexes()
 
     def del_k8s_cluster(self, k8s_cluster_id: str) -> TopologyK8sModel:
         """
@@ -96,6 +190,7 @@ class TopologyModel(BaseModel):
             raise TopoK8SHasBlueprintException('The cluster has blueprints deployed in it.')
 
         k8s_deleted = self.kubernetes.pop(k8s_index)
+        self.invalidate_indexes()
 
         return k8s_deleted
 
@@ -107,6 +202,7 @@ class TopologyModel(BaseModel):
 
         # Update in the topology information
         self.kubernetes[k8s_index] = k8s_cluster
+        self.invalidate_indexes()
 
         return k8s_cluster
 
@@ -122,6 +218,7 @@ class TopologyModel(BaseModel):
             raise ValueError(msg_err)
 
         self.pdus.append(pdu)
+        self.invalidate_indexes()
         return pdu
 
     def del_pdu(self, pdu_name: str) -> PduModel:
@@ -133,7 +230,9 @@ class TopologyModel(BaseModel):
         Returns: The removed PDU
         """
         pdu_index = self.find_pdu_index(pdu_name)
-        return self.pdus.pop(pdu_index)
+        deleted_pdu = self.pdus.pop(pdu_index)
+        self.invalidate_indexes()
+        return deleted_pdu
 
     def upd_pdu(self, pdu: PduModel) -> PduModel:
         """
@@ -148,6 +247,7 @@ class TopologyModel(BaseModel):
 
         # Update in the topology information
         self.pdus[pdu_index] = pdu
+        self.invalidate_indexes()
 
         return pdu
 
@@ -184,6 +284,7 @@ class TopologyModel(BaseModel):
             raise ValueError(msg_err)
         else:
             self.vims.append(vim)
+            self.invalidate_indexes()
             return vim
 
     def del_vim(self, vim_name: str) -> VimModel:
@@ -194,7 +295,9 @@ class TopologyModel(BaseModel):
         Returns: the removed VIM
         """
         vim_index = self.find_vim_index(vim_name)
-        return self.vims.pop(vim_index)
+        deleted_vim = self.vims.pop(vim_index)
+        self.invalidate_indexes()
+        return deleted_vim
 
     def upd_vim(self, vim: VimModel) -> VimModel:
         """
@@ -206,6 +309,7 @@ class TopologyModel(BaseModel):
         """
         vim_index = self.find_vim_index(vim.name)
         self.vims[vim_index] = vim
+        self.invalidate_indexes()
         return vim
 
     def get_vim(self, vim_name) -> VimModel:
@@ -226,7 +330,8 @@ class TopologyModel(BaseModel):
         Returns: A VIM that have the required area.
         """
         item: VimModel
-        vim = next((item for item in self.vims if area_id in item.areas), None)
+        vim_indexes = self._lookup(lambda indexes: indexes.vims_by_area.get(area_id, []), self.vims, lambda vim: area_id in vim.areas)
+        vim = self.vims[vim_indexes[0]] if vim_indexes else None
         if vim is None:
             msg_err = "The VIM of area ->{}<- was not found in the topology.".format(area_id)
             logger.error(msg_err)
@@ -243,7 +348,7 @@ class TopologyModel(BaseModel):
         Returns: A VIM list that have the required area.
         """
         item: VimModel
-        vim_list = [item for item in self.vims if area_id in item.areas]
+        vim_list = [self.vims[index] for index in self._lookup(lambda indexes: indexes.vims_by_area.get(area_id, []), self.vims, lambda vim: area_id in vim.areas)]
         if 0 >= len(vim_list):
             msg_err = "The VIM of area ->{}<- was not found in the topology.".format(area_id)
             logger.error(msg_err)
@@ -282,6 +387,7 @@ class TopologyModel(BaseModel):
             raise ValueError(msg_err)
         else:
             self.networks.append(network)
+            self.invalidate_indexes()
             return network
 
     def del_network(self, network_name: str) -> NetworkModel:
@@ -293,7 +399,9 @@ class TopologyModel(BaseModel):
         Returns:  The deleted network from the topo
         """
         net_idx = self.find_net_index(network_name)
-        return self.networks.pop(net_idx)
+        deleted_network = self.networks.pop(net_idx)
+        self.invalidate_indexes()
+        return deleted_network
 
     def upd_network(self, network: NetworkModel) -> NetworkModel:
         """
@@ -305,6 +413,7 @@ class TopologyModel(BaseModel):
         """
         net_index = self.find_net_index(network.name)
         self.networks[net_index] = network
+        self.invalidate_indexes()
         return network
 
     def get_network(self, network_name) -> NetworkModel:
@@ -338,6 +447,7 @@ class TopologyModel(BaseModel):
             logger.error(msg_err)
             raise ValueError(msg_err)
         self.routers.append(router)
+        self.invalidate_indexes()
         return router
 
     def del_router(self, router_name: str) -> RouterModel:
@@ -349,7 +459,9 @@ class TopologyModel(BaseModel):
         Returns: The deleted router from the topo
         """
         router_idx = self.find_router_index(router_name)
-        return self.routers.pop(router_idx)
+        deleted_router = self.routers.pop(router_idx)
+        self.invalidate_indexes()
+        return deleted_router
 
     def upd_router(self, router: RouterModel) -> RouterModel:
         """
@@ -362,6 +474,7 @@ class TopologyModel(BaseModel):
         """
         router_idx = self.find_router_index(router.name)
         self.routers[router_idx] = router
+        self.invalidate_indexes()
         return router
 
     def get_router(self, router_name) -> RouterModel:
@@ -446,7 +559,7 @@ class TopologyModel(BaseModel):
         Returns:
             The position of the k8s cluster in the list
         """
-        k8s_cluster_index = next((index for index, item in enumerate(self.kubernetes) if item.name == cluster_name), -1)
+        k8s_cluster_index = self._lookup_by_name(lambda indexes: indexes.k8s_by_name, self.kubernetes, cluster_name)
         if k8s_cluster_index < 0:
             msg_err = "The K8s cluster ->{}<- was not found in the topology.".format(cluster_name)
             logger.debug(msg_err)
@@ -463,7 +576,8 @@ class TopologyModel(BaseModel):
         Returns:
             The position of the k8s cluster in the list
         """
-        k8s_cluster_index = next((index for index, item in enumerate(self.kubernetes) if area_id in item.areas), -1)
+        k8s_cluster_indexes = self._lookup(lambda indexes: indexes.k8s_by_area.get(area_id, []), self.kubernetes, lambda k8s_cluster: area_id in k8s_cluster.areas)
+        k8s_cluster_index = k8s_cluster_indexes[0] if k8s_cluster_indexes else -1
         if k8s_cluster_index < 0:
             msg_err = f"No K8S cluster has been found for area {area_id}"
             logger.debug(msg_err)
@@ -480,7 +594,7 @@ class TopologyModel(BaseModel):
         Returns:
             The position of the net in the list
         """
-        net_index = next((index for index, item in enumerate(self.networks) if item.name == net_name), -1)
+        net_index = self._lookup_by_name(lambda indexes: indexes.networks_by_name, self.networks, net_name)
         if net_index < 0:
             msg_err = "The network ->{}<- was not found in the topology.".format(net_name)
             logger.debug(msg_err)
@@ -497,7 +611,7 @@ class TopologyModel(BaseModel):
         Returns:
             The position of the vim in the list
         """
-        vim_index = next((index for index, item in enumerate(self.vims) if item.name == vim_name), -1)
+        vim_index = self._lookup_by_name(lambda indexes: indexes.vims_by_name, self.vims, vim_name)
         if vim_index < 0:
             msg_err = "The VIM ->{}<- was not found in the topology.".format(vim_name)
             logger.debug(msg_err)
@@ -514,7 +628,7 @@ class TopologyModel(BaseModel):
         Returns:
             The position of the router in the list
         """
-        router_index = next((index for index, item in enumerate(self.vims) if item.name == router_name), -1)
+        router_index = self._lookup_by_name(lambda indexes: indexes.routers_by_name, self.routers, router_name)
         if router_index < 0:
             msg_err = "The router ->{}<- was not found in the topology.".format(router_name)
             logger.debug(msg_err)
@@ -534,10 +648,35 @@ class TopologyModel(BaseModel):
         Raises:
             ValueError if the PDU is not found in the model
         """
-        pdu_index = next((index for index, item in enumerate(self.pdus) if item.name == pdu_name), -1)
+        pdu_index = self._lookup_by_name(lambda indexes: indexes.pdus_by_name, self.pdus, pdu_name)
         if pdu_index < 0:
             msg_err = "The PDU ->{}<- was not found in the topology.".format(pdu_index)
             logger.debug(msg_err)
             raise ValueError(msg_err)
 
         return pdu_index
+
+    def find_routers_in_net(self, net_name: str) -> List[RouterModel]:
+        """
+        Find the routers having at least one port connected to the network
+        Args:
+            net_name: The name of the network
+
+        Returns:
+            The list of routers connected to the network, empty if there are none
+        """
+        positions = self._lookup(lambda indexes: indexes.routers_by_net.get(net_name, []), self.routers, lambda router: any(port.net == net_name for port in router.ports))
+        return [self.routers[index] for index in positions]
+
+    def find_pdus(self, area: int, pdu_type: str) -> List[PduModel]:
+        """
+        Find the PDUs of a type in an area
+        Args:
+            area: The area of the PDUs
+            pdu_type: The type of the PDUs
+
+        Returns:
+            The list of matching PDUs, empty if there are none
+        """
+        positions = self._lookup(lambda indexes: indexes.pdus_by_area_type.get((area, pdu_type), []), self.pdus, lambda pdu: pdu.area == area and pdu.type == pdu_type)
+        return [self.pdus[index] for index in positions]
@@ -2,6 +2,7 @@
 # DO NOT MOVE THIS PIECE OF CODE -------
 # Log level must be set before loggers are created!
 from nfvcl.rest_endpoints.performance import performance_router
+from nfvcl.rest_endpoints.metrics import metrics_router
 from nfvcl.rest_endpoints.rest_utils import ansible_router
 from nfvcl.rest_endpoints.day2action import day2_router
 from nfvcl.rest_endpoints.k8s import k8s_router
@@ -11,6 +12,7 @@ from nfvcl.rest_endpoints.blue_ng_router import blue_ng_router as blue_ng_router
 from nfvcl.rest_endpoints.HORSE.horse import horse_router
 
 from nfvcl.rest_endpoints import blue_ng_router
+from nfvcl.utils.blocking_executor import BlockingExecutorTimeout
 from nfvcl.utils.file_utils import create_folder
 from nfvcl.utils.log import mod_logger, set_log_level
 from nfvcl.utils.util import get_nfvcl_config
@@ -23,8 +25,8 @@ from starlette import status
 import logging
 import signal
 import os
-from fastapi import FastAPI
-from fastapi.responses import RedirectResponse
+from fastapi import FastAPI, Request
+from fastapi.responses import RedirectResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 
 swagger_parameters = {"syntaxHighlight.theme": "obsidian", "deepLinking": True}
@@ -51,6 +53,7 @@ app.include_router(day2_router)
 app.include_router(k8s_router)
 app.include_router(ansible_router)
 app.include_router(performance_router)
+app.include_router(metrics_router)
 app.include_router(horse_router)
 
 # Making repositories available for external access. Configuration files will be served from here.
@@ -59,6 +62,14 @@ create_folder(accessible_folder)
 app.mount("/files", StaticFiles(directory=accessible_folder, html=True), name="mounted_files")
 
 
+@app.exception_handler(BlockingExecutorTimeout)
+async def blocking_executor_timeout_handler(request: Request, exc: BlockingExecutorTimeout):
+    """
+    A blocking operation (e.g. a call to an unreachable k8s cluster) has not been completed in time
+    """
+    return JSONResponse(status_code=status.HTTP_504_GATEWAY_TIMEOUT, content={"detail": str(exc)})
+
+
 @app.get("/", status_code=status.HTTP_308_PERMANENT_REDIRECT)
 async def redirect_to_swagger():
     """
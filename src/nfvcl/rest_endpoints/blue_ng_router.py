@@ -1,15 +1,20 @@
+import json
 import typing
+from datetime import datetime
 from functools import partial
 from typing import List, Optional, Callable
 
 import httpx
-from fastapi import APIRouter, Query, status, Request
+from fastapi import APIRouter, Query, status, Request, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 
 from nfvcl.blueprints_ng.blueprint_ng import BlueprintNG
 from nfvcl.blueprints_ng.lcm.blueprint_manager import get_blueprint_manager
 from nfvcl.blueprints_ng.lcm.blueprint_type_manager import blueprint_type
 from nfvcl.blueprints_ng.utils import clone_function_and_patch_types
 from nfvcl.models.base_model import NFVCLBaseModel
+from nfvcl.models.blueprint_ng.blueprint_list import BlueprintNGListFilter, BlueprintNGListPage
 from nfvcl.models.blueprint_ng.worker_message import WorkerMessageType, BlueprintOperationCallbackModel
 from nfvcl.models.http_models import HttpRequestType
 from nfvcl.models.response_model import OssCompliantResponse, OssStatus
@@ -109,6 +114,96 @@ async def get_blueprints(blue_type: Optional[str] = Query(default=None), detaile
     return blue_man.get_blueprint_summary_list(blue_type, detailed=detailed)
 
 
+def get_list_filter(
+    blue_type: Optional[str] = None,
+    status: Optional[str] = None,
+    error: Optional[bool] = None,
+    parent_blue_id: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    area: Optional[int] = None
+) -> BlueprintNGListFilter:
+    return BlueprintNGListFilter(blue_type=blue_type, status=status, error=error, parent_blue_id=parent_blue_id, created_after=created_after, created_before=created_before, area=area)
+
+
+@blue_ng_router.get("/list/page", response_model=BlueprintNGListPage)
+def get_blueprints_page(
+    blue_type: Optional[str] = Query(default=None),
+    status: Optional[str] = Query(default=None, description="The current operation of the blueprint (e.g. idle, deploying)"),
+    error: Optional[bool] = Query(default=None),
+    parent_blue_id: Optional[str] = Query(default=None),
+    created_after: Optional[datetime] = Query(default=None),
+    created_before: Optional[datetime] = Query(default=None),
+    area: Optional[int] = Query(default=None),
+    detailed: bool = Query(default=False),
+    cursor: Optional[str] = Query(default=None, description="The 'next_cursor' returned with the previous page"),
+    limit: int = Query(default=100, ge=1, le=1000)
+) -> BlueprintNGListPage:
+    """
+    Return a page of the list of deployed blueprints, filtered by the database. The database is queried synchronously,
+    this is not a coroutine such that FastAPI runs it in its thread pool instead of blocking the event loop.
+
+    Args:
+        blue_type: The type, used to filter the list.
+        status: The current operation of the blueprints.
+        error: If the blueprints are in error or not.
+        parent_blue_id: The ID of the parent blueprint.
+        created_after: Minimum creation date.
+        created_before: Maximum creation date.
+        area: An area where the blueprints have resources.
+        detailed: If true, return all the info saved in the database about the blueprints.
+        cursor: The cursor of the page, None for the first one.
+        limit: The maximum number of blueprints in the page.
+
+    Returns:
+        The page of blueprints with the cursor of the next page.
+    """
+    blue_man = get_blueprint_manager()
+    list_filter = get_list_filter(blue_type, status, error, parent_blue_id, created_after, created_before, area)
+    try:
+        return blue_man.get_blueprint_summary_page(list_filter, detailed=detailed, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@blue_ng_router.get("/list/stream")
+def get_blueprints_stream(
+    blue_type: Optional[str] = Query(default=None),
+    status: Optional[str] = Query(default=None, description="The current operation of the blueprint (e.g. idle, deploying)"),
+    error: Optional[bool] = Query(default=None),
+    parent_blue_id: Optional[str] = Query(default=None),
+    created_after: Optional[datetime] = Query(default=None),
+    created_before: Optional[datetime] = Query(default=None),
+    area: Optional[int] = Query(default=None),
+    detailed: bool = Query(default=False)
+) -> StreamingResponse:
+    """
+    Return the list of deployed blueprints as NDJSON (one blueprint per line), the blueprints are streamed while they
+    are read from the database.
+
+    Args:
+        blue_type: The type, used to filter the list.
+        status: The current operation of the blueprints.
+        error: If the blueprints are in error or not.
+        parent_blue_id: The ID of the parent blueprint.
+        created_after: Minimum creation date.
+        created_before: Maximum creation date.
+        area: An area where the blueprints have resources.
+        detailed: If true, return all the info saved in the database about the blueprints.
+
+    Returns:
+        The streamed list of blueprints.
+    """
+    blue_man = get_blueprint_manager()
+    list_filter = get_list_filter(blue_type, status, error, parent_blue_id, created_after, created_before, area)
+
+    def ndjson_lines():
+        for blueprint_dict in blue_man.iter_blueprint_summaries(list_filter, detailed=detailed):
+            yield json.dumps(jsonable_encoder(blueprint_dict)) + "\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
 @blue_ng_router.get("/{blueprint_id}", response_model=dict)
 async def get_blueprint(blueprint_id: str, detailed: bool = Query(default=False)):
     """
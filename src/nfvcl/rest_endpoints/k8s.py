@@ -1,5 +1,5 @@
 import json
-from typing import List
+from typing import List, Callable, TypeVar
 
 from fastapi import APIRouter, HTTPException, Body, status
 from kubernetes.client import V1PodList, V1Namespace, ApiException, V1ServiceAccountList, V1ServiceAccount, \
@@ -23,6 +23,7 @@ from nfvcl.utils.k8s.kube_api_utils import get_service_accounts, k8s_get_roles,
     k8s_admin_role_over_namespace, \
     k8s_delete_namespace, k8s_add_quota_to_namespace, k8s_cluster_admin, k8s_add_label_to_k8s_node, k8s_get_nodes, \
     k8s_add_label_to_k8s_deployment, k8s_scale_k8s_deployment, k8s_get_deployments
+from nfvcl.utils.blocking_executor import run_blocking, run_blocking_on_cluster
 from nfvcl.utils.log import create_logger
 from nfvcl.utils.redis_utils.event_types import K8sEventType
 from nfvcl.utils.redis_utils.redis_manager import get_redis_instance, trigger_redis_event
@@ -36,6 +37,8 @@ k8s_router = APIRouter(
 logger: VerboseLogger = create_logger('K8s Management REST endpoint')
 redis_cli = get_redis_instance()
 
+T = TypeVar("T")
+
 
 def get_k8s_cluster_by_id(cluster_id: str) -> TopologyK8sModel:
     """
@@ -87,6 +90,34 @@ def get_k8s_cluster_by_area(area_id: int) -> TopologyK8sModel:
         raise HTTPException(status_code=404, detail=error_msg)
 
 
+async def run_on_k8s_cluster(cluster_id: str, func: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Execute a (blocking) k8s function on a cluster of the topology without blocking the event loop. The function is
+    executed in the blocking executor, limiting the concurrent operations on the same cluster.
+
+    Args:
+
+        cluster_id: the cluster ID that identify a k8s cluster in the topology.
+
+        func: the k8s function, the client configuration of the cluster is given as first argument
+
+        *args: the other positional arguments of the function
+
+        **kwargs: the keyword arguments of the function
+
+    Returns:
+
+        The result of the function. Throw HTTPException if the cluster is NOT found.
+    """
+    cluster: TopologyK8sModel = await run_blocking(get_k8s_cluster_by_id, cluster_id)
+
+    def _run() -> T:
+        k8s_config = get_k8s_config_from_file_content(cluster.credentials, cluster.name)
+        return func(k8s_config, *args, **kwargs)
+
+    return await run_blocking_on_cluster(cluster.name, _run)
+
+
 @k8s_router.get("/{cluster_id}/plugins", response_model=List[K8sPluginName], summary="", description="")
 async def get_k8s_installed_plugins(cluster_id: str):
     """
@@ -100,9 +131,13 @@ async def get_k8s_installed_plugins(cluster_id: str):
 
         A list of installed plugins
     """
-    cluster: TopologyK8sModel = get_k8s_cluster_by_id(cluster_id)
-    helm_plugin_manager = HelmPluginManager(cluster.credentials, "K8S REST UTILS")
-    return helm_plugin_manager.get_installed_plugins()
+    cluster: TopologyK8sModel = await run_blocking(get_k8s_cluster_by_id, cluster_id)
+
+    def _get_installed_plugins() -> List[K8sPluginName]:
+        helm_plugin_manager = HelmPluginManager(cluster.credentials, "K8S REST UTILS")
+        return helm_plugin_manager.get_installed_plugins()
+
+    return await run_blocking_on_cluster(cluster.name, _get_installed_plugins)
 
 
 @k8s_router.put("/{cluster_id}/plugins", response_model=RestAnswer202, status_code=status.HTTP_202_ACCEPTED)
@@ -123,7 +158,7 @@ async def install_k8s_plugin(cluster_id: str, message: K8sPluginsToInstall):
         subscribing to NFVCL log at the redis instance.
     """
     # Return 404 error if the cluster does not exist
-    cluster: TopologyK8sModel = get_k8s_cluster_by_id(cluster_id)
+    cluster: TopologyK8sModel = await run_blocking(get_k8s_cluster_by_id, cluster_id)
 
     request = K8sModelManagement(k8s_ops=K8sOperationType.INSTALL_PLUGIN, cluster_id=cluster.name, data=json.dumps(message.model_dump()))
 
@@ -146,7 +181,7 @@ async def apply_to_k8s(cluster_id: str, body=Body(...)):
 
     """
     # Return 404 error if the cluster does not exist
-    cluster: TopologyK8sModel = get_k8s_cluster_by_id(cluster_id)
+    cluster: TopologyK8sModel = await run_blocking(get_k8s_cluster_by_id, cluster_id)
 
     request = K8sModelManagement(k8s_ops=K8sOperationType.APPLY_YAML, cluster_id=cluster_id, data=body.decode('utf-8'))
 
@@ -169,13 +204,9 @@ async def get_k8s_cidr(cluster_id: str):
         a dict {"cidr": "x.y.z.k/z"} containing the cidr of the pod network.
     """
 
-    # Get k8s cluster and k8s config for client
-    cluster: TopologyK8sModel = get_k8s_cluster_by_id(cluster_id)
-    k8s_config = get_k8s_config_from_file_content(cluster.credentials)
-
     try:
         # Try to install plugins to cluster
-        cidr_info = get_k8s_cidr_info(k8s_config)
+        cidr_info = await run_on_k8s_cluster(cluster_id, get_k8s_cidr_info)
 
     except ValueError as val_err:
         logger.error(val_err)
@@ -200,13 +231,9 @@ async def get_k8s_pods(cluster_id: str, namespace: str = ""):
         a V1PodList list with pod belonging to the specified namespace
     """
 
-    # Get k8s cluster and k8s config for client
-    cluster: TopologyK8sModel = get_k8s_cluster_by_id(cluster_id)
-    k8s_config = get_k8s_config_from_file_content(cluster.credentials)
-
     try:
         # Try to install plugins to cluster
-        pod_list: V1PodList = get_pods_for_k8s_namespace(kube_client_config=k8s_config, namespace=namespace)
+        pod_list: V1PodList = await run_on_k8s_cluster(cluster_id, get_pods_for_k8s_namespace, namespace=namespace)
 
     except ValueError as val_err:
         logger.error(val_err)
@@ -240,13 +267,9 @@ async def create_k8s_namespace(cluster_id: str, name: str = "", labels: dict = B
         the created namespace
     """
 
-    # Get k8s cluster and k8s config for client
-    cluster: TopologyK8sModel = get_k8s_cluster_by_id(cluster_id)
-    k8s_config = get_k8s_config_from_file_content(cluster.credentials)
-
     try:
         # Try to install plugins to cluster
-        created_namespace: V1Namespace = k8s_create_namespace(k8s_config, namespace_name=name, labels=labels)
+        created_namespace: V1Namespace = await run_on_k8s_cluster(cluster_id, k8s_create_namespace, namespace_name=name, labels=labels)
 
     except (ValueError, ApiException) as val_err:
         logger.error(val_err)
@@ -271,13 +294,9 @@ async def delete_k8s_namespace(cluster_id: str, name: str = ""):
         the created namespace
     """
 
-    # Get k8s cluster and k8s config for client
-    cluster: TopologyK8sModel = get_k8s_cluster_by_id(cluster_id)
-    k8s_config = get_k8s_config_from_file_content(cluster.credentials)
-
     try:
         # Try to install plugins to cluster
-        created_namespace: V1Namespace = k8s_delete_namespace(k8s_config, namespace_name=name)
+        created_namespace: V1Namespace = await run_on_k8s_cluster(cluster_id, k8s_delete_namespace, namespace_name=name)
 
     except (ValueError, ApiException) as val_err:
         logger.error(val_err)
@@ -304,14 +323,10 @@ async def get_k8s_service_account(cluster_id: str, username: str = "", namespace
         A user list (V1ServiceAccountList)
     """
 
-    # Get k8s cluster and k8s config for client
-    cluster: TopologyK8sModel = get_k8s_cluster_by_id(cluster_id)
-    k8s_config = get_k8s_config_from_file_content(cluster.credentials)
-
     try:
         # Retrieving service account list filtered by username and namespace
-        user_accounts: V1ServiceAccountList = get_service_accounts(kube_client_config=k8s_config, username=username,
-                                                                   namespace=namespace)
+        user_accounts: V1ServiceAccountList = await run_on_k8s_cluster(cluster_id, get_service_accounts, username=username,
+                                                                       namespace=namespace)
 
     except (ValueError, ApiException) as val_err:
         logger.error(val_err)
@@ -336,14 +351,10 @@ async def get_k8s_roles(cluster_id: str, rolename: str = "", namespace: str = ""
         A role list (V1ClusterRoleList)
     """
 
-    # Get k8s cluster and k8s config for client
-    cluster: TopologyK8sModel = get_k8s_cluster_by_id(cluster_id)
-    k8s_config = get_k8s_config_from_file_content(cluster.credentials)
-
     try:
         # Retrieving service account list filtered by username and namespace
-        role_list: V1ClusterRoleList = k8s_get_roles(kube_client_config=k8s_config, rolename=rolename,
-                                                     namespace=namespace)
+        role_list: V1ClusterRoleList = await run_on_k8s_cluster(cluster_id, k8s_get_roles, rolename=rolename,
+                                                                namespace=namespace)
 
     except (ValueError, ApiException) as val_err:
         logger.error(val_err)
@@ -366,12 +377,8 @@ async def get_k8s_namespace_list(cluster_id: str, namespace: str = ""):
         A namespace list (V1NamespaceList)
     """
 
-    # Get k8s cluster and k8s config for client
-    cluster: TopologyK8sModel = get_k8s_cluster_by_id(cluster_id)
-    k8s_config = get_k8s_config_from_file_content(cluster.credentials)
-
     try:
-        namespace_list: V1NamespaceList = get_k8s_namespaces(kube_client_config=k8s_config, namespace=namespace)
+        namespace_list: V1NamespaceList = await run_on_k8s_cluster(cluster_id, get_k8s_namespaces, namespace=namespace)
 
     except (ValueError, ApiException) as val_err:
         logger.error(val_err)
@@ -398,14 +405,10 @@ async def give_admin_rights_to_sa(cluster_id: str, namespace: str, s_account: st
         The created role binding (V1RoleBinding)
     """
 
-    # Get k8s cluster and k8s config for client
-    cluster: TopologyK8sModel = get_k8s_cluster_by_id(cluster_id)
-    k8s_config = get_k8s_config_from_file_content(cluster.credentials)
-
     try:
         # Retrieving service account list filtered by username and namespace
-        role_bind_res: V1RoleBinding = k8s_admin_role_to_sa(kube_client_config=k8s_config, namespace=namespace,
-                                                            username=s_account, role_binding_name=role_binding_name)
+        role_bind_res: V1RoleBinding = await run_on_k8s_cluster(cluster_id, k8s_admin_role_to_sa, namespace=namespace,
+                                                                username=s_account, role_binding_name=role_binding_name)
 
     except (ValueError, ApiException) as val_err:
         logger.error(val_err)
@@ -434,14 +437,10 @@ async def give_admin_rights_to_user_namespaced(cluster_id: str, namespace: str,
         The created role binding (V1RoleBinding)
     """
 
-    # Get k8s cluster and k8s config for client
-    cluster: TopologyK8sModel = get_k8s_cluster_by_id(cluster_id)
-    k8s_config = get_k8s_config_from_file_content(cluster.credentials)
-
     try:
         # Retrieving service account list filtered by username and namespace
-        role_bind_res: V1RoleBinding = k8s_admin_role_over_namespace(kube_client_config=k8s_config, namespace=namespace,
-                                                                     username=user, role_binding_name=role_binding_name)
+        role_bind_res: V1RoleBinding = await run_on_k8s_cluster(cluster_id, k8s_admin_role_over_namespace, namespace=namespace,
+                                                                username=user, role_binding_name=role_binding_name)
 
     except (ValueError, ApiException) as val_err:
         logger.error(val_err)
@@ -467,12 +466,8 @@ async def give_cluster_admin_rights(cluster_id: str, user: str, cluster_role_bin
         The created role binding (V1RoleBinding)
     """
 
-    # Get k8s cluster and k8s config for client
-    cluster: TopologyK8sModel = get_k8s_cluster_by_id(cluster_id)
-    k8s_config = get_k8s_config_from_file_content(cluster.credentials)
-
     try:
-        role_bind_res: V1ClusterRoleBinding = k8s_cluster_admin(kube_client_config=k8s_config, username=user, role_binding_name=cluster_role_binding_name)
+        role_bind_res: V1ClusterRoleBinding = await run_on_k8s_cluster(cluster_id, k8s_cluster_admin, username=user, role_binding_name=cluster_role_binding_name)
 
     except (ValueError, ApiException) as val_err:
         logger.error(val_err)
@@ -497,14 +492,10 @@ async def create_service_account(cluster_id: str, namespace: str, user: str):
         The created user (V1ServiceAccount)
     """
 
-    # Get k8s cluster and k8s config for client
-    cluster: TopologyK8sModel = get_k8s_cluster_by_id(cluster_id)
-    k8s_config = get_k8s_config_from_file_content(cluster.credentials)
-
     try:
         # Creating service account
-        user_creation_res: V1ServiceAccount = k8s_create_service_account(kube_client_config=k8s_config, namespace=namespace,
-                                                                         username=user)
+        user_creation_res: V1ServiceAccount = await run_on_k8s_cluster(cluster_id, k8s_create_service_account, namespace=namespace,
+                                                                       username=user)
 
     except (ValueError, ApiException) as val_err:
         logger.error(val_err)
@@ -531,15 +522,10 @@ async def create_secret_for_sa(cluster_id: str, namespace: str, user: str, secre
         The created secret (V1Secret)
     """
 
-    # Get k8s cluster and k8s config for client
-    cluster: TopologyK8sModel = get_k8s_cluster_by_id(cluster_id)
-    k8s_config = get_k8s_config_from_file_content(cluster.credentials)
-
     try:
         # Retrieving service account list filtered by username and namespace
-        created_secret: V1Secret = k8s_create_secret_for_user(kube_client_config=k8s_config,
-                                                              namespace=namespace, username=user,
-                                                              secret_name=secret_name)
+        created_secret: V1Secret = await run_on_k8s_cluster(cluster_id, k8s_create_secret_for_user, namespace=namespace, username=user,
+                                                            secret_name=secret_name)
 
     except (ValueError, ApiException) as val_err:
         logger.error(val_err)
@@ -566,13 +552,8 @@ async def get_secrets(cluster_id: str, namespace: str = "", secret_name: str = "
         The filtered list of secrets
     """
 
-    # Get k8s cluster and k8s config for client
-    cluster: TopologyK8sModel = get_k8s_cluster_by_id(cluster_id)
-    k8s_config = get_k8s_config_from_file_content(cluster.credentials)
-
     try:
-        auth_response: V1SecretList = k8s_get_secrets(kube_client_config=k8s_config,
-                                                      namespace=namespace, secret_name=secret_name, owner=owner)
+        auth_response: V1SecretList = await run_on_k8s_cluster(cluster_id, k8s_get_secrets, namespace=namespace, secret_name=secret_name, owner=owner)
 
     except (ValueError, ApiException) as val_err:
         logger.error(val_err)
@@ -605,11 +586,7 @@ async def create_admin_sa_for_namespace(cluster_id: str, namespace: str, usernam
 
     """
 
-    # Get k8s cluster and k8s config for client
-    cluster: TopologyK8sModel = get_k8s_cluster_by_id(cluster_id)
-    k8s_config = get_k8s_config_from_file_content(cluster.credentials)
-
-    try:
+    def _create_admin_sa(k8s_config) -> dict:
         # Creating SA
         sa = k8s_create_service_account(kube_client_config=k8s_config, namespace=namespace, username=username)
         # Creating role binding to be admin
@@ -621,9 +598,12 @@ async def create_admin_sa_for_namespace(cluster_id: str, namespace: str, usernam
         # Returning secret WITH token included
         detailed_secret = k8s_get_secrets(kube_client_config=k8s_config, namespace=namespace, secret_name=secret.metadata.name)
 
-        result = {"service_account": sa.to_dict(),
-                  "binding_role": role.to_dict(),
-                  "secret": detailed_secret.to_dict()}
+        return {"service_account": sa.to_dict(),
+                "binding_role": role.to_dict(),
+                "secret": detailed_secret.to_dict()}
+
+    try:
+        result = await run_on_k8s_cluster(cluster_id, _create_admin_sa)
 
     except (ValueError, ApiException) as val_err:
         logger.error(val_err)
@@ -650,13 +630,9 @@ async def create_k8s_kubectl_user(cluster_id: str, username: str, expire_seconds
         converted from base64.
     """
 
-    # Get k8s cluster and k8s config for client
-    cluster: TopologyK8sModel = get_k8s_cluster_by_id(cluster_id)
-    k8s_config = get_k8s_config_from_file_content(cluster.credentials)
-
     try:
-        auth_response: dict = k8s_cert_sign_req(kube_client_config=k8s_config, username=username,
-                                                expiration_sec=expire_seconds)
+        auth_response: dict = await run_on_k8s_cluster(cluster_id, k8s_cert_sign_req, username=username,
+                                                       expiration_sec=expire_seconds)
 
     except (ValueError, ApiException) as val_err:
         logger.error(val_err)
@@ -682,13 +658,9 @@ async def apply_resource_quota_namespace(cluster_id: str, namespace: str, quota_
         The created quota.
     """
 
-    # Get k8s cluster and k8s config for client
-    cluster: TopologyK8sModel = get_k8s_cluster_by_id(cluster_id)
-    k8s_config = get_k8s_config_from_file_content(cluster.credentials)
-
     try:
-        quota_resp: V1ResourceQuota = k8s_add_quota_to_namespace(kube_client_config=k8s_config, namespace_name=namespace,
-                                                                 quota_name=quota_name, quota=quota)
+        quota_resp: V1ResourceQuota = await run_on_k8s_cluster(cluster_id, k8s_add_quota_to_namespace, namespace_name=namespace,
+                                                               quota_name=quota_name, quota=quota)
 
     except (ValueError, ApiException) as val_err:
         logger.error(val_err)
@@ -713,13 +685,11 @@ async def get_nodes(cluster_id: str, detailed: bool = False):
     Returns:
         If detailed a list with only names is retrieved, otherwise a V1PodList in dict form is retrieved.
     """
-    cluster: TopologyK8sModel = get_k8s_cluster_by_id(cluster_id)
-    k8s_config = get_k8s_config_from_file_content(cluster.credentials)
     if detailed:
-        node_list: V1NodeList = k8s_get_nodes(k8s_config, detailed=detailed)
+        node_list: V1NodeList = await run_on_k8s_cluster(cluster_id, k8s_get_nodes, detailed=detailed)
         to_return = node_list.to_dict()
     else:
-        name_list = k8s_get_nodes(k8s_config, detailed=detailed)
+        name_list = await run_on_k8s_cluster(cluster_id, k8s_get_nodes, detailed=detailed)
         to_return = {"nodes": name_list}
     return to_return
 
@@ -740,9 +710,7 @@ async def add_label_to_k8s_node(cluster_id: str, node_name: str, labels: Labels)
     Returns:
         The updated node V1Node in dict form
     """
-    cluster: TopologyK8sModel = get_k8s_cluster_by_id(cluster_id)
-    k8s_config = get_k8s_config_from_file_content(cluster.credentials)
-    node: V1Node = k8s_add_label_to_k8s_node(k8s_config, node_name=node_name, labels=labels)
+    node: V1Node = await run_on_k8s_cluster(cluster_id, k8s_add_label_to_k8s_node, node_name=node_name, labels=labels)
     return node.to_dict()
 
 
@@ -762,13 +730,11 @@ async def get_deployment(cluster_id: str, namespace: str, detailed: bool = False
     Returns:
         If detailed a list with only names is retrieved, otherwise a V1PodList in dict form is retrieved.
     """
-    cluster: TopologyK8sModel = get_k8s_cluster_by_id(cluster_id)
-    k8s_config = get_k8s_config_from_file_content(cluster.credentials)
     if detailed:
-        deployment_list: V1DeploymentList = k8s_get_deployments(k8s_config, namespace=namespace, detailed=detailed)
+        deployment_list: V1DeploymentList = await run_on_k8s_cluster(cluster_id, k8s_get_deployments, namespace=namespace, detailed=detailed)
         to_return = deployment_list.to_dict()
     else:
-        name_list = k8s_get_deployments(k8s_config, namespace=namespace, detailed=detailed)
+        name_list = await run_on_k8s_cluster(cluster_id, k8s_get_deployments, namespace=namespace, detailed=detailed)
         to_return = {"deployments": name_list}
     return to_return
 
@@ -789,9 +755,7 @@ async def add_label_to_k8s_deployment(cluster_id: str, namespace: str, deploymen
     Returns:
         The updated node V1Deployment in dict form
     """
-    cluster: TopologyK8sModel = get_k8s_cluster_by_id(cluster_id)
-    k8s_config = get_k8s_config_from_file_content(cluster.credentials)
-    deployment: V1Deployment = k8s_add_label_to_k8s_deployment(k8s_config, namespace=namespace, deployment_name=deployment_name, labels=labels)
+    deployment: V1Deployment = await run_on_k8s_cluster(cluster_id, k8s_add_label_to_k8s_deployment, namespace=namespace, deployment_name=deployment_name, labels=labels)
     return deployment.to_dict()
 
 
@@ -811,7 +775,5 @@ async def scale_k8s_deployment(cluster_id: str, namespace: str, deployment_name:
     Returns:
         The updated node V1Deployment in dict form
     """
-    cluster: TopologyK8sModel = get_k8s_cluster_by_id(cluster_id)
-    k8s_config = get_k8s_config_from_file_content(cluster.credentials)
-    deployment: V1Deployment = k8s_scale_k8s_deployment(k8s_config, namespace=namespace, deployment_name=deployment_name, replica_num=replica_number)
+    deployment: V1Deployment = await run_on_k8s_cluster(cluster_id, k8s_scale_k8s_deployment, namespace=namespace, deployment_name=deployment_name, replica_num=replica_number)
     return deployment.to_dict()
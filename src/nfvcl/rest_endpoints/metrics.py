@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from nfvcl.utils.metrics.metrics_registry import get_metrics_registry
+
+metrics_router = APIRouter(
+    tags=["Metrics API"],
+)
+
+# Content type of the Prometheus text exposition format
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse, status_code=200)
+def get_metrics():
+    """
+    Expose the NFVCL metrics (blueprint operation and provider call durations, workers) in the Prometheus format
+    """
+    return PlainTextResponse(get_metrics_registry().render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,5 +1,13 @@
-from fastapi import APIRouter
+import os
+from datetime import datetime
+from typing import Optional, List
+
+from fastapi import APIRouter, Query
 from nfvcl.blueprints_ng.lcm.performance_manager import get_performance_manager
+from nfvcl.models.performance import PerformanceDurationStats, PerformanceSlowProviderCall, PerformanceDay0Breakdown, \
+    PerformanceTrace
+from nfvcl.utils.file_utils import create_folder
+from nfvcl.utils.util import get_nfvcl_config
 
 from nfvcl.utils.log import create_logger
 
@@ -17,3 +25,57 @@ performance_manager = get_performance_manager()
 @performance_router.get("/blue/{blueprint_id}", status_code=200)
 def get(blueprint_id: str):
     return performance_manager.get_blue_performance(blueprint_id)
+
+@performance_router.get("/blue/{blueprint_id}/trace", response_model=PerformanceTrace, status_code=200)
+def get_blueprint_trace(blueprint_id: str):
+    """
+    The span tree (with the critical path) of the deployment (DAY0) of a blueprint, including the operations of the child blueprints.
+    """
+    return performance_manager.get_trace(performance_manager.get_day0_operation_id(blueprint_id))
+
+@performance_router.get("/trace/{operation_id}", response_model=PerformanceTrace, status_code=200)
+def get_trace(operation_id: str):
+    """
+    The span tree (with the critical path) of the trace containing the operation.
+    """
+    return performance_manager.get_trace(operation_id)
+
+@performance_router.get("/trace/{operation_id}/otel", status_code=200)
+def get_trace_otel(operation_id: str, save: bool = Query(default=False, description="Save the trace in the mounted folder (traces/<operation_id>.json)")):
+    """
+    The trace containing the operation in the OpenTelemetry (OTLP/JSON) format.
+    """
+    file_path = None
+    if save:
+        traces_folder = os.path.join(get_nfvcl_config().nfvcl.mounted_folder, "traces")
+        create_folder(traces_folder)
+        file_path = os.path.join(traces_folder, f"{operation_id}.json")
+    return performance_manager.export_trace_otel(operation_id, file_path)
+
+@performance_router.get("/stats/operations", response_model=List[PerformanceDurationStats], status_code=200)
+def get_operation_stats(since: Optional[datetime] = None, until: Optional[datetime] = None, blue_type: Optional[str] = None):
+    """
+    Duration percentiles (ms) of the blueprint operations, grouped by blueprint type, operation type, operation name and outcome.
+    """
+    return performance_manager.get_operation_stats(since, until, blue_type)
+
+@performance_router.get("/stats/provider_calls", response_model=List[PerformanceDurationStats], status_code=200)
+def get_provider_call_stats(since: Optional[datetime] = None, until: Optional[datetime] = None, blue_type: Optional[str] = None):
+    """
+    Duration percentiles (ms) of the provider calls, grouped by blueprint type, provider method name and outcome.
+    """
+    return performance_manager.get_provider_call_stats(since, until, blue_type)
+
+@performance_router.get("/stats/provider_calls/slowest", response_model=List[PerformanceSlowProviderCall], status_code=200)
+def get_slowest_provider_calls(since: Optional[datetime] = None, until: Optional[datetime] = None, blue_type: Optional[str] = None, method_name: Optional[str] = None, limit: int = Query(default=10, ge=1, le=1000)):
+    """
+    The slowest provider calls.
+    """
+    return performance_manager.get_slowest_provider_calls(since, until, blue_type, method_name, limit)
+
+@performance_router.get("/stats/day0_breakdown", response_model=List[PerformanceDay0Breakdown], status_code=200)
+def get_day0_breakdown(since: Optional[datetime] = None, until: Optional[datetime] = None, blue_type: Optional[str] = None):
+    """
+    Where the time (ms) of the DAY0 operations is spent (VM creation, Ansible, Helm, child blueprints) for every blueprint type.
+    """
+    return performance_manager.get_day0_breakdown(since, until, blue_type)
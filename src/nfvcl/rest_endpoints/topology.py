@@ -13,6 +13,7 @@ from nfvcl.topology.topology import Topology, topology_lock, build_topology
 from nfvcl.topology.topology_worker import topology_msg_queue
 from typing import List
 
+from nfvcl.utils.blocking_executor import run_blocking
 from nfvcl.utils.openstack.openstack_utils import check_openstack_instances
 from .rest_description import *
 from ..utils.database import get_nfvcl_database
@@ -29,7 +30,7 @@ async def get_topology() -> dict:
     Get information regarding the managed topology
     """
     # returning last saved topo
-    topology = Topology.from_db(topology_lock)
+    topology = await run_blocking(Topology.from_db, topology_lock)
     return topology.get()
 
 
@@ -73,7 +74,7 @@ async def delete_topology(terraform: bool = False):
 
 @topology_router.get("/vim/{vim_id}", response_model=VimModel)
 async def get_vim(vim_id: str):
-    topology = Topology.from_db(topology_lock)
+    topology = await run_blocking(Topology.from_db, topology_lock)
     try:
         vim: VimModel = topology.get_model().get_vim(vim_id)
         return vim
@@ -124,10 +125,10 @@ async def check_vims_operation():
     """
     Checks that images (required by nfvcl) and networks (in the vim info) are present in the VIMs belonging to the topology
     """
-    topology = build_topology()
+    topology = await run_blocking(build_topology)
     vim_list = topology.get_model().get_vims()
 
-    err_list = check_openstack_instances(vim_list)
+    err_list = await run_blocking(check_openstack_instances, vim_list)
     names = [vim.name for vim in err_list]
     if len(err_list)>0:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f'The following vims are not working: {names}')
@@ -165,7 +166,7 @@ async def get_network(network_id: str):
     Returns:
         NetworkModel containing data on the desired network
     """
-    topology = Topology.from_db(topology_lock)
+    topology = await run_blocking(Topology.from_db, topology_lock)
     net: NetworkModel = topology.get_network(network_id)
     return net
 
@@ -221,7 +222,7 @@ async def get_router(router_id: str):
     Returns:
         RouterModel containing data on the desired network
     """
-    topology = Topology.from_db(topology_lock)
+    topology = await run_blocking(Topology.from_db, topology_lock)
     router: RouterModel = topology.get_router(router_id)
     return router
 
@@ -272,7 +273,7 @@ async def get_pdu(pdu_id: str):
     Returns:
         PduModel containing data on the desired network
     """
-    topology = Topology.from_db(topology_lock)
+    topology = await run_blocking(Topology.from_db, topology_lock)
     pdu: PduModel = topology.get_pdu(pdu_id)
     return pdu
 
@@ -285,7 +286,7 @@ async def get_pdus():
     Returns:
         List[PduModel] containing list of PDU in the topology
     """
-    topology = Topology.from_db(topology_lock)
+    topology = await run_blocking(Topology.from_db, topology_lock)
     pdus: List[PduModel] = topology.get_pdus()
     return pdus
 
@@ -338,7 +339,8 @@ async def add_k8s_from_blueprint(cluster_info: K8sModelCreateFromBlueprint):
         OssCompliantResponse that confirm the operation has been submitted
     """
     # Loading the blueprint from the database and checking that exist. Then converting to model
-    blue_item = next((item for item in get_nfvcl_database().find_in_collection('blueprint-instances', {'id': cluster_info.blueprint_ref}, None)))
+    blue_items = await run_blocking(lambda: list(get_nfvcl_database().find_in_collection('blueprint-instances', {'id': cluster_info.blueprint_ref}, None)))
+    blue_item = next(iter(blue_items), None)
     if not blue_item:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                             detail='Blueprint {} not found'.format(cluster_info.blueprint_ref))
@@ -394,7 +396,7 @@ async def update_k8scluster(cluster: TopologyK8sModel):
     Returns:
         OssCompliantResponse that confirm the operation has been submitted
     """
-    topology = Topology.from_db(topology_lock)
+    topology = await run_blocking(Topology.from_db, topology_lock)
     try:
         topology.get_k8s_cluster(cluster.name)
     except ValueError:
@@ -430,7 +432,7 @@ async def get_k8scluster():
         The list of k8s clusters.
     """
 
-    topology = Topology.from_db(topology_lock)
+    topology = await run_blocking(Topology.from_db, topology_lock)
     return topology.get_k8s_clusters()
 
 
@@ -463,7 +465,7 @@ async def upd_prom(prom_srv: PrometheusServerModel):
     Returns:
         OssCompliantResponse that confirm the operation has been submitted
     """
-    topology = Topology.from_db(topology_lock)
+    topology = await run_blocking(Topology.from_db, topology_lock)
     try:
         topology.get_prometheus_server(prom_srv.id)
     except ValueError:
@@ -502,7 +504,7 @@ async def get_prom_list():
     Returns:
         The list of prometheus server.
     """
-    topology = Topology.from_db(topology_lock)
+    topology = await run_blocking(Topology.from_db, topology_lock)
     prom_list = topology.get_prometheus_servers_model()
     return prom_list
 
@@ -511,7 +513,7 @@ async def get_prom_list():
                      callbacks=callback_router.routes, summary=GET_PROM_SRV_SUMMARY,
                      description=GET_PROM_SRV_DESCRIPTION)
 async def get_prom(prometheus_id: str):
-    topology = Topology.from_db(topology_lock)
+    topology = await run_blocking(Topology.from_db, topology_lock)
     try:
         prom_inst = topology.get_prometheus_server(prom_server_id=prometheus_id)
     except ValueError:
@@ -163,7 +163,7 @@ class K8sManager:
         cluster = self.get_k8s_cluster_by_id(cluster_id)
 
         lb_pool: K8sLoadBalancerPoolArea = plug_to_install_list.load_balancer_pool
-        k8s_config = get_k8s_config_from_file_content(cluster.credentials)
+        k8s_config = get_k8s_config_from_file_content(cluster.credentials, cluster.name)
         pod_network_cidr = get_k8s_cidr_info(k8s_config)
 
         # Create additional data for plugins (lbpool and cidr)
@@ -183,7 +183,7 @@ class K8sManager:
             body: The yaml content to be applied at the cluster.
         """
         cluster: TopologyK8sModel = self.get_k8s_cluster_by_id(cluster_id)
-        k8s_config = get_k8s_config_from_file_content(cluster.credentials)
+        k8s_config = get_k8s_config_from_file_content(cluster.credentials, cluster.name)
 
         # Loading a yaml in this way result in a dictionary
         dict_request = yaml.safe_load_all(body)
@@ -1,7 +1,10 @@
 import json
+import threading
 import traceback
 import typing
+from functools import wraps
 from logging import Logger
+from typing import Dict
 from multiprocessing import RLock
 
 from nfvcl.models.k8s.common_k8s_model import LBPool
@@ -11,90 +14,361 @@ from nfvcl.models.network.network_models import RouterPortModel, IPv4ReservedRan
 from nfvcl.models.prometheus.prometheus_model import PrometheusServerModel
 from nfvcl.models.topology import TopologyModel
 from nfvcl.models.vim import VimModel, UpdateVimModel
-from nfvcl.utils.database import save_topology, delete_topology, get_nfvcl_database
-from nfvcl.utils.decorators import obj_multiprocess_lock
+from nfvcl.utils.database import save_topology, delete_topology, get_topology, get_topology_revision, \
+    save_topology_section, TOPOLOGY_SECTIONS
 from nfvcl.utils.file_utils import remove_files_by_pattern
+from nfvcl.utils.k8s.k8s_client_registry import get_k8s_client_registry
 from nfvcl.utils.ipam import *
 from nfvcl.utils.log import create_logger
+from nfvcl.utils.openstack.openstack_client import invalidate_network_catalog
 from nfvcl.utils.redis_utils.event_types import TopologyEventType
 from nfvcl.utils.redis_utils.redis_manager import trigger_redis_event
 from nfvcl.utils.redis_utils.topic_list import TOPOLOGY_TOPIC
 from nfvcl.utils.util import get_nfvcl_config
 
 topology_lock = RLock()
+# Operations editing only one section of the topology (e.g. the networks) lock only that section, the other sections
+# can be edited at the same time. Operations on the whole topology lock every section.
+_section_locks: Dict[str, threading.RLock] = {section: threading.RLock() for section in TOPOLOGY_SECTIONS}
+# Number of times an operation on a section is executed again when the section has been changed in the database by
+# someone else (e.g. another NFVCL instance)
+TOPOLOGY_CONFLICT_RETRIES = 5
+
+# Topology shared by every Topology instance, it is reloaded from the database only when the revision changes.
+# The cached model is never edited: every Topology instance works on its own copy, and a copy of the edited model is
+# published here only after it has been saved.
+_cached_topology_model: TopologyModel | None = None
+_cached_topology_revision: int | None = None
+_cached_section_revisions: Dict[str, int] = {}
+_topology_cache_lock = threading.RLock()
 
 logger: Logger = create_logger('Topology')
 
 
-class Topology:
-    _model: TopologyModel | None
+class TopologyConflictException(Exception):
+    pass
+
 
-    def __init__(self, topo: Union[dict, None], lock: RLock):
+class TopologyWideLock:
+    """
+    Lock of the operations on the whole topology: the topology lock and then the lock of every section.
+    """
+
+    def __init__(self, lock: RLock):
         self.lock = lock
+
+    def acquire(self):
+        self.lock.acquire()
+        for section in TOPOLOGY_SECTIONS:
+            _section_locks[section].acquire()
+
+    def release(self):
+        for section in reversed(TOPOLOGY_SECTIONS):
+            _section_locks[section].release()
+        self.lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+
+def _run_update(topology: 'Topology', section: typing.Optional[str], func, *args, **kwargs):
+    """
+    Execute a Topology method editing the topology. The outermost call aligns the topology with the database and the
+    method works on a private copy of it (visible only to the current thread), that replaces the model of the instance
+    only if the method succeeds. Nested calls work on the copy of the outermost one.
+
+    Args:
+        topology: The Topology instance
+        section: The section edited by the method, None for the whole topology
+        func: The method
+
+    Returns:
+        The result of the method
+    """
+    update = topology._update
+    if update.depth > 0:
+        update.depth += 1
+        try:
+            return func(topology, *args, **kwargs)
+        finally:
+            update.depth -= 1
+
+    topology._begin_update(whole=section is None)
+    try:
+        result = func(topology, *args, **kwargs)
+    except BaseException:
+        # The copy may be half edited, it is dropped
+        topology._end_update(succeeded=False)
+        raise
+    topology._end_update(succeeded=True)
+    return result
+
+
+def obj_topology_lock(func):
+    """
+    Decorator for the Topology methods editing the whole topology (they must save it with _save_topology_from_model).
+    The topology lock and the lock of every section are acquired, see _run_update for the model being edited.
+    """
+    @wraps(func)
+    def wrapper(self: 'Topology', *args, **kwargs):
+        with self.lock:
+            return _run_update(self, None, func, *args, **kwargs)
+
+    return wrapper
+
+
+def obj_section_lock(section: str):
+    """
+    Decorator for the Topology methods editing only a section of the topology (they must save it with _save_section).
+    Only the lock of the section is acquired, and the topology is aligned with the database before executing the
+    method. If the section has been changed in the database meanwhile (optimistic concurrency, the save is a compare
+    and swap on the revision of the section) the topology is reloaded and the method executed again: the methods must
+    have side effects (events, files, remote changes) only after _save_section.
+
+    Args:
+        section: The section edited by the method, one of TOPOLOGY_SECTIONS
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self: 'Topology', *args, **kwargs):
+            with _section_locks[section]:
+                if self._update.depth > 0:
+                    # Nested call, the topology is already aligned
+                    return _run_update(self, section, func, *args, **kwargs)
+
+                for attempt in range(TOPOLOGY_CONFLICT_RETRIES):
+                    try:
+                        return _run_update(self, section, func, *args, **kwargs)
+                    except TopologyConflictException:
+                        logger.debug(f"Section {section} of the topology changed meanwhile, retrying {func.__name__} ({attempt + 1}/{TOPOLOGY_CONFLICT_RETRIES})")
+                raise TopologyConflictException(f"Section {section} of the topology has been changed by other operations {TOPOLOGY_CONFLICT_RETRIES} times, {func.__name__} aborted")
+
+        return wrapper
+
+    return decorator
+
+
+class TopologyUpdate(threading.local):
+    """
+    State of the update of the topology running in the current thread.
+    """
+
+    def __init__(self):
+        # Number of nested editing methods being executed
+        self.depth = 0
+        # True if the update is on the whole topology
+        self.whole = False
+        # The private copy of the topology being edited
+        self.model: TopologyModel | None = None
+        # Revision of the topology, and of its sections, from which the copy derives
+        self.revision: int | None = None
+        self.section_revisions: Dict[str, int] = {}
+
+
+class Topology:
+
+    def __init__(self, topo: Union[dict, TopologyModel, None], lock: RLock):
+        self.lock = TopologyWideLock(lock)
+        self._update = TopologyUpdate()
         self._os_terraformer = {}
+        self._own_model: TopologyModel | None = None
         if topo:
             if isinstance(topo, TopologyModel):
-                self._data = topo.model_dump()
-                self._model = topo
+                self._own_model = topo
             else:
                 try:
-                    self._model = TopologyModel.model_validate(topo)
-                    self._data = self._model.model_dump()
+                    self._own_model = TopologyModel.model_validate(topo)
                 except Exception:
                     logger.error(traceback.format_exc())
                     raise ValueError("Topology cannot be initialized")
 
         else:
             msg_err = "Topology information are not existing"
-            self._model = None
             logger.warning(msg_err)
 
     @classmethod
     def from_db(cls, lock: RLock):
         """
         Return the topology from the DB as TopologyModel instance.
+        The topology is loaded and validated again only if the revision in the database is different from the cached
+        one. The instance reads the cached topology, that is shared and must not be edited: the editing methods work on
+        a private copy (see _begin_update), items to be changed and saved must be copied by the caller.
+
         Args:
             lock: the resource lock
         Returns:
             Topology: The instance of the topology from the database
         """
-        db = get_nfvcl_database()
-        topo = db.find_one_in_collection("topology", {})
-        if topo:
-            data = TopologyModel.model_validate(topo).model_dump()
+        return cls(cls._load_shared_model()[0], lock)
+
+    @classmethod
+    def _load_shared_model(cls) -> typing.Tuple[TopologyModel | None, int | None, Dict[str, int]]:
+        """
+        Align the shared topology with the database, reloading it only if the revision is changed.
+        The returned model must not be edited.
+
+        Returns:
+            The shared topology model, its revision and the revisions of its sections
+        """
+        global _cached_topology_model, _cached_topology_revision, _cached_section_revisions
+        with _topology_cache_lock:
+            revision = get_topology_revision()
+            if revision is None:
+                _cached_topology_model = None
+                _cached_topology_revision = None
+                _cached_section_revisions = {}
+            elif revision != _cached_topology_revision:
+                topo = get_topology()
+                if topo:
+                    _cached_topology_model = TopologyModel.model_validate(topo)
+                    _cached_topology_revision = topo.get("revision", 0)
+                    _cached_section_revisions = dict(topo.get("section_revisions", {}))
+                else:
+                    _cached_topology_model = None
+                    _cached_topology_revision = None
+                    _cached_section_revisions = {}
+            return _cached_topology_model, _cached_topology_revision, dict(_cached_section_revisions)
+
+    @classmethod
+    def invalidate_cache(cls) -> None:
+        """
+        Drop the cached topology, the next from_db will reload it from the database.
+        """
+        global _cached_topology_model, _cached_topology_revision, _cached_section_revisions
+        with _topology_cache_lock:
+            _cached_topology_model = None
+            _cached_topology_revision = None
+            _cached_section_revisions = {}
+
+    @property
+    def _model(self) -> TopologyModel | None:
+        """
+        The topology model: the private copy being edited by the current thread during an update, the model of the
+        instance otherwise.
+        """
+        if self._update.depth > 0:
+            return self._update.model
+        return self._own_model
+
+    @_model.setter
+    def _model(self, model: TopologyModel | None):
+        if self._update.depth > 0:
+            self._update.model = model
         else:
-            data = None
-        return cls(data, lock)
+            self._own_model = model
+
+    @property
+    def _data(self) -> dict:
+        """
+        Dictionary representation of the topology model, generated when needed.
+        """
+        return self._model.model_dump() if self._model else {}
+
+    def _begin_update(self, whole: bool) -> None:
+        """
+        Align the topology with the database before editing it: the current thread edits a private copy of it,
+        keeping the revisions it derives from for the compare and swap of the saves.
+        Must be called holding the locks of the edited sections.
+
+        Args:
+            whole: True if the whole topology is going to be edited
+        """
+        shared_model, revision, section_revisions = self._load_shared_model()
+        self._update.model = shared_model.model_copy(deep=True) if shared_model is not None else None
+        self._update.revision = revision
+        self._update.section_revisions = section_revisions
+        self._update.whole = whole
+        self._update.depth = 1
+
+    def _end_update(self, succeeded: bool) -> None:
+        """
+        Terminate the update of the current thread, the edited copy becomes the model of the instance if the update
+        succeeded.
+        """
+        if succeeded:
+            self._own_model = self._update.model
+        self._update.depth = 0
+        self._update.model = None
+        self._update.revision = None
+        self._update.section_revisions = {}
+
+    def _publish(self, revision: int, section_revisions: Dict[str, int]) -> None:
+        """
+        Called after a save of the copy being edited: a copy of it becomes the shared topology if the save was the only
+        change since the copy has been loaded, otherwise the shared topology is dropped (other sections may be newer
+        in the database).
+        """
+        global _cached_topology_model, _cached_topology_revision, _cached_section_revisions
+        saved_on_loaded_revision = self._update.revision is not None and revision == self._update.revision + 1
+        self._update.revision = revision
+        self._update.section_revisions.update(section_revisions)
+        with _topology_cache_lock:
+            if saved_on_loaded_revision:
+                if _cached_topology_revision is None or _cached_topology_revision < revision:
+                    _cached_topology_model = self._update.model.model_copy(deep=True)
+                    _cached_topology_revision = revision
+                    _cached_section_revisions = dict(self._update.section_revisions)
+            else:
+                self.invalidate_cache()
+
+    def _save_section(self, section: str) -> None:
+        """
+        Save only a section of self._model into the db, if the section has not been changed by someone else since
+        the update began. During an update of the whole topology, the whole topology is saved.
+
+        Raises:
+            TopologyConflictException if the section has been changed meanwhile (nothing is saved)
+        """
+        if self._update.whole:
+            self._save_topology_from_model()
+            return
+        # Items may have been changed in place, the indexes are rebuilt at the next lookup
+        self._model.invalidate_indexes()
+        content = json.loads(self._model.model_dump_json(include={section}))[section]
+        saved = save_topology_section(section, content, self._update.section_revisions.get(section, 0))
+        if saved is None:
+            raise TopologyConflictException(f"Section {section} of the topology has been changed meanwhile")
+        revision, section_revision = saved
+        self._publish(revision, {section: section_revision})
 
     def _save_topology(self) -> None:
         """
         Save the content of self._data into the db. Update self._model with current self._data values.
         """
-        content = TopologyModel.model_validate(self._data)
-        self._model = content
-        plain_dict = json.loads(content.model_dump_json())
-        save_topology(plain_dict)
+        self._model = TopologyModel.model_validate(self._data)
+        self._save_topology_from_model()
 
     def _save_topology_from_model(self) -> None:
         """
-        Save the content of self._model into the db. Update self._data with current self._model values.
+        Save the content of self._model into the db and publish it as the shared topology. The save fails if any
+        section has been changed by someone else since the update began: operations on the whole topology are not
+        executed again, since they may have changed the VIMs.
+
+        Raises:
+            TopologyConflictException if the topology has been changed meanwhile (nothing is saved)
         """
         content = self._model
-        self._data = content.model_dump()
+        # Items may have been changed in place (e.g. VIM areas), the indexes are rebuilt at the next lookup
+        content.invalidate_indexes()
         plain_dict = json.loads(content.model_dump_json())
-        save_topology(plain_dict)
+        expected_section_revisions = self._update.section_revisions if self._update.revision is not None else None
+        saved = save_topology(plain_dict, expected_section_revisions)
+        if saved is None:
+            raise TopologyConflictException("The topology has been changed meanwhile by another operation, retry the operation")
+        self._publish(*saved)
 
     # **************************** Topology ***********************
     def get(self) -> dict:
-        if hasattr(self, '_data'):
-            return self._data
-        else:
-            return {}
+        return self._data
 
     def get_model(self) -> TopologyModel:
         return self._model
 
-    @obj_multiprocess_lock
+    @obj_topology_lock
     def create(self, topo: TopologyModel, terraform: bool = False) -> None:
         logger.debug(f"Creating topology. Terraform: {terraform}")
 
@@ -116,7 +390,7 @@ class Topology:
         self._save_topology_from_model()
         trigger_redis_event(TOPOLOGY_TOPIC, TopologyEventType.TOPO_CREATE, data=self._model.model_dump())
 
-    @obj_multiprocess_lock
+    @obj_topology_lock
     def delete(self, terraform: bool = False) -> None:
         logger.debug("Deleting the topology. Terraform: {}".format(terraform))
         if not self._model:
@@ -137,12 +411,13 @@ class Topology:
         self._os_terraformer = {}
 
         delete_topology()
+        self.invalidate_cache()
         self._model = None
-        trigger_redis_event(TOPOLOGY_TOPIC, TopologyEventType.TOPO_DELETE, data=self._model.model_dump())
+        trigger_redis_event(TOPOLOGY_TOPIC, TopologyEventType.TOPO_DELETE, data=deleted_topology.model_dump())
 
     # **************************** VIMs ****************************
 
-    @obj_multiprocess_lock
+    @obj_topology_lock
     def add_vim(self, vim_model: VimModel, terraform: bool = False) -> None:
         """
         Add a VIM to the topology. IF required, create resources on the real VIM. Onboard the VIM on OSM to be managed by
@@ -176,7 +451,7 @@ class Topology:
 
         trigger_redis_event(TOPOLOGY_TOPIC, TopologyEventType.TOPO_VIM_CREATE, data=self._model.model_dump())
 
-    @obj_multiprocess_lock
+    @obj_topology_lock
     def del_vim(self, vim_name: str, terraform=False):
         # VIM is unique by name
         vim_model = self._model.get_vim(vim_name)
@@ -195,7 +470,7 @@ class Topology:
         self._save_topology_from_model()
         trigger_redis_event(TOPOLOGY_TOPIC, TopologyEventType.TOPO_VIM_DEL, data=self._model.model_dump())
 
-    @obj_multiprocess_lock
+    @obj_topology_lock
     def update_vim(self, update_msg: UpdateVimModel, terraform: bool = True):
         """
         Update an existing VIM.
@@ -227,6 +502,8 @@ class Topology:
             vim_model.add_area(vim_area)
         for vim_area in update_msg.areas_to_del:
             vim_model.del_area(vim_area)
+        # The areas of the VIM have been changed in place
+        self._model.invalidate_indexes()
 
         self._save_topology_from_model()
         trigger_redis_event(TOPOLOGY_TOPIC, TopologyEventType.TOPO_VIM_UPDATE, data=vim_model.model_dump())
@@ -327,7 +604,7 @@ class Topology:
             logger.debug("For area {} the following vims have been selected: {}".format(a, vims))
         self.add_network(network, vims, terraform=terraform)
 
-    # !!! Do NOT put obj_multiprocess_lock since it calls the next function that already have it.
+    # !!! Do NOT put obj_topology_lock since it calls the next function that already have it.
     def add_network(self, network: Union[NetworkModel, dict], vim_names_list: Union[list, None] = None,
                     terraform: bool = False):
         """
@@ -341,7 +618,7 @@ class Topology:
 
         self.add_network_model(network_model, vim_names_list, terraform)
 
-    @obj_multiprocess_lock
+    @obj_topology_lock
     def add_network_model(self, network_model: NetworkModel, vim_names_list: Union[list, None] = None,
                           terraform: bool = False) -> NetworkModel:
         """
@@ -367,7 +644,7 @@ class Topology:
         trigger_redis_event(TOPOLOGY_TOPIC, TopologyEventType.TOPO_CREATE_NETWORK, data=network_model.model_dump())
         return added_network
 
-    @obj_multiprocess_lock
+    @obj_topology_lock
     def del_network(self, network: Union[NetworkModel, dict], vim_names_list: Union[list, None] = None, terraform: bool = False):
         """
         Delete a network from the topology. Delete it from required VIM list, terraform if required.
@@ -391,7 +668,7 @@ class Topology:
         self._save_topology_from_model()
         trigger_redis_event(TOPOLOGY_TOPIC, TopologyEventType.TOPO_DELETE_NETWORK, data=network.model_dump())
 
-    @obj_multiprocess_lock
+    @obj_topology_lock
     def del_network_by_name(self, network_name: str, terraform: bool = False):
         """
         Delete a network from the topology. If terraform option, delete it from every VIM in the topology.
@@ -426,7 +703,7 @@ class Topology:
         router: RouterModel = self._model.get_router(router_name)
         return router.model_dump()
 
-    @obj_multiprocess_lock
+    @obj_topology_lock
     def add_router(self, router: RouterModel):
         """
         Add a router to the topology
@@ -442,7 +719,7 @@ class Topology:
         self._save_topology_from_model()
         trigger_redis_event(TOPOLOGY_TOPIC, TopologyEventType.TOPO_CREATED_ROUTER, data=router.model_dump())
 
-    @obj_multiprocess_lock
+    @obj_topology_lock
     def del_router(self, router_name: str, vim_names_list: list = None):
         """
         Delete a router from the topology and optionally from desired VIMs
@@ -493,10 +770,12 @@ class Topology:
             # Creating net
             terraformed_ids = self._os_terraformer[vim.name].createNet(topo_net.model_dump().copy())
             terraformed_ids['vim'] = vim.name
+            invalidate_network_catalog(vim.name)
 
             topo_net.ids.append(terraformed_ids)
             return terraformed_ids
         else:
+            invalidate_network_catalog(vim.name)
             return None
 
     def _del_vim_net(self, vim_net_name: str, vim: VimModel, terraform: bool = False) -> str:
@@ -517,6 +796,7 @@ class Topology:
                 msg_err = "Cannot remove network >{}< from VIM >{}<".format(vim_net_name, vim.name)
                 logger.error(msg_err)
                 raise ValueError(msg_err)
+        invalidate_network_catalog(vim.name)
 
         self._save_topology_from_model()
         return removed_net
@@ -595,13 +875,7 @@ class Topology:
             net_name: The network
         Returns: Routers (dictionary) that have at leas one port connected to the network
         """
-        res = []
-        for router in self._model.routers:
-            # check if the net is connected to this router
-            net_port = next((item for item in router.ports if item.net == net_name), None)
-            if net_port is not None:
-                res.append(router)
-        return res
+        return self._model.find_routers_in_net(net_name)
 
     def get_routers_in_net_model(self, net_name: str) -> List[RouterModel]:
         """
@@ -610,13 +884,7 @@ class Topology:
             net_name: The network
         Returns: Routers that have at leas one port connected to the network
         """
-        res = []
-        for router in self._model.routers:
-            # check if the net is connected to this router
-            net_port = next((item for item in router.ports if item.net == net_name), None)
-            if net_port is not None:
-                res.append(router)
-        return res
+        return self._model.find_routers_in_net(net_name)
 
     # **************************** Other funcs **********************
     # endpoints are network where VM (and VNFs) can be attached
@@ -669,9 +937,9 @@ class Topology:
         """
         return self.reserve_range(lb_pool.net_name, lb_pool.range_length, owner)
 
-    @obj_multiprocess_lock
-    def reserve_range(self, net_name: str, range_length: int, owner: str, vim_name: typing.Optional[str] = None) \
-        -> IPv4ReservedRange:
+    @obj_section_lock("networks")
+    def reserve_range(self, net_name: str, range_length: int, owner: str, vim_name: typing.Optional[str] = None,
+                      alignment: int = 1) -> IPv4ReservedRange:
         """
         Reserve a range in a network of the topology. The range has an owner. The network can be retrieved from a VIM.
         Args:
@@ -679,20 +947,59 @@ class Topology:
             range_length: The range length of the reservation
             owner: The owner of the range
             vim_name: The OPTIONAL vim to witch the network is must be part.
+            alignment: The start address of the range must be a multiple of it (e.g. 16 to align on a /28)
 
         Returns:
             The IP range -> {'start': '192.168.0.1', 'end': '192.168.0.100'}
         """
         net: NetworkModel = self.get_network(net_name, vim_name)
 
-        # Reserved IPs are the reserved ones + IPs already allocated
-        reserved_ips = net.allocation_pool + net.reserved_ranges
-        ip_range = get_range_in_cidr(net.cidr, reserved_ips, range_length)
+        # Best fit among the free addresses (the reserved ones and the ones allocated by the VIM are excluded)
+        ip_range = net.find_free_range(range_length, alignment)
 
         reserved_range = self.set_reserved_ip_range(ip_range, net_name, owner)
 
         return reserved_range
 
+    @obj_section_lock("networks")
+    def reserve_ranges(self, net_name: str, range_lengths: List[int], owner: str, vim_name: typing.Optional[str] = None,
+                       alignment: int = 1) -> List[IPv4ReservedRange]:
+        """
+        Reserve multiple ranges in a network of the topology with a single operation: the topology is saved only once
+        and, if one of the ranges cannot be reserved, none of them is reserved.
+        Args:
+            net_name: The name of the network in witch the ranges will be reserved
+            range_lengths: The range length of every reservation
+            owner: The owner of the ranges
+            vim_name: The OPTIONAL vim to witch the network is must be part.
+            alignment: The start address of every range must be a multiple of it
+
+        Returns:
+            The IP ranges, in the same order of the lengths
+        """
+        net: NetworkModel = self.get_network(net_name, vim_name)
+        if net.external:
+            raise ValueError('Network {} is external. Not possible to reserve any IP ranges.'.format(net_name))
+
+        reserved_ranges: List[typing.Optional[IPv4ReservedRange]] = [None] * len(range_lengths)
+        try:
+            # The largest ranges are reserved first, they are the most difficult to fit
+            for index in sorted(range(len(range_lengths)), key=lambda i: range_lengths[i], reverse=True):
+                ip_range = net.find_free_range(range_lengths[index], alignment)
+                reserved_ranges[index] = IPv4ReservedRange(start=ip_range.start, end=ip_range.end, owner=owner)
+                net.add_reserved_range(reserved_ranges[index])
+        except ValueError:
+            for reserved_range in reserved_ranges:
+                if reserved_range is not None:
+                    net.release_range(owner=owner, ip_range=reserved_range)
+            raise
+
+        self._save_section("networks")
+        for reserved_range in reserved_ranges:
+            trigger_redis_event(TOPOLOGY_TOPIC, TopologyEventType.TOPO_CREATE_RANGE_RES, data=reserved_range.model_dump())
+        return reserved_ranges
+
+    @obj_section_lock("networks")
     def set_reserved_ip_range(self, ip_range: IPv4Pool, net_name: str, owner: str) -> IPv4ReservedRange:
         """
         Set up a reserved ip range for a network of the topology.
@@ -711,11 +1018,11 @@ class Topology:
         ip_range = IPv4ReservedRange(start=ip_range.start, end=ip_range.end, owner=owner)
         topo_net.add_reserved_range(ip_range)
 
-        self._save_topology_from_model()  # Since we are working on the model
+        self._save_section("networks")  # Since we are working on the model
         trigger_redis_event(TOPOLOGY_TOPIC, TopologyEventType.TOPO_CREATE_RANGE_RES, data=ip_range.model_dump())
         return ip_range
 
-    @obj_multiprocess_lock
+    @obj_section_lock("networks")
     def release_ranges(self, owner: str, ip_range: IPv4ReservedRange = None,
                        net_name: str = None) -> IPv4ReservedRange:
         """
@@ -744,11 +1051,11 @@ class Topology:
             msg_err = f"The range owned by {owner} has NOT been found and removed."
             logger.error(msg_err)
         else:
-            self._save_topology_from_model()
+            self._save_section("networks")
             trigger_redis_event(TOPOLOGY_TOPIC, TopologyEventType.TOPO_DELETE_RANGE_RES, data=removed_range.model_dump())
             return removed_range
 
-    @obj_multiprocess_lock
+    @obj_section_lock("pdus")
     def add_pdu(self, pdu_input: PduModel):
         """
         Add PDU to the topology
@@ -759,7 +1066,7 @@ class Topology:
             self._model.add_pdu(pdu_input)
 
             # Saving changes to the topology
-            self._save_topology_from_model()
+            self._save_section("pdus")
 
             trigger_redis_event(TOPOLOGY_TOPIC, TopologyEventType.TOPO_CREATE_PDU, data=pdu_input.model_dump())
 
@@ -767,7 +1074,7 @@ class Topology:
             # Value error is thrown when the PDU already exist
             logger.error(traceback.format_exc())
 
-    @obj_multiprocess_lock
+    @obj_section_lock("pdus")
     def upd_pdu(self, pdu_input: PduModel):
         """
         Add PDU to the topology
@@ -777,10 +1084,10 @@ class Topology:
         self._model.upd_pdu(pdu_input)
 
         # Saving changes to the topology
-        self._save_topology_from_model()
+        self._save_section("pdus")
         trigger_redis_event(TOPOLOGY_TOPIC, TopologyEventType.TOPO_CREATE_PDU, data=pdu_input.model_dump())
 
-    @obj_multiprocess_lock
+    @obj_section_lock("pdus")
     def del_pdu(self, pdu_name: str):
         """
         Delete a PDU from the topology. De-onboard it from OSM if previously onboarded.
@@ -791,8 +1098,8 @@ class Topology:
 
         deleted_pdu = self._model.del_pdu(pdu_name)
 
+        self._save_section("pdus")
         trigger_redis_event(TOPOLOGY_TOPIC, TopologyEventType.TOPO_DELETE_PDU, data=deleted_pdu.model_dump())
-        self._save_topology_from_model()
 
     def get_pdu(self, pdu_name: str) -> PduModel:
         """
@@ -847,7 +1154,7 @@ class Topology:
         """
         return self._model.find_k8s_cluster_by_area(area_id)
 
-    @obj_multiprocess_lock
+    @obj_section_lock("kubernetes")
     def add_k8scluster(self, data: TopologyK8sModel):
         """
         Add the k8s cluster to the topology. If specified it onboard the cluster on OSM
@@ -857,10 +1164,10 @@ class Topology:
         # Delegate adds operation to the model. Registering the cluster on OSM if requested
         self._model.add_k8s_cluster(data)
 
-        self._save_topology_from_model()
+        self._save_section("kubernetes")
         trigger_redis_event(TOPOLOGY_TOPIC, TopologyEventType.TOPO_CREATE_K8S, data=data.model_dump())
 
-    @obj_multiprocess_lock
+    @obj_section_lock("kubernetes")
     def del_k8scluster(self, cluster_id: str):
         """
         Delete a k8s cluster instance from the k8s cluster list of the topology.
@@ -870,10 +1177,11 @@ class Topology:
         """
         k8s_deleted_cluster = self._model.del_k8s_cluster(cluster_id)
 
-        self._save_topology_from_model()
+        self._save_section("kubernetes")
+        get_k8s_client_registry().invalidate(k8s_deleted_cluster.name)
         trigger_redis_event(TOPOLOGY_TOPIC, TopologyEventType.TOPO_DELETE_K8S, data=k8s_deleted_cluster.model_dump())
 
-    @obj_multiprocess_lock
+    @obj_section_lock("kubernetes")
     def update_k8scluster(self, cluster: TopologyK8sModel):
         """
         Update a topology K8s cluster
@@ -882,10 +1190,12 @@ class Topology:
         """
         updated_cluster = self._model.upd_k8s_cluster(cluster)
 
-        self._save_topology_from_model()
+        self._save_section("kubernetes")
+        # The clients of the cluster are kept only if the credentials have not changed
+        get_k8s_client_registry().invalidate(updated_cluster.name, keep_credentials=updated_cluster.credentials)
         trigger_redis_event(TOPOLOGY_TOPIC, TopologyEventType.TOPO_UPDATE_K8S, data=updated_cluster.model_dump())
 
-    @obj_multiprocess_lock
+    @obj_section_lock("prometheus_srv")
     def add_prometheus_server(self, prom_server: PrometheusServerModel):
         """
         Add prometheus server to the topology. After this operation, it should be possible to configure this instance to
@@ -895,10 +1205,10 @@ class Topology:
         """
         # Check if there is an instance with the same id
         self._model.add_prometheus_srv(prom_server)
-        self._save_topology_from_model()
+        self._save_section("prometheus_srv")
         trigger_redis_event(TOPOLOGY_TOPIC, TopologyEventType.TOPO_CREATE_PROM_SRV, data=prom_server.model_dump())
 
-    @obj_multiprocess_lock
+    @obj_section_lock("prometheus_srv")
     def del_prometheus_server(self, prom_srv_id: str, force: bool = False) -> PrometheusServerModel:
         """
         Delete prometheus server from the topology.
@@ -910,13 +1220,12 @@ class Topology:
         """
         deleted_prom_instance = self._model.del_prometheus_srv(prom_srv_id, force)
 
+        self._save_section("prometheus_srv")
         remove_files_by_pattern(get_nfvcl_config().nfvcl.tmp_folder, f"prometheus_{prom_srv_id}*")
-
-        self._save_topology_from_model()
         trigger_redis_event(TOPOLOGY_TOPIC, TopologyEventType.TOPO_DELETE_PROM_SRV, data=deleted_prom_instance.model_dump())
         return deleted_prom_instance
 
-    @obj_multiprocess_lock
+    @obj_section_lock("prometheus_srv")
     def update_prometheus_server(self, prom_server: PrometheusServerModel):
         """
         Update a Prometheus server instance of the topology
@@ -924,9 +1233,9 @@ class Topology:
             prom_server: The prometheus server to be updated
         """
         updated_instance = self._model.upd_prometheus_srv(prom_server)
-        prom_server.update_remote_sd_file()
 
-        self._save_topology_from_model()
+        self._save_section("prometheus_srv")
+        prom_server.update_remote_sd_file()
         trigger_redis_event(TOPOLOGY_TOPIC, TopologyEventType.TOPO_UPDATE_PROM_SRV, data=updated_instance.model_dump())
 
     def get_prometheus_server(self, prom_server_id: str) -> PrometheusServerModel:
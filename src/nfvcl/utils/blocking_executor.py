@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, TypeVar
+
+from nfvcl.models.config_model import RestParameters
+from nfvcl.utils.log import create_logger
+from nfvcl.utils.util import get_nfvcl_config
+
+T = TypeVar("T")
+
+logger = create_logger("BlockingExecutor")
+
+__blocking_executor: BlockingExecutor | None = None
+
+
+def get_blocking_executor() -> BlockingExecutor:
+    """
+    Allow to retrieve the BlockingExecutor (that can have only one instance)
+    Returns:
+        The blocking executor
+    """
+    global __blocking_executor
+    if __blocking_executor is not None:
+        return __blocking_executor
+    else:
+        rest_config: RestParameters = get_nfvcl_config().rest
+        __blocking_executor = BlockingExecutor(rest_config.blocking_max_workers, rest_config.max_concurrent_per_cluster, rest_config.request_timeout)
+        return __blocking_executor
+
+
+class BlockingExecutorTimeout(TimeoutError):
+    pass
+
+
+class BlockingExecutor:
+    """
+    Bounded thread pool executing the blocking operations (k8s client, database) of async code, in this way the event
+    loop (e.g. the one of the REST server) is never blocked.
+    Operations can be grouped by key (e.g. the k8s cluster name): at most 'max_per_key' operations of the same key
+    are running at the same time, so an unreachable cluster cannot take all the threads of the pool.
+    """
+
+    def __init__(self, max_workers: int, max_per_key: int, timeout: float):
+        self.max_per_key = max_per_key
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="blocking_executor")
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    async def run(self, func: Callable[[], T], key: Optional[str] = None, timeout: Optional[float] = None) -> T:
+        """
+        Execute a blocking function in the pool and wait for the result without blocking the event loop.
+
+        Args:
+            func: The function to be executed, without arguments (use functools.partial)
+            key: The key limiting the concurrent operations (e.g. the k8s cluster name), None for no limit
+            timeout: Maximum seconds to wait for the result (including the time waiting for a free slot of the key),
+                None to use the default one
+
+        Returns:
+            The result of the function
+
+        Raises:
+            BlockingExecutorTimeout if the result is not available before the timeout. The function cannot be
+            interrupted: if it is already running it continues in background, keeping its slot of the key.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        semaphore: Optional[asyncio.Semaphore] = None
+        if key is not None:
+            semaphore = self._semaphores.setdefault(key, asyncio.Semaphore(self.max_per_key))
+            try:
+                await asyncio.wait_for(semaphore.acquire(), timeout)
+            except asyncio.TimeoutError:
+                raise BlockingExecutorTimeout(f"Too many operations running on '{key}', the operation has not been started in {timeout} seconds")
+
+        try:
+            future = self._executor.submit(func)
+        except BaseException:
+            if semaphore is not None:
+                semaphore.release()
+            raise
+        if semaphore is not None:
+            # The slot is released when the function ends, not when the caller stops waiting
+            future.add_done_callback(lambda _: loop.call_soon_threadsafe(semaphore.release))
+
+        try:
+            # If the function has not been started yet, the cancellation removes it from the queue
+            return await asyncio.wait_for(asyncio.wrap_future(future), max(deadline - loop.time(), 0))
+        except asyncio.TimeoutError:
+            logger.warning(f"Blocking operation {getattr(func, '__name__', func)} on '{key}' not completed in {timeout} seconds")
+            raise BlockingExecutorTimeout(f"The operation has not been completed in {timeout} seconds")
+
+
+async def run_blocking(func: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Execute a blocking function in the blocking executor, see BlockingExecutor.run.
+
+    Args:
+        func: The function to be executed
+        *args: The positional arguments of the function
+        **kwargs: The keyword arguments of the function
+
+    Returns:
+        The result of the function
+    """
+    return await get_blocking_executor().run(functools.partial(func, *args, **kwargs))
+
+
+async def run_blocking_on_cluster(cluster_name: str, func: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Execute a blocking function, operating on a k8s cluster, in the blocking executor limiting the concurrent
+    operations on the same cluster, see BlockingExecutor.run.
+
+    Args:
+        cluster_name: The name of the cluster
+        func: The function to be executed
+        *args: The positional arguments of the function
+        **kwargs: The keyword arguments of the function
+
+    Returns:
+        The result of the function
+    """
+    return await get_blocking_executor().run(functools.partial(func, *args, **kwargs), key=cluster_name)
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
 import json
+import threading
 from pathlib import Path
-from typing import List
-from pymongo import MongoClient
+from typing import List, Dict, Any, Optional, Tuple
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import MongoClient, ReturnDocument, ASCENDING
+from pymongo.cursor import Cursor
 from pymongo.database import Database
-from pymongo.results import InsertOneResult
+from pymongo.errors import OperationFailure
+from pymongo.results import InsertOneResult, UpdateResult
 from nfvcl.models.config_model import NFVCLConfigModel
+from nfvcl.utils.log import create_logger
 from nfvcl.utils.util import get_nfvcl_config
 
 nfvcl_config: NFVCLConfigModel = get_nfvcl_config()
@@ -16,8 +23,17 @@ BLUE_COLLECTION_V2 = "blue-inst-v2"
 TOPOLOGY_COLLECTION = "topology"
 EXTRA_COLLECTION = "extra"
 
+# Fields of the blueprint document needed to build the blueprint summary (see BlueprintNG.to_dict)
+BLUE_SUMMARY_PROJECTION = {"_id": False, "id": True, "type": True, "status": True, "created": True, "protected": True, "corrupted": True}
+
+logger = create_logger("Database")
+
 __database: NFVCLDatabase | None = None
 
+# Last document persisted for every blueprint, used to compute the delta to be written at the next save
+__blue_snapshots: Dict[str, dict] = {}
+__blue_snapshots_lock = threading.Lock()
+
 
 def get_nfvcl_database() -> NFVCLDatabase:
     """
@@ -45,10 +61,25 @@ class NFVCLDatabase:
         self.mongo_client: MongoClient = MongoClient(uri)
         self.mongo_database = self.mongo_client[nfvcl_config.mongodb.db]
         self.test_connection()
+        self.create_indexes()
 
     def test_connection(self):
         self.list_collections()
 
+    def create_indexes(self):
+        """
+        Create the indexes used by the queries on the collections, if they already exist nothing is done.
+        """
+        blue_collection = self.mongo_database[BLUE_COLLECTION_V2]
+        try:
+            blue_collection.create_index([("id", ASCENDING)], unique=True)
+        except OperationFailure as e:
+            # Happens if the collection already contains blueprints with duplicated IDs
+            logger.warning(f"Unable to create the unique index on the blueprint ID: {str(e)}")
+            blue_collection.create_index([("id", ASCENDING)])
+        blue_collection.create_index([("type", ASCENDING)])
+        blue_collection.create_index([("parent_blue_id", ASCENDING)])
+
     def list_collections(self):
         return self.mongo_database.list_collections()
 
@@ -87,6 +118,18 @@ class NFVCLDatabase:
         # for i in db.find(filter):
         db.update_one(filter, {"$set": data}, upsert=True)
 
+    def update_one_in_collection(self, collection, filter, update: dict, upsert: bool = True) -> UpdateResult:
+        db = self.mongo_database[collection]
+        return db.update_one(filter, update, upsert=upsert)
+
+    def replace_in_collection(self, collection, data, filter) -> UpdateResult:
+        db = self.mongo_database[collection]
+        return db.replace_one(filter, data, upsert=True)
+
+    def find_one_and_update_in_collection(self, collection, filter, update: dict, projection=None, upsert: bool = True) -> dict | None:
+        db = self.mongo_database[collection]
+        return db.find_one_and_update(filter, update, projection=projection, upsert=upsert, return_document=ReturnDocument.AFTER)
+
     def delete_from_collection(self, collection, filter):
         db = self.mongo_database[collection]
         return db.delete_many(filter)
@@ -122,6 +165,52 @@ def get_ng_blue_list(blueprint_type: str = None) -> List[dict]:
     return list(blue_list)
 
 
+def get_ng_blue_summary_list(blueprint_type: str = None) -> List[dict]:
+    """
+    Retrieve the summary fields (BLUE_SUMMARY_PROJECTION) of all blueprints from the database, the rest of the
+    document is not transferred.
+    Args:
+        blueprint_type: The optional filter to be used to filter results.
+
+    Returns:
+        The filtered blueprint summary list.
+    """
+    blue_filter = {}
+    if blueprint_type:
+        blue_filter = {'type': blueprint_type}
+    return list(get_nfvcl_database().find_collection(BLUE_COLLECTION_V2, blue_filter, BLUE_SUMMARY_PROJECTION))
+
+
+def get_ng_blue_cursor(blue_filter: dict, detailed: bool = False, after: Optional[str] = None, limit: Optional[int] = None) -> Cursor:
+    """
+    Return a cursor on the blueprints matching the filter, ordered by insertion (_id). Documents are fetched in batches
+    while iterating the cursor, they are never loaded all together.
+
+    Args:
+        blue_filter: The query used to filter blueprints.
+        detailed: If true the whole documents are returned, otherwise only the summary fields (BLUE_SUMMARY_PROJECTION).
+        after: The cursor returned by a previous page (the '_id' of its last blueprint), only following blueprints are returned.
+        limit: The maximum number of blueprints to be returned, None for no limit.
+
+    Returns:
+        The database cursor, every document contains the '_id' field
+
+    Raises:
+        ValueError if 'after' is not a valid cursor
+    """
+    query = dict(blue_filter)
+    if after:
+        try:
+            query["_id"] = {"$gt": ObjectId(after)}
+        except InvalidId:
+            raise ValueError(f"Invalid cursor '{after}'")
+    projection = None if detailed else {**BLUE_SUMMARY_PROJECTION, "_id": True}
+    cursor = get_nfvcl_database().find_collection(BLUE_COLLECTION_V2, query, projection).sort("_id", ASCENDING)
+    if limit:
+        cursor = cursor.limit(limit)
+    return cursor
+
+
 def get_ng_blue_by_id_filter(blueprint_id: str) -> dict | None:
     """
     Retrieve a blueprint from the database, given the blueprint ID.
@@ -138,22 +227,109 @@ def get_ng_blue_by_id_filter(blueprint_id: str) -> dict | None:
     return None
 
 
+def _is_valid_path_key(key: Any) -> bool:
+    """
+    Check if a dictionary key can be used as a component of a MongoDB dotted path
+    """
+    return isinstance(key, str) and len(key) > 0 and "." not in key and not key.startswith("$")
+
+
+def _compute_delta(old: Any, new: Any, path: str, delta: Dict[str, dict]) -> None:
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key, new_value in new.items():
+            if not _is_valid_path_key(key):
+                # The key cannot be addressed in a dotted path, the whole sub-document is rewritten
+                if old != new:
+                    delta["$set"][path] = new
+                return
+        for key in old.keys():
+            if not _is_valid_path_key(key):
+                delta["$set"][path] = new
+                return
+        for key, new_value in new.items():
+            key_path = f"{path}.{key}" if path else key
+            if key not in old:
+                delta["$set"][key_path] = new_value
+            else:
+                _compute_delta(old[key], new_value, key_path, delta)
+        for key in old.keys():
+            if key not in new:
+                delta["$unset"][f"{path}.{key}" if path else key] = ""
+    elif isinstance(old, list) and isinstance(new, list) and len(new) > len(old) > 0 and new[:len(old)] == old:
+        # The list only grew (e.g. day_2_call_history), only the new items are appended
+        delta["$push"][path] = {"$each": new[len(old):]}
+    elif type(old) is not type(new) or old != new:
+        delta["$set"][path] = new
+
+
+def compute_document_delta(old: dict, new: dict) -> Optional[dict]:
+    """
+    Compute the MongoDB update operators needed to transform the old document in the new one.
+    Changed values are updated with $set, removed keys with $unset and lists that only grew with $push.
+
+    Args:
+        old: The document currently saved in the database
+        new: The document to be saved
+
+    Returns:
+        The update document to be used in update_one, empty if the two documents are equal. None if the change cannot
+        be expressed as an update (a top level key cannot be used in a dotted path), the document must be replaced.
+    """
+    delta: Dict[str, dict] = {"$set": {}, "$unset": {}, "$push": {}}
+    _compute_delta(old, new, "", delta)
+    if "" in delta["$set"]:
+        return None
+    return {operator: fields for operator, fields in delta.items() if len(fields) > 0}
+
+
 def save_ng_blue(blueprint_id: str, dict_blue: dict):
     """
     Save a blueprint to the database. IF already existing it updates the object, otherwise it creates a new one.
+    Only the difference from the last saved version of the blueprint is written, the first save of a blueprint (in this
+    NFVCL instance) writes the whole document.
 
     Args:
         blueprint_id: The blueprint ID, used to look for blueprints in the database.
-        dict_blue: The object to be saved/updated.
+        dict_blue: The object to be saved/updated, it must not be modified after the save since it is kept as snapshot.
 
     Returns:
-        The result of the operation (saved object)
+        The result of the operation
     """
     database_instance = get_nfvcl_database()
-    if database_instance.exists_in_collection(BLUE_COLLECTION_V2, {'id': blueprint_id}):
-        return database_instance.update_in_collection(BLUE_COLLECTION_V2, dict_blue, {'id': blueprint_id})
-    else:
-        return database_instance.insert_in_collection(BLUE_COLLECTION_V2, dict_blue)
+    with __blue_snapshots_lock:
+        snapshot = __blue_snapshots.pop(blueprint_id, None)
+
+    result = None
+    if snapshot is not None:
+        delta = compute_document_delta(snapshot, dict_blue)
+        if delta is None:
+            snapshot = None
+        elif len(delta) == 0:
+            result = None
+        else:
+            result = database_instance.update_one_in_collection(BLUE_COLLECTION_V2, {'id': blueprint_id}, delta, upsert=False)
+            if result.matched_count == 0:
+                # The document has been deleted from the database by someone else, it needs to be written entirely
+                snapshot = None
+    if snapshot is None:
+        result = database_instance.replace_in_collection(BLUE_COLLECTION_V2, dict_blue, {'id': blueprint_id})
+
+    # If the write fails the snapshot is not restored, the next save will write the whole document
+    with __blue_snapshots_lock:
+        __blue_snapshots[blueprint_id] = dict_blue
+    return result
+
+
+def forget_ng_blue_snapshot(blueprint_id: str):
+    """
+    Drop the last saved version of a blueprint kept to compute the delta, to be called when the blueprint is removed from
+    the memory. The next save of the blueprint writes the whole document.
+
+    Args:
+        blueprint_id: The blueprint ID
+    """
+    with __blue_snapshots_lock:
+        __blue_snapshots.pop(blueprint_id, None)
 
 
 def destroy_ng_blue(blueprint_id: str):
@@ -165,24 +341,103 @@ def destroy_ng_blue(blueprint_id: str):
     Returns:
         The destroyed blueprint.
     """
+    forget_ng_blue_snapshot(blueprint_id)
     return get_nfvcl_database().delete_from_collection(BLUE_COLLECTION_V2, {'id': blueprint_id})
 
 
-def save_topology(dict_topo: dict):
+# Sections of the topology that can be saved independently, each one has its own revision
+TOPOLOGY_SECTIONS = ("networks", "pdus", "kubernetes", "prometheus_srv")
+
+
+def get_topology() -> dict | None:
+    """
+    Retrieve the topology from the database.
+
+    Returns:
+        The topology (dict) including its revision, None if there is no topology.
     """
-    Save a blueprint to the database. If it is already existing, it updates the object, otherwise it creates a new one.
+    return get_nfvcl_database().find_one_in_collection(TOPOLOGY_COLLECTION, {'id': 'topology'}, {"_id": False})
+
+
+def get_topology_revision() -> int | None:
+    """
+    Retrieve only the revision of the topology from the database, the revision is incremented at every save.
+
+    Returns:
+        The revision of the topology, None if there is no topology.
+    """
+    topo = get_nfvcl_database().find_one_in_collection(TOPOLOGY_COLLECTION, {'id': 'topology'}, {"_id": False, "revision": True})
+    if topo is None:
+        return None
+    return topo.get("revision", 0)
+
+
+def _section_revision_condition(expected_revision: int) -> int | dict:
+    # Topologies saved before the introduction of the sections have no section revisions
+    return expected_revision if expected_revision > 0 else {"$in": [0, None]}
+
+
+def save_topology(dict_topo: dict, expected_section_revisions: Dict[str, int] | None) -> Tuple[int, Dict[str, int]] | None:
+    """
+    Save the whole topology to the database, only if none of its sections has been changed since it has been loaded
+    (compare and swap on the revisions of the sections). The revision of the topology, and the one of every section,
+    is incremented by the same operation.
 
     Args:
         dict_topo: The dict of topology to be saved.
+        expected_section_revisions: The revisions of the sections when the topology has been loaded, None if the
+            topology was not existing (it is created).
 
     Returns:
-        The result of the operation (saved object)
+        The revision of the saved topology and the revisions of its sections, None if the topology has been changed
+        (or created) by someone else (nothing is saved).
     """
     database_instance = get_nfvcl_database()
-    if database_instance.exists_in_collection(TOPOLOGY_COLLECTION, {'id': 'topology'}):  # TOPO is unique, fixed ID
-        return database_instance.update_in_collection(TOPOLOGY_COLLECTION, dict_topo, {'id': 'topology'})
+    if expected_section_revisions is None:
+        if database_instance.exists_in_collection(TOPOLOGY_COLLECTION, {'id': 'topology'}):
+            return None
+        topology_filter = {'id': 'topology'}
     else:
-        return database_instance.insert_in_collection(TOPOLOGY_COLLECTION, dict_topo)
+        topology_filter = {'id': 'topology', **{f"section_revisions.{section}": _section_revision_condition(expected_section_revisions.get(section, 0)) for section in TOPOLOGY_SECTIONS}}
+    increments = {"revision": 1, **{f"section_revisions.{section}": 1 for section in TOPOLOGY_SECTIONS}}
+    # TOPO is unique, fixed ID
+    updated = database_instance.find_one_and_update_in_collection(
+        TOPOLOGY_COLLECTION,
+        topology_filter,
+        {"$set": dict_topo, "$inc": increments},
+        projection={"_id": False, "revision": True, "section_revisions": True},
+        upsert=expected_section_revisions is None
+    )
+    if updated is None:
+        return None
+    return updated["revision"], updated["section_revisions"]
+
+
+def save_topology_section(section: str, content: list, expected_revision: int) -> Tuple[int, int] | None:
+    """
+    Save a section of the topology (e.g. 'networks') only if the section has not been changed since it has been
+    loaded (compare and swap on the revision of the section). The other sections are not written.
+
+    Args:
+        section: The section to be saved, one of TOPOLOGY_SECTIONS
+        content: The serialized content of the section
+        expected_revision: The revision of the section when it has been loaded
+
+    Returns:
+        The revision of the topology and the one of the section after the save, None if the section has been changed
+        by someone else (nothing is saved).
+    """
+    revision_field = f"section_revisions.{section}"
+    updated = get_nfvcl_database().find_one_and_update_in_collection(
+        TOPOLOGY_COLLECTION,
+        {'id': 'topology', revision_field: _section_revision_condition(expected_revision)},
+        {"$set": {section: content}, "$inc": {"revision": 1, revision_field: 1}},
+        projection={"_id": False, "revision": True, "section_revisions": True},
+        upsert=False
+    )
+    if updated is None:
+        return None
+    return updated["revision"], updated["section_revisions"][section]
 
 
 def delete_topology():
@@ -206,7 +461,7 @@ def insert_extra(object_id: str, object_dict: dict):
     Returns:
 
     """
-    database_instance = NFVCLDatabase()
+    database_instance = get_nfvcl_database()
     object_dict['id'] = object_id
     if database_instance.exists_in_collection(EXTRA_COLLECTION, {'id': object_id}):
         return database_instance.update_in_collection(EXTRA_COLLECTION, object_dict, {'id': object_id})
@@ -225,7 +480,7 @@ def get_extra(object_id: str) -> dict | None:
     Returns:
 
     """
-    extra_list = NFVCLDatabase().find_in_collection(EXTRA_COLLECTION, {'id': object_id}, {"_id": False})
+    extra_list = get_nfvcl_database().find_in_collection(EXTRA_COLLECTION, {'id': object_id}, {"_id": False})
     for extra in extra_list:
         return extra  # Return the first match
     return None
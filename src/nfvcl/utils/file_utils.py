@@ -3,12 +3,15 @@ import os
 import shutil
 from hashlib import sha512
 from pathlib import Path
-from typing import List
+from typing import List, Iterable, BinaryIO, Optional, Tuple
 
 from jinja2 import Environment, FileSystemLoader
 
 from src.nfvcl.utils.util import get_nfvcl_config
 
+# Bytes read at a time when computing the hash of a file
+FILE_HASH_CHUNK_SIZE = 1024 * 1024
+
 
 def create_tmp_file(filename: str, sub_folder: str = None, file_can_exist: bool = False) -> Path:
     """
@@ -214,9 +217,29 @@ def remove_files_by_pattern(folder: str, name_pattern: str):
             os.remove(path)
 
 
+def stream_sha512sum(chunks: Iterable[bytes], output: Optional[BinaryIO] = None) -> Tuple[str, int]:
+    """
+    Compute the SHA512sum of a stream of bytes without keeping it in memory, optionally writing it to a file
+    Args:
+        chunks: The chunks of the stream (e.g. the content of an HTTP response)
+        output: The binary file in which the chunks are written, None to only compute the hash
+
+    Returns:
+        The hash of the stream and its size in bytes
+    """
+    sha512_hash = sha512()
+    size = 0
+    for chunk in chunks:
+        sha512_hash.update(chunk)
+        size += len(chunk)
+        if output is not None:
+            output.write(chunk)
+    return sha512_hash.hexdigest(), size
+
+
 def file_sha512sum(file: Path) -> str:
     """
-    Check that file exists and compute its SHA512sum reading 4096 bytes at a time
+    Check that file exists and compute its SHA512sum reading FILE_HASH_CHUNK_SIZE bytes at a time
     Args:
         file: The file on which the hash is to be computed
 
@@ -224,12 +247,7 @@ def file_sha512sum(file: Path) -> str:
         The hash of the file
     """
     if file.exists() and file.is_file():
-        sha512_hash = sha512()
-
         with file.open("rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha512_hash.update(byte_block)
-
-        return sha512_hash.hexdigest()
+            return stream_sha512sum(iter(lambda: f.read(FILE_HASH_CHUNK_SIZE), b""))[0]
     else:
         raise FileNotFoundError(f"File {file.absolute()} does not exists: sha512sum cannot be computed")
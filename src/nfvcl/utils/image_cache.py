@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import requests
+from pydantic import Field
+
+from nfvcl.models.base_model import NFVCLBaseModel
+from nfvcl.models.config_model import ImageCacheParameters
+from nfvcl.utils.file_utils import stream_sha512sum
+from nfvcl.utils.log import create_logger
+from nfvcl.utils.util import get_nfvcl_config
+
+# Name of the file, in the cache folder, containing the information of the cached images
+IMAGE_CACHE_INDEX_FILE = "index.json"
+# Bytes received at a time when hashing an image
+IMAGE_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# Seconds waited for the connection to the image server and for every chunk of the image
+IMAGE_DOWNLOAD_TIMEOUT = 60
+
+logger = create_logger("ImageCache")
+
+__image_cache: ImageCache | None = None
+
+
+def get_image_cache() -> ImageCache:
+    """
+    Allow to retrieve the ImageCache (that can have only one instance)
+    Returns:
+        The image cache
+    """
+    global __image_cache
+    if __image_cache is not None:
+        return __image_cache
+    else:
+        nfvcl_config = get_nfvcl_config()
+        images_config: ImageCacheParameters = nfvcl_config.images
+        cache_folder = Path(images_config.cache_folder) if images_config.cache_folder else Path(nfvcl_config.nfvcl.tmp_folder) / "image_cache"
+        __image_cache = ImageCache(cache_folder)
+        return __image_cache
+
+
+class ImageCacheException(Exception):
+    pass
+
+
+class ImageCacheEntry(NFVCLBaseModel):
+    url: str = Field(description="The URL of the image")
+    etag: Optional[str] = Field(default=None, description="The ETag returned by the server when the image was hashed")
+    last_modified: Optional[str] = Field(default=None, description="The Last-Modified returned by the server when the image was hashed")
+    sha512: str = Field(description="The sha512sum of the image")
+    size: int = Field(description="The size of the image in bytes")
+    last_used: float = Field(default_factory=time.time)
+
+    def matches(self, etag: Optional[str], last_modified: Optional[str]) -> bool:
+        """
+        Check if the entry refers to the image currently returned by the server.
+
+        Args:
+            etag: The current ETag of the image
+            last_modified: The current Last-Modified of the image
+
+        Returns:
+            True if at least one validator is known and all the known validators are unchanged
+        """
+        if etag is None and last_modified is None:
+            return False
+        return self.etag == etag and self.last_modified == last_modified
+
+
+class ImageCacheIndex(NFVCLBaseModel):
+    images: Dict[str, ImageCacheEntry] = Field(default={}, description="The hashed images by URL")
+
+
+def _response_validators(response: requests.Response) -> Tuple[Optional[str], Optional[str]]:
+    return response.headers.get("ETag"), response.headers.get("Last-Modified")
+
+
+class ImageCache:
+    """
+    Persistent cache of the sha512 of the VM images used by NFVCL, keyed by URL and validated using the ETag and
+    Last-Modified returned by the server. Images are hashed while they are streamed, reading them in chunks and without
+    writing them to disk, so the memory and the disk used do not depend on the size of the image. The images themselves
+    are downloaded by the VIMs.
+    """
+
+    def __init__(self, cache_folder: Path):
+        self.cache_folder = cache_folder
+        self.cache_folder.mkdir(parents=True, exist_ok=True)
+        self._index_lock = threading.Lock()
+        # Prevent the same image from being hashed multiple times at the same time
+        self._url_locks: Dict[str, threading.Lock] = {}
+        self._index = self._load_index()
+
+    def _load_index(self) -> ImageCacheIndex:
+        try:
+            return ImageCacheIndex.model_validate_json((self.cache_folder / IMAGE_CACHE_INDEX_FILE).read_text())
+        except (OSError, ValueError):
+            return ImageCacheIndex()
+
+    def _save_index(self):
+        # Must be called holding the index lock, the index is replaced atomically
+        tmp_file = self.cache_folder / f".{IMAGE_CACHE_INDEX_FILE}.{os.getpid()}.tmp"
+        tmp_file.write_text(self._index.model_dump_json())
+        tmp_file.replace(self.cache_folder / IMAGE_CACHE_INDEX_FILE)
+
+    def _get_entry(self, url: str) -> Optional[ImageCacheEntry]:
+        with self._index_lock:
+            return self._index.images.get(url)
+
+    def _remote_validators(self, url: str) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        try:
+            response = requests.head(url, allow_redirects=True, timeout=IMAGE_DOWNLOAD_TIMEOUT)
+        except requests.RequestException as e:
+            logger.debug(f"Unable to retrieve the headers of {url}: {str(e)}")
+            return None
+        if response.status_code != 200:
+            # Some servers do not support HEAD, the image is validated by hashing it again
+            return None
+        return _response_validators(response)
+
+    def _hash(self, url: str) -> ImageCacheEntry:
+        logger.debug(f"Hashing {url}...")
+        try:
+            with requests.get(url, stream=True, timeout=IMAGE_DOWNLOAD_TIMEOUT) as response:
+                if response.status_code != 200:
+                    raise ImageCacheException(f"Failed to download {url}, status code: {response.status_code}")
+                etag, last_modified = _response_validators(response)
+                sha512, size = stream_sha512sum(response.iter_content(chunk_size=IMAGE_DOWNLOAD_CHUNK_SIZE))
+        except requests.RequestException as e:
+            raise ImageCacheException(f"Failed to download {url}: {str(e)}") from e
+        logger.debug(f"Hash of {url} computed, sha512 {sha512}")
+
+        entry = ImageCacheEntry(url=url, etag=etag, last_modified=last_modified, sha512=sha512, size=size)
+        with self._index_lock:
+            self._index.images[url] = entry
+            self._save_index()
+        return entry
+
+    def _use(self, entry: ImageCacheEntry):
+        with self._index_lock:
+            entry.last_used = time.time()
+            self._save_index()
+
+    def get_sha512(self, url: str) -> str:
+        """
+        Get the sha512sum of the image currently available at the URL. The image is downloaded (and hashed) only if the
+        server reports that it has changed (or the change cannot be detected).
+
+        Args:
+            url: The URL of the image
+
+        Returns:
+            The sha512sum of the image
+
+        Raises:
+            ImageCacheException if the image cannot be downloaded
+        """
+        with self._index_lock:
+            url_lock = self._url_locks.setdefault(url, threading.Lock())
+        with url_lock:
+            entry = self._get_entry(url)
+            if entry is not None:
+                validators = self._remote_validators(url)
+                if validators is not None and entry.matches(*validators):
+                    self._use(entry)
+                    return entry.sha512
+            return self._hash(url).sha512
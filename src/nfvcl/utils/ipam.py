@@ -1,6 +1,6 @@
+import bisect
 import ipaddress
-import socket
-from typing import Union, List
+from typing import Union, List, Tuple, Optional
 
 from nfvcl.models.network.network_models import IPv4Pool
 
@@ -53,52 +53,202 @@ def check_ipv4_valid(ipv4: str) -> bool:
     except ipaddress.AddressValueError:
         return False
 
-def get_available_network_ip(cidr: ipaddress.IPv4Network, reserved_ranges: List[IPv4Pool]) -> List[IPv4Pool]:
+class IPv4IntervalSet:
     """
-    Returns all the available intervals in a network, given the reserved ranges.
+    Set of free IPv4 addresses of a network, kept as sorted and disjoint intervals of integers (ends included).
+    Intervals are indexed both by start address and by size: finding, allocating and releasing a range are binary
+    searches (plus the shift of the underlying lists), so the cost does not depend on how many ranges have been reserved
+    in the network before.
+    """
+
+    def __init__(self, low: Union[ipaddress.IPv4Address, int], high: Union[ipaddress.IPv4Address, int]):
+        """
+        Args:
+            low: The first usable address of the network
+            high: The last usable address of the network
+        """
+        self.low = int(low)
+        self.high = int(high)
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        # (size, start) of every free interval, sorted
+        self._by_size: List[Tuple[int, int]] = []
+        if self.high >= self.low:
+            self._insert(self.low, self.high)
+
+    def _insert(self, start: int, end: int):
+        index = bisect.bisect_left(self._starts, start)
+        self._starts.insert(index, start)
+        self._ends.insert(index, end)
+        bisect.insort(self._by_size, (end - start + 1, start))
+
+    def _remove_at(self, index: int) -> Tuple[int, int]:
+        start = self._starts.pop(index)
+        end = self._ends.pop(index)
+        del self._by_size[bisect.bisect_left(self._by_size, (end - start + 1, start))]
+        return start, end
+
+    def intervals(self) -> List[Tuple[int, int]]:
+        """
+        Returns:
+            The free intervals, sorted by start address
+        """
+        return list(zip(self._starts, self._ends))
+
+    def is_free(self, start: int, end: int) -> bool:
+        """
+        Check if all the addresses of a range are free.
+        """
+        index = bisect.bisect_right(self._starts, start) - 1
+        return index >= 0 and self._ends[index] >= end
+
+    def reserve(self, start: int, end: int):
+        """
+        Remove a range from the free addresses.
+
+        Args:
+            start: The first address of the range
+            end: The last address of the range
+
+        Raises:
+            ValueError if some of the addresses are not free
+        """
+        index = bisect.bisect_right(self._starts, start) - 1
+        if index < 0 or self._ends[index] < end:
+            raise ValueError(f"Range {ipaddress.IPv4Address(start)}-{ipaddress.IPv4Address(end)} is not free")
+        free_start, free_end = self._remove_at(index)
+        if free_start < start:
+            self._insert(free_start, start - 1)
+        if end < free_end:
+            self._insert(end + 1, free_end)
+
+    def discard(self, start: int, end: int):
+        """
+        Remove from the free addresses the ones in a range, addresses that are already used are ignored.
+
+        Args:
+            start: The first address of the range
+            end: The last address of the range
+        """
+        index = bisect.bisect_right(self._starts, end) - 1
+        # Visiting backward the free intervals overlapping the range
+        while index >= 0 and self._ends[index] >= start:
+            free_start, free_end = self._remove_at(index)
+            if end < free_end:
+                self._insert(end + 1, free_end)
+            if free_start < start:
+                self._insert(free_start, start - 1)
+                break
+            index -= 1
+
+    def release(self, start: int, end: int):
+        """
+        Add a range to the free addresses, merging it with the adjacent free intervals. The part of the range out of the
+        network usable addresses is ignored.
+
+        Args:
+            start: The first address of the range
+            end: The last address of the range
+        """
+        start = max(start, self.low)
+        end = min(end, self.high)
+        if end < start:
+            return
+        # Removing the free intervals overlapping or adjacent to the range and merging them
+        index = bisect.bisect_right(self._starts, end + 1) - 1
+        while index >= 0 and self._ends[index] >= start - 1:
+            free_start, free_end = self._remove_at(index)
+            start = min(start, free_start)
+            end = max(end, free_end)
+            index -= 1
+        self._insert(start, end)
+
+    def find(self, size: int, alignment: int = 1, best_fit: bool = True) -> Optional[int]:
+        """
+        Look for a free range.
+
+        Args:
+            size: The number of addresses of the range
+            alignment: The start address of the range must be a multiple of it (e.g. 16 to align on a /28)
+            best_fit: If true the smallest free interval that can contain the range is used, reducing the fragmentation,
+                otherwise the first one (lowest address)
+
+        Returns:
+            The start address of the range, None if there is no free range
+        """
+        if best_fit:
+            index = bisect.bisect_left(self._by_size, (size, -1))
+            while index < len(self._by_size):
+                free_size, free_start = self._by_size[index]
+                start = -(-free_start // alignment) * alignment
+                if start + size <= free_start + free_size:
+                    return start
+                index += 1
+        else:
+            for free_start, free_end in zip(self._starts, self._ends):
+                start = -(-free_start // alignment) * alignment
+                if start + size - 1 <= free_end:
+                    return start
+        return None
+
+    def allocate(self, size: int, alignment: int = 1, best_fit: bool = True) -> Tuple[int, int]:
+        """
+        Find and reserve a free range, see find.
+
+        Returns:
+            The first and the last address of the range
+
+        Raises:
+            ValueError if there is no free range
+        """
+        start = self.find(size, alignment, best_fit)
+        if start is None:
+            raise ValueError('Not possible to get a range in the network cidr')
+        self.reserve(start, start + size - 1)
+        return start, start + size - 1
+
+
+def build_network_ipam(cidr: ipaddress.IPv4Network, reserved_ranges: List[IPv4Pool]) -> IPv4IntervalSet:
+    """
+    Build the set of free addresses of a network, given the reserved ranges.
     Args:
         cidr: The CIDR of the network (e.g. '192.168.0.0/16')
         reserved_ranges: The ranges that must NOT be used
 
     Returns:
-        Available IPv4 ranges of the network.
+        The free addresses of the network.
     """
     # cidr[1] applied on a IPv4Network return the 2nd adress of the cidr.
     # Starting from [4] (.3) because .1 and .2 (DHCP) should be used by OpenStack.
     # Ending [-2] (.254) because .255 is broadcast.
-    available_ranges: List[IPv4Pool] = [IPv4Pool(start=cidr[4], end=cidr[-2])]
-
-    # Ordering IP addresses
-    ordered_reserved_ranges = sorted(reserved_ranges, key=lambda k: socket.inet_aton(k.start.exploded))
+    ipam = IPv4IntervalSet(cidr[4], cidr[-2])
 
-    for reserved_range in ordered_reserved_ranges:
-        if type(reserved_range.start) is str:
-            reserved_range.start = ipaddress.IPv4Address(reserved_range.start)
-        if type(reserved_range.end) is str:
-            reserved_range.end = ipaddress.IPv4Address(reserved_range.end)
-        if int(reserved_range.end) - int(reserved_range.start) < 0:
+    for reserved_range in reserved_ranges:
+        start = ipaddress.IPv4Address(reserved_range.start)
+        end = ipaddress.IPv4Address(reserved_range.end)
+        if int(end) - int(start) < 0:
             raise ValueError("Reserved range [{}-{}] is not valid -> Starting address comes before ending address.".
-                             format(reserved_range.start, reserved_range.end))
+                             format(start, end))
 
-        if not check_range_in_cidr(reserved_range.start, reserved_range.end, cidr):
-            raise ValueError("Range {}-{} not in cidr {}".format(reserved_range.start, reserved_range.end, cidr))
+        if not check_range_in_cidr(start, end, cidr):
+            raise ValueError("Range {}-{} not in cidr {}".format(start, end, cidr))
 
-        for ava_range in available_ranges:
-            # If the available range is ending after the start of the reservation there could be space for a range
-            if ava_range.end > reserved_range.start:
-                # Moving the end of the available range to the start of reservation range and saving the old end.
-                original_end = ava_range.end
-                ava_range.end = reserved_range.start - 1
+        ipam.discard(int(start), int(end))
+    return ipam
 
-                # If the actual ava_range is not more valid let's delete it (means that 2 reservation are adjacent)
-                if ava_range.end <= ava_range.start:
-                    available_ranges.remove(ava_range)
 
-                # Add new available range
-                available_ranges.append(IPv4Pool(start=reserved_range.end + 1, end=original_end))
-                # Stopping the inner FOR
-                break
-    return available_ranges
+def get_available_network_ip(cidr: ipaddress.IPv4Network, reserved_ranges: List[IPv4Pool]) -> List[IPv4Pool]:
+    """
+    Returns all the available intervals in a network, given the reserved ranges.
+    Args:
+        cidr: The CIDR of the network (e.g. '192.168.0.0/16')
+        reserved_ranges: The ranges that must NOT be used
+
+    Returns:
+        Available IPv4 ranges of the network.
+    """
+    ipam = build_network_ipam(cidr, reserved_ranges)
+    return [IPv4Pool(start=ipaddress.IPv4Address(start), end=ipaddress.IPv4Address(end)) for start, end in ipam.intervals()]
 
 
 def get_range_length(ip_min: ipaddress.IPv4Address, ip_max: ipaddress.IPv4Address) -> int:
@@ -113,24 +263,36 @@ def get_range_length(ip_min: ipaddress.IPv4Address, ip_max: ipaddress.IPv4Addres
     return int(ip_max) - int(ip_min)
 
 
+def find_range_in_ipam(ipam: IPv4IntervalSet, range_length: int, alignment: int = 1, best_fit: bool = True) -> IPv4Pool:
+    """
+    Return a free interval of sequential IP addresses, without reserving it.
+    Args:
+        ipam: The free addresses of the network
+        range_length: The length of sequential interval (the interval goes from start to start + range_length)
+        alignment: The start address must be a multiple of it
+        best_fit: Use the smallest free interval that can contain the range, otherwise the first one
+
+    Returns:
+        The free interval that can be allocated.
+    """
+    start = ipam.find(range_length + 1, alignment, best_fit)
+    if start is None:
+        raise ValueError('Not possible to get a range in the network cidr')
+    return IPv4Pool(start=ipaddress.IPv4Address(start), end=ipaddress.IPv4Address(start + range_length))
+
+
 def get_range_in_cidr(cidr: ipaddress.IPv4Network, reserved_ranges: List[IPv4Pool],
-                      range_length: int) -> IPv4Pool:
+                      range_length: int, alignment: int = 1, best_fit: bool = True) -> IPv4Pool:
     """
     Return a free interval of sequential IP addresses in the network.
     Args:
         cidr: The CIDR of the network (e.g. 192.168.0.0/16)
         reserved_ranges: The already reserved ranges in the network
         range_length: The length of sequential interval
+        alignment: The start address must be a multiple of it
+        best_fit: Use the smallest free interval that can contain the range, otherwise the first one
 
     Returns:
         The free interval that can be allocated.
     """
-    available_ranges = get_available_network_ip(cidr, reserved_ranges)
-    for ava_range in available_ranges:
-        if get_range_length(ava_range.start, ava_range.end) >= range_length:
-            # Found a range that is available and len enough
-            # Reducing to the required number of IPs
-            ava_range.end = ava_range.start+range_length
-            return ava_range
-
-    raise ValueError('Not possible to get a range in the network cidr')
+    return find_range_in_ipam(build_network_ipam(cidr, reserved_ranges), range_length, alignment, best_fit)
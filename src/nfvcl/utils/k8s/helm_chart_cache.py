@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Union, List, Iterator
+
+import yaml
+from pyhelm3 import Client
+from pyhelm3.models import Chart
+
+from nfvcl.models.config_model import HelmParameters
+from nfvcl.utils.k8s.helm_event_loop import run_helm
+from nfvcl.utils.log import create_logger
+from nfvcl.utils.util import get_nfvcl_config
+
+# Name of the file, in every cache entry, containing the entry information
+CHART_CACHE_ENTRY_FILE = "entry.json"
+# Name of the folder, in every cache entry, containing the unpacked chart
+CHART_CACHE_CHART_FOLDER = "chart"
+
+logger = create_logger("HelmChartCache")
+
+__helm_chart_cache: HelmChartCache | None = None
+
+
+def get_helm_chart_cache() -> HelmChartCache:
+    """
+    Allow to retrieve the HelmChartCache (that can have only one instance)
+    Returns:
+        The helm chart cache
+    """
+    global __helm_chart_cache
+    if __helm_chart_cache is not None:
+        return __helm_chart_cache
+    else:
+        nfvcl_config = get_nfvcl_config()
+        helm_config: HelmParameters = nfvcl_config.helm
+        cache_folder = Path(helm_config.chart_cache_folder) if helm_config.chart_cache_folder else Path(nfvcl_config.nfvcl.tmp_folder) / "helm_chart_cache"
+        __helm_chart_cache = HelmChartCache(cache_folder, helm_config.chart_cache_max_size_mb * 1024 * 1024, helm_config.offline)
+        return __helm_chart_cache
+
+
+class HelmChartCacheException(Exception):
+    pass
+
+
+def _folder_size(folder: Path) -> int:
+    return sum(file.stat().st_size for file in folder.rglob("*") if file.is_file())
+
+
+class HelmChartCache:
+    """
+    On disk cache of the helm charts downloaded from remote repositories, keyed by (repo, chart, version).
+    The charts are unpacked in the cache folder and installed from there, in this way the same chart version is
+    downloaded only once also when it is installed by many blueprints. When the cache exceeds the maximum size the
+    least recently used charts are removed, except the ones in use (see use_chart).
+
+    In offline mode the remote repositories are never contacted, only cached charts can be used (when the version is
+    not specified the most recent cached version is used).
+
+    The coroutines must be executed on the helm event loop (see run_helm).
+    """
+
+    def __init__(self, cache_folder: Path, max_size: int, offline: bool = False):
+        self.cache_folder = cache_folder
+        self.max_size = max_size
+        self.offline = offline
+        self.cache_folder.mkdir(parents=True, exist_ok=True)
+        # Prevent the same chart from being downloaded multiple times at the same time
+        self._locks: Dict[str, asyncio.Lock] = {}
+        # Number of users of every entry, entries with users cannot be removed. The eviction runs outside the helm event
+        # loop, this is a threading lock
+        self._readers: Dict[str, int] = {}
+        self._readers_lock = threading.Lock()
+
+    @staticmethod
+    def _entry_key(repo: Optional[str], chart: str, version: str) -> str:
+        return hashlib.sha256(f"{repo or ''}|{chart}|{version}".encode()).hexdigest()
+
+    def _entry_folder(self, repo: Optional[str], chart: str, version: str) -> Path:
+        return self.cache_folder / self._entry_key(repo, chart, version)
+
+    def _read_entry(self, entry_folder: Path) -> Optional[dict]:
+        try:
+            return json.loads((entry_folder / CHART_CACHE_ENTRY_FILE).read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _entries(self) -> List[Path]:
+        # Folders without the entry file are incomplete downloads
+        return [entry for entry in self.cache_folder.iterdir() if entry.is_dir() and (entry / CHART_CACHE_ENTRY_FILE).exists()]
+
+    def _pin(self, entry_folder: Path):
+        with self._readers_lock:
+            self._readers[entry_folder.name] = self._readers.get(entry_folder.name, 0) + 1
+
+    def _unpin(self, entry_folder: Path):
+        with self._readers_lock:
+            self._readers[entry_folder.name] -= 1
+            if self._readers[entry_folder.name] == 0:
+                del self._readers[entry_folder.name]
+
+    def _touch(self, entry_folder: Path):
+        # The last use of an entry is the modification time of its entry file
+        os.utime(entry_folder / CHART_CACHE_ENTRY_FILE)
+
+    def _load_chart(self, helm_client: Client, entry_folder: Path) -> Chart:
+        chart_folder = entry_folder / CHART_CACHE_CHART_FOLDER
+        with (chart_folder / "Chart.yaml").open() as chart_yaml:
+            metadata = yaml.safe_load(chart_yaml)
+        self._touch(entry_folder)
+        # Reading Chart.yaml avoids running 'helm show chart'
+        return Chart(helm_client._command, ref=chart_folder, metadata=metadata)
+
+    def _find_latest_cached_version(self, repo: Optional[str], chart: str) -> Optional[Path]:
+        candidates = []
+        for entry_folder in self._entries():
+            entry = self._read_entry(entry_folder)
+            if entry and entry["repo"] == repo and entry["chart"] == chart:
+                candidates.append((entry["created"], entry_folder))
+        return max(candidates)[1] if len(candidates) > 0 else None
+
+    def _store(self, pulled_chart_folder: Path, repo: Optional[str], chart: str, version: str) -> Path:
+        entry_folder = self._entry_folder(repo, chart, version)
+        tmp_folder = self.cache_folder / f".{entry_folder.name}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp_folder, ignore_errors=True)
+        shutil.copytree(pulled_chart_folder, tmp_folder / CHART_CACHE_CHART_FOLDER)
+        entry = {"repo": repo, "chart": chart, "version": version, "created": time.time(), "size": _folder_size(tmp_folder)}
+        (tmp_folder / CHART_CACHE_ENTRY_FILE).write_text(json.dumps(entry))
+        shutil.rmtree(entry_folder, ignore_errors=True)
+        # The entry appears complete or not at all
+        tmp_folder.rename(entry_folder)
+        return entry_folder
+
+    def evict(self, keep: Optional[Path] = None) -> List[str]:
+        """
+        Remove the least recently used charts until the cache size is below the maximum.
+
+        Args:
+            keep: An entry that must not be removed (e.g. the one just added)
+
+        Returns:
+            The removed charts as 'repo chart version'
+        """
+        entries = []
+        total_size = 0
+        for entry_folder in self._entries():
+            entry = self._read_entry(entry_folder)
+            if entry is None:
+                continue
+            total_size += entry["size"]
+            entries.append(((entry_folder / CHART_CACHE_ENTRY_FILE).stat().st_mtime, entry_folder, entry))
+
+        removed = []
+        for _, entry_folder, entry in sorted(entries, key=lambda item: item[0]):
+            if total_size <= self.max_size:
+                break
+            if entry_folder == keep:
+                continue
+            with self._readers_lock:
+                if self._readers.get(entry_folder.name, 0) > 0:
+                    continue
+                # Once renamed the entry cannot be found by get_chart anymore
+                removed_folder = self.cache_folder / f".{entry_folder.name}.{os.getpid()}.removed"
+                entry_folder.rename(removed_folder)
+            shutil.rmtree(removed_folder, ignore_errors=True)
+            total_size -= entry["size"]
+            removed.append(f"{entry['repo']} {entry['chart']} {entry['version']}")
+        if len(removed) > 0:
+            logger.debug(f"Removed charts from the cache: {removed}")
+        return removed
+
+    async def _pull(self, helm_client: Client, repo: Optional[str], chart: str, version: str) -> Path:
+        async with helm_client.pull_chart(chart, repo=repo, version=version) as pulled_chart:
+            entry_folder = await asyncio.to_thread(self._store, Path(pulled_chart.ref), repo, chart, version)
+        await asyncio.to_thread(self.evict, entry_folder)
+        return entry_folder
+
+    async def get_chart(self, helm_client: Client, chart_ref: Union[Path, str], repo: Optional[str] = None, version: Optional[str] = None, pin: bool = False) -> Chart:
+        """
+        Get a chart, from the cache when possible. Charts on the local filesystem are not cached.
+
+        Args:
+            helm_client: The helm client used to download the chart
+            chart_ref: The chart reference (name, URL or local path)
+            repo: The repository of the chart
+            version: The version of the chart, if None the latest
+            pin: If True the chart is not removed from the cache until release_chart is called
+
+        Returns:
+            The chart, referencing the cached chart folder
+
+        Raises:
+            HelmChartCacheException in offline mode when the chart is not cached
+        """
+        if isinstance(chart_ref, Path):
+            return await helm_client.get_chart(chart_ref, repo=repo, version=version)
+
+        if version is None:
+            if self.offline:
+                entry_folder = self._find_latest_cached_version(repo, chart_ref)
+                if entry_folder is None:
+                    raise HelmChartCacheException(f"Chart {chart_ref} from {repo} is not cached and the helm offline mode is enabled")
+                return self._load_pinned_chart(helm_client, entry_folder, pin)
+            # Only the chart metadata is retrieved to find the latest version
+            version = (await helm_client.get_chart(chart_ref, repo=repo)).metadata.version
+
+        entry_folder = self._entry_folder(repo, chart_ref, version)
+        lock = self._locks.setdefault(entry_folder.name, asyncio.Lock())
+        async with lock:
+            # Pinned before checking if it exists, such that it cannot be removed in the meantime
+            if pin:
+                self._pin(entry_folder)
+            try:
+                if not (entry_folder / CHART_CACHE_ENTRY_FILE).exists():
+                    if self.offline:
+                        raise HelmChartCacheException(f"Chart {chart_ref} {version} from {repo} is not cached and the helm offline mode is enabled")
+                    logger.debug(f"Downloading chart {chart_ref} {version} from {repo}")
+                    entry_folder = await self._pull(helm_client, repo, chart_ref, version)
+                return self._load_chart(helm_client, entry_folder)
+            except BaseException:
+                if pin:
+                    self._unpin(entry_folder)
+                raise
+
+    def _load_pinned_chart(self, helm_client: Client, entry_folder: Path, pin: bool) -> Chart:
+        if pin:
+            self._pin(entry_folder)
+        try:
+            return self._load_chart(helm_client, entry_folder)
+        except BaseException:
+            if pin:
+                self._unpin(entry_folder)
+            raise
+
+    def release_chart(self, chart: Chart):
+        """
+        Allow the removal of a chart pinned by get_chart, charts not in the cache are ignored.
+
+        Args:
+            chart: The chart returned by get_chart
+        """
+        entry_folder = Path(chart.ref).parent
+        if entry_folder.parent == self.cache_folder:
+            self._unpin(entry_folder)
+
+    @contextlib.contextmanager
+    def use_chart(self, helm_client: Client, chart_ref: Union[Path, str], repo: Optional[str] = None, version: Optional[str] = None) -> Iterator[Chart]:
+        """
+        Get a chart, like get_chart, keeping it in the cache while the context is active (e.g. while it is installed).
+        To be called outside the helm event loop.
+
+        Args:
+            helm_client: The helm client used to download the chart
+            chart_ref: The chart reference (name, URL or local path)
+            repo: The repository of the chart
+            version: The version of the chart, if None the latest
+
+        Returns:
+            A context manager giving the chart
+
+        Raises:
+            HelmChartCacheException in offline mode when the chart is not cached
+        """
+        chart = run_helm(self.get_chart(helm_client, chart_ref, repo=repo, version=version, pin=True))
+        try:
+            yield chart
+        finally:
+            self.release_chart(chart)
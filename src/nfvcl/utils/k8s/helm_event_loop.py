@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Coroutine, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+__helm_event_loop: HelmEventLoop | None = None
+
+
+def get_helm_event_loop() -> HelmEventLoop:
+    """
+    Allow to retrieve the HelmEventLoop (that can have only one instance)
+    Returns:
+        The helm event loop
+    """
+    global __helm_event_loop
+    if __helm_event_loop is not None:
+        return __helm_event_loop
+    else:
+        __helm_event_loop = HelmEventLoop()
+        return __helm_event_loop
+
+
+class HelmEventLoop:
+    """
+    An event loop running forever in a dedicated thread, used to execute the (async) pyhelm3 operations from
+    synchronous code. Creating a new loop for every operation (asyncio.run) is expensive and prevents the operations
+    of different blueprints from running on the same loop at the same time.
+    """
+
+    def __init__(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name="helm_event_loop", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def run(self, coroutine: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """
+        Execute a coroutine on the helm event loop and wait for the result.
+        THREAD SAFE, must not be called from the helm event loop thread.
+
+        Args:
+            coroutine: The coroutine to be executed
+            timeout: Maximum seconds to wait for the result, None to wait forever
+
+        Returns:
+            The result of the coroutine
+
+        Raises:
+            TimeoutError if the coroutine is not completed before the timeout (the coroutine is cancelled)
+        """
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("HelmEventLoop.run cannot be called from the helm event loop thread")
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"Helm operation not completed in {timeout} seconds")
+
+    def gather(self, *coroutines: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> List[Any]:
+        """
+        Execute multiple coroutines concurrently on the helm event loop and wait for all the results.
+
+        Args:
+            *coroutines: The coroutines to be executed
+            timeout: Maximum seconds to wait for all the results, None to wait forever
+
+        Returns:
+            The results of the coroutines, in the same order
+        """
+        async def _gather():
+            return await asyncio.gather(*coroutines)
+
+        return self.run(_gather(), timeout)
+
+
+def run_helm(coroutine: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+    """
+    Execute a pyhelm3 coroutine on the shared helm event loop and wait for the result (sync facade of pyhelm3).
+
+    Args:
+        coroutine: The coroutine to be executed (e.g. helm_client.get_chart(...))
+        timeout: Maximum seconds to wait for the result, None to wait forever
+
+    Returns:
+        The result of the coroutine
+    """
+    return get_helm_event_loop().run(coroutine, timeout)
@@ -1,4 +1,3 @@
-import asyncio
 import time
 import traceback
 from pathlib import Path
@@ -14,6 +13,8 @@ from nfvcl.utils.file_utils import render_file_from_template_to_file, create_tmp
 from nfvcl.blueprints_ng.resources import HelmChartResource
 from nfvcl.models.k8s.plugin_k8s_model import K8sPluginName, K8sPluginAdditionalData
 from pyhelm3 import Client
+from nfvcl.utils.k8s.helm_chart_cache import get_helm_chart_cache
+from nfvcl.utils.k8s.helm_event_loop import run_helm
 
 
 def build_helm_client_from_credential_file_path(k8s_credential_file_path) -> Client:
@@ -94,21 +95,21 @@ class HelmPluginManager:
 
         helm_client: Client = self.helm_client
 
-        chart = asyncio.run(helm_client.get_chart(
+        with get_helm_chart_cache().use_chart(
+            helm_client,
             helm_chart_res.get_chart_converted(),
             repo=helm_chart_res.repo,
             version=helm_chart_res.version
-        ))
-
-        self.logger.info(f"Installing chart {chart} in {namespace}")
-        chart_install_result = asyncio.run(helm_client.install_or_upgrade_release(
-            helm_chart_res.name.lower(),
-            chart,
-            values if values else {},
-            namespace=helm_chart_res.namespace.lower(),
-            atomic=True,
-            wait=True
-        ))
+        ) as chart:
+            self.logger.info(f"Installing chart {chart} in {namespace}")
+            chart_install_result = run_helm(helm_client.install_or_upgrade_release(
+                helm_chart_res.name.lower(),
+                chart,
+                values if values else {},
+                namespace=helm_chart_res.namespace.lower(),
+                atomic=True,
+                wait=True
+            ))
 
     def install_plugins(self, plugin_names: list[K8sPluginName], plugin_data: K8sPluginAdditionalData):
         """
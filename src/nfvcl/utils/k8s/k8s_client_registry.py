@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Optional, Tuple, Dict, Iterator
+
+import kubernetes.client
+from kubernetes import config
+from kubernetes.client import Configuration
+
+from nfvcl.utils.log import create_logger
+
+# Maximum number of cluster configurations (and connection pools) kept in memory, the least recently used are closed
+K8S_CLIENT_REGISTRY_MAX_ENTRIES = 64
+
+logger = create_logger("K8sClientRegistry")
+
+__k8s_client_registry: K8sClientRegistry | None = None
+
+
+def get_k8s_client_registry() -> K8sClientRegistry:
+    """
+    Allow to retrieve the K8sClientRegistry (that can have only one instance)
+    Returns:
+        The k8s client registry
+    """
+    global __k8s_client_registry
+    if __k8s_client_registry is not None:
+        return __k8s_client_registry
+    else:
+        __k8s_client_registry = K8sClientRegistry()
+        return __k8s_client_registry
+
+
+def _credentials_hash(credentials: str) -> str:
+    return hashlib.sha256(credentials.encode()).hexdigest()
+
+
+def load_k8s_config_from_file_content(kube_client_config_file_content: str) -> Configuration:
+    """
+    Create a kube client config from the content of configuration file, without using the registry.
+
+    Args:
+        kube_client_config_file_content: the content of the configuration file
+
+    Returns:
+        kube client configuration
+    """
+    with tempfile.NamedTemporaryFile(mode='w') as tmp:
+        tmp.write(kube_client_config_file_content)
+        tmp.flush()
+
+        kube_client_config = type.__call__(Configuration)
+        config.load_kube_config(config_file=tmp.name, context=None, client_configuration=kube_client_config, persist_config=False)
+        kube_client_config.verify_ssl = False
+
+    return kube_client_config
+
+
+class K8sClientRegistry:
+    """
+    Keep, for every k8s cluster, the client configuration and an ApiClient, whose connection pool is reused by all the
+    requests to the cluster. Entries are keyed by cluster name and credential hash, when the credentials of a cluster
+    change the old entry is closed.
+    """
+
+    def __init__(self, max_entries: int = K8S_CLIENT_REGISTRY_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # (cluster name, credentials hash) -> configuration
+        self._configurations: OrderedDict[Tuple[Optional[str], str], Configuration] = OrderedDict()
+        # id(configuration) -> api client, only for the configurations in the registry
+        self._api_clients: Dict[int, kubernetes.client.ApiClient] = {}
+
+    def get_configuration(self, credentials: str, cluster_name: Optional[str] = None) -> Configuration:
+        """
+        Get the client configuration for a cluster, the kubeconfig is parsed only the first time.
+
+        Args:
+            credentials: The content of the kubeconfig file
+            cluster_name: The name of the cluster, None if unknown
+
+        Returns:
+            The client configuration, the same object is returned while the credentials do not change
+        """
+        key = (cluster_name, _credentials_hash(credentials))
+        with self._lock:
+            if key in self._configurations:
+                self._configurations.move_to_end(key)
+                return self._configurations[key]
+
+        configuration = load_k8s_config_from_file_content(credentials)
+
+        with self._lock:
+            if key in self._configurations:
+                # Loaded at the same time by another thread
+                return self._configurations[key]
+            if cluster_name is not None:
+                # The credentials of the cluster have changed
+                for old_key in [old_key for old_key in self._configurations if old_key[0] == cluster_name]:
+                    self._remove(old_key)
+            self._configurations[key] = configuration
+            while len(self._configurations) > self.max_entries:
+                self._remove(next(iter(self._configurations)))
+        return configuration
+
+    def get_api_client(self, configuration: Configuration) -> Optional[kubernetes.client.ApiClient]:
+        """
+        Get the shared ApiClient for a configuration of the registry.
+
+        Args:
+            configuration: A configuration returned by get_configuration
+
+        Returns:
+            The shared ApiClient, None if the configuration is not in the registry
+        """
+        with self._lock:
+            if not any(registered is configuration for registered in self._configurations.values()):
+                return None
+            if id(configuration) not in self._api_clients:
+                self._api_clients[id(configuration)] = kubernetes.client.ApiClient(configuration)
+            return self._api_clients[id(configuration)]
+
+    def invalidate(self, cluster_name: str, keep_credentials: Optional[str] = None) -> None:
+        """
+        Remove the entries of a cluster, closing their connection pools.
+
+        Args:
+            cluster_name: The name of the cluster
+            keep_credentials: If present, the entry for these credentials is kept (the credentials have not changed)
+        """
+        keep_hash = _credentials_hash(keep_credentials) if keep_credentials is not None else None
+        with self._lock:
+            for key in [key for key in self._configurations if key[0] == cluster_name and key[1] != keep_hash]:
+                self._remove(key)
+
+    def _remove(self, key: Tuple[Optional[str], str]) -> None:
+        # Must be called holding the lock
+        configuration = self._configurations.pop(key)
+        api_client = self._api_clients.pop(id(configuration), None)
+        if api_client is not None:
+            try:
+                api_client.close()
+            except Exception as e:
+                logger.warning(f"Error closing the k8s client for cluster {key[0]}: {str(e)}")
+
+
+@contextmanager
+def k8s_api_client(kube_client_config: Configuration) -> Iterator[kubernetes.client.ApiClient]:
+    """
+    Context manager returning an ApiClient for the configuration. For configurations of the registry the shared client
+    is returned and it is not closed at the exit, for other configurations a new client is created and closed.
+
+    Args:
+        kube_client_config: The client configuration
+    """
+    api_client = get_k8s_client_registry().get_api_client(kube_client_config)
+    if api_client is not None:
+        yield api_client
+    else:
+        with kubernetes.client.ApiClient(kube_client_config) as api_client:
+            yield api_client
@@ -1,7 +1,6 @@
-import tempfile
 from logging import Logger
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 import kubernetes.client
 import kubernetes.utils
@@ -14,6 +13,7 @@ from nfvcl.config_templates.k8s.k8s_plugin_config_manager import get_enabled_plu
 from nfvcl.models.k8s.plugin_k8s_model import K8sPluginName, K8sPluginType
 from nfvcl.models.k8s.topology_k8s_model import K8sVersion
 from nfvcl.utils.k8s.k8s_client_extension import create_from_yaml_custom
+from nfvcl.utils.k8s.k8s_client_registry import get_k8s_client_registry, k8s_api_client
 from nfvcl.utils.log import create_logger
 
 TIMEOUT_SECONDS = 10
@@ -68,28 +68,17 @@ class check_k8s_version(object):
         return wrapped_f
 
 
-def get_k8s_config_from_file_content(kube_client_config_file_content: str) -> kubernetes.client.Configuration:
+def get_k8s_config_from_file_content(kube_client_config_file_content: str, cluster_name: Optional[str] = None) -> kubernetes.client.Configuration:
     """
-    Create a kube client config from the content of configuration file. It creates a temp file and read it's content in
-    order to create the k8s config
+    Create a kube client config from the content of configuration file. The config is cached in the k8s client registry,
+    the file is parsed only the first time and the same config (with its connection pool) is returned while the content
+    does not change.
     @param kube_client_config_file_content: the content of the configuration file
+    @param cluster_name: the name of the cluster, allows to discard the old config when the credentials of the cluster change
 
     @return kube client configuration
     """
-    tmp = tempfile.NamedTemporaryFile()
-    try:
-        with open(tmp.name, 'w') as f:
-            f.write(kube_client_config_file_content)
-        tmp.flush()
-
-        kube_client_config = type.__call__(Configuration)
-        config.load_kube_config(config_file=tmp.name, context=None, client_configuration=kube_client_config,
-                                persist_config=False)
-        kube_client_config.verify_ssl = False
-    finally:
-        tmp.close()
-
-    return kube_client_config
+    return get_k8s_client_registry().get_configuration(kube_client_config_file_content, cluster_name)
 
 
 def get_config_for_k8s_from_dict(kube_client_config_dict: dict) -> kubernetes.client.Configuration:
@@ -122,7 +111,7 @@ def get_pods_for_k8s_namespace(kube_client_config: kubernetes.client.Configurati
         Return the list of pods (as V1PodList) belonging to that namespace in the given k8s cluster.
     """
     # Enter a context with an instance of the API kubernetes.client
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         # Create an instance of the API class
         api_instance_core = kubernetes.client.CoreV1Api(api_client)
         pod_list: V1PodList = None
@@ -139,7 +128,7 @@ def get_pods_for_k8s_namespace(kube_client_config: kubernetes.client.Configurati
         return pod_list
 
 def get_logs_for_pod(kube_client_config: kubernetes.client.Configuration, namespace: str, pod_name: str, tail_lines=None):
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         # Create an instance of the API class
         api_instance_core = kubernetes.client.CoreV1Api(api_client)
         pod_log: str
@@ -168,7 +157,7 @@ def get_daemon_sets(kube_client_config: kubernetes.client.Configuration, namespa
     Returns: an object V1DaemonSetList containing a list of DaemonSets
     """
     # Enter a context with an instance of the API kubernetes.client
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         # Create an instance of the apps API
         api_instance_appsV1 = kubernetes.client.AppsV1Api(api_client)
         try:
@@ -203,7 +192,7 @@ def get_deployments(kube_client_config: kubernetes.client.Configuration, namespa
     Returns: an object V1DaemonSetList containing a list of DaemonSets
     """
     # Enter a context with an instance of the API kubernetes.client
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         # Create an instance of the apps API
         api_instance_appsV1 = kubernetes.client.AppsV1Api(api_client)
         try:
@@ -236,7 +225,7 @@ def get_services(kube_client_config: kubernetes.client.Configuration, namespace:
     Returns: an object V1DaemonSetList containing a list of DaemonSets
     """
     # Enter a context with an instance of the API kubernetes.client
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         # Create an instance of the apps API
         api_instance_coreV1 = kubernetes.client.CoreV1Api(api_client)
         try:
@@ -264,7 +253,7 @@ def get_config_map(kube_client_config: kubernetes.client.Configuration, namespac
 
         Returns: an object V1ConfigMap containing the desired configmap if found
     """
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         api_instance_configmap = kubernetes.client.CoreV1Api(api_client)
         try:
             config_map = api_instance_configmap.read_namespaced_config_map(config_map_name, namespace=namespace)
@@ -288,7 +277,7 @@ def patch_config_map(kube_client_config: kubernetes.client.Configuration, name,
 
         Returns: an object V1ConfigMap containing the patched configmap if patched
     """
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         api_instance_configmap = kubernetes.client.CoreV1Api(api_client)
         try:
             config_map = api_instance_configmap.patch_namespaced_config_map(name, namespace, config_map)
@@ -317,7 +306,7 @@ def apply_def_to_cluster(kube_client_config: kubernetes.client.Configuration, di
     result_dict = None
     result_yaml = None
 
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         try:
             if dict_to_be_applied:
                 result_dict = kubernetes.utils.create_from_dict(api_client, dict_to_be_applied)
@@ -345,7 +334,7 @@ def k8s_create_namespace(kube_client_config: kubernetes.client.Configuration, na
         The created namespace
     """
     # Enter a context with an instance of the API kubernetes.client
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         # Create an instance of the API class
         api_instance_core = kubernetes.client.CoreV1Api(api_client)
         object_metadata = V1ObjectMeta(name=namespace_name, labels=labels)
@@ -371,7 +360,7 @@ def k8s_delete_namespace(kube_client_config: kubernetes.client.Configuration, na
         The deleted namespace
     """
     # Enter a context with an instance of the API kubernetes.client
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         # Create an instance of the API class
         api_instance_core = kubernetes.client.CoreV1Api(api_client)
         try:
@@ -440,7 +429,7 @@ def get_k8s_version(kube_client_config: kubernetes.client.Configuration) -> K8sV
         ApiException: when an error occurs into kube client
         ValueError: When k8s version is not included among those provided
     """
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         version_api = kubernetes.client.VersionApi(api_client)
         try:
             api_version: VersionInfo = version_api.get_code(_request_timeout=10)
@@ -493,7 +482,7 @@ def read_namespaced_config_map(kube_client_config: kubernetes.client.Configurati
     Raises:
         ApiException when k8s client fail
     """
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         core_v1_api = kubernetes.client.CoreV1Api(api_client)
         try:
             config_map: V1ConfigMap = core_v1_api.read_namespaced_config_map(name=config_name,
@@ -521,7 +510,7 @@ def read_namespaced_storage_class(kube_client_config: kubernetes.client.Configur
     Raises:
         ApiException when k8s client fails
     """
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         api_instance = kubernetes.client.StorageV1Api(api_client)
         try:
             storage_class = api_instance.read_storage_class(name=storage_class_name)
@@ -545,7 +534,7 @@ def patch_namespaced_storage_class(kube_client_config: kubernetes.client.Configu
     Returns:
         The patched storage class
     """
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         api_instance = kubernetes.client.StorageV1Api(api_client)
         try:
             patched_storage_class = api_instance.patch_storage_class(name=storage_class.metadata.name,
@@ -10,6 +10,7 @@ from kubernetes.client import V1ServiceAccountList, ApiException, V1ServiceAccou
 
 from nfvcl.models.k8s.common_k8s_model import Labels
 from nfvcl.models.k8s.topology_k8s_model import K8sQuota
+from nfvcl.utils.k8s.k8s_client_registry import k8s_api_client
 from nfvcl.utils.log import create_logger
 from nfvcl.utils.util import generate_rsa_key, generate_cert_sign_req, convert_to_base64
 
@@ -35,7 +36,7 @@ def get_service_accounts(kube_client_config: kubernetes.client.Configuration, na
     """
     field_selector = ''
     # Enter a context with an instance of the API kubernetes.client
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         # Create an instance of the apps API
         api_instance_core = kubernetes.client.CoreV1Api(api_client)
         try:
@@ -104,7 +105,7 @@ def k8s_get_roles(kube_client_config: kubernetes.client.Configuration, namespace
     """
     field_selector = ''
     # Enter a context with an instance of the API kubernetes.client
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         # Create an instance of the RBAC API
         api_instance_rbac = kubernetes.client.RbacAuthorizationV1Api(api_client)
         try:
@@ -169,7 +170,7 @@ def get_k8s_namespaces(kube_client_config: kubernetes.client.Configuration, name
     """
     field_selector = ''
     # Enter a context with an instance of the API kubernetes.client
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         # Create an instance of the CORE API
         api_instance_core = kubernetes.client.CoreV1Api(api_client)
         try:
@@ -221,7 +222,7 @@ def k8s_create_service_account(kube_client_config: kubernetes.client.Configurati
         The created service account
     """
     # Enter a context with an instance of the API kubernetes.client
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         # Create an instance of the CORE API
         api_instance_core = kubernetes.client.CoreV1Api(api_client)
         try:
@@ -245,7 +246,7 @@ def k8s_create_admin_role(kube_client_config: kubernetes.client.Configuration, n
     if not k8s_check_namespace_exist(kube_client_config, namespace):
         raise ValueError("Namespace ->{}<- does not exist.".format(namespace))
     # Enter a context with an instance of the API kubernetes.client
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         # Create an instance of the RBAC API
         api_instance_rbac = kubernetes.client.RbacAuthorizationV1Api(api_client)
         try:
@@ -282,7 +283,7 @@ def k8s_admin_role_to_sa(kube_client_config: kubernetes.client.Configuration, na
         # Not critical, can exist a role binding to a user(service account) that is not inside namespace
         logger.warning("User ->{}<- in {} namespace.".format(username, namespace))
     # Enter a context with an instance of the API kubernetes.client
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         # Create an instance of the RBAC API
         api_instance_rbac = kubernetes.client.RbacAuthorizationV1Api(api_client)
         try:
@@ -322,7 +323,7 @@ def k8s_admin_role_over_namespace(kube_client_config: kubernetes.client.Configur
     if not k8s_check_namespace_exist(kube_client_config, namespace):
         raise ValueError("Namespace ->{}<- does not exist.".format(namespace))
     # Enter a context with an instance of the API kubernetes.client
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         # Create an instance of the RBAC API
         api_instance_rbac = kubernetes.client.RbacAuthorizationV1Api(api_client)
         # Checking if admin role exist, otherwise create it
@@ -364,7 +365,7 @@ def k8s_cluster_admin(kube_client_config: kubernetes.client.Configuration, usern
         The created cluster role binding for administrator.
     """
 
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         # Create an instance of the RBAC API
         api_instance_rbac = kubernetes.client.RbacAuthorizationV1Api(api_client)
         try:
@@ -403,7 +404,7 @@ def k8s_create_secret_for_user(kube_client_config: kubernetes.client.Configurati
     if not service_account:
         raise ValueError("User ->{}<- in {} namespace.".format(username, namespace))
 
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         # Create an instance of the Core API
         api_instance_core = kubernetes.client.CoreV1Api(api_client)
         try:
@@ -437,7 +438,7 @@ def k8s_get_secrets(kube_client_config: kubernetes.client.Configuration, namespa
         A filtered list of secrets
     """
     field_selector = ''
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         # Create an instance of the CORE API
         api_instance_core = kubernetes.client.CoreV1Api(api_client)
         try:
@@ -490,7 +491,7 @@ def k8s_cert_sign_req(kube_client_config: kubernetes.client.Configuration, usern
     cert_sign_req = generate_cert_sign_req(username, key)
     cert_sign_req_base64 = convert_to_base64(cert_sign_req)
 
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         # Create an instance of the CORE API
         api_instance_core = kubernetes.client.CertificatesV1Api(api_client)
         api_instance_secrets = kubernetes.client.CoreV1Api(api_client)
@@ -555,7 +556,7 @@ def k8s_create_namespace(kube_client_config: kubernetes.client.Configuration, na
         The created namespace
     """
     # Enter a context with an instance of the API kubernetes.client
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         # Create an instance of the API class
         api_instance_core = kubernetes.client.CoreV1Api(api_client)
         metadata = V1ObjectMeta(name=namespace_name, labels=labels)
@@ -584,7 +585,7 @@ def k8s_delete_namespace(kube_client_config: kubernetes.client.Configuration, na
         The deleted namespace
     """
     # Enter a context with an instance of the API kubernetes.client
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         # Create an instance of the API class
         api_instance_core = kubernetes.client.CoreV1Api(api_client)
         try:
@@ -611,7 +612,7 @@ def k8s_add_quota_to_namespace(kube_client_config: kubernetes.client.Configurati
     Returns:
         The created quota.
     """
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         api_instance_core = kubernetes.client.CoreV1Api(api_client)
 
         spec = quota.model_dump(by_alias=True)
@@ -644,7 +645,7 @@ def k8s_add_container_to_namespaced_deployment(kube_client_config: kubernetes.cl
     Returns:
         The patched deployment.
     """
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         api_instance_app = kubernetes.client.AppsV1Api(api_client)
 
         deployment_to_be_patched: V1Pod = api_instance_app.read_namespaced_deployment(name=deployment_name, namespace=namespace_name)
@@ -674,7 +675,7 @@ def k8s_get_nodes(kube_client_config: kubernetes.client.Configuration, detailed:
     Returns:
         The list of nodes or the list of names if detailed is false.
     """
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         api_instance_core = kubernetes.client.CoreV1Api(api_client)
         node_list: V1NodeList = api_instance_core.list_node()
         if detailed:
@@ -697,7 +698,7 @@ def k8s_add_label_to_k8s_node(kube_client_config: kubernetes.client.Configuratio
     Returns:
         The patched node
     """
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         api_instance_core = kubernetes.client.CoreV1Api(api_client)
         node: V1Node = api_instance_core.read_node(name=node_name)
 
@@ -719,7 +720,7 @@ def k8s_get_deployments(kube_client_config: kubernetes.client.Configuration, nam
     Returns:
         The list of deployments or the list of names if detailed is false.
     """
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         api_instance_apps = kubernetes.client.AppsV1Api(api_client)
         deployment_list: V1DeploymentList = api_instance_apps.list_namespaced_deployment(namespace=namespace)
         if detailed:
@@ -741,7 +742,7 @@ def k8s_add_label_to_k8s_deployment(kube_client_config: kubernetes.client.Config
     Returns:
         The patched deployment
     """
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         api_instance_app = kubernetes.client.AppsV1Api(api_client)
         node: V1Deployment = api_instance_app.read_namespaced_deployment(namespace=namespace, name=deployment_name)
 
@@ -764,7 +765,7 @@ def k8s_scale_k8s_deployment(kube_client_config: kubernetes.client.Configuration
     Returns:
         The patched deployment
     """
-    with kubernetes.client.ApiClient(kube_client_config) as api_client:
+    with k8s_api_client(kube_client_config) as api_client:
         api_instance_app = kubernetes.client.AppsV1Api(api_client)
         node: V1Deployment = api_instance_app.read_namespaced_deployment(namespace=namespace, name=deployment_name)
 
@@ -1,13 +1,15 @@
 import logging
 from logging.handlers import RotatingFileHandler
-from typing import Dict
-from redis import Redis
+from typing import Dict, TYPE_CHECKING
 import coloredlogs
 import verboselogs
 from pathlib import Path
 
 from nfvcl.utils.util import is_config_loaded
 
+if TYPE_CHECKING:
+    from nfvcl.utils.redis_utils.redis_publisher import RedisPublisher
+
 _log_level = logging.DEBUG
 LOG_FILE_PATH = "logs/nfvcl.log"
 Path('logs').mkdir(parents=True, exist_ok=True)
@@ -147,9 +149,8 @@ def mod_logger(logger: logging.Logger, blueprintid='SYSTEM', log_level=_log_leve
     # Workaround for logging before loading config
     if is_config_loaded():
         # Adding Redis handler to output the log to redis through publication
-        from nfvcl.utils.redis_utils.redis_manager import get_redis_instance
-        _redis_cli: Redis = get_redis_instance()
-        redis_handler = RedisLoggingHandler(_redis_cli)
+        from nfvcl.utils.redis_utils.redis_manager import get_redis_publisher
+        redis_handler = RedisLoggingHandler(get_redis_publisher())
         redis_handler.setLevel(log_level)
         redis_handler.setFormatter(formatter)
         logger.addHandler(redis_handler)
@@ -176,20 +177,20 @@ class RedisLoggingHandler(logging.Handler):
     observe what is going on, without need to connect at the NFVCL machine.
     """
 
-    def __init__(self, redis_instance: Redis, *args, **kwargs):
+    def __init__(self, redis_publisher: 'RedisPublisher', *args, **kwargs):
         """
         Args:
-            redis_instance: the redis instance, where to publish logs.
+            redis_publisher: the redis publisher, used to publish logs in background.
         """
         super().__init__(*args, **kwargs)
-        self.redis_instance = redis_instance
+        self.redis_publisher = redis_publisher
 
     def emit(self, record):
         """
-        Format and publish the record on redis
+        Format and queue the record to be published on redis, it does not wait for redis.
 
         Args:
             record: the record to be published
         """
         s = self.format(record)
-        self.redis_instance.publish('NFVCL_LOG', s)
+        self.redis_publisher.publish('NFVCL_LOG', s)
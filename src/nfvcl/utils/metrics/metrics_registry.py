@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+from typing import Callable, Dict, List, Tuple
+
+# Default buckets (seconds) for the duration of blueprint operations and provider calls, a DAY0 can take tens of minutes
+DEFAULT_DURATION_BUCKETS: Tuple[float, ...] = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1200, 1800, 3600)
+
+__metrics_registry: MetricsRegistry | None = None
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """
+    Allow to retrieve the MetricsRegistry (that can have only one instance)
+    Returns:
+        The metrics registry
+    """
+    global __metrics_registry
+    if __metrics_registry is not None:
+        return __metrics_registry
+    else:
+        __metrics_registry = MetricsRegistry()
+        return __metrics_registry
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: List[Tuple[str, str]]) -> str:
+    if len(labels) == 0:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class Histogram:
+    """
+    A Prometheus histogram with labels, the observations are counted in cumulative buckets.
+    """
+
+    def __init__(self, name: str, description: str, label_names: Tuple[str, ...], buckets: Tuple[float, ...] = DEFAULT_DURATION_BUCKETS):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # label values -> (count for every bucket (the last is +Inf), sum)
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """
+        Add an observation to the histogram.
+        THREAD SAFE.
+
+        Args:
+            value: The observed value
+            **labels: The value of every label of the histogram
+        """
+        label_values = tuple(str(labels[name]) for name in self.label_names)
+        # Index of the first bucket containing the value, the counts are made cumulative when rendered
+        bucket_index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._series.get(label_values, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[bucket_index] += 1
+            self._series[label_values] = (counts, total + value)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = [(label_values, list(counts), total) for label_values, (counts, total) in self._series.items()]
+        for label_values, counts, total in series:
+            labels = list(zip(self.label_names, label_values))
+            cumulative = 0
+            for upper_bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(labels + [('le', _format_value(upper_bound))])} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class Counter:
+    """
+    A Prometheus counter with labels.
+    """
+
+    def __init__(self, name: str, description: str, label_names: Tuple[str, ...]):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """
+        Increment the counter.
+        THREAD SAFE.
+
+        Args:
+            amount: The increment
+            **labels: The value of every label of the counter
+        """
+        label_values = tuple(str(labels[name]) for name in self.label_names)
+        with self._lock:
+            self._series[label_values] = self._series.get(label_values, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            series = list(self._series.items())
+        for label_values, value in series:
+            lines.append(f"{self.name}{_format_labels(list(zip(self.label_names, label_values)))} {_format_value(value)}")
+        return lines
+
+
+class Gauge:
+    """
+    A Prometheus gauge whose value is read, when the metrics are exposed, from a function.
+    """
+
+    def __init__(self, name: str, description: str, function: Callable[[], float]):
+        self.name = name
+        self.description = description
+        self.function = function
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} gauge", f"{self.name} {_format_value(self.function())}"]
+
+
+class MetricsRegistry:
+    """
+    Collect the metrics of the NFVCL and render them in the Prometheus text exposition format.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Histogram | Counter | Gauge] = {}
+
+    def histogram(self, name: str, description: str, label_names: Tuple[str, ...], buckets: Tuple[float, ...] = DEFAULT_DURATION_BUCKETS) -> Histogram:
+        """
+        Get the histogram with the given name, it is created if it does not exist.
+
+        Args:
+            name: The metric name
+            description: The help text of the metric
+            label_names: The names of the labels
+            buckets: The upper bounds of the buckets
+
+        Returns:
+            The histogram
+        """
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Histogram(name, description, label_names, buckets)
+            return self._metrics[name]
+
+    def counter(self, name: str, description: str, label_names: Tuple[str, ...]) -> Counter:
+        """
+        Get the counter with the given name, it is created if it does not exist.
+
+        Args:
+            name: The metric name
+            description: The help text of the metric
+            label_names: The names of the labels
+
+        Returns:
+            The counter
+        """
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Counter(name, description, label_names)
+            return self._metrics[name]
+
+    def gauge(self, name: str, description: str, function: Callable[[], float]) -> Gauge:
+        """
+        Register a gauge, the function is called every time the metrics are exposed.
+        A gauge with the same name is replaced.
+
+        Args:
+            name: The metric name
+            description: The help text of the metric
+            function: The function returning the current value
+
+        Returns:
+            The gauge
+        """
+        gauge = Gauge(name, description, function)
+        with self._lock:
+            self._metrics[name] = gauge
+        return gauge
+
+    def render(self) -> str:
+        """
+        Returns:
+            The metrics in the Prometheus text exposition format (version 0.0.4)
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
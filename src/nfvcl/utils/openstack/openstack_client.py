@@ -1,8 +1,11 @@
+import threading
+import time
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 
 from openstack.image.v2.image import Image
 from openstack.network.v2.network import Network
+from openstack.network.v2.subnet import Subnet
 
 from nfvcl.models.openstack.images import ImageRepo
 from nfvcl.models.vim import VimModel
@@ -16,6 +19,54 @@ from nfvcl.utils.file_utils import render_file_from_template_to_file
 logger = create_logger("OpenStack Client")
 # Client list for the singleton pattern. One client for each OS cloud instance
 clients: dict = {}
+# Seconds after which the network catalog of a VIM is loaded again from Neutron
+OPENSTACK_NETWORK_CACHE_TTL = 60
+# Minimum seconds between two loads of the network catalog caused by a network missing from it
+OPENSTACK_NETWORK_MISS_REFRESH_INTERVAL = 5
+
+
+class NetworkCatalog:
+    """
+    Networks and subnets of a VIM, loaded from Neutron at most once every OPENSTACK_NETWORK_CACHE_TTL seconds.
+    Shared by all the clients of the same VIM.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.networks: Optional[Dict[str, Network]] = None
+        self.loaded_at: float = 0
+        # Subnet id -> (load time, subnet)
+        self.subnets: Dict[str, Tuple[float, Subnet]] = {}
+
+    def is_valid(self) -> bool:
+        return self.networks is not None and time.monotonic() - self.loaded_at < OPENSTACK_NETWORK_CACHE_TTL
+
+    def invalidate(self):
+        with self.lock:
+            self.networks = None
+            self.subnets = {}
+
+
+# Network catalog of every VIM (by VIM name)
+network_catalogs: Dict[str, NetworkCatalog] = {}
+network_catalogs_lock = threading.Lock()
+
+
+def get_network_catalog(vim_name: str) -> NetworkCatalog:
+    with network_catalogs_lock:
+        if vim_name not in network_catalogs:
+            network_catalogs[vim_name] = NetworkCatalog()
+        return network_catalogs[vim_name]
+
+
+def invalidate_network_catalog(vim_name: str):
+    """
+    Drop the cached networks and subnets of a VIM, they are loaded again from Neutron at the next request.
+    To be called when the networks of the VIM change.
+    Args:
+        vim_name: The name of the VIM
+    """
+    get_network_catalog(vim_name).invalidate()
 
 def _get_client(cloud_name: str) -> Connection:
     """
@@ -55,14 +106,50 @@ class OpenStackClient:
         # Get the client using a singleton pattern
         self.client = _get_client(vim.name)
         self.project_id = self.client.identity.find_project(vim.vim_tenant_name).id
+        self.network_catalog = get_network_catalog(vim.name)
 
-    def get_available_networks(self) -> Dict[str, Network]:
+    def _list_networks(self) -> Dict[str, Network]:
         shared_networks = list(self.client.network.networks(shared=True))
         project_networks = list(self.client.network.networks(project_id=self.project_id))
         all_networks: Dict[str, Network] = {network.name: network for network in shared_networks}
         all_networks.update({network.name: network for network in project_networks})
         return all_networks
 
+    def get_available_networks(self, refresh: bool = False) -> Dict[str, Network]:
+        """
+        Get the OS networks that the project can access, from the network catalog of the VIM.
+        Args:
+            refresh: If true the networks are loaded again from Neutron, also if the catalog is still valid
+
+        Returns: The networks by name
+        """
+        with self.network_catalog.lock:
+            if refresh or not self.network_catalog.is_valid():
+                self._load_networks()
+            return self.network_catalog.networks
+
+    def _load_networks(self):
+        # Must be called holding the lock of the network catalog
+        self.network_catalog.networks = self._list_networks()
+        self.network_catalog.loaded_at = time.monotonic()
+
+    def _find_networks(self, network_names: List[str]) -> Dict[str, Network]:
+        with self.network_catalog.lock:
+            if not self.network_catalog.is_valid():
+                self._load_networks()
+            elif any(network_name not in self.network_catalog.networks for network_name in network_names):
+                # The network may have been created after the catalog has been loaded, the catalog is loaded again
+                # only if it is not too recent: lookups of networks that do not exist must not flood Neutron
+                if time.monotonic() - self.network_catalog.loaded_at >= OPENSTACK_NETWORK_MISS_REFRESH_INTERVAL:
+                    self._load_networks()
+            return self.network_catalog.networks
+
+    def invalidate_network_cache(self):
+        """
+        Drop the cached networks and subnets of the VIM, to be called after changing the networks of the VIM.
+        """
+        self.network_catalog.invalidate()
+
     def get_network(self, network_name: str) -> Optional[Network]:
         """
         Get a OS network from the ones that the project can access
@@ -71,7 +158,7 @@ class OpenStackClient:
 
         Returns: The Network object or None if a network with the given name does not exist.
         """
-        all_networks = self.get_available_networks()
+        all_networks = self._find_networks([network_name])
         return all_networks[network_name] if network_name in all_networks else None
 
     def network_names_to_ids(self, network_names: List[str]) -> List[str]:
@@ -82,11 +169,30 @@ class OpenStackClient:
         Returns: List of network ids.
         """
         id_list = []
-        all_networks = self.get_available_networks()
+        all_networks = self._find_networks(network_names)
         for network_name in network_names:
             id_list.append(all_networks[network_name].id)
         return id_list
 
+    def get_subnet(self, subnet_id: str) -> Optional[Subnet]:
+        """
+        Get a OS subnet, from the network catalog of the VIM.
+        Args:
+            subnet_id: The id of the subnet
+
+        Returns: The Subnet object or None if it does not exist.
+        """
+        with self.network_catalog.lock:
+            if subnet_id in self.network_catalog.subnets:
+                loaded_at, subnet = self.network_catalog.subnets[subnet_id]
+                if time.monotonic() - loaded_at < OPENSTACK_NETWORK_CACHE_TTL:
+                    return subnet
+        subnet = self.client.get_subnet(subnet_id)
+        if subnet is not None:
+            with self.network_catalog.lock:
+                self.network_catalog.subnets[subnet_id] = (time.monotonic(), subnet)
+        return subnet
+
     def find_image(self, image_name: str) -> Image | None:
         """
         Find image on openstack given the name
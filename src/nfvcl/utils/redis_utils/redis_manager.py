@@ -1,11 +1,15 @@
+import threading
+
 import redis
 from redis import Redis
-from nfvcl.models.event import Event
 from nfvcl.utils.redis_utils.event_types import NFVCLEventType
+from nfvcl.utils.redis_utils.redis_publisher import RedisPublisher
 from nfvcl.utils.util import get_nfvcl_config
 
 # Private instance of redis to be distributed on need
 redis_instance: Redis | None = None
+redis_publisher: RedisPublisher | None = None
+redis_publisher_lock = threading.Lock()
 nfvcl_config = get_nfvcl_config()
 
 
@@ -22,15 +26,28 @@ def get_redis_instance() -> Redis:
     return redis_instance
 
 
+def get_redis_publisher() -> RedisPublisher:
+    """
+    Return the redis publisher, that publish messages on redis in background. In this way it is unique among all calls.
+
+    Returns:
+        The redis publisher
+    """
+    global redis_publisher
+    with redis_publisher_lock:
+        if redis_publisher is None:
+            redis_publisher = RedisPublisher(get_redis_instance(), nfvcl_config.redis)
+    return redis_publisher
+
+
 def trigger_redis_event(topic: str, event_type: NFVCLEventType, data: dict):
     """
     Send an event, together with the data that have been updated, to REDIS.
+    The event is queued and published in background, this function does not wait for REDIS.
 
     Args:
         topic: the topic where the event is published
         event_type (NFVCLEventType): the type of event
         data: the data that describe the type of event
     """
-    redis_cli = get_redis_instance()
-    event: Event = Event(operation=event_type.value, data=data)
-    redis_cli.publish(topic, event.model_dump_json())
+    get_redis_publisher().publish_event(topic, event_type, data)
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import atexit
+import threading
+import time
+from collections import deque, OrderedDict
+from typing import Deque, Optional, Tuple, Any, List
+
+from redis import Redis
+
+from nfvcl.models.config_model import RedisDropPolicy, RedisParameters
+from nfvcl.models.event import Event
+from nfvcl.utils.metrics.metrics_registry import get_metrics_registry
+from nfvcl.utils.redis_utils.event_types import NFVCLEventType
+
+# Seconds to wait before retrying after redis is found unreachable
+REDIS_PUBLISH_RETRY_INTERVAL = 1.0
+# Maximum number of objects for which the last published data is kept to compute compact events
+COMPACT_EVENTS_MAX_SNAPSHOTS = 1000
+
+
+class RedisPublisher:
+    """
+    Publish messages on redis from a background thread, callers only append the message to a bounded queue.
+    Messages are published in batches using a pipeline; when the queue is full the drop policy decides if the oldest
+    or the newest message is dropped, in this way a slow or unreachable redis never blocks the callers.
+    Batches that redis does not accept are queued again and retried, they are subject to the drop policy like new messages.
+    """
+
+    def __init__(self, redis_instance: Redis, redis_config: RedisParameters):
+        self.redis_instance = redis_instance
+        self.queue_size = redis_config.publish_queue_size
+        self.batch_size = redis_config.publish_batch_size
+        self.drop_policy = redis_config.publish_drop_policy
+        self.compact_events = redis_config.compact_events
+
+        # Items are (channel, event_type, data), if event_type is None data is the message to be published as it is
+        self._queue: Deque[Tuple[str, Optional[NFVCLEventType], Any]] = deque()
+        self._condition = threading.Condition()
+        metrics_registry = get_metrics_registry()
+        self.published_counter = metrics_registry.counter("nfvcl_redis_published_messages_total", "Messages published on redis", ())
+        self.dropped_counter = metrics_registry.counter("nfvcl_redis_dropped_messages_total", "Messages dropped because the redis publish queue was full", ())
+        self.failed_counter = metrics_registry.counter("nfvcl_redis_failed_messages_total", "Messages that could not be serialized or were still unpublished when the redis publisher was closed", ())
+        self.retried_counter = metrics_registry.counter("nfvcl_redis_retried_messages_total", "Messages queued again because redis was unreachable", ())
+        metrics_registry.gauge("nfvcl_redis_publish_queue_size", "Messages waiting to be published on redis", lambda: len(self._queue))
+        self._last_published: OrderedDict[Tuple[str, str], dict] = OrderedDict()
+        self._redis_reachable = True
+        self._closed = False
+        # Once closed, failed batches are retried until this time.monotonic() deadline
+        self._close_deadline = 0.0
+
+        self._thread = threading.Thread(target=self._run, name="redis_publisher", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def publish(self, channel: str, message: str) -> None:
+        """
+        Queue a message to be published on a channel.
+        THREAD SAFE, NON BLOCKING.
+
+        Args:
+            channel: The redis channel
+            message: The message to be published
+        """
+        self._put((channel, None, message))
+
+    def publish_event(self, topic: str, event_type: NFVCLEventType, data: dict) -> None:
+        """
+        Queue an event to be published on a topic, the event is serialized by the publisher thread.
+        THREAD SAFE, NON BLOCKING.
+
+        Args:
+            topic: the topic where the event is published
+            event_type: the type of event
+            data: the data that describe the event, it must not be modified after this call
+        """
+        self._put((topic, event_type, data))
+
+    def close(self, timeout: float = 5) -> None:
+        """
+        Stop the publisher, messages still in the queue are published if redis answers before the timeout.
+
+        Args:
+            timeout: Maximum seconds to wait for the queue to be emptied
+        """
+        with self._condition:
+            self._closed = True
+            self._close_deadline = time.monotonic() + timeout
+            self._condition.notify_all()
+        self._thread.join(timeout)
+
+    def _get_logger(self):
+        # Created when needed, creating it at import time would import this module again through the redis log handler
+        from nfvcl.utils.log import create_logger
+        return create_logger("RedisPublisher")
+
+    def _put(self, item: Tuple[str, Optional[NFVCLEventType], Any]) -> None:
+        with self._condition:
+            if len(self._queue) >= self.queue_size:
+                self.dropped_counter.inc()
+                if self.drop_policy == RedisDropPolicy.DROP_NEWEST:
+                    return
+                self._queue.popleft()
+            self._queue.append(item)
+            self._condition.notify()
+
+    def _requeue(self, messages: List[Tuple[str, str]]) -> None:
+        """
+        Put the serialized messages of a failed batch back at the head of the queue, keeping their order.
+        Messages exceeding the queue size are dropped following the drop policy.
+        """
+        with self._condition:
+            self._queue.extendleft((channel, None, message) for channel, message in reversed(messages))
+            self.retried_counter.inc(len(messages))
+            while len(self._queue) > self.queue_size:
+                self.dropped_counter.inc()
+                if self.drop_policy == RedisDropPolicy.DROP_NEWEST:
+                    self._queue.pop()
+                else:
+                    self._queue.popleft()
+
+    def _compact_data(self, topic: str, data: dict) -> dict:
+        """
+        Reduce the data of an event to the id, the status and the difference from the previous event of the same object.
+        """
+        # Imported here to avoid a circular import (database -> log -> redis)
+        from nfvcl.utils.database import compute_document_delta
+
+        object_id = data.get("id")
+        if not isinstance(object_id, str):
+            return data
+        key = (topic, object_id)
+        previous = self._last_published.pop(key, {})
+        self._last_published[key] = data
+        if len(self._last_published) > COMPACT_EVENTS_MAX_SNAPSHOTS:
+            self._last_published.popitem(last=False)
+        return {"id": object_id, "status": data.get("status"), "diff": compute_document_delta(previous, data)}
+
+    def _serialize(self, event_type: Optional[NFVCLEventType], data: Any, channel: str) -> str:
+        if event_type is None:
+            return data
+        if self.compact_events:
+            data = self._compact_data(channel, data)
+        return Event(operation=event_type.value, data=data).model_dump_json()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while len(self._queue) == 0 and not self._closed:
+                    self._condition.wait()
+                if len(self._queue) == 0 and self._closed:
+                    return
+                batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+
+            # Serialized once, a retried message is published as it is (compact events depend on the previous ones)
+            messages: List[Tuple[str, str]] = []
+            for channel, event_type, data in batch:
+                try:
+                    messages.append((channel, self._serialize(event_type, data, channel)))
+                except Exception as e:
+                    self.failed_counter.inc()
+                    self._get_logger().error(f"Unable to serialize the message for channel {channel}: {str(e)}")
+
+            pipeline = self.redis_instance.pipeline(transaction=False)
+            for channel, message in messages:
+                pipeline.publish(channel, message)
+            try:
+                pipeline.execute()
+                self.published_counter.inc(len(messages))
+                self._redis_reachable = True
+            except Exception as e:
+                if self._redis_reachable:
+                    # Logged only on the first failure, the log is also queued for redis
+                    self._get_logger().error(f"Unable to publish on redis, messages will be retried until it is reachable: {str(e)}")
+                    self._redis_reachable = False
+                if self._closed and time.monotonic() >= self._close_deadline:
+                    with self._condition:
+                        self.failed_counter.inc(len(messages) + len(self._queue))
+                        self._queue.clear()
+                    return
+                self._requeue(messages)
+                time.sleep(REDIS_PUBLISH_RETRY_INTERVAL)
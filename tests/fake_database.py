@@ -0,0 +1,482 @@
+import contextlib
+import copy
+import functools
+import math
+import threading
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from nfvcl.utils import database
+
+_MISSING = object()
+
+
+def _get_path(document: dict, path: str) -> Any:
+    value = document
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return _MISSING
+        value = value[key]
+    return value
+
+
+def _set_path(document: dict, path: str, value: Any):
+    keys = path.split(".")
+    for key in keys[:-1]:
+        document = document.setdefault(key, {})
+    document[keys[-1]] = value
+
+
+def _unset_path(document: dict, path: str):
+    keys = path.split(".")
+    for key in keys[:-1]:
+        document = document.get(key, {})
+    document.pop(keys[-1], None)
+
+
+def _match_value(value: Any, condition: Any) -> bool:
+    if isinstance(condition, dict) and len(condition) > 0 and all(key.startswith("$") for key in condition):
+        for operator, operand in condition.items():
+            present = value is not _MISSING
+            if operator == "$in":
+                if not any(_match_value(value, item) for item in operand):
+                    return False
+            elif operator == "$exists":
+                if present != operand:
+                    return False
+            elif operator == "$ne":
+                if _match_value(value, operand):
+                    return False
+            elif operator in ("$gt", "$gte", "$lt", "$lte"):
+                if not present or value is None:
+                    return False
+                if operator == "$gt" and not value > operand or operator == "$gte" and not value >= operand \
+                        or operator == "$lt" and not value < operand or operator == "$lte" and not value <= operand:
+                    return False
+            else:
+                raise NotImplementedError(operator)
+        return True
+    if condition is None:
+        return value is _MISSING or value is None
+    if isinstance(value, list) and not isinstance(condition, list):
+        return condition in value
+    return value is not _MISSING and value == condition
+
+
+def _match_path(value: Any, keys: List[str], condition: Any) -> bool:
+    # Like MongoDB, a path crossing an array matches if any of its elements matches
+    if len(keys) == 0:
+        return _match_value(value, condition)
+    if isinstance(value, list):
+        return any(_match_path(item, keys, condition) for item in value if isinstance(item, dict)) \
+            or len(value) == 0 and _match_value(_MISSING, condition)
+    if not isinstance(value, dict) or keys[0] not in value:
+        return _match_value(_MISSING, condition)
+    return _match_path(value[keys[0]], keys[1:], condition)
+
+
+def matches(document: dict, filter: dict) -> bool:
+    for key, condition in filter.items():
+        if key == "$or":
+            if not any(matches(document, sub_filter) for sub_filter in condition):
+                return False
+        elif not _match_path(document, key.split("."), condition):
+            return False
+    return True
+
+
+def _project(document: dict, projection: Optional[dict]) -> dict:
+    document = copy.deepcopy(document)
+    if not projection:
+        return document
+    included = [key for key, value in projection.items() if value and key != "_id"]
+    if len(included) > 0:
+        projected = {}
+        for key in included:
+            value = _get_path(document, key)
+            if value is not _MISSING:
+                _set_path(projected, key, value)
+        if projection.get("_id", True) and "_id" in document:
+            projected["_id"] = document["_id"]
+        return projected
+    for key, value in projection.items():
+        if not value:
+            _unset_path(document, key)
+    return document
+
+
+def _apply_update(document: dict, update: dict, inserting: bool = False):
+    for operator, fields in update.items():
+        for path, value in fields.items():
+            if operator == "$set":
+                _set_path(document, path, copy.deepcopy(value))
+            elif operator == "$setOnInsert":
+                if inserting:
+                    _set_path(document, path, copy.deepcopy(value))
+            elif operator == "$unset":
+                _unset_path(document, path)
+            elif operator == "$inc":
+                current = _get_path(document, path)
+                _set_path(document, path, (0 if current is _MISSING or current is None else current) + value)
+            elif operator == "$push":
+                current = _get_path(document, path)
+                items = list(current) if current is not _MISSING else []
+                if isinstance(value, dict) and "$each" in value:
+                    items.extend(copy.deepcopy(value["$each"]))
+                    if "$slice" in value:
+                        items = items[value["$slice"]:] if value["$slice"] < 0 else items[:value["$slice"]]
+                else:
+                    items.append(copy.deepcopy(value))
+                _set_path(document, path, items)
+            else:
+                raise NotImplementedError(operator)
+
+
+def _evaluate(expression: Any, document: dict, variables: Optional[dict] = None) -> Any:
+    """
+    Evaluate an aggregation expression on a document, missing fields are None
+    """
+    variables = variables or {}
+    if isinstance(expression, str) and expression.startswith("$$"):
+        name, _, path = expression[2:].partition(".")
+        value = variables[name]
+        return _get_path(value, path) if path else value
+    if isinstance(expression, str) and expression.startswith("$"):
+        value = _get_path(document, expression[1:])
+        return None if value is _MISSING else value
+    if isinstance(expression, list):
+        return [_evaluate(item, document, variables) for item in expression]
+    if not isinstance(expression, dict):
+        return expression
+    if len(expression) == 1 and next(iter(expression)).startswith("$"):
+        operator, operand = next(iter(expression.items()))
+        if operator == "$map":
+            items = _evaluate(operand["input"], document, variables) or []
+            return [_evaluate(operand["in"], document, {**variables, operand["as"]: item}) for item in items]
+        arguments = _evaluate(operand, document, variables)
+        if operator == "$arrayElemAt":
+            return arguments[0][arguments[1]]
+        if operator == "$toInt":
+            return int(arguments)
+        if operator == "$floor":
+            return math.floor(arguments)
+        if operator == "$multiply":
+            return functools.reduce(lambda first, second: first * second, arguments)
+        if operator == "$subtract":
+            return arguments[0] - arguments[1]
+        if operator == "$ifNull":
+            return arguments[0] if arguments[0] is not None else arguments[1]
+        raise NotImplementedError(operator)
+    return {key: _evaluate(value, document, variables) for key, value in expression.items()}
+
+
+def _sort_documents(documents: List[dict], keys: List[tuple]):
+    for key, key_direction in reversed(keys):
+        documents.sort(key=lambda document: (_get_path(document, key) is _MISSING, _get_path(document, key)), reverse=key_direction < 0)
+
+
+def _unwind(documents: List[dict], stage: Any) -> List[dict]:
+    path, preserve = (stage, False) if isinstance(stage, str) else (stage["path"], stage.get("preserveNullAndEmptyArrays", False))
+    path = path[1:]
+    unwound = []
+    for document in documents:
+        value = _get_path(document, path)
+        if not isinstance(value, list):
+            if value is not _MISSING and value is not None or preserve:
+                unwound.append(document)
+            continue
+        if len(value) == 0 and preserve:
+            document = copy.deepcopy(document)
+            _unset_path(document, path)
+            unwound.append(document)
+        for item in value:
+            element = copy.deepcopy(document)
+            _set_path(element, path, copy.deepcopy(item))
+            unwound.append(element)
+    return unwound
+
+
+def _group(documents: List[dict], stage: dict) -> List[dict]:
+    groups: Dict[str, dict] = {}
+    values: Dict[str, Dict[str, list]] = {}
+    for document in documents:
+        group_id = _evaluate(stage["_id"], document)
+        key = repr(group_id)
+        if key not in groups:
+            groups[key] = {"_id": group_id}
+            values[key] = {field: [] for field in stage if field != "_id"}
+        for field, accumulator in stage.items():
+            if field != "_id":
+                operator, expression = next(iter(accumulator.items()))
+                values[key][field].append(_evaluate(expression, document))
+    for key, group in groups.items():
+        for field, accumulator in stage.items():
+            if field == "_id":
+                continue
+            operator = next(iter(accumulator))
+            field_values = values[key][field]
+            numbers = [value for value in field_values if isinstance(value, (int, float))]
+            if operator == "$push":
+                group[field] = field_values
+            elif operator == "$sum":
+                group[field] = sum(numbers)
+            elif operator == "$avg":
+                group[field] = sum(numbers) / len(numbers) if numbers else None
+            elif operator == "$max":
+                group[field] = max(numbers) if numbers else None
+            elif operator == "$first":
+                group[field] = field_values[0]
+            else:
+                raise NotImplementedError(operator)
+    return list(groups.values())
+
+
+def _project_stage(document: dict, stage: dict) -> dict:
+    projected = {}
+    for field, expression in stage.items():
+        if expression is True or expression == 1:
+            value = _get_path(document, field)
+            if value is not _MISSING:
+                _set_path(projected, field, copy.deepcopy(value))
+        elif expression is not False and expression != 0:
+            _set_path(projected, field, _evaluate(expression, document))
+    if stage.get("_id", True) is not False and "_id" in document and "_id" not in stage:
+        projected["_id"] = document["_id"]
+    return projected
+
+
+def aggregate(documents: List[dict], pipeline: List[dict]) -> List[dict]:
+    """
+    Execute an aggregation pipeline, supporting the subset of the stages and expressions used by NFVCL
+    """
+    documents = copy.deepcopy(documents)
+    for stage in pipeline:
+        operator, operand = next(iter(stage.items()))
+        if operator == "$match":
+            documents = [document for document in documents if matches(document, operand)]
+        elif operator == "$unwind":
+            documents = _unwind(documents, operand)
+        elif operator == "$sort":
+            _sort_documents(documents, list(operand.items()))
+        elif operator == "$group":
+            documents = _group(documents, operand)
+        elif operator == "$project":
+            documents = [_project_stage(document, operand) for document in documents]
+        elif operator == "$limit":
+            documents = documents[:operand]
+        else:
+            raise NotImplementedError(operator)
+    return documents
+
+
+class FakeCursor:
+    """
+    Implements the part of the pymongo Cursor used by NFVCL
+    """
+
+    def __init__(self, documents: List[dict]):
+        self._documents = documents
+        self._skip = 0
+        self._limit = 0
+        self.closed = False
+
+    def sort(self, key_or_list, direction=None):
+        _sort_documents(self._documents, [(key_or_list, direction or 1)] if isinstance(key_or_list, str) else key_or_list)
+        return self
+
+    def skip(self, skip: int):
+        self._skip = skip
+        return self
+
+    def limit(self, limit: int):
+        self._limit = limit
+        return self
+
+    def batch_size(self, batch_size: int):
+        return self
+
+    def close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __iter__(self):
+        documents = self._documents[self._skip:]
+        if self._limit:
+            documents = documents[:self._limit]
+        return iter(documents)
+
+
+class FakeNFVCLDatabase:
+    """
+    In memory implementation of the NFVCLDatabase methods, supporting the subset of the MongoDB queries used by NFVCL
+    """
+
+    def __init__(self):
+        self.collections: Dict[str, List[dict]] = {}
+        self.lock = threading.RLock()
+        # Number of calls of every method, to check how the database is used
+        self.calls: Dict[str, int] = {}
+        # The cursors returned by find_in_collection
+        self.cursors: List[FakeCursor] = []
+        self.mongo_client = FakeMongoClient(self)
+
+    def _count(self, method: str):
+        self.calls[method] = self.calls.get(method, 0) + 1
+
+    def _collection(self, name: str) -> List[dict]:
+        return self.collections.setdefault(name, [])
+
+    def _find(self, collection: str, filter: dict) -> List[dict]:
+        return [document for document in self._collection(collection) if matches(document, filter)]
+
+    def create_indexes(self):
+        pass
+
+    def insert_in_collection(self, collection_name: str, data: dict):
+        self._count("insert_in_collection")
+        with self.lock:
+            self._collection(collection_name).append(copy.deepcopy(data))
+
+    def find_collection(self, collection, data, exclude=None):
+        return self.find_in_collection(collection, data, exclude)
+
+    def find_in_collection(self, collection, data, exclude=None):
+        self._count("find_in_collection")
+        with self.lock:
+            cursor = FakeCursor([_project(document, exclude) for document in self._find(collection, data)])
+            self.cursors.append(cursor)
+            return cursor
+
+    def find_one_in_collection(self, collection, data, exclude=None):
+        self._count("find_one_in_collection")
+        with self.lock:
+            found = self._find(collection, data)
+            return _project(found[0], exclude) if len(found) > 0 else None
+
+    def exists_in_collection(self, collection, data):
+        self._count("exists_in_collection")
+        with self.lock:
+            return len(self._find(collection, data)) > 0
+
+    def update_in_collection(self, collection, data, filter):
+        return self.update_one_in_collection(collection, filter, {"$set": data})
+
+    def _update_one(self, collection, filter, update, upsert) -> Optional[dict]:
+        found = self._find(collection, filter)
+        if len(found) > 0:
+            _apply_update(found[0], update)
+            return found[0]
+        if not upsert:
+            return None
+        document = {key: copy.deepcopy(value) for key, value in filter.items() if not isinstance(value, dict) and not key.startswith("$")}
+        _apply_update(document, update, inserting=True)
+        self._collection(collection).append(document)
+        return document
+
+    def update_one_in_collection(self, collection, filter, update: dict, upsert: bool = True):
+        self._count("update_one_in_collection")
+        with self.lock:
+            matched = len(self._find(collection, filter)) > 0
+            self._update_one(collection, filter, update, upsert)
+            return SimpleNamespace(matched_count=1 if matched else 0, modified_count=1 if matched else 0)
+
+    def replace_in_collection(self, collection, data, filter):
+        self._count("replace_in_collection")
+        with self.lock:
+            documents = self._collection(collection)
+            for index, document in enumerate(documents):
+                if matches(document, filter):
+                    documents[index] = copy.deepcopy(data)
+                    return SimpleNamespace(matched_count=1, modified_count=1)
+            documents.append(copy.deepcopy(data))
+            return SimpleNamespace(matched_count=0, modified_count=0)
+
+    def find_one_and_update_in_collection(self, collection, filter, update: dict, projection=None, upsert: bool = True):
+        self._count("find_one_and_update_in_collection")
+        with self.lock:
+            document = self._update_one(collection, filter, update, upsert)
+            return _project(document, projection) if document is not None else None
+
+    def delete_from_collection(self, collection, filter):
+        self._count("delete_from_collection")
+        with self.lock:
+            documents = self._collection(collection)
+            kept = [document for document in documents if not matches(document, filter)]
+            deleted = len(documents) - len(kept)
+            self.collections[collection] = kept
+            return SimpleNamespace(deleted_count=deleted)
+
+
+class FakeCollection:
+    """
+    Implements the part of the pymongo Collection used by NFVCL, on a collection of the fake database
+    """
+
+    def __init__(self, database: FakeNFVCLDatabase, name: str):
+        self.database = database
+        self.name = name
+        # The keys of the created indexes
+        self.indexes: List[list] = []
+
+    def create_index(self, keys, **kwargs):
+        self.indexes.append(keys)
+
+    def find(self, filter: Optional[dict] = None, projection: Optional[dict] = None) -> FakeCursor:
+        return self.database.find_in_collection(self.name, filter or {}, projection)
+
+    def find_one(self, filter: Optional[dict] = None, projection: Optional[dict] = None) -> Optional[dict]:
+        return self.database.find_one_in_collection(self.name, filter or {}, projection)
+
+    def update_one(self, filter: dict, update: dict, upsert: bool = False):
+        return self.database.update_one_in_collection(self.name, filter, update, upsert)
+
+    def aggregate(self, pipeline: List[dict], **kwargs) -> List[dict]:
+        with self.database.lock:
+            return aggregate(self.database._collection(self.name), pipeline)
+
+
+class FakeMongoDatabase:
+    def __init__(self, database: FakeNFVCLDatabase):
+        self.database = database
+        self.collections: Dict[str, FakeCollection] = {}
+
+    def list_collection_names(self) -> List[str]:
+        return list(self.database.collections.keys())
+
+    def create_collection(self, name: str) -> FakeCollection:
+        self.database._collection(name)
+        return self.get_collection(name)
+
+    def get_collection(self, name: str) -> FakeCollection:
+        return self.collections.setdefault(name, FakeCollection(self.database, name))
+
+
+class FakeMongoClient:
+    """
+    Implements the part of the pymongo MongoClient used by NFVCL, every database is the fake database
+    """
+
+    def __init__(self, database: FakeNFVCLDatabase):
+        self.database = FakeMongoDatabase(database)
+
+    def get_database(self, name: str) -> FakeMongoDatabase:
+        return self.database
+
+
+@contextlib.contextmanager
+def fake_database():
+    """
+    Replace the NFVCL database with an in memory one while the context is active
+    """
+    fake = FakeNFVCLDatabase()
+    previous = getattr(database, "__database")
+    setattr(database, "__database", fake)
+    try:
+        yield fake
+    finally:
+        setattr(database, "__database", previous)
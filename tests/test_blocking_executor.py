@@ -0,0 +1,36 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from nfvcl.utils.blocking_executor import BlockingExecutor, BlockingExecutorTimeout
+
+
+class BlockingExecutorTestCase(unittest.TestCase):
+    def setUp(self):
+        self.executor = BlockingExecutor(max_workers=4, max_per_key=1, timeout=5)
+
+    def test_run_in_pool(self):
+        result = asyncio.run(self.executor.run(lambda: threading.current_thread().name))
+        self.assertTrue(result.startswith("blocking_executor"))
+
+    def test_timeout(self):
+        with self.assertRaises(BlockingExecutorTimeout):
+            asyncio.run(self.executor.run(lambda: time.sleep(1), timeout=0.1))
+
+    def test_per_key_limit(self):
+        async def _run():
+            blocked = self.executor.run(lambda: time.sleep(1), key="cluster1", timeout=2)
+            waiting = self.executor.run(lambda: "done", key="cluster1", timeout=0.2)
+            other_key = self.executor.run(lambda: "other", key="cluster2", timeout=0.2)
+            return await asyncio.gather(blocked, waiting, other_key, return_exceptions=True)
+
+        blocked, waiting, other_key = asyncio.run(_run())
+        self.assertIsNone(blocked)
+        # Only one operation at a time on cluster1, the other clusters are not affected
+        self.assertIsInstance(waiting, BlockingExecutorTimeout)
+        self.assertEqual(other_key, "other")
+
+
+if __name__ == '__main__':
+    unittest.main()
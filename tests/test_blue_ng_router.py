@@ -0,0 +1,78 @@
+import json
+import unittest
+from unittest import mock
+
+from bson import ObjectId
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from nfvcl.blueprints_ng.lcm.blueprint_manager import BlueprintManager
+from nfvcl.rest_endpoints.blue_ng_router import blue_ng_router
+from nfvcl.utils.database import BLUE_COLLECTION_V2
+from tests.fake_database import fake_database
+
+
+class BlueprintListEndpointsTestCase(unittest.TestCase):
+    def setUp(self):
+        self._database_context = fake_database()
+        self.database = self._database_context.__enter__()
+        for index in range(5):
+            self.database.insert_in_collection(BLUE_COLLECTION_V2, {
+                "_id": ObjectId(),
+                "id": f"blue{index}",
+                "type": "k8s" if index % 2 == 0 else "ueransim",
+                "protected": False,
+                "corrupted": False
+            })
+
+        # The manager is not initialized, the blueprint modules are not needed to list the blueprints
+        manager = BlueprintManager.__new__(BlueprintManager)
+        self._manager_patch = mock.patch("nfvcl.rest_endpoints.blue_ng_router.get_blueprint_manager", return_value=manager)
+        self._manager_patch.start()
+        app = FastAPI()
+        app.include_router(blue_ng_router)
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        self._manager_patch.stop()
+        self._database_context.__exit__(None, None, None)
+
+    def test_pages(self):
+        ids = []
+        cursor = None
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = self.client.get("/nfvcl/v2/api/blue/list/page", params=params)
+            self.assertEqual(response.status_code, 200)
+            page = response.json()
+            self.assertLessEqual(len(page["items"]), 2)
+            ids.extend(item["id"] for item in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        self.assertEqual(ids, [f"blue{index}" for index in range(5)])
+
+    def test_page_filter(self):
+        response = self.client.get("/nfvcl/v2/api/blue/list/page", params={"blue_type": "k8s", "limit": 10})
+        page = response.json()
+        self.assertEqual([item["id"] for item in page["items"]], ["blue0", "blue2", "blue4"])
+        self.assertIsNone(page["next_cursor"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get("/nfvcl/v2/api/blue/list/page", params={"cursor": "not_a_cursor"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_stream_ends_and_closes_the_cursor(self):
+        response = self.client.get("/nfvcl/v2/api/blue/list/stream", params={"blue_type": "ueransim"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-type"], "application/x-ndjson")
+        lines = response.text.splitlines()
+        self.assertEqual([json.loads(line)["id"] for line in lines], ["blue1", "blue3"])
+        self.assertTrue(all(cursor.closed for cursor in self.database.cursors))
+
+
+if __name__ == '__main__':
+    unittest.main()
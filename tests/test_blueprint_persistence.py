@@ -0,0 +1,131 @@
+import contextlib
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from nfvcl.blueprints_ng.blueprint_ng import BlueprintNG, register_performance
+from nfvcl.utils.log import create_logger
+
+
+def _blueprint(serialize=None):
+    """
+    The fields of BlueprintNG used by mark_dirty, flush_db and to_db
+    """
+    blueprint = SimpleNamespace(
+        id="blue",
+        db_dirty=False,
+        db_deleted=False,
+        db_lock=threading.RLock(),
+        logger=create_logger("PersistenceTest"),
+        base_model=SimpleNamespace(id="blue"),
+        _BlueprintNG__serialize_content=serialize or (lambda: {"id": "blue"})
+    )
+    blueprint.to_db = lambda: BlueprintNG.to_db(blueprint)
+    blueprint.flush_db = lambda: BlueprintNG.flush_db(blueprint)
+    blueprint.mark_dirty = lambda: BlueprintNG.mark_dirty(blueprint)
+    return blueprint
+
+
+class FlushDbTestCase(unittest.TestCase):
+    def setUp(self):
+        self._save_patch = mock.patch("nfvcl.blueprints_ng.blueprint_ng.save_ng_blue")
+        self.save_ng_blue = self._save_patch.start()
+
+    def tearDown(self):
+        self._save_patch.stop()
+
+    def test_only_dirty_blueprints_are_saved(self):
+        blueprint = _blueprint()
+        self.assertFalse(blueprint.flush_db())
+
+        # Many changes, a single write
+        blueprint.mark_dirty()
+        blueprint.mark_dirty()
+        self.assertTrue(blueprint.flush_db())
+        self.assertFalse(blueprint.flush_db())
+        self.save_ng_blue.assert_called_once_with("blue", {"id": "blue"})
+
+    def test_failed_save_keeps_the_blueprint_dirty(self):
+        blueprint = _blueprint()
+        blueprint.mark_dirty()
+        self.save_ng_blue.side_effect = ConnectionError("database unreachable")
+        with self.assertRaises(ConnectionError):
+            blueprint.flush_db()
+        self.assertTrue(blueprint.db_dirty)
+
+        self.save_ng_blue.side_effect = None
+        self.assertTrue(blueprint.flush_db())
+        self.assertFalse(blueprint.db_dirty)
+
+    def test_deleted_blueprint_is_not_saved(self):
+        blueprint = _blueprint()
+        blueprint.db_deleted = True
+        blueprint.mark_dirty()
+        blueprint.flush_db()
+        self.save_ng_blue.assert_not_called()
+
+
+class RegisterPerformanceTestCase(unittest.TestCase):
+    def setUp(self):
+        performance_manager = SimpleNamespace(
+            get_pending_operation_id=lambda blueprint_id: None,
+            provider_call=lambda operation_id, method_name, info: contextlib.nullcontext()
+        )
+        self._performance_patch = mock.patch("nfvcl.blueprints_ng.blueprint_ng.performance_manager", performance_manager)
+        self._performance_patch.start()
+        self._save_patch = mock.patch("nfvcl.blueprints_ng.blueprint_ng.save_ng_blue")
+        self.save_ng_blue = self._save_patch.start()
+
+    def tearDown(self):
+        self._performance_patch.stop()
+        self._save_patch.stop()
+
+    def _provider(self, method):
+        class Provider:
+            def __init__(self, blueprint):
+                self.blueprint = blueprint
+
+            @register_performance()
+            def call(self):
+                return method(self)
+
+        return Provider(_blueprint())
+
+    def test_changes_are_flushed_at_the_end_of_the_call(self):
+        def method(provider):
+            provider.blueprint.mark_dirty()
+            return "result"
+
+        self.assertEqual(self._provider(method).call(), "result")
+        self.save_ng_blue.assert_called_once()
+
+    def test_changes_are_flushed_when_the_call_fails(self):
+        def method(provider):
+            provider.blueprint.mark_dirty()
+            raise ValueError("provider error")
+
+        with self.assertRaises(ValueError):
+            self._provider(method).call()
+        self.save_ng_blue.assert_called_once()
+
+    def test_failed_flush_does_not_hide_the_error_of_the_call(self):
+        def method(provider):
+            provider.blueprint.mark_dirty()
+            raise ValueError("provider error")
+
+        self.save_ng_blue.side_effect = ConnectionError("database unreachable")
+        with self.assertRaises(ValueError):
+            self._provider(method).call()
+
+    def test_failed_flush_after_a_successful_call_is_raised(self):
+        def method(provider):
+            provider.blueprint.mark_dirty()
+
+        self.save_ng_blue.side_effect = ConnectionError("database unreachable")
+        with self.assertRaises(ConnectionError):
+            self._provider(method).call()
+
+
+if __name__ == '__main__':
+    unittest.main()
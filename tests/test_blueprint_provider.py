@@ -0,0 +1,92 @@
+import threading
+import time
+import unittest
+from typing import Callable, Dict
+from unittest import mock
+
+from nfvcl.blueprints_ng.providers.blueprint.blueprint_provider import BlueprintProvider, BlueprintProviderData, BlueprintProviderException
+from nfvcl.models.blueprint_ng.worker_message import BlueprintOperationCallbackModel
+
+
+class FakeBlueprintManager:
+    """
+    Creates the blueprints without a worker, the creations are completed by the test
+    """
+
+    def __init__(self):
+        self.callbacks: Dict[str, Callable] = {}
+
+    def create_blueprint(self, msg, path, wait, parent_id, callback):
+        blue_id = f"child{len(self.callbacks)}"
+        self.callbacks[blue_id] = callback
+        return blue_id
+
+    def complete(self, blue_id: str, status: str = "OK", detailed_status: str = None):
+        self.callbacks[blue_id](BlueprintOperationCallbackModel(id=blue_id, operation="create", status=status, detailed_status=detailed_status))
+
+
+class BlueprintProviderTestCase(unittest.TestCase):
+    def setUp(self):
+        self.manager = FakeBlueprintManager()
+        self.flushes = 0
+
+        def init(provider):
+            provider.blueprint_manager = self.manager
+            provider.data = BlueprintProviderData()
+
+        def flush():
+            self.flushes += 1
+
+        with mock.patch("nfvcl.blueprints_ng.providers.blueprint_ng_provider_interface.build_topology"), mock.patch.object(BlueprintProvider, "init", init):
+            self.provider = BlueprintProvider(0, "parent", lambda: None, flush)
+
+    def _create(self, count: int):
+        return [self.provider.create_blueprint_async({}, "k8s") for _ in range(count)]
+
+    def test_created_blueprints_are_saved_before_waiting(self):
+        handles = self._create(2)
+        self.assertEqual([handle.blue_id for handle in handles], ["child0", "child1"])
+        self.assertEqual(self.provider.data.deployed_blueprints, ["child0", "child1"])
+        self.assertEqual(self.flushes, 2)
+        self.assertFalse(any(handle.done() for handle in handles))
+
+    def test_results_follow_the_order_of_the_handles(self):
+        handles = self._create(3)
+
+        def complete():
+            # Completed in the reverse order of the creation
+            for blue_id in reversed(list(self.manager.callbacks)):
+                time.sleep(0.01)
+                self.manager.complete(blue_id)
+
+        threading.Thread(target=complete).start()
+        results = self.provider.wait_all(handles, timeout=10)
+        self.assertEqual([result.id for result in results], ["child0", "child1", "child2"])
+
+    def test_partial_failure_is_raised_after_every_operation(self):
+        handles = self._create(3)
+        self.manager.complete("child0")
+        self.manager.complete("child1", status="ERROR", detailed_status="deploy failed")
+        self.manager.complete("child2")
+
+        with self.assertRaises(BlueprintProviderException) as context:
+            self.provider.wait_all(handles, timeout=10)
+        self.assertIn("1 of 3", str(context.exception))
+        self.assertIn("child1: deploy failed", str(context.exception))
+
+    def test_timeout_is_global_and_aggregated(self):
+        handles = self._create(3)
+        self.manager.complete("child1")
+
+        start = time.monotonic()
+        with self.assertRaises(BlueprintProviderException) as context:
+            self.provider.wait_all(handles, timeout=0.2)
+        # A single timeout for all the operations, not one for each of them
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertIn("2 of 3", str(context.exception))
+        self.assertIn("child0", str(context.exception))
+        self.assertIn("child2", str(context.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from nfvcl.blueprints_ng.providers.virtualization.common import utils
+from nfvcl.blueprints_ng.providers.virtualization.virtualization_provider_interface import VirtualizationProviderException
+from nfvcl.blueprints_ng.providers.virtualization.virtualization_provider_openstack import VirtualizationProviderOpenstack
+from nfvcl.blueprints_ng.resources import VmResource, VmResourceImage, VmResourceFlavor, VmResourceAnsibleConfiguration, \
+    VmResourceNativeConfiguration
+from nfvcl.utils.log import create_logger
+
+
+class TestAnsibleConfiguration(VmResourceAnsibleConfiguration):
+    def dump_playbook(self) -> str:
+        return "- hosts: all\n"
+
+
+class TestNativeConfiguration(VmResourceNativeConfiguration):
+    def run_code(self):
+        pass
+
+
+def _vm(index: int, created: bool = True) -> VmResource:
+    vm = VmResource(area=0, name=f"vm{index}", image=VmResourceImage(name="ubuntu"), flavor=VmResourceFlavor(), username="ubuntu", password="ubuntu", management_network="mgt")
+    vm.access_ip = f"10.0.0.{index}"
+    vm.created = created
+    return vm
+
+
+class ConfigureVmsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.ssh_waits = []
+        self.ssh_waits_lock = threading.Lock()
+
+        def wait_for_ssh_to_be_ready(host, *args, **kwargs):
+            with self.ssh_waits_lock:
+                self.ssh_waits.append(host)
+            time.sleep(0.3)
+            return True
+
+        def run_ansible_playbook_multi_host(hosts, playbook, logger, forks):
+            return SimpleNamespace(status="successful"), {host.host: {"host": host.host} for host in hosts}
+
+        self._patches = [
+            mock.patch.object(utils, "wait_for_ssh_to_be_ready", wait_for_ssh_to_be_ready),
+            mock.patch.object(utils, "run_ansible_playbook_multi_host", run_ansible_playbook_multi_host),
+            mock.patch.object(utils, "get_performance_manager", return_value=SimpleNamespace(in_current_provider_call=lambda function: function))
+        ]
+        for patch in self._patches:
+            patch.start()
+
+        # Both providers share the implementation of the interface
+        self.provider = VirtualizationProviderOpenstack.__new__(VirtualizationProviderOpenstack)
+        self.provider.blueprint_id = "blue"
+        self.provider.logger = create_logger("ConfigureVmsTest")
+        self.provider.save_to_db = mock.Mock()
+
+    def tearDown(self):
+        for patch in self._patches:
+            patch.stop()
+
+    def test_ssh_is_waited_concurrently(self):
+        configurations = [TestAnsibleConfiguration(vm_resource=_vm(index)) for index in range(4)]
+        start = time.monotonic()
+        facts = self.provider.configure_vms(configurations)
+
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual(sorted(self.ssh_waits), [f"10.0.0.{index}" for index in range(4)])
+        self.assertEqual(facts, [{"host": f"10.0.0.{index}"} for index in range(4)])
+        self.provider.save_to_db.assert_called_once()
+
+    def test_only_ansible_configurations_are_executed(self):
+        configurations = [TestNativeConfiguration(vm_resource=_vm(0)), TestAnsibleConfiguration(vm_resource=_vm(1))]
+        facts = self.provider.configure_vms(configurations)
+
+        self.assertEqual(facts, [None, {"host": "10.0.0.1"}])
+        self.assertEqual(self.ssh_waits, ["10.0.0.1"])
+
+    def test_vms_must_be_created(self):
+        with self.assertRaises(VirtualizationProviderException):
+            self.provider.configure_vms([TestAnsibleConfiguration(vm_resource=_vm(0)), TestAnsibleConfiguration(vm_resource=_vm(1, created=False))])
+        self.assertEqual(self.ssh_waits, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
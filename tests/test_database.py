@@ -0,0 +1,100 @@
+import unittest
+
+from nfvcl.utils import database
+from nfvcl.utils.database import compute_document_delta, save_ng_blue, forget_ng_blue_snapshot, BLUE_COLLECTION_V2, insert_extra, get_extra
+from tests.fake_database import fake_database
+
+
+class DocumentDeltaTestCase(unittest.TestCase):
+    def test_equal_documents(self):
+        self.assertEqual(compute_document_delta({"id": "a", "state": {"x": 1}}, {"id": "a", "state": {"x": 1}}), {})
+
+    def test_set_and_unset(self):
+        delta = compute_document_delta(
+            {"id": "a", "state": {"x": 1, "y": 2}},
+            {"id": "a", "state": {"x": 3, "z": 4}}
+        )
+        self.assertEqual(delta["$set"], {"state.x": 3, "state.z": 4})
+        self.assertEqual(delta["$unset"], {"state.y": ""})
+        self.assertNotIn("$push", delta)
+
+    def test_appended_list_is_pushed(self):
+        delta = compute_document_delta(
+            {"day_2_call_history": ["a", "b"]},
+            {"day_2_call_history": ["a", "b", "c"]}
+        )
+        self.assertEqual(delta, {"$push": {"day_2_call_history": {"$each": ["c"]}}})
+
+    def test_changed_list_is_set(self):
+        delta = compute_document_delta({"areas": [1, 2]}, {"areas": [2, 3, 4]})
+        self.assertEqual(delta, {"$set": {"areas": [2, 3, 4]}})
+
+    def test_type_change_is_set(self):
+        self.assertEqual(compute_document_delta({"x": 1}, {"x": True}), {"$set": {"x": True}})
+
+    def test_keys_not_addressable(self):
+        delta = compute_document_delta({"values": {"a.b": 1}}, {"values": {"a.b": 2}})
+        self.assertEqual(delta, {"$set": {"values": {"a.b": 2}}})
+
+    def test_top_level_keys_not_addressable(self):
+        self.assertIsNone(compute_document_delta({"id": "a", "a.b": 1}, {"id": "a", "a.b": 2}))
+
+
+class SaveBlueprintTestCase(unittest.TestCase):
+    def setUp(self):
+        self._database_context = fake_database()
+        self.database = self._database_context.__enter__()
+
+    def tearDown(self):
+        forget_ng_blue_snapshot("blue")
+        self._database_context.__exit__(None, None, None)
+
+    def _saved(self) -> dict:
+        return self.database.find_one_in_collection(BLUE_COLLECTION_V2, {"id": "blue"}, {"_id": False})
+
+    def test_only_the_delta_is_written(self):
+        save_ng_blue("blue", {"id": "blue", "state": {"x": 1}})
+        save_ng_blue("blue", {"id": "blue", "state": {"x": 2}})
+
+        self.assertEqual(self.database.calls["replace_in_collection"], 1)
+        self.assertEqual(self.database.calls["update_one_in_collection"], 1)
+        self.assertEqual(self._saved(), {"id": "blue", "state": {"x": 2}})
+
+    def test_top_level_change_replaces_the_document(self):
+        save_ng_blue("blue", {"id": "blue", "a.b": 1})
+        save_ng_blue("blue", {"id": "blue", "a.b": 2})
+
+        self.assertEqual(self.database.calls["replace_in_collection"], 2)
+        self.assertNotIn("update_one_in_collection", self.database.calls)
+        self.assertEqual(self._saved(), {"id": "blue", "a.b": 2})
+
+    def test_forgotten_snapshot_is_released(self):
+        save_ng_blue("blue", {"id": "blue", "state": {"x": 1}})
+        forget_ng_blue_snapshot("blue")
+
+        self.assertNotIn("blue", getattr(database, "__blue_snapshots"))
+        save_ng_blue("blue", {"id": "blue", "state": {"x": 2}})
+        self.assertEqual(self.database.calls["replace_in_collection"], 2)
+        self.assertEqual(self._saved(), {"id": "blue", "state": {"x": 2}})
+
+
+class ExtraTestCase(unittest.TestCase):
+    def setUp(self):
+        self._database_context = fake_database()
+        self.database = self._database_context.__enter__()
+
+    def tearDown(self):
+        self._database_context.__exit__(None, None, None)
+
+    def test_extra_uses_the_shared_database(self):
+        self.assertIsNone(get_extra("extra1"))
+        insert_extra("extra1", {"value": 1})
+        insert_extra("extra1", {"value": 2})
+
+        self.assertEqual(get_extra("extra1"), {"id": "extra1", "value": 2})
+        self.assertEqual(self.database.calls["insert_in_collection"], 1)
+        self.assertEqual(self.database.calls["update_one_in_collection"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import contextlib
+import tempfile
+import unittest
+from pathlib import Path
+
+from nfvcl.utils.k8s.helm_chart_cache import HelmChartCache, HelmChartCacheException
+from nfvcl.utils.k8s.helm_event_loop import HelmEventLoop
+
+
+class FakeHelmClient:
+    """
+    Implements the part of the pyhelm3 Client used by the cache, pulled charts contain a file of the given size
+    """
+
+    def __init__(self, chart_size: int = 1000):
+        self._command = None
+        self.chart_size = chart_size
+        self.pulls = []
+
+    @contextlib.asynccontextmanager
+    async def pull_chart(self, chart_ref, repo=None, version=None):
+        self.pulls.append((repo, chart_ref, version))
+        with tempfile.TemporaryDirectory() as pull_folder:
+            chart_folder = Path(pull_folder) / chart_ref
+            chart_folder.mkdir()
+            (chart_folder / "Chart.yaml").write_text(f"apiVersion: v2\nname: {chart_ref}\nversion: {version}\n")
+            (chart_folder / "values.yaml").write_text("x" * self.chart_size)
+
+            class PulledChart:
+                ref = chart_folder
+            yield PulledChart()
+
+
+class HelmChartCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.helm_event_loop = HelmEventLoop()
+        self.cache_folder = tempfile.TemporaryDirectory()
+        self.helm_client = FakeHelmClient()
+
+    def tearDown(self):
+        self.cache_folder.cleanup()
+
+    def get_chart(self, cache: HelmChartCache, chart: str, version: str = None):
+        return self.helm_event_loop.run(cache.get_chart(self.helm_client, chart, repo="https://charts.example", version=version))
+
+    def test_chart_downloaded_once(self):
+        cache = HelmChartCache(Path(self.cache_folder.name), 100000)
+        first = self.get_chart(cache, "upf", "1.0.0")
+        second = self.get_chart(cache, "upf", "1.0.0")
+        self.assertEqual(len(self.helm_client.pulls), 1)
+        self.assertEqual(first.ref, second.ref)
+        self.assertEqual(second.metadata.version, "1.0.0")
+        self.assertTrue((Path(second.ref) / "values.yaml").exists())
+
+    def test_least_recently_used_is_evicted(self):
+        cache = HelmChartCache(Path(self.cache_folder.name), 2500)
+        self.get_chart(cache, "amf", "1.0.0")
+        self.get_chart(cache, "smf", "1.0.0")
+        # amf is used again, smf becomes the least recently used
+        self.get_chart(cache, "amf", "1.0.0")
+        self.get_chart(cache, "upf", "1.0.0")
+        self.get_chart(cache, "amf", "1.0.0")
+        self.assertEqual([chart for _, chart, _ in self.helm_client.pulls], ["amf", "smf", "upf"])
+        self.get_chart(cache, "smf", "1.0.0")
+        self.assertEqual(len(self.helm_client.pulls), 4)
+
+    def test_charts_in_use_are_not_evicted(self):
+        cache = HelmChartCache(Path(self.cache_folder.name), 2500)
+        amf = self.helm_event_loop.run(cache.get_chart(self.helm_client, "amf", repo="https://charts.example", version="1.0.0", pin=True))
+        # amf is the least recently used but it is being installed
+        self.get_chart(cache, "smf", "1.0.0")
+        self.get_chart(cache, "upf", "1.0.0")
+        self.assertTrue((Path(amf.ref) / "values.yaml").exists())
+
+        cache.release_chart(amf)
+        self.get_chart(cache, "nrf", "1.0.0")
+        self.assertFalse(Path(amf.ref).exists())
+
+    def test_use_chart(self):
+        cache = HelmChartCache(Path(self.cache_folder.name), 1500)
+        with cache.use_chart(self.helm_client, "amf", repo="https://charts.example", version="1.0.0") as amf:
+            self.get_chart(cache, "smf", "1.0.0")
+            self.assertTrue((Path(amf.ref) / "values.yaml").exists())
+        self.get_chart(cache, "upf", "1.0.0")
+        self.assertFalse(Path(amf.ref).exists())
+
+    def test_offline(self):
+        online_cache = HelmChartCache(Path(self.cache_folder.name), 100000)
+        self.get_chart(online_cache, "upf", "1.0.0")
+        offline_cache = HelmChartCache(Path(self.cache_folder.name), 100000, offline=True)
+        self.assertEqual(self.get_chart(offline_cache, "upf").metadata.version, "1.0.0")
+        with self.assertRaises(HelmChartCacheException):
+            self.get_chart(offline_cache, "upf", "2.0.0")
+        self.assertEqual(len(self.helm_client.pulls), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import asyncio
+import threading
+import unittest
+
+from nfvcl.utils.k8s.helm_event_loop import HelmEventLoop
+
+
+async def delayed(value, delay: float = 0.1):
+    await asyncio.sleep(delay)
+    return value, threading.current_thread().name
+
+
+class HelmEventLoopTestCase(unittest.TestCase):
+    def setUp(self):
+        self.helm_event_loop = HelmEventLoop()
+
+    def test_run_on_loop_thread(self):
+        value, thread_name = self.helm_event_loop.run(delayed(1))
+        self.assertEqual(value, 1)
+        self.assertEqual(thread_name, "helm_event_loop")
+
+    def test_gather_keeps_order(self):
+        results = self.helm_event_loop.gather(delayed(1, 0.2), delayed(2, 0.1), delayed(3, 0))
+        self.assertEqual([value for value, _ in results], [1, 2, 3])
+
+    def test_timeout(self):
+        with self.assertRaises(TimeoutError):
+            self.helm_event_loop.run(delayed(1, 5), timeout=0.1)
+        # The loop is still usable after a timeout
+        self.assertEqual(self.helm_event_loop.run(delayed(2, 0))[0], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import functools
+import hashlib
+import os
+import tempfile
+import threading
+import unittest
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from nfvcl.utils.image_cache import ImageCache, ImageCacheException
+
+
+class CountingHandler(SimpleHTTPRequestHandler):
+    """
+    Serves the files of a folder (with Last-Modified) counting the GET requests
+    """
+    gets = []
+
+    def do_GET(self):
+        CountingHandler.gets.append(self.path)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestImageCache(unittest.TestCase):
+    def setUp(self):
+        self.served_folder = tempfile.TemporaryDirectory()
+        self.cache_folder = tempfile.TemporaryDirectory()
+        CountingHandler.gets = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(CountingHandler, directory=self.served_folder.name))
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.served_folder.cleanup()
+        self.cache_folder.cleanup()
+
+    def _serve(self, name: str, content: bytes, mtime: int) -> str:
+        path = Path(self.served_folder.name) / name
+        path.write_bytes(content)
+        os.utime(path, (mtime, mtime))
+        return f"http://127.0.0.1:{self.server.server_address[1]}/{name}"
+
+    def _cached_files(self) -> list:
+        return [file.name for file in Path(self.cache_folder.name).iterdir()]
+
+    def test_hash_is_cached_until_the_image_changes(self):
+        url = self._serve("image.qcow2", b"a" * 3000000, 1000000000)
+        cache = ImageCache(Path(self.cache_folder.name))
+        self.assertEqual(cache.get_sha512(url), hashlib.sha512(b"a" * 3000000).hexdigest())
+        self.assertEqual(cache.get_sha512(url), hashlib.sha512(b"a" * 3000000).hexdigest())
+        self.assertEqual(len(CountingHandler.gets), 1)
+
+        # The index is persisted
+        self.assertEqual(ImageCache(Path(self.cache_folder.name)).get_sha512(url), hashlib.sha512(b"a" * 3000000).hexdigest())
+        self.assertEqual(len(CountingHandler.gets), 1)
+
+        self._serve("image.qcow2", b"b" * 1000, 1000000100)
+        self.assertEqual(cache.get_sha512(url), hashlib.sha512(b"b" * 1000).hexdigest())
+        self.assertEqual(len(CountingHandler.gets), 2)
+
+    def test_images_are_not_stored(self):
+        url1 = self._serve("image1.qcow2", b"1" * 6000, 1000000000)
+        url2 = self._serve("image2.qcow2", b"2" * 6000, 1000000000)
+        cache = ImageCache(Path(self.cache_folder.name))
+        cache.get_sha512(url1)
+        cache.get_sha512(url2)
+
+        # Only the hashes are kept
+        self.assertEqual(self._cached_files(), ["index.json"])
+
+    def test_missing_image(self):
+        cache = ImageCache(Path(self.cache_folder.name))
+        with self.assertRaises(ImageCacheException):
+            cache.get_sha512(f"http://127.0.0.1:{self.server.server_address[1]}/missing.qcow2")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import ipaddress
+import unittest
+
+from nfvcl.models.network import NetworkModel
+from nfvcl.models.network.network_models import IPv4Pool, IPv4ReservedRange
+from nfvcl.utils.ipam import IPv4IntervalSet, get_available_network_ip, get_range_in_cidr
+
+
+def ip(address: str) -> int:
+    return int(ipaddress.IPv4Address(address))
+
+
+class IPv4IntervalSetTestCase(unittest.TestCase):
+    def test_reserve_and_release_merge(self):
+        ipam = IPv4IntervalSet(ip("10.0.0.0"), ip("10.0.0.255"))
+        ipam.reserve(ip("10.0.0.10"), ip("10.0.0.19"))
+        self.assertEqual(ipam.intervals(), [(ip("10.0.0.0"), ip("10.0.0.9")), (ip("10.0.0.20"), ip("10.0.0.255"))])
+        with self.assertRaises(ValueError):
+            ipam.reserve(ip("10.0.0.15"), ip("10.0.0.25"))
+        ipam.release(ip("10.0.0.10"), ip("10.0.0.19"))
+        self.assertEqual(ipam.intervals(), [(ip("10.0.0.0"), ip("10.0.0.255"))])
+
+    def test_best_fit(self):
+        ipam = IPv4IntervalSet(0, 99)
+        ipam.discard(10, 19)
+        ipam.discard(25, 99)
+        # Free intervals: 0-9 and 20-24
+        self.assertEqual(ipam.allocate(4), (20, 23))
+        self.assertEqual(ipam.allocate(4, best_fit=False), (0, 3))
+        self.assertIsNone(ipam.find(11))
+
+    def test_aligned(self):
+        ipam = IPv4IntervalSet(3, 100)
+        self.assertEqual(ipam.allocate(16, alignment=16), (16, 31))
+        self.assertEqual(ipam.allocate(16, alignment=16), (32, 47))
+
+
+class NetworkIpamTestCase(unittest.TestCase):
+    def setUp(self):
+        self.network = NetworkModel(name="net", type="vxlan", cidr="192.168.0.0/24",
+                                    allocation_pool=[IPv4Pool(start="192.168.0.100", end="192.168.0.200")])
+
+    def test_same_result_as_list_functions(self):
+        self.network.add_reserved_range(IPv4ReservedRange(start="192.168.0.10", end="192.168.0.20", owner="a"))
+        ip_range = self.network.find_free_range(5)
+        self.assertEqual(ip_range, get_range_in_cidr(self.network.cidr, self.network.allocation_pool + self.network.reserved_ranges, 5))
+        available = get_available_network_ip(self.network.cidr, self.network.allocation_pool + self.network.reserved_ranges)
+        self.assertEqual([(int(pool.start), int(pool.end)) for pool in available], self.network.get_ipam().intervals())
+
+    def test_release_keeps_allocation_pool(self):
+        self.network.get_ipam()
+        reserved = IPv4ReservedRange(start="192.168.0.90", end="192.168.0.110", owner="a")
+        self.network.add_reserved_range(reserved)
+        self.network.release_range("a", None)
+        self.assertFalse(self.network.get_ipam().is_free(ip("192.168.0.100"), ip("192.168.0.100")))
+        self.assertTrue(self.network.get_ipam().is_free(ip("192.168.0.90"), ip("192.168.0.99")))
+
+    def test_overlapping_reservation_refused(self):
+        self.network.add_reserved_range(IPv4ReservedRange(start="192.168.0.10", end="192.168.0.20", owner="a"))
+        with self.assertRaises(ValueError):
+            self.network.add_reserved_range(IPv4ReservedRange(start="192.168.0.5", end="192.168.0.30", owner="b"))
+
+
+if __name__ == '__main__':
+    unittest.main()
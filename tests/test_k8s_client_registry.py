@@ -0,0 +1,59 @@
+import unittest
+
+from nfvcl.utils.k8s.k8s_client_registry import K8sClientRegistry
+
+KUBECONFIG_TEMPLATE = """
+apiVersion: v1
+kind: Config
+clusters:
+- cluster:
+    server: https://{host}:6443
+  name: test
+contexts:
+- context:
+    cluster: test
+    user: test
+  name: test
+current-context: test
+users:
+- name: test
+  user:
+    token: test-token
+"""
+
+
+class K8sClientRegistryTestCase(unittest.TestCase):
+    def setUp(self):
+        self.registry = K8sClientRegistry(max_entries=2)
+
+    def test_configuration_reused(self):
+        credentials = KUBECONFIG_TEMPLATE.format(host="10.0.0.1")
+        configuration = self.registry.get_configuration(credentials, "cluster1")
+        self.assertIs(self.registry.get_configuration(credentials, "cluster1"), configuration)
+        self.assertEqual(configuration.host, "https://10.0.0.1:6443")
+        self.assertIs(self.registry.get_api_client(configuration), self.registry.get_api_client(configuration))
+
+    def test_credentials_change(self):
+        old_configuration = self.registry.get_configuration(KUBECONFIG_TEMPLATE.format(host="10.0.0.1"), "cluster1")
+        new_configuration = self.registry.get_configuration(KUBECONFIG_TEMPLATE.format(host="10.0.0.2"), "cluster1")
+        self.assertIsNot(old_configuration, new_configuration)
+        # The old configuration is no longer in the registry
+        self.assertIsNone(self.registry.get_api_client(old_configuration))
+
+    def test_invalidate(self):
+        credentials = KUBECONFIG_TEMPLATE.format(host="10.0.0.1")
+        configuration = self.registry.get_configuration(credentials, "cluster1")
+        self.registry.invalidate("cluster1", keep_credentials=credentials)
+        self.assertIs(self.registry.get_configuration(credentials, "cluster1"), configuration)
+        self.registry.invalidate("cluster1")
+        self.assertIsNot(self.registry.get_configuration(credentials, "cluster1"), configuration)
+
+    def test_lru_eviction(self):
+        first = self.registry.get_configuration(KUBECONFIG_TEMPLATE.format(host="10.0.0.1"))
+        self.registry.get_configuration(KUBECONFIG_TEMPLATE.format(host="10.0.0.2"))
+        self.registry.get_configuration(KUBECONFIG_TEMPLATE.format(host="10.0.0.3"))
+        self.assertIsNone(self.registry.get_api_client(first))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from nfvcl.utils.metrics.metrics_registry import MetricsRegistry
+
+
+class MetricsRegistryTestCase(unittest.TestCase):
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("op_duration_seconds", "Duration", ("method_name",), buckets=(1, 5))
+        histogram.observe(0.5, method_name="create_vm")
+        histogram.observe(3, method_name="create_vm")
+        histogram.observe(10, method_name="create_vm")
+        lines = registry.render().splitlines()
+        self.assertIn('op_duration_seconds_bucket{method_name="create_vm",le="1.0"} 1', lines)
+        self.assertIn('op_duration_seconds_bucket{method_name="create_vm",le="5.0"} 2', lines)
+        self.assertIn('op_duration_seconds_bucket{method_name="create_vm",le="+Inf"} 3', lines)
+        self.assertIn('op_duration_seconds_sum{method_name="create_vm"} 13.5', lines)
+        self.assertIn('op_duration_seconds_count{method_name="create_vm"} 3', lines)
+
+    def test_same_histogram_is_returned(self):
+        registry = MetricsRegistry()
+        self.assertIs(registry.histogram("a", "A", ()), registry.histogram("a", "A", ()))
+
+    def test_counter(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("errors_total", "Errors", ("error",))
+        counter.inc(error="TimeoutError")
+        counter.inc(2, error="TimeoutError")
+        lines = registry.render().splitlines()
+        self.assertIn("# TYPE errors_total counter", lines)
+        self.assertIn('errors_total{error="TimeoutError"} 3.0', lines)
+
+    def test_gauge_and_label_escaping(self):
+        registry = MetricsRegistry()
+        registry.gauge("queue_depth", "Depth", lambda: 4)
+        registry.histogram("h", "H", ("name",), buckets=(1,)).observe(1, name='a"b')
+        lines = registry.render().splitlines()
+        self.assertIn("# TYPE queue_depth gauge", lines)
+        self.assertIn("queue_depth 4.0", lines)
+        self.assertIn('h_bucket{name="a\\"b",le="1.0"} 1', lines)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from nfvcl.utils.openstack.openstack_client import OpenStackClient, NetworkCatalog
+
+
+class FakeNetworkClient:
+    """
+    Neutron API returning the networks of the test, counting the listings
+    """
+
+    def __init__(self):
+        self.shared = {"public": "net-public"}
+        self.project = {"private": "net-private"}
+        self.listings = 0
+
+    def networks(self, shared: bool = None, project_id: str = None):
+        if shared:
+            self.listings += 1
+            return [SimpleNamespace(name=name, id=network_id) for name, network_id in self.shared.items()]
+        return [SimpleNamespace(name=name, id=network_id) for name, network_id in self.project.items()]
+
+
+class FakeConnection:
+    def __init__(self):
+        self.network = FakeNetworkClient()
+        self.subnet_gets = 0
+
+    def get_subnet(self, subnet_id: str):
+        self.subnet_gets += 1
+        return SimpleNamespace(id=subnet_id)
+
+
+class NetworkCatalogTestCase(unittest.TestCase):
+    def setUp(self):
+        self.connection = FakeConnection()
+        self.catalog = NetworkCatalog()
+
+    def _client(self) -> OpenStackClient:
+        # The clients of the same VIM share the catalog, the connection to OpenStack is not needed
+        client = OpenStackClient.__new__(OpenStackClient)
+        client.client = self.connection
+        client.project_id = "project"
+        client.network_catalog = self.catalog
+        return client
+
+    def test_catalog_is_shared_until_the_ttl(self):
+        self.assertEqual(self._client().network_names_to_ids(["public", "private"]), ["net-public", "net-private"])
+        self.assertEqual(self._client().get_network("private").id, "net-private")
+        self.assertEqual(self.connection.network.listings, 1)
+
+        with mock.patch("nfvcl.utils.openstack.openstack_client.OPENSTACK_NETWORK_CACHE_TTL", 0):
+            self._client().get_network("public")
+        self.assertEqual(self.connection.network.listings, 2)
+
+    def test_invalidated_catalog_is_loaded_again(self):
+        client = self._client()
+        client.get_network("public")
+        self.connection.network.project["new"] = "net-new"
+        client.invalidate_network_cache()
+
+        self.assertEqual(self._client().get_network("new").id, "net-new")
+        self.assertEqual(self.connection.network.listings, 2)
+
+    def test_missing_network_reloads_the_catalog(self):
+        client = self._client()
+        client.get_network("public")
+        self.connection.network.project["new"] = "net-new"
+
+        with mock.patch("nfvcl.utils.openstack.openstack_client.OPENSTACK_NETWORK_MISS_REFRESH_INTERVAL", 0):
+            self.assertEqual(client.get_network("new").id, "net-new")
+        self.assertEqual(self.connection.network.listings, 2)
+
+    def test_reloads_on_missing_networks_are_rate_limited(self):
+        client = self._client()
+        client.get_network("public")
+        for _ in range(10):
+            self.assertIsNone(client.get_network("missing"))
+        # The catalog has just been loaded, the missing network is not searched again
+        self.assertEqual(self.connection.network.listings, 1)
+
+        with mock.patch("nfvcl.utils.openstack.openstack_client.OPENSTACK_NETWORK_MISS_REFRESH_INTERVAL", 0):
+            self.assertIsNone(client.get_network("missing"))
+        self.assertEqual(self.connection.network.listings, 2)
+
+    def test_subnets_are_cached_until_the_ttl(self):
+        client = self._client()
+        client.get_subnet("subnet1")
+        self._client().get_subnet("subnet1")
+        self.assertEqual(self.connection.subnet_gets, 1)
+
+        with mock.patch("nfvcl.utils.openstack.openstack_client.OPENSTACK_NETWORK_CACHE_TTL", 0):
+            client.get_subnet("subnet1")
+        self.assertEqual(self.connection.subnet_gets, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
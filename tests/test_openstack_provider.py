@@ -0,0 +1,83 @@
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+from nfvcl.blueprints_ng.providers.virtualization.virtualization_provider_openstack import \
+    VirtualizationProviderOpenstack, VirtualizationProviderDataOpenstack
+from nfvcl.blueprints_ng.resources import VmResourceFlavor
+
+
+class FakeConnection:
+    """
+    Keeps the created flavors in memory, the creation takes some time like on a real VIM
+    """
+
+    def __init__(self):
+        self.flavors = {}
+        self.created = []
+        self.lock = threading.Lock()
+
+    def get_flavor(self, name):
+        with self.lock:
+            return self.flavors.get(name)
+
+    def create_flavor(self, name, ram, vcpus, disk, is_public=True):
+        time.sleep(0.05)
+        with self.lock:
+            self.created.append(name)
+            self.flavors[name] = SimpleNamespace(id=f"{name}_{len(self.created)}", name=name)
+            return self.flavors[name]
+
+    def get_project(self, name):
+        return {"id": "project"}
+
+    def add_flavor_access(self, flavor_id, project_id):
+        pass
+
+
+def _provider() -> VirtualizationProviderOpenstack:
+    provider = VirtualizationProviderOpenstack.__new__(VirtualizationProviderOpenstack)
+    provider.data = VirtualizationProviderDataOpenstack()
+    provider.conn = FakeConnection()
+    provider.vim = SimpleNamespace(vim_tenant_name="tenant")
+    provider._flavor_locks = {}
+    provider._flavor_locks_lock = threading.Lock()
+    return provider
+
+
+class CreateGetFlavorTestCase(unittest.TestCase):
+    def _concurrently(self, function, times: int):
+        results = []
+        barrier = threading.Barrier(times)
+
+        def run(index):
+            barrier.wait()
+            results.append(function(index))
+
+        threads = [threading.Thread(target=run, args=(index,)) for index in range(times)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_named_flavor_is_created_once(self):
+        provider = _provider()
+        flavor = VmResourceFlavor(name="shared", memory_mb="1024", vcpu_count="1", storage_gb="10")
+        flavors = self._concurrently(lambda index: provider.create_get_flavor(flavor, f"vm{index}"), 6)
+
+        self.assertEqual(provider.conn.created, ["shared"])
+        self.assertEqual({flavor.id for flavor in flavors}, {"shared_1"})
+
+    def test_unnamed_flavors_are_created_once_per_vm(self):
+        provider = _provider()
+        flavor = VmResourceFlavor(memory_mb="1024", vcpu_count="1", storage_gb="10")
+        self._concurrently(lambda index: provider.create_get_flavor(flavor, f"vm{index % 2}"), 6)
+
+        self.assertEqual(sorted(provider.conn.created), ["Flavor_vm0", "Flavor_vm1"])
+        self.assertEqual(sorted(provider.data.flavors), ["Flavor_vm0", "Flavor_vm1"])
+
+
+if __name__ == '__main__':
+    unittest.main()
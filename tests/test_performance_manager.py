@@ -0,0 +1,187 @@
+import datetime
+import threading
+import unittest
+from unittest import mock
+
+from nfvcl.blueprints_ng.lcm.performance_manager import PerformanceManager
+from nfvcl.models.performance import BlueprintPerformanceType, PerformanceOutcome
+from tests.fake_database import fake_database
+
+
+class PerformanceManagerTestCase(unittest.TestCase):
+    def setUp(self):
+        self._database_context = fake_database()
+        self.database = self._database_context.__enter__()
+        self.performance_manager = PerformanceManager()
+        self.performance_manager.add_blueprint("blue", "k8s")
+
+    def tearDown(self):
+        self._database_context.__exit__(None, None, None)
+
+    def _saved_operations(self) -> list:
+        return self.database.find_one_in_collection("performance", {"blueprint_id": "blue"})["operations"]
+
+    def _operation_with_open_call(self, exception):
+        operation_id = self.performance_manager.start_operation("blue", BlueprintPerformanceType.DAY0, "create")
+        call_started = threading.Event()
+        operation_ended = threading.Event()
+
+        def provider_thread():
+            # A call still running in another thread when the operation ends
+            self.performance_manager.start_provider_call(operation_id, "create_vm", {})
+            call_started.set()
+            operation_ended.wait(10)
+
+        thread = threading.Thread(target=provider_thread)
+        thread.start()
+        call_started.wait(10)
+        with self.performance_manager.provider_call(operation_id, "configure_vm", {}):
+            pass
+        self.performance_manager.end_operation(operation_id, exception)
+        operation_ended.set()
+        thread.join()
+        return self._saved_operations()[0]
+
+    def test_open_calls_are_aborted_with_the_operation_error(self):
+        operation = self._operation_with_open_call(RuntimeError("failed"))
+
+        self.assertEqual(operation["outcome"], PerformanceOutcome.ERROR.value)
+        calls = {call["method_name"]: call for call in operation["provider_calls"]}
+        self.assertEqual(calls["configure_vm"]["outcome"], PerformanceOutcome.OK.value)
+        self.assertEqual(calls["create_vm"]["outcome"], PerformanceOutcome.ABORTED.value)
+        self.assertEqual(calls["create_vm"]["error"], "RuntimeError")
+        self.assertIsNotNone(calls["create_vm"]["end"])
+
+    def test_open_calls_are_aborted_when_the_operation_succeeds(self):
+        operation = self._operation_with_open_call(None)
+
+        self.assertEqual(operation["outcome"], PerformanceOutcome.OK.value)
+        calls = {call["method_name"]: call for call in operation["provider_calls"]}
+        self.assertEqual(calls["create_vm"]["outcome"], PerformanceOutcome.ABORTED.value)
+        self.assertIsNone(calls["create_vm"]["error"])
+
+    def test_queried_fields_are_indexed(self):
+        indexes = self.performance_manager.performance_collection.indexes
+        for field in ("blueprint_id", "operations.start", "operations.id", "operations.trace_id"):
+            self.assertIn([(field, 1)], indexes)
+
+    def test_only_the_last_operations_are_kept(self):
+        with mock.patch("nfvcl.blueprints_ng.lcm.performance_manager.PERFORMANCE_OPERATIONS_RETENTION", 3):
+            for index in range(5):
+                with self.performance_manager.operation("blue", BlueprintPerformanceType.DAY2, f"op{index}"):
+                    pass
+
+        self.assertEqual([operation["op_name"] for operation in self._saved_operations()], ["op2", "op3", "op4"])
+        # Completed operations are not kept in memory
+        self.assertEqual(self.performance_manager.performance_dict["blue"].operations, [])
+        self.assertEqual(self.performance_manager.operations, {})
+
+    def test_performances_are_loaded_in_batches(self):
+        for index in range(5):
+            self.database.insert_in_collection("blue-inst-v2", {"id": f"blue{index}"})
+            if index != 3:
+                self.database.insert_in_collection("performance", {"blueprint_id": f"blue{index}", "blueprint_type": "k8s", "start": datetime.datetime(2024, 1, 1), "operations": []})
+        finds = self.database.calls["find_in_collection"]
+
+        with mock.patch("nfvcl.blueprints_ng.lcm.performance_manager.PERFORMANCE_LOAD_BATCH_SIZE", 2):
+            performance_manager = PerformanceManager()
+
+        self.assertEqual(sorted(performance_manager.performance_dict.keys()), ["blue0", "blue1", "blue2", "blue4"])
+        # One query for the blueprints and one for every batch of 2 blueprints
+        self.assertEqual(self.database.calls["find_in_collection"] - finds, 4)
+
+
+class PerformanceStatsTestCase(unittest.TestCase):
+    START = datetime.datetime(2024, 1, 1)
+
+    def setUp(self):
+        self._database_context = fake_database()
+        self.database = self._database_context.__enter__()
+        self.performance_manager = PerformanceManager()
+
+        # 10 DAY0 operations from 100 to 1000 ms, one every minute, only the last one has a failed Ansible call
+        operations = []
+        for index in range(10):
+            duration = (index + 1) * 100
+            provider_calls = [self._call(f"vm{index}", "create_vm", duration // 2)]
+            if index == 9:
+                provider_calls.append(self._call(f"ansible{index}", "configure_vm", 5000, PerformanceOutcome.ERROR))
+            operations.append(self._operation(f"k8s{index}", index, duration, provider_calls))
+        self._insert("blue_k8s", "k8s", operations)
+        self._insert("blue_ueransim", "ueransim", [self._operation("ueransim0", 30, 50, [])])
+
+    def tearDown(self):
+        self._database_context.__exit__(None, None, None)
+
+    def _call(self, call_id: str, method_name: str, duration: int, outcome: PerformanceOutcome = PerformanceOutcome.OK) -> dict:
+        return {"id": call_id, "method_name": method_name, "info": {}, "start": self.START, "duration": duration, "outcome": outcome.value, "error": "Exception" if outcome == PerformanceOutcome.ERROR else None, "retries": 0}
+
+    def _operation(self, operation_id: str, minute: int, duration: int, provider_calls: list) -> dict:
+        start = self.START + datetime.timedelta(minutes=minute)
+        return {"id": operation_id, "op_name": "create", "type": BlueprintPerformanceType.DAY0.value, "start": start, "end": start + datetime.timedelta(milliseconds=duration),
+                "duration": duration, "provider_calls": provider_calls, "outcome": PerformanceOutcome.OK.value, "trace_id": operation_id}
+
+    def _insert(self, blueprint_id: str, blueprint_type: str, operations: list):
+        self.database.insert_in_collection("performance", {"blueprint_id": blueprint_id, "blueprint_type": blueprint_type, "start": self.START, "operations": operations})
+
+    def test_operation_stats(self):
+        stats = self.performance_manager.get_operation_stats()
+
+        self.assertEqual([item.group["blueprint_type"] for item in stats], ["k8s", "ueransim"])
+        k8s = stats[0]
+        self.assertEqual((k8s.count, k8s.mean, k8s.max), (10, 550, 1000))
+        # Nearest rank on the sorted durations
+        self.assertEqual((k8s.p50, k8s.p95, k8s.p99), (500, 900, 900))
+        self.assertEqual(k8s.group["outcome"], PerformanceOutcome.OK.value)
+
+    def test_operation_stats_time_window(self):
+        stats = self.performance_manager.get_operation_stats(since=self.START + datetime.timedelta(minutes=5), until=self.START + datetime.timedelta(minutes=8))
+        self.assertEqual(len(stats), 1)
+        self.assertEqual((stats[0].count, stats[0].max), (3, 800))
+
+        self.assertEqual([item.group["blueprint_type"] for item in self.performance_manager.get_operation_stats(blueprint_type="ueransim")], ["ueransim"])
+
+    def test_provider_call_stats(self):
+        stats = self.performance_manager.get_provider_call_stats()
+
+        # Failed calls are a separate group
+        groups = [(item.group["method_name"], item.group["outcome"], item.count) for item in stats]
+        self.assertEqual(groups, [("configure_vm", PerformanceOutcome.ERROR.value, 1), ("create_vm", PerformanceOutcome.OK.value, 10)])
+        self.assertEqual(stats[1].max, 500)
+
+    def test_slowest_provider_calls(self):
+        calls = self.performance_manager.get_slowest_provider_calls(limit=2)
+        self.assertEqual([(call.method_name, call.duration) for call in calls], [("configure_vm", 5000), ("create_vm", 500)])
+        self.assertEqual(calls[0].operation_id, "k8s9")
+        self.assertEqual(calls[0].outcome, PerformanceOutcome.ERROR)
+
+        calls = self.performance_manager.get_slowest_provider_calls(method_name="create_vm", limit=1)
+        self.assertEqual([(call.method_name, call.duration) for call in calls], [("create_vm", 500)])
+
+    def test_day0_breakdown(self):
+        breakdowns = self.performance_manager.get_day0_breakdown()
+
+        self.assertEqual([breakdown.blueprint_type for breakdown in breakdowns], ["k8s", "ueransim"])
+        k8s, ueransim = breakdowns
+        self.assertEqual((k8s.operations, k8s.total_duration), (10, 5500))
+        self.assertEqual(k8s.categories, {"vm": 2750, "ansible": 5000})
+        # The provider calls take longer than the operations, they overlap
+        self.assertEqual(k8s.not_in_provider_calls, 0)
+        self.assertEqual((ueransim.operations, ueransim.categories, ueransim.not_in_provider_calls), (1, {}, 50))
+
+    def test_day0_breakdown_async_child_blueprints(self):
+        calls = [self._call("child0", "create_blueprint_async", 10), self._call("child1", "call_blueprint_function_async", 20), self._call("wait", "wait_all", 300)]
+        self._insert("blue_5g", "5g", [self._operation("5g0", 40, 400, calls)])
+
+        breakdown = self.performance_manager.get_day0_breakdown(blueprint_type="5g")[0]
+        self.assertEqual(breakdown.categories, {"child_blueprints": 330})
+        self.assertEqual(breakdown.not_in_provider_calls, 70)
+
+    def test_day0_operation_id(self):
+        self.assertEqual(self.performance_manager.get_day0_operation_id("blue_k8s"), "k8s9")
+        with self.assertRaises(ValueError):
+            self.performance_manager.get_day0_operation_id("missing")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import datetime
+import unittest
+import uuid
+
+from nfvcl.blueprints_ng.lcm.performance_trace import build_trace, trace_to_otel
+from nfvcl.models.performance import BlueprintPerformanceOperation, BlueprintPerformanceProviderCall, BlueprintPerformanceType, \
+    PerformanceTraceParent
+
+START = datetime.datetime(2024, 1, 1)
+
+
+def time(seconds: int) -> datetime.datetime:
+    return START + datetime.timedelta(seconds=seconds)
+
+
+def operation(name: str, start: int, end: int, trace_id: str = None, parent: PerformanceTraceParent = None, calls=()) -> BlueprintPerformanceOperation:
+    op_id = str(uuid.uuid4())
+    return BlueprintPerformanceOperation(
+        id=op_id,
+        op_name=name,
+        type=BlueprintPerformanceType.DAY0,
+        start=time(start),
+        end=time(end),
+        duration=(end - start) * 1000,
+        trace_id=trace_id or op_id,
+        parent=parent,
+        provider_calls=[
+            BlueprintPerformanceProviderCall(id=str(uuid.uuid4()), method_name=method, start=time(call_start), end=time(call_end), duration=(call_end - call_start) * 1000)
+            for method, call_start, call_end in calls
+        ]
+    )
+
+
+class PerformanceTraceTestCase(unittest.TestCase):
+    def setUp(self):
+        self.core = operation("create", 0, 100, calls=[("create_blueprint", 1, 40), ("create_blueprint", 40, 90), ("install_helm_chart", 90, 99)])
+        router_call, upf_call = self.core.provider_calls[0], self.core.provider_calls[1]
+        self.router = operation("create", 2, 39, trace_id=self.core.id, parent=PerformanceTraceParent(trace_id=self.core.id, blueprint_id="core", operation_id=self.core.id, provider_call_id=router_call.id), calls=[("create_vm", 3, 30)])
+        self.upf = operation("create", 41, 89, trace_id=self.core.id, parent=PerformanceTraceParent(trace_id=self.core.id, blueprint_id="core", operation_id=self.core.id, provider_call_id=upf_call.id), calls=[("create_vm", 42, 60), ("configure_vm", 60, 88)])
+        self.operations = [("upf", "upf", self.upf), ("core", "sdcore", self.core), ("router", "router", self.router)]
+
+    def test_span_tree(self):
+        trace = build_trace(self.core.id, self.operations)
+        self.assertEqual(len(trace.spans), 1)
+        root = trace.spans[0]
+        self.assertEqual(root.id, self.core.id)
+        self.assertEqual([child.name for child in root.children], ["create_blueprint", "create_blueprint", "install_helm_chart"])
+        self.assertEqual(root.children[0].children[0].id, self.router.id)
+        self.assertEqual(root.children[1].children[0].name, "upf.create")
+
+    def test_critical_path(self):
+        trace = build_trace(self.core.id, self.operations)
+        upf_span = trace.spans[0].children[1].children[0]
+        self.assertEqual(trace.critical_path, [
+            self.core.id,
+            self.core.provider_calls[2].id,
+        ])
+        self.assertFalse(upf_span.critical)
+
+    def test_critical_path_follows_last_child(self):
+        # Without the final helm installation the UPF creation is the last to end
+        self.core.provider_calls.pop()
+        trace = build_trace(self.core.id, self.operations)
+        self.assertEqual(trace.critical_path, [self.core.id, self.core.provider_calls[1].id, self.upf.id, self.upf.provider_calls[1].id])
+
+    def test_otel_export(self):
+        otel = trace_to_otel(build_trace(self.core.id, self.operations))
+        spans = otel["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        self.assertEqual(len(spans), 3 + 1 + 1 + 2 + 2)
+        self.assertEqual({span["traceId"] for span in spans}, {uuid.UUID(self.core.id).hex})
+        upf_span = next(span for span in spans if span["spanId"] == uuid.UUID(self.upf.id).hex[:16])
+        self.assertEqual(upf_span["parentSpanId"], uuid.UUID(self.core.provider_calls[1].id).hex[:16])
+        self.assertEqual(upf_span["startTimeUnixNano"], str(int(time(41).replace(tzinfo=datetime.timezone.utc).timestamp()) * 10 ** 9))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from nfvcl.blueprints_ng.blueprint_ng import ProvidersAggregator, BlueprintNGException
+from nfvcl.blueprints_ng.modules.generic_5g.generic_5g import Generic5GBlueprintNG
+from nfvcl.blueprints_ng.providers.blueprint_ng_provider_interface import BlueprintNGProviderData
+from nfvcl.utils.log import create_logger
+
+
+class SlowK8SProvider:
+    """
+    Provider that takes some time to be created, counting the created instances
+    """
+    created = 0
+
+    def __init__(self, area, blueprint_id, persistence_function, persistence_flush_function):
+        SlowK8SProvider.created += 1
+        time.sleep(0.05)
+        self.data = BlueprintNGProviderData()
+
+
+def _blueprint():
+    base_model = SimpleNamespace(virt_providers={}, k8s_providers={}, pdu_provider=None, blueprint_provider=None)
+    return SimpleNamespace(id="blueprint", base_model=base_model, mark_dirty=lambda: None, to_db=lambda: None)
+
+
+class ProvidersAggregatorTestCase(unittest.TestCase):
+    def setUp(self):
+        SlowK8SProvider.created = 0
+        with mock.patch("nfvcl.blueprints_ng.providers.blueprint_ng_provider_interface.build_topology"):
+            self.blueprint = _blueprint()
+            self.aggregator = ProvidersAggregator(self.blueprint)
+
+    def test_concurrent_getters_share_the_provider(self):
+        providers = []
+        barrier = threading.Barrier(8)
+
+        def get_provider():
+            barrier.wait()
+            providers.append(self.aggregator.get_k8s_provider(1))
+
+        with mock.patch("nfvcl.blueprints_ng.blueprint_ng.K8SProviderNative", SlowK8SProvider):
+            threads = [threading.Thread(target=get_provider) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(SlowK8SProvider.created, 1)
+        self.assertTrue(all(provider is providers[0] for provider in providers))
+        self.assertIs(self.blueprint.base_model.k8s_providers["1"].provider_data, providers[0].data)
+
+
+class EdgeAreasRolloutTestCase(unittest.TestCase):
+    def _blueprint(self, area_ids, deploy):
+        state = SimpleNamespace(current_config=SimpleNamespace(areas=[SimpleNamespace(id=area_id) for area_id in area_ids]), edge_areas={})
+        return SimpleNamespace(id="5g", state=state, logger=create_logger("EdgeAreasTest"), _update_edge_area=deploy)
+
+    def test_areas_are_deployed_concurrently(self):
+        barrier = threading.Barrier(3, timeout=10)
+        deployed = []
+
+        def deploy(area, new):
+            # Every area waits for the other ones, this only succeeds if they are deployed at the same time
+            barrier.wait()
+            deployed.append(area.id)
+            raise RuntimeError("stop before the routes")
+
+        with self.assertRaises(BlueprintNGException):
+            Generic5GBlueprintNG.update_edge_areas(self._blueprint([1, 2, 3], deploy), max_workers=3)
+        self.assertEqual(sorted(deployed), [1, 2, 3])
+
+    def test_failed_areas_are_aggregated(self):
+        deployed = []
+
+        def deploy(area, new):
+            if area.id in (2, 4):
+                raise RuntimeError(f"area {area.id} failed")
+            deployed.append(area.id)
+
+        blueprint = self._blueprint([1, 2, 3, 4], deploy)
+        with self.assertRaises(BlueprintNGException) as context:
+            Generic5GBlueprintNG.update_edge_areas(blueprint, max_workers=2)
+
+        # The other areas are deployed anyway and every failed area is reported
+        self.assertEqual(sorted(deployed), [1, 3])
+        self.assertIn("[2, 4]", str(context.exception))
+        self.assertIsInstance(context.exception.__cause__, RuntimeError)
+        self.assertEqual(sorted(blueprint.state.edge_areas.keys()), ["1", "2", "3", "4"])
+
+
+if __name__ == '__main__':
+    unittest.main()
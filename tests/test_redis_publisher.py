@@ -0,0 +1,141 @@
+import threading
+import unittest
+from typing import List, Tuple
+from unittest import mock
+
+from nfvcl.models.config_model import RedisParameters, RedisDropPolicy
+from nfvcl.utils.metrics.metrics_registry import MetricsRegistry
+from nfvcl.utils.redis_utils.redis_publisher import RedisPublisher
+
+
+class FakePipeline:
+    def __init__(self, redis: "FakeRedis"):
+        self.redis = redis
+        self.messages: List[Tuple[str, str]] = []
+
+    def publish(self, channel: str, message: str):
+        self.messages.append((channel, message))
+
+    def __len__(self):
+        return len(self.messages)
+
+    def execute(self):
+        self.redis.executing.set()
+        self.redis.release.wait(10)
+        with self.redis.lock:
+            if self.redis.failures > 0:
+                self.redis.failures -= 1
+                raise ConnectionError("redis unreachable")
+            self.redis.published.extend(self.messages)
+
+
+class FakeRedis:
+    """
+    Records the published messages, execute blocks until released and fails the first times
+    """
+
+    def __init__(self, failures: int = 0, blocked: bool = False):
+        self.lock = threading.Lock()
+        self.failures = failures
+        self.published: List[Tuple[str, str]] = []
+        self.executing = threading.Event()
+        self.release = threading.Event()
+        if not blocked:
+            self.release.set()
+
+    def pipeline(self, transaction: bool = True):
+        return FakePipeline(self)
+
+
+class RedisPublisherTestCase(unittest.TestCase):
+    def setUp(self):
+        self._interval_patch = mock.patch("nfvcl.utils.redis_utils.redis_publisher.REDIS_PUBLISH_RETRY_INTERVAL", 0.01)
+        self._interval_patch.start()
+        self.metrics_registry = MetricsRegistry()
+        self._registry_patch = mock.patch("nfvcl.utils.redis_utils.redis_publisher.get_metrics_registry", return_value=self.metrics_registry)
+        self._registry_patch.start()
+
+    def tearDown(self):
+        self._interval_patch.stop()
+        self._registry_patch.stop()
+
+    def _metric(self, name: str) -> float:
+        """
+        The value of a metric exposed on /metrics, 0 for counters never incremented
+        """
+        for line in self.metrics_registry.render().splitlines():
+            if line.startswith(f"{name} "):
+                return float(line.split(" ")[1])
+        return 0
+
+    def _publisher(self, redis: FakeRedis, **config) -> RedisPublisher:
+        publisher = RedisPublisher(redis, RedisParameters(host="127.0.0.1", port=6379, **config))
+        self.addCleanup(publisher.close, 1)
+        return publisher
+
+    def _fill_blocked_queue(self, policy: RedisDropPolicy) -> Tuple[FakeRedis, RedisPublisher]:
+        redis = FakeRedis(blocked=True)
+        publisher = self._publisher(redis, publish_queue_size=3, publish_drop_policy=policy)
+        # The first message is taken by the publisher thread, that waits for redis
+        publisher.publish("channel", "m0")
+        self.assertTrue(redis.executing.wait(10))
+        for index in range(1, 6):
+            publisher.publish("channel", f"m{index}")
+        self.assertEqual(self._metric("nfvcl_redis_dropped_messages_total"), 2)
+        self.assertEqual(self._metric("nfvcl_redis_publish_queue_size"), 3)
+        redis.release.set()
+        publisher.close()
+        return redis, publisher
+
+    def test_drop_oldest(self):
+        redis, publisher = self._fill_blocked_queue(RedisDropPolicy.DROP_OLDEST)
+        self.assertEqual([message for _, message in redis.published], ["m0", "m3", "m4", "m5"])
+        self.assertEqual(self._metric("nfvcl_redis_published_messages_total"), 4)
+
+    def test_drop_newest(self):
+        redis, publisher = self._fill_blocked_queue(RedisDropPolicy.DROP_NEWEST)
+        self.assertEqual([message for _, message in redis.published], ["m0", "m1", "m2", "m3"])
+
+    def test_failed_batches_are_retried(self):
+        redis = FakeRedis(failures=3)
+        publisher = self._publisher(redis, publish_batch_size=2)
+        for index in range(5):
+            publisher.publish("channel", f"m{index}")
+        publisher.close()
+
+        # Nothing is lost and the order is kept
+        self.assertEqual([message for _, message in redis.published], [f"m{index}" for index in range(5)])
+        self.assertEqual(self._metric("nfvcl_redis_published_messages_total"), 5)
+        self.assertEqual(self._metric("nfvcl_redis_failed_messages_total"), 0)
+        self.assertGreater(self._metric("nfvcl_redis_retried_messages_total"), 0)
+
+    def test_retried_messages_follow_the_drop_policy(self):
+        redis = FakeRedis(failures=1, blocked=True)
+        publisher = self._publisher(redis, publish_queue_size=3, publish_batch_size=2)
+        publisher.publish("channel", "m0")
+        self.assertTrue(redis.executing.wait(10))
+        for index in range(1, 4):
+            publisher.publish("channel", f"m{index}")
+        # m0 fails and is queued again in front of m1, m2, m3: the oldest one is dropped
+        redis.release.set()
+        publisher.close()
+
+        self.assertEqual([message for _, message in redis.published], ["m1", "m2", "m3"])
+        self.assertEqual(self._metric("nfvcl_redis_dropped_messages_total"), 1)
+
+    def test_unpublished_messages_at_close_are_failed(self):
+        redis = FakeRedis(failures=1000)
+        publisher = self._publisher(redis)
+        for index in range(3):
+            publisher.publish("channel", f"m{index}")
+        publisher.close(0.1)
+        # The publisher thread gives up after the deadline of close
+        publisher._thread.join(5)
+
+        self.assertEqual(redis.published, [])
+        self.assertEqual(self._metric("nfvcl_redis_failed_messages_total"), 3)
+        self.assertEqual(self._metric("nfvcl_redis_publish_queue_size"), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
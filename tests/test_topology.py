@@ -0,0 +1,121 @@
+import threading
+import unittest
+
+from nfvcl.models.network import PduModel, RouterModel
+from nfvcl.models.network.network_models import PduType
+from nfvcl.models.topology import TopologyModel
+from nfvcl.topology.topology import Topology, TopologyConflictException, TOPOLOGY_CONFLICT_RETRIES
+from nfvcl.utils.database import save_topology_section, save_topology, get_topology
+from tests.fake_database import fake_database
+
+
+def _pdu(name: str) -> PduModel:
+    return PduModel(name=name, area=1, type=PduType.GNB, instance_type="UERANSIM")
+
+
+class TopologyTestCase(unittest.TestCase):
+    def setUp(self):
+        self._database_context = fake_database()
+        self.database = self._database_context.__enter__()
+        Topology.invalidate_cache()
+        self.lock = threading.RLock()
+        Topology.from_db(self.lock).create(TopologyModel(routers=[RouterModel(name="router1", external_gateway_info={})]))
+
+    def tearDown(self):
+        Topology.invalidate_cache()
+        self._database_context.__exit__(None, None, None)
+
+    def _concurrent_section_saves(self, section: str, times: int):
+        """
+        Before the next saves of the section, another NFVCL instance changes it
+        """
+        original = self.database.find_one_and_update_in_collection
+        remaining = {"saves": times}
+
+        def find_one_and_update_in_collection(collection, filter, update, projection=None, upsert=True):
+            if remaining["saves"] > 0 and f"section_revisions.{section}" in filter and section in update.get("$set", {}):
+                remaining["saves"] -= 1
+                original(collection, {'id': 'topology'}, {"$inc": {"revision": 1, f"section_revisions.{section}": 1}}, upsert=False)
+            return original(collection, filter, update, projection, upsert)
+
+        self.database.find_one_and_update_in_collection = find_one_and_update_in_collection
+
+    def test_readers_share_the_cached_model(self):
+        self.assertIs(Topology.from_db(self.lock).get_model(), Topology.from_db(self.lock).get_model())
+
+    def test_edits_are_private_until_saved(self):
+        topology1 = Topology.from_db(self.lock)
+        topology2 = Topology.from_db(self.lock)
+        shared_model = topology2.get_model()
+        # The router is removed from the private copy before the missing VIM makes the operation fail
+        with self.assertRaises(ValueError):
+            topology1.del_router("router1", vim_names_list=["missing_vim"])
+
+        self.assertEqual(shared_model.routers[0].name, "router1")
+        self.assertEqual(Topology.from_db(self.lock).get_model().routers[0].name, "router1")
+
+    def test_saved_changes_are_shared(self):
+        topology1 = Topology.from_db(self.lock)
+        topology1.add_pdu(_pdu("pdu1"))
+
+        self.assertEqual([pdu.name for pdu in topology1.get_pdus()], ["pdu1"])
+        self.assertEqual([pdu.name for pdu in Topology.from_db(self.lock).get_pdus()], ["pdu1"])
+        # The saved topology has been published, it is not reloaded from the database
+        shared_model = Topology._load_shared_model()[0]
+        self.assertIs(Topology._load_shared_model()[0], shared_model)
+        self.assertEqual([pdu.name for pdu in shared_model.pdus], ["pdu1"])
+
+    def test_failed_update_is_dropped(self):
+        topology = Topology.from_db(self.lock)
+        # The router is removed from the model before the missing VIM makes the operation fail
+        with self.assertRaises(ValueError):
+            topology.del_router("router1", vim_names_list=["missing_vim"])
+
+        self.assertEqual(topology.get_model().routers[0].name, "router1")
+        self.assertEqual(Topology.from_db(self.lock).get_model().routers[0].name, "router1")
+
+
+    def test_whole_save_does_not_overwrite_newer_sections(self):
+        topology = Topology.from_db(self.lock)
+        topology._begin_update(whole=True)
+        try:
+            # Another NFVCL instance adds a PDU meanwhile
+            section_revisions = get_topology()["section_revisions"]
+            self.assertIsNotNone(save_topology_section("pdus", [_pdu("other_instance").model_dump(mode="json")], section_revisions["pdus"]))
+
+            topology._model.routers.append(RouterModel(name="router2", external_gateway_info={}))
+            with self.assertRaises(TopologyConflictException):
+                topology._save_topology_from_model()
+        finally:
+            topology._end_update(succeeded=False)
+
+        saved = get_topology()
+        self.assertEqual([pdu["name"] for pdu in saved["pdus"]], ["other_instance"])
+        self.assertEqual([router["name"] for router in saved["routers"]], ["router1"])
+
+    def test_topology_created_only_once(self):
+        self.assertIsNone(save_topology(TopologyModel().model_dump(mode="json"), None))
+
+
+    def test_section_conflict_is_retried(self):
+        self._concurrent_section_saves("pdus", 2)
+        Topology.from_db(self.lock).add_pdu(_pdu("pdu1"))
+
+        saved = get_topology()
+        self.assertEqual([pdu["name"] for pdu in saved["pdus"]], ["pdu1"])
+        # One revision for the creation, two for the other instance and one for the PDU
+        self.assertEqual(saved["section_revisions"]["pdus"], 4)
+
+    def test_section_conflicts_abort_the_operation(self):
+        Topology.from_db(self.lock).add_pdu(_pdu("pdu1"))
+        self._concurrent_section_saves("pdus", TOPOLOGY_CONFLICT_RETRIES)
+        topology = Topology.from_db(self.lock)
+        with self.assertRaises(TopologyConflictException):
+            topology.del_pdu("pdu1")
+
+        self.assertEqual([pdu["name"] for pdu in get_topology()["pdus"]], ["pdu1"])
+        self.assertEqual([pdu.name for pdu in topology.get_pdus()], ["pdu1"])
+
+
+if __name__ == '__main__':
+    unittest.main()
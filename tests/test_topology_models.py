@@ -0,0 +1,90 @@
+import unittest
+from unittest import mock
+
+from nfvcl.models.network import PduModel, RouterModel
+from nfvcl.models.network.network_models import PduType, RouterPortModel
+from nfvcl.models.topology import TopologyModel
+from nfvcl.models.topology.topology_models import TopologyIndexes
+from nfvcl.models.vim import VimModel
+
+
+def _vim(name: str, areas) -> VimModel:
+    return VimModel(name=name, vim_url="http://vim", areas=areas)
+
+
+def _pdu(name: str, area: int = 1) -> PduModel:
+    return PduModel(name=name, area=area, type=PduType.GNB, instance_type="UERANSIM")
+
+
+class TopologyIndexesTestCase(unittest.TestCase):
+    def setUp(self):
+        self.topology = TopologyModel(vims=[_vim("vim1", [1]), _vim("vim2", [2, 3])], pdus=[_pdu("pdu1"), _pdu("pdu2", 2)])
+
+    def test_lookups(self):
+        self.assertEqual(self.topology.find_vim_index("vim2"), 1)
+        self.assertEqual(self.topology.get_vim_by_area(3).name, "vim2")
+        self.assertEqual(self.topology.find_pdu_index("pdu2"), 1)
+        self.assertEqual([pdu.name for pdu in self.topology.find_pdus(2, PduType.GNB)], ["pdu2"])
+        with self.assertRaises(ValueError):
+            self.topology.find_vim_index("missing")
+
+    def test_items_added_to_the_lists(self):
+        self.topology.find_pdu_index("pdu1")
+        self.topology.pdus.insert(0, _pdu("pdu0"))
+
+        self.assertEqual(self.topology.find_pdu_index("pdu0"), 0)
+        self.assertEqual(self.topology.find_pdu_index("pdu2"), 2)
+
+    def test_items_removed_from_the_lists(self):
+        self.topology.find_vim_index("vim2")
+        self.topology.vims.pop(0)
+
+        self.assertEqual(self.topology.find_vim_index("vim2"), 0)
+        with self.assertRaises(ValueError):
+            self.topology.find_vim_index("vim1")
+
+    def test_items_renamed_in_place(self):
+        self.topology.find_pdu_index("pdu1")
+        self.topology.pdus[0].name = "renamed"
+        self.topology.invalidate_indexes()
+
+        self.assertEqual(self.topology.find_pdu_index("renamed"), 0)
+        with self.assertRaises(ValueError):
+            self.topology.find_pdu_index("pdu1")
+
+    def test_items_replaced_in_place(self):
+        self.topology.find_vim_index("vim1")
+        self.topology.vims[0], self.topology.vims[1] = self.topology.vims[1], self.topology.vims[0]
+
+        self.assertEqual(self.topology.find_vim_index("vim1"), 1)
+        self.assertEqual(self.topology.find_vim_index("vim2"), 0)
+
+    def test_areas_changed_in_place(self):
+        self.assertEqual(self.topology.get_vim_by_area(3).name, "vim2")
+        self.topology.vims[1].areas.remove(3)
+        self.topology.vims[0].areas.append(3)
+
+        self.assertEqual(self.topology.get_vim_by_area(3).name, "vim1")
+        self.assertEqual([vim.name for vim in self.topology.get_vim_list_by_area(3)], ["vim1"])
+
+    def test_router_ports_changed_in_place(self):
+        self.topology.routers = [RouterModel(name="router1", external_gateway_info={})]
+        self.assertEqual(self.topology.find_routers_in_net("net1"), [])
+        self.topology.routers[0].ports.append(RouterPortModel(net="net1", ip_addr="10.0.0.1"))
+        self.topology.invalidate_indexes()
+
+        self.assertEqual([router.name for router in self.topology.find_routers_in_net("net1")], ["router1"])
+
+    def test_misses_do_not_rebuild_the_indexes(self):
+        self.topology.find_pdu_index("pdu1")
+        with mock.patch("nfvcl.models.topology.topology_models.TopologyIndexes", wraps=TopologyIndexes) as indexes:
+            self.assertEqual(self.topology.find_pdus(5, PduType.GNB), [])
+            with self.assertRaises(ValueError):
+                self.topology.get_vim_list_by_area(5)
+            with self.assertRaises(ValueError):
+                self.topology.find_pdu_index("missing")
+        indexes.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import queue
+import threading
+import time
+import unittest
+
+from nfvcl.blueprints_ng.lcm.worker_scheduler import BlueprintWorkerScheduler
+
+
+class FakeBlueprint:
+    def __init__(self, blue_id: str):
+        self.id = blue_id
+
+
+class FakeWorker:
+    """
+    Implements the part of BlueprintWorker used by the scheduler, messages are functions to be called
+    """
+
+    def __init__(self, scheduler: BlueprintWorkerScheduler, blue_id: str):
+        self.scheduler = scheduler
+        self.blueprint = FakeBlueprint(blue_id)
+        self.message_queue = queue.Queue()
+        self.scheduled = False
+        self.stopped = False
+
+    def put(self, function):
+        self.message_queue.put(function)
+        self.scheduler.schedule(self)
+
+    def process_next_message(self):
+        try:
+            function = self.message_queue.get_nowait()
+        except queue.Empty:
+            return
+        function()
+
+
+class WorkerSchedulerTestCase(unittest.TestCase):
+    def test_fifo_per_worker(self):
+        scheduler = BlueprintWorkerScheduler(max_threads=4, thread_idle_timeout=1)
+        workers = [FakeWorker(scheduler, f"blue{i}") for i in range(10)]
+        results = {worker.blueprint.id: [] for worker in workers}
+        done = threading.Event()
+        counter = {"value": 0}
+        lock = threading.Lock()
+
+        def append(blue_id, value):
+            results[blue_id].append(value)
+            with lock:
+                counter["value"] += 1
+                if counter["value"] == 10 * 50:
+                    done.set()
+
+        for value in range(50):
+            for worker in workers:
+                worker.put(lambda w=worker, v=value: append(w.blueprint.id, v))
+
+        self.assertTrue(done.wait(10))
+        for worker in workers:
+            self.assertEqual(results[worker.blueprint.id], list(range(50)))
+        self.assertLessEqual(scheduler.thread_count, 4)
+
+    def test_burst_is_processed_concurrently(self):
+        scheduler = BlueprintWorkerScheduler(max_threads=4, thread_idle_timeout=1)
+        # A first worker leaves an idle thread
+        warmup = threading.Event()
+        FakeWorker(scheduler, "warmup").put(warmup.set)
+        self.assertTrue(warmup.wait(5))
+        time.sleep(0.1)
+
+        workers = [FakeWorker(scheduler, f"blue{i}") for i in range(4)]
+        barrier = threading.Barrier(4, timeout=5)
+        done = []
+        start = time.monotonic()
+        for worker in workers:
+            worker.put(lambda: done.append(barrier.wait()))
+        while len(done) < 4 and time.monotonic() - start < 5:
+            time.sleep(0.01)
+        # The 4 operations can only complete if they run at the same time
+        self.assertEqual(len(done), 4)
+        self.assertLessEqual(scheduler.thread_count, 4)
+
+    def test_blocked_threads_are_not_counted(self):
+        scheduler = BlueprintWorkerScheduler(max_threads=1, thread_idle_timeout=1)
+        parent = FakeWorker(scheduler, "parent")
+        child = FakeWorker(scheduler, "child")
+        child_done = threading.Event()
+        parent_done = threading.Event()
+
+        def parent_operation():
+            # Like a parent blueprint waiting for the creation of a child blueprint
+            child.put(child_done.set)
+            with scheduler.blocking():
+                child_done.wait(5)
+            parent_done.set()
+
+        parent.put(parent_operation)
+        self.assertTrue(parent_done.wait(10))
+        self.assertTrue(child_done.is_set())
+
+    def test_idle_threads_terminate(self):
+        scheduler = BlueprintWorkerScheduler(max_threads=2, thread_idle_timeout=0.2)
+        worker = FakeWorker(scheduler, "blue")
+        done = threading.Event()
+        worker.put(done.set)
+        self.assertTrue(done.wait(5))
+        time.sleep(1)
+        self.assertEqual(scheduler.thread_count, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()